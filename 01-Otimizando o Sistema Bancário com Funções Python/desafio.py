@@ -39,34 +39,77 @@ def exibir_subtitulo(subtitulo: str) -> None:
     print(subtitulo)
 
 
-def efetuar_deposito(saldo: float, extrato: str, /) -> tuple[float, str, str]:
+def converter_para_centavos(texto: str) -> int:
+    """Converte um valor digitado (ex.: "10", "10.5", "10,50") em centavos.
+
+    Aceita ponto ou vírgula como separador decimal e no máximo duas casas
+    decimais, sem passar por `float`, para que saldos e limites sejam exatos.
+
+    Args:
+        texto (str): Valor monetário em reais, opcionalmente com sinal.
+
+    Returns:
+        int: Valor correspondente em centavos.
+
+    Raises:
+        ValueError: Se o texto não representar um valor com até duas casas decimais.
+    """
+    texto = texto.strip().replace(",", ".", 1)
+    sinal = -1 if texto.startswith("-") else 1
+    if texto[:1] in "+-":
+        texto = texto[1:]
+
+    reais, _, centavos = texto.partition(".")
+    digitos = reais + centavos
+    if (
+        not digitos
+        or len(centavos) > 2
+        or not (digitos.isascii() and digitos.isdigit())
+    ):
+        raise ValueError(f"Valor monetário inválido: {texto!r}")
+
+    return sinal * (int(reais or "0") * 100 + int(centavos.ljust(2, "0")))
+
+
+def formatar_centavos(centavos: int) -> str:
+    """Formata centavos como reais com duas casas decimais (ex.: 12345 -> "123.45")."""
+    sinal = "-" if centavos < 0 else ""
+    return sinal + "%d.%02d" % divmod(abs(centavos), 100)
+
+
+def efetuar_deposito(saldo: int, extrato: str, /) -> tuple[int, str, str]:
     """Processa um depósito e atualiza saldo/extrato após validar o valor.
 
     Args:
-        saldo (float): Saldo atual disponível para movimentações.
+        saldo (int): Saldo atual disponível para movimentações, em centavos.
         extrato (str): Histórico de transações em formato de string.
 
     Returns:
-        tuple[float, str, str]: Novo saldo, extrato atualizado e mensagem da operação.
+        tuple[int, str, str]: Novo saldo, extrato atualizado e mensagem da operação.
     """
     try:
-        valor = float(input("Informe o valor do depósito: "))
+        valor = converter_para_centavos(input("Informe o valor do depósito: "))
     except ValueError:
-        return saldo, extrato, "Operação falhou! O valor informado não é numérico."
+        return (
+            saldo,
+            extrato,
+            "Operação falhou! O valor informado não é numérico ou tem mais de duas "
+            "casas decimais.",
+        )
 
     if valor <= 0:
         return saldo, extrato, "Operação falhou! O valor informado é inválido."
 
     saldo += valor
     extrato += f"\nDepósito:"
-    str_deposito = f"R$ {valor:.2f}"
+    str_deposito = f"R$ {formatar_centavos(valor)}"
     extrato += f"{str_deposito:>31}"
     return saldo, extrato, "Depósito realizado com sucesso!"
 
 
 def efetuar_saque(
-    *, saldo: float, extrato: str, limite: float, numero_saques: int, limite_saques: int
-) -> tuple[float, str, int, str]:
+    *, saldo: int, extrato: str, limite: int, numero_saques: int, limite_saques: int
+) -> tuple[int, str, int, str]:
     """Realiza uma operação de saque, atualizando o saldo, o extrato e o número de saques.
 
     A função solicita ao usuário o valor do saque e executa validações relacionadas
@@ -74,14 +117,14 @@ def efetuar_saque(
     Em caso de sucesso, o valor é debitado e o extrato atualizado.
 
     Args:
-        saldo (float): Saldo atual da conta.
+        saldo (int): Saldo atual da conta, em centavos.
         extrato (str): Histórico de transações em formato de string.
-        limite (float): Valor máximo permitido por saque.
+        limite (int): Valor máximo permitido por saque, em centavos.
         numero_saques (int): Quantidade de saques já realizados no dia.
         limite_saques (int): Número máximo de saques permitidos por dia.
 
     Returns:
-        tuple[float, str, int, str]:
+        tuple[int, str, int, str]:
             - Novo saldo após a conclusão de saque.
             - Extrato atualizado com a transação (se bem-sucedida).
             - Número atualizado de saques realizados.
@@ -89,13 +132,14 @@ def efetuar_saque(
     """
 
     try:
-        valor = float(input("Informe o valor do saque: "))
+        valor = converter_para_centavos(input("Informe o valor do saque: "))
     except ValueError:
         return (
             saldo,
             extrato,
             numero_saques,
-            "Operação falhou! O valor informado não é numérico.",
+            "Operação falhou! O valor informado não é numérico ou tem mais de duas "
+            "casas decimais.",
         )
 
     msg = ""
@@ -111,7 +155,7 @@ def efetuar_saque(
     else:
         saldo -= valor
         extrato += f"\nSaque:"
-        str_saque = f"R$ {valor:.2f}"
+        str_saque = f"R$ {formatar_centavos(valor)}"
         extrato += f"{str_saque:>34}"
         numero_saques += 1
         msg = "Saque realizado com sucesso!"
@@ -119,11 +163,11 @@ def efetuar_saque(
     return saldo, extrato, numero_saques, msg
 
 
-def exibir_extrato(saldo: float, /, *, extrato: str) -> str:
+def exibir_extrato(saldo: int, /, *, extrato: str) -> str:
     """Monta e retorna o texto formatado do extrato e do saldo atual.
 
     Args:
-        saldo (float): Valor de saldo disponível que será mostrado ao final do extrato.
+        saldo (int): Saldo disponível (em centavos) mostrado ao final do extrato.
         extrato (str): Texto consolidado com as transações realizadas.
 
     Returns:
@@ -132,7 +176,7 @@ def exibir_extrato(saldo: float, /, *, extrato: str) -> str:
     msg = " EXTRATO ".center(40, "=")
     msg += "\nSem movimentações.\n" if not extrato else extrato
     msg += f"\n\n\nSaldo:"
-    str_saldo = f"R$ {saldo:.2f}"
+    str_saldo = f"R$ {formatar_centavos(saldo)}"
     msg += f"{str_saldo:>34}"
     msg += "\n" + "".center(40, "=") + "\n"
 
@@ -588,7 +632,7 @@ def main():
     # carregar_dados_mock(lista_usuarios, lista_contas)
 
     saldo = 0
-    valor_limite_saque = 500
+    valor_limite_saque = 500_00  # em centavos
     extrato = ""
     numero_saques = 0
     QTD_LIMITE_SAQUES = 3
@@ -0,0 +1,204 @@
+"""Alocação de números de conta corrente únicos em tempo constante.
+
+O número de uma conta tem o formato "12345-6": um corpo numérico, um hífen e um
+dígito verificador módulo 11, calculado sobre a agência e o corpo. Os corpos são
+entregues na ordem de uma permutação pseudoaleatória calculada sob demanda
+(rede de Feistel), de modo que cada novo número custa o mesmo tempo qualquer
+que seja a quantidade de contas já abertas, sem sorteios repetidos nem consulta
+às contas existentes.
+"""
+
+import random
+from collections.abc import Callable
+from itertools import cycle
+from operator import mul
+
+# Largura inicial do corpo do número da conta (sem o dígito verificador).
+DIGITOS_CONTA = 5
+
+# Pesos do módulo 11, aplicados da direita para a esquerda e repetidos em ciclo.
+_PESOS_MODULO_11 = (2, 3, 4, 5, 6, 7, 8, 9)
+
+# Converte os bytes ASCII "0" a "9" nos valores 0 a 9 (`bytes.translate`).
+_VALORES_DIGITOS = bytes.maketrans(b"0123456789", bytes(range(10)))
+
+
+def calcular_digito_verificador(agencia: str, corpo: str) -> str:
+    """Calcula o dígito verificador módulo 11 de uma conta.
+
+    Os dígitos da agência seguidos dos dígitos do corpo são multiplicados, da
+    direita para a esquerda, pelos pesos 2 a 9 (recomeçando após o 9). O dígito
+    é 11 menos o resto da soma por 11; os resultados 10 e 11 viram 0.
+
+    Args:
+        agencia (str): Código numérico da agência (ex.: "0001").
+        corpo (str): Corpo numérico do número da conta (ex.: "12345").
+
+    Returns:
+        str: Dígito verificador, de "0" a "9".
+    """
+    digitos = (agencia + corpo)[::-1].encode("ascii").translate(_VALORES_DIGITOS)
+    soma = sum(map(mul, digitos, cycle(_PESOS_MODULO_11)))
+    digito_verificador = 11 - soma % 11
+    return "0" if digito_verificador >= 10 else str(digito_verificador)
+
+
+def formatar_numero_conta(agencia: str, corpo: int, digitos: int) -> str:
+    """Formata o corpo com zeros à esquerda e acrescenta o dígito verificador."""
+    texto = f"{corpo:0{digitos}d}"
+    return f"{texto}-{calcular_digito_verificador(agencia, texto)}"
+
+
+def validar_numero_conta(agencia: str, numero_conta: str) -> bool:
+    """Indica se o número da conta é bem formado e válido para a agência.
+
+    Args:
+        agencia (str): Código numérico da agência.
+        numero_conta (str): Número no formato "12345-6".
+
+    Returns:
+        bool: True se o dígito verificador confere com a agência e o corpo.
+    """
+    corpo, separador, digito = numero_conta.rpartition("-")
+    return (
+        bool(separador)
+        and (agencia + corpo).isascii()
+        and agencia.isdigit()
+        and corpo.isdigit()
+        and calcular_digito_verificador(agencia, corpo) == digito
+    )
+
+
+class PermutacaoFeistel:
+    """Permutação pseudoaleatória de `range(tamanho)`, calculada sob demanda.
+
+    Uma rede de Feistel balanceada embaralha os inteiros de `[0, 4^k)`, a menor
+    potência de 4 que comporta `tamanho`; resultados fora do intervalo são
+    embaralhados de novo até caírem nele (*cycle walking*). Cada rodada é
+    inversível, então a rede é uma bijeção, e a restrição por *cycle walking*
+    também: índices distintos levam a valores distintos sem que seja preciso
+    guardar os valores já entregues. Como `4^k < 4 * tamanho`, cada consulta
+    percorre a rede, em média, menos de quatro vezes.
+
+    Attributes:
+        tamanho (int): Quantidade de valores permutados.
+    """
+
+    RODADAS = 4
+
+    def __init__(self, tamanho: int, semente: int | str) -> None:
+        self.tamanho = tamanho
+        self._bits = max(1, ((tamanho - 1).bit_length() + 1) // 2)
+        self._mascara = (1 << self._bits) - 1
+        gerador = random.Random(semente)
+        self._chaves = tuple(gerador.getrandbits(32) for _ in range(self.RODADAS))
+
+    def __call__(self, indice: int) -> int:
+        """Retorna o valor que ocupa a posição `indice` da permutação.
+
+        Raises:
+            IndexError: Se o índice estiver fora de `range(tamanho)`.
+        """
+        if not 0 <= indice < self.tamanho:
+            raise IndexError(f"Índice fora da permutação: {indice}")
+
+        valor = self._embaralhar(indice)
+        while valor >= self.tamanho:
+            valor = self._embaralhar(valor)
+        return valor
+
+    def _embaralhar(self, valor: int) -> int:
+        """Aplica as rodadas da rede de Feistel sobre `[0, 4^k)`."""
+        bits = self._bits
+        mascara = self._mascara
+        esquerda, direita = valor >> bits, valor & mascara
+        for chave in self._chaves:
+            esquerda, direita = direita, esquerda ^ (
+                ((direita ^ chave) * 0x9E3779B1 >> 15) & mascara
+            )
+        return esquerda << bits | direita
+
+
+class AlocadorContas:
+    """Entrega números de conta corrente únicos, em tempo constante.
+
+    O i-ésimo corpo entregue é o valor na posição i de uma `PermutacaoFeistel`
+    de `range(10^digitos)`: não se repete, não depende de sortear de novo em
+    caso de colisão e não exige consultar as contas existentes, por mais
+    ocupada que esteja a faixa de números. O corpo zero é pulado. Esgotados os
+    corpos de uma largura, o alocador passa à largura seguinte (um dígito a
+    mais), cujos números nunca coincidem com os anteriores.
+
+    Os corpos são únicos no banco inteiro, não apenas na agência, porque o menu
+    e o processamento em lote localizam a conta só pelo número. A agência entra
+    no dígito verificador: o número só é válido junto com a sua agência.
+
+    Attributes:
+        semente (int): Semente da permutação; a mesma semente reproduz a mesma
+            sequência de números.
+        digitos (int): Largura atual do corpo dos números.
+        alocados (int): Posições da permutação já percorridas na largura atual.
+    """
+
+    def __init__(self, digitos: int = DIGITOS_CONTA, semente: int | None = None):
+        self.semente = random.getrandbits(64) if semente is None else semente
+        self.digitos = digitos
+        self.alocados = 0
+        self._permutacao = self._criar_permutacao()
+
+    def _criar_permutacao(self) -> PermutacaoFeistel:
+        """Cria a permutação dos corpos da largura atual."""
+        return PermutacaoFeistel(10**self.digitos, f"{self.semente}:{self.digitos}")
+
+    @property
+    def capacidade(self) -> int:
+        """Quantidade de corpos da largura atual, incluindo os já entregues."""
+        return self._permutacao.tamanho
+
+    def posicionar(self, digitos: int, alocados: int) -> None:
+        """Retoma a sequência de números a partir de um estado salvo.
+
+        Args:
+            digitos (int): Largura do corpo dos números.
+            alocados (int): Posições da permutação já percorridas nessa largura.
+        """
+        if digitos != self.digitos:
+            self.digitos = digitos
+            self._permutacao = self._criar_permutacao()
+        self.alocados = alocados
+
+    def alocar(
+        self, agencia: str = "0001", em_uso: Callable[[str], bool] | None = None
+    ) -> str:
+        """Entrega o próximo número de conta, já com o dígito verificador.
+
+        Args:
+            agencia (str): Código numérico da agência da nova conta.
+            em_uso (Callable[[str], bool] | None): Consulta opcional de números
+                cadastrados por outro caminho (contas de exemplo ou importadas),
+                que são pulados. Como esses números são poucos, o custo médio
+                continua constante.
+
+        Returns:
+            str: Número da conta no formato "12345-6".
+
+        Raises:
+            ValueError: Se a agência não for numérica.
+        """
+        if not (agencia.isascii() and agencia.isdigit()):
+            raise ValueError(f"Agência inválida: {agencia!r}")
+
+        while True:
+            if self.alocados == self._permutacao.tamanho:
+                self.digitos += 1
+                self.alocados = 0
+                self._permutacao = self._criar_permutacao()
+
+            corpo = self._permutacao(self.alocados)
+            self.alocados += 1
+            if corpo == 0:
+                continue
+
+            numero = formatar_numero_conta(agencia, corpo, self.digitos)
+            if em_uso is None or not em_uso(numero):
+                return numero
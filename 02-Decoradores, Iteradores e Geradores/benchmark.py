@@ -0,0 +1,2499 @@
+"""Medições de desempenho das estruturas do sistema bancário.
+
+Execute a partir do diretório da atividade, por exemplo:
+
+    python benchmark.py busca_contas --tamanhos 1000 100000 1000000
+"""
+
+import argparse
+import asyncio
+import builtins
+import functools
+import hashlib
+import itertools
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from array import array
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, redirect_stdout
+from datetime import date, datetime, timedelta
+from fractions import Fraction
+from typing import Any
+
+from alocador import AlocadorContas
+from concorrencia import MotorConcorrente
+from dados_sinteticos import gerar_dados_sinteticos
+from desafio import (
+    efetuar_deposito,
+    efetuar_saque,
+    escrever_em_blocos,
+    formatar_extrato,
+    gerar_extrato,
+    iterar_listagem_usuarios,
+    iterar_transacoes,
+    listar_usuarios,
+    recuperar_conta,
+    registrar_log,
+)
+from dinheiro import converter_para_centavos, formatar_centavos
+from extratos_mensais import TAMANHO_PARTE, gerar_extratos_mensais, periodo_do_mes
+from fragmentos import TAMANHO_LOTE, RegistroFragmentado, aplicar_operacoes
+from layout import (
+    LARGURAS_BLOCO_USUARIO,
+    MODELO_BLOCO_USUARIO,
+    MODELO_LINHA_EXTRATO,
+    PREENCHIMENTO_ENDERECOS_2,
+)
+from livro_binario import migrar_para_livro_binario
+from livro_extrato import LivroExtrato, TipoTransacao, Transacao, formatar_instante
+from lote import TAMANHO_BUFFER, executar_lote, ler_operacoes_csv
+from monitoramento import (
+    DESTINO_NULO,
+    DestinoArquivoLote,
+    DestinoConsole,
+    DestinoMemoria,
+    HistogramaLatencia,
+    ativar_metricas,
+    configurar_log,
+    desativar_metricas,
+)
+from motor import (
+    ResultadoOperacao,
+    abrir_conta,
+    atualizar_extrato,
+    depositar,
+    gerar_conta_unica,
+    sacar,
+)
+from persistencia import ArmazenamentoBanco, gravar_snapshot
+from registro import RegistroBancario
+from registro_sqlite import RegistroSQLite
+from saques_diarios import ControleSaquesDiarios
+
+
+def formatar_numero_conta(indice: int) -> str:
+    """Converte um inteiro no formato de número de conta utilizado pelo sistema.
+
+    Args:
+        indice (int): Valor entre 0 e 999.999.
+
+    Returns:
+        str: Número de conta no formato "12345-6".
+    """
+    s = f"{indice:06}"
+    return f"{s[:5]}-{s[5:]}"
+
+
+def gerar_registro(quantidade_contas: int) -> RegistroBancario:
+    """Cria um registro com um usuário por conta e números de conta sequenciais.
+
+    Args:
+        quantidade_contas (int): Quantidade de contas (e usuários) a criar.
+
+    Returns:
+        RegistroBancario: Registro populado, pronto para as medições.
+    """
+    registro = RegistroBancario()
+    for i in range(quantidade_contas):
+        cpf = f"{i:011}"
+        registro.adicionar_usuario({"cpf": cpf, "nome_titular": f"Titular {i}"})
+        registro.adicionar_conta(
+            {
+                "agencia": "0001",
+                "numero_conta_corrente": formatar_numero_conta(i),
+                "cpf_titular": cpf,
+                "extrato": LivroExtrato(),
+                "saldo": 0,
+            }
+        )
+    return registro
+
+
+def existe_item(lista_items: list[dict], chave: str, valor) -> bool:
+    """Verifica, varrendo a lista, se algum item tem o valor na chave informada.
+
+    Comportamento anterior aos índices do registro, mantido como referência
+    das medições de busca linear.
+
+    Args:
+        lista_items (list[dict]): Lista de dicionários que será pesquisada.
+        chave (str): Nome da chave a ser verificada em cada item.
+        valor: Valor esperado associado à chave.
+
+    Returns:
+        bool: True se algum item corresponder ao critério, False caso contrário.
+    """
+    if not lista_items:
+        return False
+
+    return any(item.get(chave) == valor for item in lista_items)
+
+
+def medir(funcao: Callable[[], Any], repeticoes: int) -> float:
+    """Executa `funcao` repetidas vezes e retorna o tempo médio em nanossegundos."""
+    inicio = time.perf_counter_ns()
+    for _ in range(repeticoes):
+        funcao()
+    return (time.perf_counter_ns() - inicio) / repeticoes
+
+
+def benchmark_busca_contas(
+    tamanhos: list[int], repeticoes: int = 10_000, repeticoes_lineares: int = 20
+) -> list[dict[str, Any]]:
+    """Compara a busca linear nas listas com a busca pelos índices do registro.
+
+    Para cada tamanho são medidas a localização de uma conta pelo número e a
+    verificação de existência de um CPF, tanto varrendo a lista (comportamento
+    anterior de `recuperar_conta` e `existe_item`) quanto pelo índice.
+
+    Args:
+        tamanhos (list[int]): Quantidades de contas a medir (até 999.999).
+        repeticoes (int): Número de consultas pelo índice em cada medição.
+        repeticoes_lineares (int): Número de consultas por varredura em cada medição.
+
+    Returns:
+        list[dict[str, Any]]: Uma linha de resultado por tamanho, com os tempos
+            médios em nanossegundos.
+    """
+    resultados = []
+    for tamanho in tamanhos:
+        registro = gerar_registro(tamanho)
+        alvos = [
+            formatar_numero_conta(random.randrange(tamanho)) for _ in range(repeticoes)
+        ]
+        alvo_linear = formatar_numero_conta(tamanho - 1)
+        cpf_linear = f"{tamanho - 1:011}"
+        iterador_alvos = iter(alvos)
+
+        resultados.append(
+            {
+                "contas": tamanho,
+                "busca_indice_ns": medir(
+                    lambda: registro.buscar_conta(next(iterador_alvos)), repeticoes
+                ),
+                "existe_indice_ns": medir(
+                    lambda: registro.existe_usuario(cpf_linear), repeticoes
+                ),
+                "busca_linear_ns": medir(
+                    lambda: next(
+                        (
+                            conta
+                            for conta in registro.lista_contas
+                            if conta.get("numero_conta_corrente") == alvo_linear
+                        ),
+                        None,
+                    ),
+                    repeticoes_lineares,
+                ),
+                "existe_linear_ns": medir(
+                    lambda: any(
+                        usuario.get("cpf") == cpf_linear
+                        for usuario in registro.lista_usuarios
+                    ),
+                    repeticoes_lineares,
+                ),
+            }
+        )
+    return resultados
+
+
+def agrupar_contas_por_varredura(registro: RegistroBancario) -> int:
+    """Reproduz o agrupamento anterior de `listar_usuarios`, com duas varreduras
+    completas da lista de contas para cada usuário.
+
+    Returns:
+        int: Quantidade de contas encontradas, apenas para evitar otimizações.
+    """
+    encontradas = 0
+    for usuario in registro.lista_usuarios:
+        cpf = usuario.get("cpf")
+        if any(conta.get("cpf_titular") == cpf for conta in registro.lista_contas):
+            for conta in registro.lista_contas:
+                if conta.get("cpf_titular") == cpf:
+                    encontradas += 1
+    return encontradas
+
+
+def agrupar_contas_por_indice(registro: RegistroBancario) -> int:
+    """Agrupa as contas de cada usuário pelo índice por titular do registro.
+
+    Returns:
+        int: Quantidade de contas encontradas, apenas para evitar otimizações.
+    """
+    encontradas = 0
+    for usuario in registro.lista_usuarios:
+        for _ in registro.contas_do_titular(usuario.get("cpf")):
+            encontradas += 1
+    return encontradas
+
+
+def benchmark_listagem_titulares(tamanhos: list[int]) -> list[dict[str, Any]]:
+    """Compara o agrupamento de contas por titular usado em `listar_usuarios`.
+
+    Cada tamanho gera a mesma quantidade de usuários e de contas; a varredura é
+    O(usuários × contas) e o índice é O(usuários + contas). A medição cobre
+    apenas o agrupamento, sem a formatação do texto.
+
+    Args:
+        tamanhos (list[int]): Quantidades de usuários (e de contas) a medir.
+
+    Returns:
+        list[dict[str, Any]]: Uma linha de resultado por tamanho, com os tempos
+            totais em milissegundos.
+    """
+    resultados = []
+    for tamanho in tamanhos:
+        registro = gerar_registro(tamanho)
+        resultados.append(
+            {
+                "usuarios_x_contas": f"{tamanho}x{tamanho}",
+                "varredura_ms": medir(lambda: agrupar_contas_por_varredura(registro), 1)
+                / 1e6,
+                "indice_ms": medir(lambda: agrupar_contas_por_indice(registro), 1)
+                / 1e6,
+            }
+        )
+    return resultados
+
+
+class DestinoDescarte:
+    """Destino do tipo arquivo que descarta o conteúdo e registra a primeira escrita.
+
+    Attributes:
+        caracteres (int): Total de caracteres recebidos.
+        instante_primeira_escrita_ns (int | None): Valor de `perf_counter_ns` no
+            momento da primeira escrita.
+    """
+
+    def __init__(self) -> None:
+        self.caracteres = 0
+        self.instante_primeira_escrita_ns: int | None = None
+
+    def write(self, texto: str) -> int:
+        if self.instante_primeira_escrita_ns is None:
+            self.instante_primeira_escrita_ns = time.perf_counter_ns()
+        self.caracteres += len(texto)
+        return len(texto)
+
+    def flush(self) -> None:
+        pass
+
+
+def medir_listagem(
+    registro: RegistroBancario, streaming: bool
+) -> tuple[float, float, float]:
+    """Mede uma listagem completa de usuários escrita em um `DestinoDescarte`.
+
+    Args:
+        registro (RegistroBancario): Registro a listar.
+        streaming (bool): Se True, consome o gerador em lotes; caso contrário,
+            monta a string completa com `listar_usuarios` antes de escrever.
+
+    Returns:
+        tuple[float, float, float]: Tempo até o primeiro byte (ms), tempo total
+            (ms) e pico de memória alocada durante a listagem (KiB).
+    """
+    destino = DestinoDescarte()
+    tracemalloc.start()
+    inicio = time.perf_counter_ns()
+    if streaming:
+        escrever_em_blocos(iterar_listagem_usuarios(registro), destino)
+    else:
+        destino.write(listar_usuarios(registro))
+    fim = time.perf_counter_ns()
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return (
+        (destino.instante_primeira_escrita_ns - inicio) / 1e6,
+        (fim - inicio) / 1e6,
+        pico / 1024,
+    )
+
+
+def benchmark_listagem_streaming(tamanhos: list[int]) -> list[dict[str, Any]]:
+    """Compara a listagem de usuários montada em uma string com a versão em lotes.
+
+    Args:
+        tamanhos (list[int]): Quantidades de usuários (e de contas) a medir.
+
+    Returns:
+        list[dict[str, Any]]: Uma linha de resultado por tamanho, com tempo até o
+            primeiro byte, tempo total e pico de memória de cada estratégia.
+    """
+    resultados = []
+    for tamanho in tamanhos:
+        registro = gerar_registro(tamanho)
+        ttfb_string, total_string, pico_string = medir_listagem(registro, False)
+        ttfb_stream, total_stream, pico_stream = medir_listagem(registro, True)
+        resultados.append(
+            {
+                "usuarios": tamanho,
+                "string_ttfb_ms": ttfb_string,
+                "string_total_ms": total_string,
+                "string_pico_kib": pico_string,
+                "stream_ttfb_ms": ttfb_stream,
+                "stream_total_ms": total_stream,
+                "stream_pico_kib": pico_stream,
+            }
+        )
+    return resultados
+
+
+def formatar_linha_extrato_anterior(data: str, tipo: str, valor: float) -> str:
+    """Reproduz o formatador de linha anterior de `gerar_extrato`."""
+    valor_operacao = f"R$ +{valor:.2f}" if tipo == "Depósito" else f"R$ -{valor:.2f}"
+    valor_operacao = f"{valor_operacao:>21}"
+    msg = "\n"
+    msg += "-" * 70
+    msg += f"\n{data}"
+    msg += "|".center(10)
+    msg += tipo.upper().center(10)
+    msg += "|".center(10)
+    msg += valor_operacao
+    return msg
+
+
+def formatar_linha_extrato_modelo(data: str, tipo: str, valor: int) -> str:
+    """Formata a linha do extrato pelo modelo pré-compilado do módulo `layout`,
+    com o valor em centavos."""
+    sinal = "+" if tipo == "Depósito" else "-"
+    return MODELO_LINHA_EXTRATO % (
+        data,
+        tipo.upper().center(10),
+        f"R$ {sinal}{formatar_centavos(valor)}",
+    )
+
+
+def formatar_bloco_usuario_anterior(i: int, valores: tuple[str, ...]) -> str:
+    """Reproduz a montagem anterior da parte fixa do bloco de cada usuário."""
+    nome, cpf, data, logradouro, numero, bairro, cidade, uf, _ = valores
+    separador_tabela = "-" * 84
+    separador_secao_tabela = f"|{''.center(82)}|"
+    msg = f"\n\nUsuário #{i}"
+    msg += f"\n{separador_tabela}"
+    msg += f"\n|{'*INFORMAÇÕES CADASTRAIS*'.center(len(separador_tabela) - 2)}|"
+    msg += f"\n{separador_tabela}"
+    msg += (
+        f"\n|{'NOME'.center(41)}|{'CPF'.center(17)}|{'DATA DE NASCIMENTO'.center(22)}|"
+    )
+    msg += f"\n{separador_tabela}"
+    msg += f"\n|{nome.center(41)}|{cpf.center(17)}|{data.center(22)}|"
+    msg += f"\n{separador_tabela}"
+    msg += f"\n{separador_secao_tabela}"
+    msg += f"\n{separador_tabela}"
+    msg += f"\n|{'*ENDEREÇOS CADASTRADOS*'.center(len(separador_tabela) - 2)}|"
+    msg += f"\n{separador_tabela}"
+    msg += f"\n|{'LOGRADOURO'.center(40)}|{'NUMERO'.center(18)}|{'BAIRRO'.center(22)}|"
+    msg += f"\n{separador_tabela}"
+    msg += f"\n|{logradouro.center(40)}|{numero.center(18)}|{bairro.center(22)}|"
+    msg += f"\n{separador_tabela}"
+    msg += f"\n|{'CIDADE'.center(32)}|{'UF'.center(6)}|{''.center(42, '#')}|"
+    msg += f"\n{separador_tabela}"
+    msg += f"\n|{cidade.center(32)}|{uf.center(6)}|{''.center(42, '#')}|"
+    msg += f"\n{separador_tabela}"
+    msg += f"\n{separador_secao_tabela}"
+    msg += f"\n{separador_tabela}"
+    msg += f"\n|{'*DADOS BANCÁRIOS*'.center(len(separador_tabela) - 2)}|"
+    msg += f"\n{separador_tabela}"
+    return msg
+
+
+def formatar_bloco_usuario_modelo(i: int, valores: tuple[str, ...]) -> str:
+    """Formata a parte fixa do bloco de cada usuário pelo modelo pré-compilado."""
+    return MODELO_BLOCO_USUARIO % (
+        i,
+        *map(str.center, valores, LARGURAS_BLOCO_USUARIO),
+    )
+
+
+def benchmark_layout(linhas: int) -> list[dict[str, Any]]:
+    """Compara a vazão dos formatadores anteriores com os modelos pré-compilados.
+
+    No extrato, cada linha é uma transação; na listagem de usuários, cada linha
+    é a parte fixa do bloco de um usuário (dados cadastrais e endereço).
+
+    Args:
+        linhas (int): Quantidade de linhas renderizadas por formatador.
+
+    Returns:
+        list[dict[str, Any]]: Uma linha de resultado por relatório, com a vazão
+            em linhas por segundo de cada formatador.
+    """
+    argumentos_bloco_usuario = (
+        1,
+        (
+            "Sebastiana M. de Carvalho",
+            "01234567890",
+            "24-04-1964",
+            "Rua nova",
+            "1",
+            "Bairro Teste",
+            "Cidade teste",
+            "PE",
+            PREENCHIMENTO_ENDERECOS_2,
+        ),
+    )
+    casos = {
+        "extrato": (
+            formatar_linha_extrato_anterior,
+            formatar_linha_extrato_modelo,
+            ("2025-01-01 12:00:00", "Depósito", 1234.5),
+            ("2025-01-01 12:00:00", "Depósito", 123450),
+        ),
+        "listagem_usuarios": (
+            formatar_bloco_usuario_anterior,
+            formatar_bloco_usuario_modelo,
+            argumentos_bloco_usuario,
+            argumentos_bloco_usuario,
+        ),
+    }
+    resultados = []
+    for relatorio, (
+        anterior,
+        modelo,
+        argumentos_anterior,
+        argumentos_modelo,
+    ) in casos.items():
+        ns_anterior = medir(lambda: anterior(*argumentos_anterior), linhas)
+        ns_modelo = medir(lambda: modelo(*argumentos_modelo), linhas)
+        resultados.append(
+            {
+                "relatorio": relatorio,
+                "anterior_linhas_s": 1e9 / ns_anterior,
+                "modelo_linhas_s": 1e9 / ns_modelo,
+                "ganho": ns_anterior / ns_modelo,
+            }
+        )
+    return resultados
+
+
+def gerar_historico(quantidade: int, semente: int = 42) -> LivroExtrato:
+    """Cria um livro de extrato com depósitos e saques intercalados aleatoriamente.
+
+    A partir de 01/01/2024, cada transação ocorre de 1 segundo a 1 hora depois
+    da anterior: as datas são distintas e os dois tipos se intercalam no
+    tempo, como em um histórico real. Com o instante atual em todas, as datas
+    se repetiriam e as listas por tipo da consolidação anterior já chegariam
+    à ordenação praticamente em ordem.
+
+    Args:
+        quantidade (int): Quantidade de transações do histórico.
+        semente (int): Semente do sorteio de tipos, valores e intervalos.
+
+    Returns:
+        LivroExtrato: Livro preenchido por `atualizar_extrato`.
+    """
+    gerador = random.Random(semente)
+    extrato = LivroExtrato()
+    instante = int(datetime(2024, 1, 1).timestamp())
+    for _ in range(quantidade):
+        instante += gerador.randint(1, 3_600)
+        atualizar_extrato(
+            extrato=extrato,
+            operacao=gerador.choice(("deposito", "saque")),
+            valor=gerador.randint(1_00, 1_000_00),
+            instante=instante,
+        )
+    return extrato
+
+
+def transacao_como_dicionario(transacao: Transacao) -> dict[str, Any]:
+    """Converte uma transação no dicionário usado anteriormente pelo extrato."""
+    return {
+        "valor": transacao.valor,
+        "data": transacao.data,
+        "tipo": transacao.tipo.descricao,
+    }
+
+
+def ordenar_extrato_por_tipo(
+    extrato_por_tipo: dict[str, list[dict[str, Any]]], tipo_transacao: str
+) -> list[dict[str, Any]]:
+    """Reproduz a consolidação anterior de `gerar_extrato`: achata as listas por
+    tipo de operação, filtra e ordena por data a cada consulta."""
+    transacoes = [
+        transacao
+        for lista_transacoes in extrato_por_tipo.values()
+        for transacao in lista_transacoes
+        if not tipo_transacao or transacao.get("tipo") == tipo_transacao
+    ]
+    return sorted(transacoes, key=lambda transacao: transacao["data"])
+
+
+def benchmark_extrato_ordenado(tamanhos: list[int]) -> list[dict[str, Any]]:
+    """Compara a consolidação do extrato ordenada a cada consulta com a leitura
+    sequencial do livro cronológico.
+
+    Args:
+        tamanhos (list[int]): Quantidades de transações do histórico a medir.
+
+    Returns:
+        list[dict[str, Any]]: Uma linha de resultado por tamanho, com os tempos
+            em milissegundos do extrato completo e do filtrado por saques.
+    """
+    resultados = []
+    for tamanho in tamanhos:
+        extrato = gerar_historico(tamanho)
+        extrato_por_tipo: dict[str, list[dict[str, Any]]] = {}
+        for transacao in extrato.iterar():
+            extrato_por_tipo.setdefault(transacao.tipo.operacao, []).append(
+                transacao_como_dicionario(transacao)
+            )
+
+        resultados.append(
+            {
+                "transacoes": tamanho,
+                "ordenado_ms": medir(
+                    lambda: ordenar_extrato_por_tipo(extrato_por_tipo, ""), 3
+                )
+                / 1e6,
+                "livro_ms": medir(lambda: list(iterar_transacoes("", extrato)), 3)
+                / 1e6,
+                "ordenado_saques_ms": medir(
+                    lambda: ordenar_extrato_por_tipo(extrato_por_tipo, "Saque"), 3
+                )
+                / 1e6,
+                "livro_saques_ms": medir(
+                    lambda: list(iterar_transacoes("saque", extrato)), 3
+                )
+                / 1e6,
+            }
+        )
+    return resultados
+
+
+def benchmark_memoria_extrato(
+    tamanhos: list[int], limite_dicionarios: int = 1_000_000
+) -> list[dict[str, Any]]:
+    """Mede os bytes por transação do livro colunar e dos dicionários anteriores.
+
+    A memória é medida com `tracemalloc` durante o preenchimento. Como os
+    dicionários consomem dezenas de vezes mais memória, eles só são medidos até
+    `limite_dicionarios` transações.
+
+    Args:
+        tamanhos (list[int]): Quantidades de transações a medir.
+        limite_dicionarios (int): Maior quantidade medida com dicionários.
+
+    Returns:
+        list[dict[str, Any]]: Uma linha de resultado por tamanho, com os bytes
+            por transação de cada representação.
+    """
+    instante = int(time.time())
+    resultados = []
+    for tamanho in tamanhos:
+        tipos = (TipoTransacao.DEPOSITO, TipoTransacao.SAQUE)
+
+        tracemalloc.start()
+        extrato = LivroExtrato()
+        for i in range(tamanho):
+            extrato.registrar(tipos[i & 1], 100_00 + i, instante + i)
+        bytes_livro, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del extrato
+
+        bytes_dicionarios = None
+        if tamanho <= limite_dicionarios:
+            tracemalloc.start()
+            extrato_por_tipo: dict[str, list[dict[str, Any]]] = {}
+            for i in range(tamanho):
+                tipo = tipos[i & 1]
+                extrato_por_tipo.setdefault(tipo.operacao, []).append(
+                    {
+                        "valor": (100_00 + i) / 100,
+                        "data": formatar_instante(instante + i),
+                        "tipo": tipo.descricao,
+                    }
+                )
+            bytes_dicionarios, _ = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            del extrato_por_tipo
+
+        resultados.append(
+            {
+                "transacoes": tamanho,
+                "livro_bytes_tx": bytes_livro / tamanho,
+                "dict_bytes_tx": (
+                    bytes_dicionarios / tamanho if bytes_dicionarios else "-"
+                ),
+            }
+        )
+    return resultados
+
+
+def benchmark_dinheiro(operacoes: int, semente: int = 42) -> list[dict[str, Any]]:
+    """Compara a aritmética em centavos inteiros com a aritmética em `float`.
+
+    Aplica `operacoes` depósitos e saques aleatórios (valores com centavos) a um
+    saldo, uma vez acumulando inteiros de centavos e outra acumulando `float`
+    em reais, e mede também a conversão e a formatação dos valores.
+
+    Args:
+        operacoes (int): Quantidade de operações aleatórias.
+        semente (int): Semente do gerador aleatório, para resultados repetíveis.
+
+    Returns:
+        list[dict[str, Any]]: Vazão (operações por segundo) de cada etapa e o
+            saldo final de cada representação, com a diferença exata (em reais)
+            em relação ao total correto.
+    """
+    gerador = random.Random(semente)
+    centavos = [gerador.randint(-1_000_00, 1_000_00) for _ in range(operacoes)]
+    reais = [valor / 100 for valor in centavos]
+    textos = [formatar_centavos(valor) for valor in centavos[:1_000_000]]
+
+    def somar(valores: list) -> int | float:
+        saldo = 0
+        for valor in valores:
+            saldo += valor
+        return saldo
+
+    inicio = time.perf_counter_ns()
+    saldo_centavos = somar(centavos)
+    ns_centavos = time.perf_counter_ns() - inicio
+
+    inicio = time.perf_counter_ns()
+    saldo_float = somar(reais)
+    ns_float = time.perf_counter_ns() - inicio
+
+    ns_conversao = medir(lambda: [converter_para_centavos(t) for t in textos], 1)
+    ns_float_conversao = medir(lambda: [float(t) for t in textos], 1)
+    ns_formatacao = medir(
+        lambda: [formatar_centavos(v) for v in centavos[:1_000_000]], 1
+    )
+    ns_float_formatacao = medir(lambda: [f"{v:.2f}" for v in reais[:1_000_000]], 1)
+
+    return [
+        {
+            "representacao": "centavos (int)",
+            "soma_ops_s": operacoes * 1e9 / ns_centavos,
+            "conversao_ops_s": len(textos) * 1e9 / ns_conversao,
+            "formatacao_ops_s": len(textos) * 1e9 / ns_formatacao,
+            "saldo_final": formatar_centavos(saldo_centavos),
+            "erro_reais": "0",
+        },
+        {
+            "representacao": "reais (float)",
+            "soma_ops_s": operacoes * 1e9 / ns_float,
+            "conversao_ops_s": len(textos) * 1e9 / ns_float_conversao,
+            "formatacao_ops_s": len(textos) * 1e9 / ns_float_formatacao,
+            "saldo_final": repr(saldo_float),
+            "erro_reais": "%.3e"
+            % (Fraction(saldo_float) - Fraction(saldo_centavos, 100)),
+        },
+    ]
+
+
+def benchmark_motor(
+    operacoes: int, quantidade_contas: int, semente: int = 42
+) -> list[dict[str, Any]]:
+    """Mede a vazão do motor de transações chamado diretamente, sem console.
+
+    Gera antecipadamente `operacoes` depósitos e saques aleatórios distribuídos
+    entre as contas e os aplica com `depositar` e `sacar`, uma vez com o
+    instante atual obtido a cada operação e outra com um instante fixo (como
+    em uma carga em lote, em que o instante já vem informado).
+
+    Args:
+        operacoes (int): Quantidade de operações de cada execução.
+        quantidade_contas (int): Quantidade de contas que recebem as operações.
+        semente (int): Semente do gerador aleatório, para resultados repetíveis.
+
+    Returns:
+        list[dict[str, Any]]: Vazão (operações por segundo) e quantidade de
+            operações recusadas de cada execução.
+    """
+    gerador = random.Random(semente)
+    indices = [gerador.randrange(quantidade_contas) for _ in range(operacoes)]
+    depositos = [gerador.random() < 0.6 for _ in range(operacoes)]
+    valores = [gerador.randint(1_00, 1_000_00) for _ in range(operacoes)]
+    instante_fixo = int(time.time())
+
+    resultados = []
+    for descricao, instante in (
+        ("instante atual", None),
+        ("instante informado", instante_fixo),
+    ):
+        contas = gerar_registro(quantidade_contas).lista_contas
+        recusadas = 0
+
+        inicio = time.perf_counter_ns()
+        for indice, deposito, valor in zip(indices, depositos, valores):
+            conta = contas[indice]
+            if deposito:
+                resultado = depositar(conta, valor, instante=instante)
+            else:
+                resultado = sacar(
+                    conta,
+                    valor,
+                    limite=500_00,
+                    limite_saques=3,
+                    instante=instante,
+                )
+            if not resultado.sucesso:
+                recusadas += 1
+        decorrido_ns = time.perf_counter_ns() - inicio
+
+        resultados.append(
+            {
+                "execucao": descricao,
+                "operacoes": operacoes,
+                "ops_s": operacoes * 1e9 / decorrido_ns,
+                "ns_por_op": decorrido_ns / operacoes,
+                "recusadas": recusadas,
+            }
+        )
+    return resultados
+
+
+def benchmark_saques_diarios(
+    operacoes: int, quantidade_contas: int, semente: int = 42
+) -> list[dict[str, Any]]:
+    """Mede o custo dos contadores diários de saques no motor.
+
+    Aplica `operacoes` saques distribuídos entre as contas, ao longo de três
+    dias: sem contadores (quantidade informada por quem chama), com
+    `ControleSaquesDiarios` e com ele mais o limite de valor diário. Cada conta
+    começa com um histórico de saques, lido na primeira operação do dia.
+
+    Args:
+        operacoes (int): Quantidade de saques de cada execução.
+        quantidade_contas (int): Quantidade de contas movimentadas.
+        semente (int): Semente do gerador aleatório, para resultados repetíveis.
+
+    Returns:
+        list[dict[str, Any]]: Tempo por saque, recusas por limite e contas com
+            contador ao final.
+    """
+    gerador = random.Random(semente)
+    indices = [gerador.randrange(quantidade_contas) for _ in range(operacoes)]
+    instante_inicial = int(
+        datetime.combine(date.today(), datetime.min.time()).timestamp()
+    )
+    # Três dias de operações, em ordem cronológica.
+    passo = 3 * 86_400 // operacoes or 1
+    instantes = range(instante_inicial, instante_inicial + passo * operacoes, passo)
+
+    resultados = []
+    for descricao, parametros in (
+        ("sem contadores", {}),
+        ("contadores diarios", {"saques_diarios": True}),
+        (
+            "contadores + limite diario",
+            {"saques_diarios": True, "limite_diario": 500_00},
+        ),
+    ):
+        contas = gerar_registro(quantidade_contas).lista_contas
+        for conta in contas:
+            conta["saldo"] = 10**12
+            for valor in (10_00, 20_00):
+                sacar(
+                    conta,
+                    valor,
+                    limite=500_00,
+                    limite_saques=2,
+                    instante=instante_inicial - 1,
+                )
+        if parametros.get("saques_diarios"):
+            parametros = {**parametros, "saques_diarios": ControleSaquesDiarios()}
+        recusadas = 0
+
+        inicio = time.perf_counter_ns()
+        for indice, instante in zip(indices, instantes):
+            resultado = sacar(
+                contas[indice],
+                1_00,
+                limite=500_00,
+                limite_saques=3,
+                instante=instante,
+                **parametros,
+            )
+            if not resultado.sucesso:
+                recusadas += 1
+        decorrido_ns = time.perf_counter_ns() - inicio
+
+        controle = parametros.get("saques_diarios")
+        resultados.append(
+            {
+                "execucao": descricao,
+                "ns_por_op": decorrido_ns / operacoes,
+                "recusadas": recusadas,
+                "contadores": "" if controle is None else len(controle),
+            }
+        )
+    return resultados
+
+
+def benchmark_concorrencia(
+    quantidade_contas: int, threads: int, operacoes: int, semente: int = 42
+) -> list[dict[str, Any]]:
+    """Teste de carga concorrente: verifica a conservação exata dos saldos.
+
+    `threads` trabalhadores de um `ThreadPoolExecutor` aplicam, juntos,
+    `operacoes` depósitos e saques sobre contas sorteadas, sem travas (motor
+    chamado diretamente) e com `MotorConcorrente`. O intervalo de troca de
+    threads do interpretador é reduzido durante a medição, para que as
+    intercalações aconteçam com frequência.
+
+    Ao final, confere-se que a soma dos saldos é exatamente a soma inicial mais
+    os depósitos aceitos menos os saques aceitos, e que o saldo de cada conta é
+    o saldo inicial mais o movimento registrado no seu extrato.
+
+    Args:
+        quantidade_contas (int): Quantidade de contas movimentadas.
+        threads (int): Quantidade de threads.
+        operacoes (int): Total de operações, divididas entre as threads.
+        semente (int): Semente dos geradores aleatórios das threads.
+
+    Returns:
+        list[dict[str, Any]]: Vazão, contas com saldo divergente do extrato,
+            diferença da soma dos saldos e se os saldos foram conservados.
+    """
+    saldo_inicial = 1_000_00
+    por_thread = operacoes // threads
+    resultados = []
+    intervalo_original = sys.getswitchinterval()
+
+    for execucao in ("sem travas", "com travas"):
+        registro = gerar_registro(quantidade_contas)
+        numeros = [conta["numero_conta_corrente"] for conta in registro.lista_contas]
+        for conta in registro.lista_contas:
+            conta["saldo"] = saldo_inicial
+
+        if execucao == "com travas":
+            motor = MotorConcorrente(registro)
+            operar_deposito = motor.depositar
+            operar_saque = functools.partial(
+                motor.sacar, limite=500_00, limite_saques=1_000_000
+            )
+        else:
+            saques_diarios = ControleSaquesDiarios()
+
+            def operar_deposito(numero: str, valor: int) -> ResultadoOperacao:
+                return depositar(registro.buscar_conta(numero), valor)
+
+            def operar_saque(numero: str, valor: int) -> ResultadoOperacao:
+                return sacar(
+                    registro.buscar_conta(numero),
+                    valor,
+                    limite=500_00,
+                    limite_saques=1_000_000,
+                    saques_diarios=saques_diarios,
+                )
+
+        def trabalhar(indice: int) -> tuple[int, int]:
+            gerador = random.Random(semente + indice)
+            depositado = sacado = 0
+            for _ in range(por_thread):
+                numero = numeros[gerador.randrange(quantidade_contas)]
+                valor = gerador.randint(1_00, 100_00)
+                if gerador.random() < 0.5:
+                    if operar_deposito(numero, valor).sucesso:
+                        depositado += valor
+                elif operar_saque(numero, valor).sucesso:
+                    sacado += valor
+            return depositado, sacado
+
+        sys.setswitchinterval(1e-6)
+        try:
+            inicio = time.perf_counter_ns()
+            with ThreadPoolExecutor(max_workers=threads) as executor:
+                totais = list(executor.map(trabalhar, range(threads)))
+            decorrido_ns = time.perf_counter_ns() - inicio
+        finally:
+            sys.setswitchinterval(intervalo_original)
+
+        esperado = (
+            saldo_inicial * quantidade_contas
+            + sum(depositado for depositado, _ in totais)
+            - sum(sacado for _, sacado in totais)
+        )
+        soma = sum(conta["saldo"] for conta in registro.lista_contas)
+        divergentes = sum(
+            conta["saldo"] != saldo_inicial + conta["extrato"].agregados.movimento_ate()
+            for conta in registro.lista_contas
+        )
+        resultados.append(
+            {
+                "execucao": execucao,
+                "ops_s": por_thread * threads * 1e9 / decorrido_ns,
+                "contas_divergentes": divergentes,
+                "diferenca_centavos": soma - esperado,
+                "conservado": soma == esperado and not divergentes,
+            }
+        )
+    return resultados
+
+
+def benchmark_transferencias(
+    quantidade_contas: int,
+    threads: int,
+    transferencias: int,
+    tamanho_lote: int,
+    semente: int = 42,
+) -> list[dict[str, Any]]:
+    """Transferências concorrentes entre contas sorteadas, uma a uma e em lotes.
+
+    `threads` trabalhadores aplicam, juntos, `transferencias` transferências
+    por `MotorConcorrente`, chamando `transferir` a cada uma ou
+    `transferir_lote` a cada `tamanho_lote`. Os pares são sorteados nos dois
+    sentidos, de modo que threads diferentes disputam as mesmas contas em
+    ordens opostas: sem a ordenação das travas, a execução poderia travar.
+
+    Ao final, confere-se que a soma dos saldos não mudou e que o saldo de cada
+    conta é o saldo inicial mais o movimento registrado no seu extrato.
+
+    Args:
+        quantidade_contas (int): Quantidade de contas movimentadas.
+        threads (int): Quantidade de threads.
+        transferencias (int): Total de transferências, divididas entre as threads.
+        tamanho_lote (int): Transferências por chamada de `transferir_lote`.
+        semente (int): Semente dos geradores aleatórios das threads.
+
+    Returns:
+        list[dict[str, Any]]: Vazão, transferências aceitas, contas com saldo
+            divergente do extrato e se os saldos foram conservados.
+    """
+    saldo_inicial = 1_000_00
+    por_thread = transferencias // threads
+    resultados = []
+
+    for execucao in ("individual", "lote"):
+        registro = gerar_registro(quantidade_contas)
+        numeros = [conta["numero_conta_corrente"] for conta in registro.lista_contas]
+        for conta in registro.lista_contas:
+            conta["saldo"] = saldo_inicial
+        motor = MotorConcorrente(registro)
+
+        def trabalhar(indice: int) -> int:
+            gerador = random.Random(semente + indice)
+            pares = [
+                (
+                    numeros[gerador.randrange(quantidade_contas)],
+                    numeros[gerador.randrange(quantidade_contas)],
+                    gerador.randint(1_00, 100_00),
+                )
+                for _ in range(por_thread)
+            ]
+            if execucao == "individual":
+                aplicados = [motor.transferir(*par) for par in pares]
+            else:
+                aplicados = []
+                for inicio in range(0, por_thread, tamanho_lote):
+                    aplicados += motor.transferir_lote(
+                        pares[inicio : inicio + tamanho_lote]
+                    )
+            return sum(resultado.sucesso for resultado in aplicados)
+
+        inicio = time.perf_counter_ns()
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            aceitas = sum(executor.map(trabalhar, range(threads)))
+        decorrido_ns = time.perf_counter_ns() - inicio
+
+        soma = sum(conta["saldo"] for conta in registro.lista_contas)
+        divergentes = sum(
+            conta["saldo"] != saldo_inicial + conta["extrato"].agregados.movimento_ate()
+            for conta in registro.lista_contas
+        )
+        resultados.append(
+            {
+                "execucao": execucao,
+                "transferencias_s": por_thread * threads * 1e9 / decorrido_ns,
+                "aceitas": aceitas,
+                "contas_divergentes": divergentes,
+                "conservado": soma == saldo_inicial * quantidade_contas
+                and not divergentes,
+            }
+        )
+    return resultados
+
+
+def benchmark_fragmentos(
+    operacoes: int,
+    quantidade_contas: int,
+    fragmentos: list[int],
+    transferencias: int,
+    semente: int = 42,
+) -> list[dict[str, Any]]:
+    """Vazão de depósitos e saques em um processo e divididos em fragmentos.
+
+    As mesmas `operacoes` (60% depósitos) são aplicadas primeiro no processo
+    atual, por `aplicar_operacoes`, e depois por `RegistroFragmentado` com cada
+    quantidade de fragmentos. A coluna de CPU do processo principal mostra o
+    custo do roteador por operação, que limita a vazão máxima com muitos
+    núcleos; a aceleração só aparece com núcleos livres para os fragmentos.
+    Em seguida, `transferencias` transferências entre contas sorteadas (em sua
+    maioria entre fragmentos diferentes) são aplicadas em lotes, e confere-se que a soma dos saldos é exatamente a dos
+    depósitos menos a dos saques aceitos e que cada saldo bate com o extrato.
+
+    Args:
+        operacoes (int): Quantidade de depósitos e saques.
+        quantidade_contas (int): Quantidade de contas movimentadas.
+        fragmentos (list[int]): Quantidades de fragmentos (processos) a medir.
+        transferencias (int): Quantidade de transferências após as operações.
+        semente (int): Semente do gerador aleatório.
+
+    Returns:
+        list[dict[str, Any]]: Vazão, aceleração em relação ao processo único e
+            se os saldos foram conservados, por execução.
+    """
+    gerador = random.Random(semente)
+    numeros = [formatar_numero_conta(i) for i in range(quantidade_contas)]
+    lista_operacoes = [
+        (
+            "deposito" if gerador.random() < 0.6 else "saque",
+            numeros[gerador.randrange(quantidade_contas)],
+            gerador.randint(1_00, 500_00),
+        )
+        for _ in range(operacoes)
+    ]
+    lista_transferencias = [
+        (
+            numeros[gerador.randrange(quantidade_contas)],
+            numeros[gerador.randrange(quantidade_contas)],
+            gerador.randint(1_00, 100_00),
+        )
+        for _ in range(transferencias)
+    ]
+    instante = int(time.time())
+
+    def movimento(resultados: list[ResultadoOperacao]) -> int:
+        return sum(
+            valor if operacao == "deposito" else -valor
+            for (operacao, _, valor), resultado in zip(lista_operacoes, resultados)
+            if resultado.sucesso
+        )
+
+    registro = gerar_registro(quantidade_contas)
+    saques_diarios = ControleSaquesDiarios()
+    resultados_locais = []
+    inicio_cpu = time.process_time_ns()
+    inicio = time.perf_counter_ns()
+    for posicao in range(0, operacoes, TAMANHO_LOTE):
+        resultados_locais += aplicar_operacoes(
+            registro,
+            lista_operacoes[posicao : posicao + TAMANHO_LOTE],
+            limite=500_00,
+            limite_saques=1_000_000,
+            limite_diario=None,
+            saques_diarios=saques_diarios,
+            instante=instante,
+        )
+    base_ns = time.perf_counter_ns() - inicio
+    base_cpu_ns = time.process_time_ns() - inicio_cpu
+    esperado = movimento(resultados_locais)
+    resultados = [
+        {
+            "execucao": "processo único",
+            "fragmentos": 0,
+            "ops_s": operacoes * 1e9 / base_ns,
+            "aceleracao": 1.0,
+            "cpu_principal_us_op": base_cpu_ns / operacoes / 1_000,
+            "conservado": sum(c["saldo"] for c in registro.lista_contas) == esperado,
+        }
+    ]
+
+    for quantidade in fragmentos:
+        with RegistroFragmentado(
+            quantidade, limite=500_00, limite_saques=1_000_000
+        ) as fragmentado:
+            fragmentado.adicionar_contas(gerar_registro(quantidade_contas).lista_contas)
+            inicio_cpu = time.process_time_ns()
+            inicio = time.perf_counter_ns()
+            resultados_fragmentos = fragmentado.executar(
+                lista_operacoes, instante=instante
+            )
+            decorrido_ns = time.perf_counter_ns() - inicio
+            cpu_ns = time.process_time_ns() - inicio_cpu
+            for posicao in range(0, transferencias, TAMANHO_LOTE):
+                fragmentado.transferir_lote(
+                    lista_transferencias[posicao : posicao + TAMANHO_LOTE],
+                    instante=instante,
+                )
+            conferencia = fragmentado.conferir()
+
+        resultados.append(
+            {
+                "execucao": "fragmentado",
+                "fragmentos": quantidade,
+                "ops_s": operacoes * 1e9 / decorrido_ns,
+                "aceleracao": base_ns / decorrido_ns,
+                "cpu_principal_us_op": cpu_ns / operacoes / 1_000,
+                "conservado": sum(soma for _, soma, _ in conferencia)
+                == movimento(resultados_fragmentos)
+                and not any(divergentes for _, _, divergentes in conferencia),
+            }
+        )
+    return resultados
+
+
+def benchmark_extratos_mensais(
+    quantidade_usuarios: int,
+    transacoes_por_conta: float,
+    processos: list[int],
+    tamanhos_parte: list[int],
+    semente: int = 42,
+) -> list[dict[str, Any]]:
+    """Extratos de janeiro de 2024 de todas as contas, em um e em vários processos.
+
+    Os dados vêm de `gerar_dados_sinteticos`, cujos históricos começam em
+    2024. Os extratos são gravados primeiro no processo atual
+    (`processos=0`) e depois com cada quantidade de processos, sempre com o
+    mesmo número de arquivos, e confere-se que os arquivos são idênticos. Em
+    seguida, com o maior número de processos, cada tamanho de parte é medido.
+    A coluna de CPU do processo principal mostra o custo de recortar e enviar
+    as contas, que limita a aceleração com muitos núcleos; o pico de memória
+    do processo principal (`tracemalloc`, em uma execução à parte) acompanha
+    o tamanho das partes, não a quantidade de contas.
+
+    Args:
+        quantidade_usuarios (int): Usuários gerados (as contas são um pouco mais).
+        transacoes_por_conta (float): Média de operações por conta.
+        processos (list[int]): Quantidades de processos a medir.
+        tamanhos_parte (list[int]): Contas por parte a medir.
+        semente (int): Semente dos dados sintéticos.
+
+    Returns:
+        list[dict[str, Any]]: Vazão, aceleração, CPU e memória do processo
+            principal e se os arquivos conferem, por execução.
+    """
+    registro = RegistroBancario(alocador_contas=AlocadorContas(semente=semente))
+    gerar_dados_sinteticos(
+        registro,
+        quantidade_usuarios,
+        transacoes_por_conta=transacoes_por_conta,
+        semente=semente,
+    )
+    quantidade_contas = len(registro.lista_contas)
+    inicio, fim = periodo_do_mes("01-2024")
+    fragmentos = max(processos)
+
+    def executar(quantidade: int, tamanho_parte: int) -> dict[str, Any]:
+        with tempfile.TemporaryDirectory() as diretorio:
+            inicio_cpu = time.process_time_ns()
+            inicio_execucao = time.perf_counter_ns()
+            caminhos = gerar_extratos_mensais(
+                registro,
+                diretorio,
+                inicio,
+                fim,
+                processos=quantidade,
+                fragmentos=fragmentos,
+                tamanho_parte=tamanho_parte,
+            )
+            decorrido_ns = time.perf_counter_ns() - inicio_execucao
+            cpu_ns = time.process_time_ns() - inicio_cpu
+            resumo = hashlib.sha256()
+            for caminho in caminhos:
+                resumo.update(caminho.read_bytes())
+
+            tracemalloc.start()
+            gerar_extratos_mensais(
+                registro,
+                diretorio,
+                inicio,
+                fim,
+                processos=quantidade,
+                fragmentos=fragmentos,
+                tamanho_parte=tamanho_parte,
+            )
+            _, pico = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        return {
+            "processos": quantidade,
+            "tamanho_parte": tamanho_parte,
+            "contas_s": quantidade_contas * 1e9 / decorrido_ns,
+            "decorrido_ns": decorrido_ns,
+            "cpu_principal_us_conta": cpu_ns / quantidade_contas / 1_000,
+            "pico_principal_kib": pico / 1024,
+            "resumo": resumo.hexdigest(),
+        }
+
+    execucoes = [executar(0, TAMANHO_PARTE)]
+    execucoes += [executar(quantidade, TAMANHO_PARTE) for quantidade in processos]
+    execucoes += [
+        executar(fragmentos, tamanho)
+        for tamanho in tamanhos_parte
+        if tamanho != TAMANHO_PARTE
+    ]
+    base_ns = execucoes[0]["decorrido_ns"]
+    resumo_base = execucoes[0]["resumo"]
+    return [
+        {
+            "processos": execucao["processos"],
+            "tamanho_parte": execucao["tamanho_parte"],
+            "contas_s": execucao["contas_s"],
+            "aceleracao": base_ns / execucao["decorrido_ns"],
+            "cpu_principal_us_conta": execucao["cpu_principal_us_conta"],
+            "pico_principal_kib": execucao["pico_principal_kib"],
+            "identicos": execucao["resumo"] == resumo_base,
+        }
+        for execucao in execucoes
+    ]
+
+
+def iniciar_servidor_local(*argumentos: str) -> tuple[subprocess.Popen, int]:
+    """Inicia `servidor.py` em outro processo, em uma porta livre.
+
+    Returns:
+        tuple[subprocess.Popen, int]: Processo do servidor e porta em que ele
+            escuta, lida da linha que o servidor escreve ao começar.
+    """
+    processo = subprocess.Popen(
+        [sys.executable, "servidor.py", "--porta", "0", *argumentos],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    linha = processo.stdout.readline()
+    if not linha:
+        processo.wait()
+        raise RuntimeError("O servidor encerrou antes de começar a escutar.")
+    return processo, int(linha.rsplit(":", 1)[1])
+
+
+async def pedir_em_lote(
+    leitor: asyncio.StreamReader,
+    escritor: asyncio.StreamWriter,
+    pedidos: list[dict[str, Any]],
+) -> list[dict[str, Any]]:
+    """Envia vários pedidos de uma vez (pipeline) e lê as respostas, em ordem."""
+    escritor.write("".join(json.dumps(pedido) + "\n" for pedido in pedidos).encode())
+    await escritor.drain()
+    return [json.loads(await leitor.readline()) for _ in pedidos]
+
+
+async def gerar_carga_servidor(
+    porta: int,
+    conexoes: int,
+    requisicoes: int,
+    quantidade_contas: int,
+    semente: int = 42,
+) -> dict[str, Any]:
+    """Gera carga sobre o servidor local com várias conexões simultâneas.
+
+    Uma conexão de preparação cadastra um usuário, abre as contas e deposita o
+    saldo inicial. Em seguida, `conexoes` clientes abertos ao mesmo tempo fazem,
+    juntos, `requisicoes` pedidos, cada um esperando a resposta antes do
+    pedido seguinte: 45% depósitos, 45% saques e 10% extratos de 10 linhas em
+    contas sorteadas. A latência de cada pedido (do envio à resposta) vai para
+    um `HistogramaLatencia`.
+
+    Args:
+        porta (int): Porta do servidor em 127.0.0.1.
+        conexoes (int): Quantidade de conexões simultâneas.
+        requisicoes (int): Total de pedidos, divididos entre as conexões.
+        quantidade_contas (int): Quantidade de contas movimentadas.
+        semente (int): Semente dos geradores aleatórios dos clientes.
+
+    Returns:
+        dict[str, Any]: Vazão, percentis de latência e respostas com falha.
+    """
+    leitor, escritor = await asyncio.open_connection("127.0.0.1", porta)
+    cpf = "12345678901"
+    await pedir_em_lote(
+        leitor,
+        escritor,
+        [
+            {
+                "operacao": "cadastrar_usuario",
+                "cpf": cpf,
+                "nome_titular": "Carga",
+                "data_nascimento_titular": "01-01-1990",
+            }
+        ],
+    )
+    contas = await pedir_em_lote(
+        leitor,
+        escritor,
+        [{"operacao": "cadastrar_conta", "cpf": cpf}] * quantidade_contas,
+    )
+    numeros = [resposta["conta"] for resposta in contas]
+    await pedir_em_lote(
+        leitor,
+        escritor,
+        [
+            {"operacao": "depositar", "conta": numero, "valor": "1000.00"}
+            for numero in numeros
+        ],
+    )
+    escritor.close()
+
+    por_conexao = requisicoes // conexoes
+    histograma = HistogramaLatencia()
+    falhas = 0
+
+    async def cliente(
+        indice: int, leitor: asyncio.StreamReader, escritor: asyncio.StreamWriter
+    ) -> None:
+        nonlocal falhas
+        gerador = random.Random(semente + indice)
+        for _ in range(por_conexao):
+            numero = numeros[gerador.randrange(quantidade_contas)]
+            sorteio = gerador.random()
+            if sorteio < 0.45:
+                pedido = {"operacao": "depositar", "conta": numero, "valor": "10.00"}
+            elif sorteio < 0.9:
+                pedido = {"operacao": "sacar", "conta": numero, "valor": "10.00"}
+            else:
+                pedido = {"operacao": "extrato", "conta": numero, "limite": 10}
+            inicio = time.perf_counter_ns()
+            escritor.write((json.dumps(pedido) + "\n").encode())
+            await escritor.drain()
+            resposta = await leitor.readline()
+            histograma.registrar(time.perf_counter_ns() - inicio)
+            if not resposta.startswith(b'{"status"'):
+                falhas += 1
+        escritor.close()
+
+    abertas = await asyncio.gather(
+        *(asyncio.open_connection("127.0.0.1", porta) for _ in range(conexoes))
+    )
+    inicio = time.perf_counter_ns()
+    await asyncio.gather(*(cliente(i, *conexao) for i, conexao in enumerate(abertas)))
+    decorrido_ns = time.perf_counter_ns() - inicio
+
+    return {
+        "conexoes": conexoes,
+        "requisicoes_s": por_conexao * conexoes * 1e9 / decorrido_ns,
+        "p50_ms": histograma.percentil(50) / 1e6,
+        "p99_ms": histograma.percentil(99) / 1e6,
+        "p99_9_ms": histograma.percentil(99.9) / 1e6,
+        "maximo_ms": histograma.maximo / 1e6,
+        "falhas": falhas,
+    }
+
+
+def benchmark_servidor(
+    conexoes: list[int], requisicoes: int, quantidade_contas: int
+) -> list[dict[str, Any]]:
+    """Mede vazão e latência de cauda do servidor TCP com várias conexões.
+
+    Para cada quantidade de conexões, um servidor novo (`servidor.py`) é
+    iniciado em outro processo e recebe a carga de `gerar_carga_servidor`.
+    Cliente e servidor usam um núcleo cada.
+
+    Args:
+        conexoes (list[int]): Quantidades de conexões simultâneas.
+        requisicoes (int): Total de pedidos por medição.
+        quantidade_contas (int): Quantidade de contas movimentadas.
+
+    Returns:
+        list[dict[str, Any]]: Uma linha de resultados por quantidade de conexões.
+    """
+    resultados = []
+    for quantidade in conexoes:
+        processo, porta = iniciar_servidor_local("--limite-saques", "1000000000")
+        try:
+            resultados.append(
+                asyncio.run(
+                    gerar_carga_servidor(
+                        porta, quantidade, requisicoes, quantidade_contas
+                    )
+                )
+            )
+        finally:
+            processo.terminate()
+            processo.wait()
+    return resultados
+
+
+def gerar_arquivo_operacoes(
+    caminho: str, quantidade: int, quantidade_contas: int, semente: int = 42
+) -> None:
+    """Grava um CSV sintético de depósitos e saques para o processamento em lote.
+
+    Args:
+        caminho (str): Arquivo de destino.
+        quantidade (int): Quantidade de operações (linhas de dados).
+        quantidade_contas (int): Contas de `gerar_registro` que recebem as
+            operações.
+        semente (int): Semente do gerador aleatório, para arquivos repetíveis.
+    """
+    gerador = random.Random(semente)
+    with open(caminho, "w", encoding="utf-8", newline="") as arquivo:
+        arquivo.write("operacao,conta,valor\n")
+        for _ in range(quantidade):
+            arquivo.write(
+                "%s,%s,%s\n"
+                % (
+                    "deposito" if gerador.random() < 0.6 else "saque",
+                    formatar_numero_conta(gerador.randrange(quantidade_contas)),
+                    formatar_centavos(gerador.randint(1_00, 1_000_00)),
+                )
+            )
+
+
+def benchmark_lote(tamanhos: list[int], quantidade_contas: int) -> list[dict[str, Any]]:
+    """Mede o processamento em lote de arquivos CSV sintéticos.
+
+    Para cada tamanho, o arquivo é processado duas vezes: uma para medir a
+    vazão e outra, com `tracemalloc`, para medir a memória. A memória retida ao
+    final é o estado das contas (saldos e livros de extrato), que cresce com as
+    operações aplicadas; a memória transitória (pico menos retida) corresponde
+    à leitura, aplicação e escrita das linhas e deve ser constante.
+
+    Args:
+        tamanhos (list[int]): Quantidades de operações por arquivo.
+        quantidade_contas (int): Quantidade de contas movimentadas.
+
+    Returns:
+        list[dict[str, Any]]: Vazão, operações recusadas e memória de cada
+            tamanho.
+    """
+    resultados = []
+    with tempfile.TemporaryDirectory() as diretorio:
+        entrada = os.path.join(diretorio, "operacoes.csv")
+        for tamanho in tamanhos:
+            gerar_arquivo_operacoes(entrada, tamanho, quantidade_contas)
+
+            medicoes = []
+            for rastrear_memoria in (False, True):
+                registro = gerar_registro(quantidade_contas)
+                if rastrear_memoria:
+                    tracemalloc.start()
+                with (
+                    open(entrada, encoding="utf-8", newline="") as arquivo,
+                    open(os.devnull, "w", buffering=TAMANHO_BUFFER) as resultados_lote,
+                    open(os.devnull, "w", buffering=TAMANHO_BUFFER) as rejeicoes,
+                ):
+                    resumo = executar_lote(
+                        registro,
+                        ler_operacoes_csv(arquivo),
+                        resultados_lote,
+                        rejeicoes,
+                        limite=500_00,
+                        limite_saques=3,
+                    )
+                if rastrear_memoria:
+                    medicoes.append(tracemalloc.get_traced_memory())
+                    tracemalloc.stop()
+                else:
+                    medicoes.append(resumo)
+
+            resumo, (retida, pico) = medicoes
+            resultados.append(
+                {
+                    "operacoes": tamanho,
+                    "ops_s": resumo.operacoes_por_segundo,
+                    "rejeitadas": resumo.rejeitadas,
+                    "estado_kib": retida / 1024,
+                    "transitoria_kib": (pico - retida) / 1024,
+                }
+            )
+    return resultados
+
+
+def registrar_log_anterior(*, operacao: str) -> Callable[[Callable], Callable]:
+    """Versão anterior de `registrar_log`: dois `print` com `strftime` por chamada."""
+
+    def decorator(function: Callable) -> Callable:
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            print(
+                f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] Iniciando operação: {operacao}"
+            )
+            resultado = function(*args, **kwargs)
+            print(
+                f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] Operação concluída: {operacao}"
+            )
+            return resultado
+
+        return wrapper
+
+    return decorator
+
+
+def benchmark_log(chamadas: int) -> list[dict[str, Any]]:
+    """Mede o custo que `registrar_log` acrescenta a cada chamada decorada.
+
+    Uma função vazia é chamada sem decorador (referência) e decorada com a
+    versão anterior (com a saída padrão descartada), com cada destino de log e
+    com o destino nulo coletando os histogramas de latência.
+    O custo do log é a diferença entre o tempo da chamada decorada e o da
+    chamada sem decorador.
+
+    Args:
+        chamadas (int): Quantidade de chamadas medidas em cada configuração.
+
+    Returns:
+        list[dict[str, Any]]: Tempo médio por chamada e custo do log, em ns.
+    """
+
+    def operacao() -> None:
+        pass
+
+    referencia_ns = medir(operacao, chamadas)
+    decorada_anterior = registrar_log_anterior(operacao="medicao")(operacao)
+    decorada = registrar_log(operacao="medicao")(operacao)
+
+    resultados = [
+        {"configuracao": "sem decorador", "ns_chamada": referencia_ns, "custo_ns": 0.0}
+    ]
+    with tempfile.TemporaryDirectory() as diretorio:
+        with open(os.devnull, "w") as descarte, redirect_stdout(descarte):
+            configuracoes = [
+                ("anterior (print)", decorada_anterior, None, False),
+                ("console", decorada, DestinoConsole(), False),
+                ("memoria", decorada, DestinoMemoria(), False),
+                (
+                    "arquivo em lote",
+                    decorada,
+                    DestinoArquivoLote(os.path.join(diretorio, "eventos.jsonl")),
+                    False,
+                ),
+                ("nulo", decorada, DESTINO_NULO, False),
+                ("nulo + metricas", decorada, DESTINO_NULO, True),
+            ]
+            metricas_anteriores = desativar_metricas()
+            for descricao, funcao, destino, com_metricas in configuracoes:
+                anterior = configurar_log(destino) if destino else None
+                if com_metricas:
+                    ativar_metricas()
+                ns_chamada = medir(funcao, chamadas)
+                if com_metricas:
+                    desativar_metricas()
+                if destino:
+                    configurar_log(anterior)
+                    destino.fechar()
+                resultados.append(
+                    {
+                        "configuracao": descricao,
+                        "ns_chamada": ns_chamada,
+                        "custo_ns": ns_chamada - referencia_ns,
+                    }
+                )
+            if metricas_anteriores is not None:
+                ativar_metricas(metricas=metricas_anteriores)
+    return resultados
+
+
+def gerar_conta_unica_anterior(existe_conta: Callable[[str], bool]) -> str:
+    """Versão anterior de `gerar_conta_unica`: sorteia até achar um número livre."""
+    while True:
+        s = f"{random.randint(0, 999_999):06}"
+        if s == "000000":
+            continue
+        s = f"{s[:5]}-{s[5:]}"
+        if existe_conta(s):
+            continue
+        return s
+
+
+def benchmark_alocador(
+    ocupacoes: list[float], alocacoes: int = 2_000
+) -> list[dict[str, Any]]:
+    """Compara o sorteio com nova tentativa ao alocador por permutação.
+
+    Para cada taxa de ocupação da faixa de 999.999 números, mede o tempo médio
+    para obter um número livre pelo sorteio anterior (que tenta, em média,
+    `1 / (1 - ocupacao)` vezes) e pelo `AlocadorContas` de seis dígitos
+    posicionado na mesma ocupação. A ocupação fica fixa durante a medição.
+
+    Args:
+        ocupacoes (list[float]): Frações ocupadas da faixa (ex.: 0.99).
+        alocacoes (int): Números obtidos em cada medição.
+
+    Returns:
+        list[dict[str, Any]]: Tempo médio por número, em ns, de cada abordagem.
+    """
+    resultados = []
+    for ocupacao in ocupacoes:
+        quantidade = int(ocupacao * 999_999)
+        ocupados = {
+            formatar_numero_conta(i)
+            for i in random.sample(range(1, 1_000_000), quantidade)
+        }
+        em_uso = ocupados.__contains__
+
+        anterior_ns = medir(lambda: gerar_conta_unica_anterior(em_uso), alocacoes)
+
+        alocador = AlocadorContas(digitos=6)
+        alocador.alocados = min(quantidade, alocador.capacidade - alocacoes)
+        alocador_ns = medir(lambda: alocador.alocar("0001", em_uso), alocacoes)
+
+        resultados.append(
+            {
+                "ocupacao": f"{ocupacao:.2%}",
+                "anterior_ns": anterior_ns,
+                "alocador_ns": alocador_ns,
+                "aceleracao": anterior_ns / alocador_ns,
+            }
+        )
+    return resultados
+
+
+def benchmark_persistencia(
+    escalas: list[int], operacoes: int = 20_000, operacoes_fsync: int = 200
+) -> list[dict[str, Any]]:
+    """Mede a gravação do snapshot, a inicialização e o diário de operações.
+
+    Para cada escala (quantidade de usuários de `gerar_dados_sinteticos`), mede
+    a gravação do snapshot e a abertura do diretório de dados a partir dele; em
+    seguida, a vazão de depósitos com o diário sincronizado a cada 1.000
+    operações e a cada operação; por fim, a abertura com o diário a reaplicar.
+
+    Args:
+        escalas (list[int]): Quantidades de usuários.
+        operacoes (int): Depósitos registrados com sincronização em lote.
+        operacoes_fsync (int): Depósitos registrados com `fsync` a cada um.
+
+    Returns:
+        list[dict[str, Any]]: Tamanho do snapshot, tempos e vazões por escala.
+    """
+    resultados = []
+    for escala in escalas:
+        registro = RegistroBancario(alocador_contas=AlocadorContas(semente=42))
+        resumo = gerar_dados_sinteticos(registro, escala)
+
+        with tempfile.TemporaryDirectory() as diretorio:
+            armazenamento = ArmazenamentoBanco(diretorio)
+            inicio = time.perf_counter()
+            gravar_snapshot(registro, armazenamento.caminho_snapshot, 1)
+            gravacao_s = time.perf_counter() - inicio
+            del registro
+
+            inicio = time.perf_counter()
+            registro = armazenamento.abrir()
+            abertura_s = time.perf_counter() - inicio
+
+            vazoes = []
+            for quantidade, por_sincronizacao in (
+                (operacoes, 1_000),
+                (operacoes_fsync, 1),
+            ):
+                armazenamento.diario.registros_por_sincronizacao = por_sincronizacao
+                contas = itertools.cycle(registro.lista_contas)
+                inicio = time.perf_counter()
+                for _ in range(quantidade):
+                    depositar(next(contas), 1_00)
+                armazenamento.diario.sincronizar()
+                vazoes.append(quantidade / (time.perf_counter() - inicio))
+            armazenamento.fechar()
+            del registro
+
+            inicio = time.perf_counter()
+            armazenamento = ArmazenamentoBanco(diretorio)
+            armazenamento.abrir()
+            abertura_diario_s = time.perf_counter() - inicio
+            armazenamento.fechar()
+
+            resultados.append(
+                {
+                    "usuarios": escala,
+                    "contas": resumo.contas,
+                    "transacoes": resumo.transacoes,
+                    "snapshot_mib": os.path.getsize(armazenamento.caminho_snapshot)
+                    / 2**20,
+                    "gravacao_s": gravacao_s,
+                    "abertura_s": abertura_s,
+                    "diario_lote_ops_s": vazoes[0],
+                    "diario_fsync_ops_s": vazoes[1],
+                    "abertura_diario_s": abertura_diario_s,
+                }
+            )
+    return resultados
+
+
+def benchmark_sqlite(escalas: list[int]) -> list[dict[str, Any]]:
+    """Compara os caminhos do menu no registro em memória e no `RegistroSQLite`.
+
+    Para cada escala (quantidade de usuários de `gerar_dados_sinteticos`), os
+    dados são importados em um banco temporário (`executemany` em uma única
+    transação) e cada caminho é medido nos dois registros: busca de conta,
+    abertura de conta pelo motor, primeiro bloco da listagem de usuários,
+    extrato completo, uma página de 20 transações e depósito.
+
+    Args:
+        escalas (list[int]): Quantidades de usuários.
+
+    Returns:
+        list[dict[str, Any]]: Tempo médio por chamada, em ns, em cada registro.
+    """
+    resultados = []
+    for escala in escalas:
+        memoria = RegistroBancario(alocador_contas=AlocadorContas(semente=42))
+        gerar_dados_sinteticos(memoria, escala)
+        numeros = [
+            conta["numero_conta_corrente"]
+            for conta in random.Random(42).choices(memoria.lista_contas, k=1_000)
+        ]
+        # As contas abertas na medição vão para o último usuário, fora do
+        # primeiro bloco da listagem.
+        cpf = memoria.lista_usuarios[-1]["cpf"]
+
+        with tempfile.TemporaryDirectory() as diretorio:
+            banco = RegistroSQLite(os.path.join(diretorio, "banco.db"))
+            inicio = time.perf_counter()
+            banco.importar(memoria)
+            importacao_s = time.perf_counter() - inicio
+            resultados.append(
+                {
+                    "usuarios": escala,
+                    "caminho": "importacao (s)",
+                    "memoria_ns": "",
+                    "sqlite_ns": importacao_s,
+                }
+            )
+
+            for caminho, medicao in (
+                ("buscar_conta", lambda r, n: r.buscar_conta(n)),
+                ("abrir_conta", lambda r, n: abrir_conta(r, cpf=cpf)),
+                (
+                    "listagem (1o bloco)",
+                    lambda r, n: next(iterar_listagem_usuarios(r)),
+                ),
+                ("extrato completo", lambda r, n: formatar_extrato(r.buscar_conta(n))),
+                (
+                    "extrato (pagina de 20)",
+                    lambda r, n: list(
+                        r.buscar_conta(n)["extrato"].iterar(limite=20)
+                        if isinstance(r, RegistroSQLite)
+                        else itertools.islice(r.buscar_conta(n)["extrato"].iterar(), 20)
+                    ),
+                ),
+                ("depositar", lambda r, n: depositar(r.buscar_conta(n), 1_00)),
+            ):
+                linha = {"usuarios": escala, "caminho": caminho}
+                for coluna, registro in (("memoria_ns", memoria), ("sqlite_ns", banco)):
+                    alvos = itertools.cycle(numeros)
+                    linha[coluna] = medir_adaptativo(
+                        lambda: medicao(registro, next(alvos)), maximo=10_000
+                    )[0]
+                resultados.append(linha)
+            banco.fechar()
+    return resultados
+
+
+def gerar_livro_por_minuto(tamanho: int, gerador: random.Random) -> LivroExtrato:
+    """Cria um livro com uma transação por minuto, montado direto pelas colunas."""
+    return LivroExtrato.de_colunas(
+        array("q", (gerador.randint(1_00, 1_000_00) for _ in range(tamanho))),
+        array("q", range(1_700_000_000, 1_700_000_000 + 60 * tamanho, 60)),
+        array("B", (gerador.choice((1, 2)) for _ in range(tamanho))),
+    )
+
+
+def benchmark_livro_binario(tamanhos: list[int]) -> list[dict[str, Any]]:
+    """Compara consultas por faixa de datas no livro em memória e no binário.
+
+    Para cada tamanho, um histórico com uma transação por minuto é gravado em
+    um `LivroBinario` temporário. Mede-se a abertura do arquivo com a primeira
+    leitura e a consulta de uma faixa de 20 transações no meio do histórico e
+    da última página: percorrendo o livro em memória até a faixa (varredura) e
+    por busca binária no livro em memória e no arquivo mapeado.
+
+    Args:
+        tamanhos (list[int]): Quantidades de transações do histórico.
+
+    Returns:
+        list[dict[str, Any]]: Tempos médios por consulta, em microssegundos.
+    """
+    resultados = []
+    gerador = random.Random(42)
+    for tamanho in tamanhos:
+        livro = gerar_livro_por_minuto(tamanho, gerador)
+        conta = {"numero_conta_corrente": "12345-6", "extrato": livro}
+        meio = livro.instantes[tamanho // 2]
+        ultimo = livro.instantes[-1] + 1
+
+        with tempfile.TemporaryDirectory() as diretorio:
+            binario = migrar_para_livro_binario(conta, diretorio)
+            binario.fechar()
+            inicio = time.perf_counter_ns()
+            binario = type(binario)(binario.caminho, binario.conta_id)
+            next(binario.iterar(inicio=meio), None)
+            abertura_us = (time.perf_counter_ns() - inicio) / 1e3
+
+            for consulta, faixa in (
+                ("faixa de 20 (meio)", (meio, meio + 20 * 60)),
+                ("ultima pagina (20)", (ultimo - 20 * 60, ultimo)),
+            ):
+                linha = {"transacoes": tamanho, "consulta": consulta}
+                for coluna, medicao in (
+                    ("varredura_us", lambda: list(filtrar_faixa(livro, *faixa))),
+                    (
+                        "memoria_us",
+                        lambda: list(livro.iterar(inicio=faixa[0], fim=faixa[1])),
+                    ),
+                    (
+                        "binario_us",
+                        lambda: list(binario.iterar(inicio=faixa[0], fim=faixa[1])),
+                    ),
+                ):
+                    linha[coluna] = medir_adaptativo(medicao, maximo=1_000)[0] / 1e3
+                resultados.append(linha)
+            resultados.append(
+                {
+                    "transacoes": tamanho,
+                    "consulta": "abertura + 1a leitura",
+                    "varredura_us": "",
+                    "memoria_us": "",
+                    "binario_us": abertura_us,
+                }
+            )
+            binario.fechar()
+    return resultados
+
+
+def benchmark_extrato_paginado(tamanhos: list[int]) -> list[dict[str, Any]]:
+    """Mede `formatar_extrato` completo, por página e por período.
+
+    Para cada tamanho de histórico (uma transação por minuto), compara o
+    extrato completo com a última página de 20 transações, a mesma página
+    filtrada por saques e um período de um dia no meio do histórico.
+
+    Args:
+        tamanhos (list[int]): Quantidades de transações do histórico.
+
+    Returns:
+        list[dict[str, Any]]: Tempo médio por extrato, em milissegundos.
+    """
+    resultados = []
+    gerador = random.Random(42)
+    for tamanho in tamanhos:
+        conta = {"saldo": 0, "extrato": gerar_livro_por_minuto(tamanho, gerador)}
+        meio = conta["extrato"].instantes[tamanho // 2]
+        for consulta, filtros in (
+            ("completo", {}),
+            ("ultima pagina (20)", {"limite": 20, "deslocamento": tamanho - 20}),
+            (
+                "pagina de saques (20)",
+                {"tipo_transacao": "saque", "limite": 20, "deslocamento": 100},
+            ),
+            ("um dia (1440)", {"inicio": meio, "fim": meio + 86_400}),
+        ):
+            tempo_ns, _ = medir_adaptativo(
+                lambda: formatar_extrato(conta, **filtros), maximo=1_000
+            )
+            resultados.append(
+                {
+                    "transacoes": tamanho,
+                    "consulta": consulta,
+                    "tempo_ms": tempo_ns / 1e6,
+                }
+            )
+    return resultados
+
+
+def benchmark_agregados(tamanhos: list[int]) -> list[dict[str, Any]]:
+    """Compara consultas de totais e saldos por varredura e pelos agregados.
+
+    Para cada tamanho de histórico (uma transação por minuto), mede o total
+    depositado em um mês e o saldo ao fim de um dia, percorrendo o livro e
+    consultando `AgregadosExtrato`, além do custo de `registrar` com e sem
+    agregados e do cálculo inicial dos agregados a partir das colunas.
+
+    Args:
+        tamanhos (list[int]): Quantidades de transações do histórico.
+
+    Returns:
+        list[dict[str, Any]]: Tempo médio por consulta, em microssegundos.
+    """
+    resultados = []
+    gerador = random.Random(42)
+    for tamanho in tamanhos:
+        livro = gerar_livro_por_minuto(tamanho, gerador)
+        meio = date.fromtimestamp(livro.instantes[tamanho // 2])
+        inicio_mes = meio.replace(day=1)
+        fim_mes = (inicio_mes + timedelta(days=31)).replace(day=1) - timedelta(days=1)
+        limite_mes = (
+            datetime.combine(inicio_mes, datetime.min.time()).timestamp(),
+            datetime.combine(
+                fim_mes + timedelta(days=1), datetime.min.time()
+            ).timestamp(),
+        )
+        limite_dia = datetime.combine(
+            meio + timedelta(days=1), datetime.min.time()
+        ).timestamp()
+
+        inicio = time.perf_counter_ns()
+        agregados = livro.agregados
+        calculo_ms = (time.perf_counter_ns() - inicio) / 1e6
+
+        def depositos_do_mes() -> int:
+            return sum(
+                valor
+                for instante, codigo, valor in zip(
+                    livro.instantes, livro.tipos, livro.valores
+                )
+                if codigo == TipoTransacao.DEPOSITO
+                and limite_mes[0] <= instante < limite_mes[1]
+            )
+
+        def saldo_no_dia() -> int:
+            return sum(
+                TipoTransacao(codigo).sinal * valor
+                for instante, codigo, valor in zip(
+                    livro.instantes, livro.tipos, livro.valores
+                )
+                if instante < limite_dia
+            )
+
+        for consulta, varredura, consulta_agregados in (
+            (
+                "depositos do mes",
+                depositos_do_mes,
+                lambda: agregados.totais(TipoTransacao.DEPOSITO, inicio_mes, fim_mes),
+            ),
+            ("saldo no dia", saldo_no_dia, lambda: agregados.saldo_em(0, meio)),
+        ):
+            resultados.append(
+                {
+                    "transacoes": tamanho,
+                    "consulta": consulta,
+                    "varredura_us": medir_adaptativo(varredura, maximo=100)[0] / 1e3,
+                    "agregados_us": medir_adaptativo(consulta_agregados)[0] / 1e3,
+                }
+            )
+
+        instante = livro.instantes[-1]
+        sem_agregados = LivroExtrato()
+        resultados.append(
+            {
+                "transacoes": tamanho,
+                "consulta": "registrar",
+                "varredura_us": medir_adaptativo(
+                    lambda: sem_agregados.registrar(TipoTransacao.SAQUE, 1, instante)
+                )[0]
+                / 1e3,
+                "agregados_us": medir_adaptativo(
+                    lambda: livro.registrar(TipoTransacao.SAQUE, 1, instante)
+                )[0]
+                / 1e3,
+            }
+        )
+        resultados.append(
+            {
+                "transacoes": tamanho,
+                "consulta": "calculo inicial (ms)",
+                "varredura_us": "",
+                "agregados_us": calculo_ms,
+            }
+        )
+    return resultados
+
+
+def filtrar_faixa(extrato: LivroExtrato, inicio: int, fim: int) -> Iterator[Transacao]:
+    """Filtra a faixa de datas percorrendo o livro desde o início."""
+    return itertools.takewhile(
+        lambda transacao: transacao.instante < fim,
+        itertools.dropwhile(
+            lambda transacao: transacao.instante < inicio, extrato.iterar()
+        ),
+    )
+
+
+@contextmanager
+def entradas_simuladas(respostas: Iterable[str]) -> Iterator[None]:
+    """Substitui `input()` por respostas fixas, repetidas em ciclo, no bloco.
+
+    Permite medir as funções do menu, que leem os dados pelo console.
+    """
+    proxima = itertools.cycle(respostas).__next__
+    original = builtins.input
+    builtins.input = lambda *_: proxima()
+    try:
+        yield
+    finally:
+        builtins.input = original
+
+
+def medir_adaptativo(
+    funcao: Callable[[], Any], orcamento_ns: int = 200_000_000, maximo: int = 100_000
+) -> tuple[float, int]:
+    """Mede `funcao` repetindo-a até consumir aproximadamente o orçamento de tempo.
+
+    Returns:
+        tuple[float, int]: Tempo médio por chamada (ns) e quantidade de chamadas.
+    """
+    estimativa = max(medir(funcao, 1), 1)
+    repeticoes = int(min(maximo, max(1, orcamento_ns // estimativa)))
+    return medir(funcao, repeticoes), repeticoes
+
+
+def benchmark_suite(
+    escalas: list[int], semente: int, transacoes_por_conta: float
+) -> list[dict[str, Any]]:
+    """Mede os caminhos principais do sistema sobre dados sintéticos em escala.
+
+    Para cada escala (quantidade de usuários), gera os dados com
+    `gerar_dados_sinteticos` e mede: `recuperar_conta`, `existe_item`,
+    `gerar_conta_unica`, `listar_usuarios` (string completa até 100 mil
+    usuários e em fluxo para qualquer escala), `gerar_extrato`,
+    `efetuar_deposito` e `efetuar_saque` (com `input()` simulado) e as funções
+    `depositar` e `sacar` do motor. Contas e CPFs consultados são sorteados com
+    a mesma semente dos dados.
+
+    Args:
+        escalas (list[int]): Quantidades de usuários.
+        semente (int): Semente dos dados e dos sorteios.
+        transacoes_por_conta (float): Média de transações no histórico.
+
+    Returns:
+        list[dict[str, Any]]: Uma linha por escala e caminho medido, com o tempo
+            médio por chamada (ns) e a quantidade de chamadas.
+    """
+    resultados = []
+    for escala in escalas:
+        registro = RegistroBancario(alocador_contas=AlocadorContas(semente=semente))
+        inicio = time.perf_counter_ns()
+        resumo = gerar_dados_sinteticos(
+            registro,
+            escala,
+            transacoes_por_conta=transacoes_por_conta,
+            semente=semente,
+        )
+        resultados.append(
+            {
+                "escala": escala,
+                "operacao": "gerar_dados_sinteticos",
+                "ns_por_chamada": float(time.perf_counter_ns() - inicio),
+                "chamadas": 1,
+                "detalhes": f"{resumo.contas} contas, {resumo.transacoes} transações",
+            }
+        )
+
+        sorteio = random.Random(semente)
+        numeros = [
+            conta["numero_conta_corrente"]
+            for conta in sorteio.choices(registro.lista_contas, k=1_000)
+        ]
+        cpfs = itertools.cycle(
+            usuario["cpf"]
+            for usuario in sorteio.choices(registro.lista_usuarios, k=1_000)
+        )
+
+        saques_diarios = ControleSaquesDiarios()
+        medicoes: list[tuple[str, Iterable[str], Callable[[], Any]]] = [
+            ("recuperar_conta", numeros, lambda: recuperar_conta(registro)),
+            (
+                "existe_item",
+                (),
+                lambda: existe_item(registro.lista_usuarios, "cpf", next(cpfs)),
+            ),
+            ("gerar_conta_unica", (), lambda: gerar_conta_unica(registro)),
+            (
+                "listar_usuarios (fluxo)",
+                (),
+                lambda: escrever_em_blocos(
+                    iterar_listagem_usuarios(registro), DestinoDescarte()
+                ),
+            ),
+            (
+                "gerar_extrato",
+                [
+                    resposta
+                    for numero in numeros
+                    for resposta in (numero, "3", "", "", "")
+                ],
+                lambda: gerar_extrato(registro=registro),
+            ),
+            (
+                "efetuar_deposito",
+                [resposta for numero in numeros for resposta in (numero, "100.00")],
+                lambda: efetuar_deposito(registro),
+            ),
+            (
+                "efetuar_saque",
+                [resposta for numero in numeros for resposta in (numero, "1.00")],
+                lambda: efetuar_saque(
+                    limite=500_00,
+                    limite_saques=1_000_000,
+                    registro=registro,
+                    saques_diarios=saques_diarios,
+                ),
+            ),
+        ]
+        if escala <= 100_000:
+            medicoes.insert(
+                3, ("listar_usuarios", (), lambda: listar_usuarios(registro))
+            )
+
+        contas = itertools.cycle(registro.buscar_conta(numero) for numero in numeros)
+        medicoes += [
+            ("motor.depositar", (), lambda: depositar(next(contas), 100_00)),
+            (
+                "motor.sacar",
+                (),
+                lambda: sacar(next(contas), 1_00, limite=500_00, limite_saques=3),
+            ),
+        ]
+
+        for operacao, respostas, funcao in medicoes:
+            with entradas_simuladas(respostas or ("",)):
+                ns_por_chamada, chamadas = medir_adaptativo(funcao)
+            resultados.append(
+                {
+                    "escala": escala,
+                    "operacao": operacao,
+                    "ns_por_chamada": ns_por_chamada,
+                    "chamadas": chamadas,
+                    "detalhes": "",
+                }
+            )
+    return resultados
+
+
+def salvar_resultados_suite(
+    resultados: list[dict[str, Any]], caminho: str, parametros: dict[str, Any]
+) -> None:
+    """Grava os resultados da suíte em JSON, com os dados do ambiente."""
+    with open(caminho, "w", encoding="utf-8") as arquivo:
+        json.dump(
+            {
+                "metadados": {
+                    "data": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                    "python": platform.python_version(),
+                    "plataforma": platform.platform(),
+                    **parametros,
+                },
+                "resultados": resultados,
+            },
+            arquivo,
+            indent=2,
+            ensure_ascii=False,
+        )
+
+
+def comparar_resultados_suite(
+    resultados: list[dict[str, Any]], caminho_base: str
+) -> list[dict[str, Any]]:
+    """Acrescenta a cada resultado a razão em relação a uma execução anterior.
+
+    Args:
+        resultados (list[dict[str, Any]]): Resultados da execução atual.
+        caminho_base (str): JSON gravado por uma execução anterior da suíte.
+
+    Returns:
+        list[dict[str, Any]]: Os resultados com a coluna "razao_base" (tempo
+            atual / tempo anterior; abaixo de 1 indica melhora), vazia quando o
+            caminho não existe na base.
+    """
+    with open(caminho_base, encoding="utf-8") as arquivo:
+        base = {
+            (linha["escala"], linha["operacao"]): linha["ns_por_chamada"]
+            for linha in json.load(arquivo)["resultados"]
+        }
+    return [
+        {
+            **linha,
+            "razao_base": (
+                linha["ns_por_chamada"] / base[chave]
+                if (chave := (linha["escala"], linha["operacao"])) in base
+                else ""
+            ),
+        }
+        for linha in resultados
+    ]
+
+
+def exibir_tabela(resultados: list[dict[str, Any]]) -> None:
+    """Imprime os resultados de uma medição em formato de tabela."""
+    if not resultados:
+        return
+
+    colunas = list(resultados[0])
+    print(" | ".join(f"{coluna:>18}" for coluna in colunas))
+    print("-" * (21 * len(colunas) - 3))
+    for linha in resultados:
+        print(
+            " | ".join(
+                (
+                    f"{linha[coluna]:>18.1f}"
+                    if isinstance(linha[coluna], float)
+                    else f"{linha[coluna]:>18}"
+                )
+                for coluna in colunas
+            )
+        )
+
+
+def main() -> None:
+    """Interpreta os argumentos de linha de comando e executa a medição escolhida."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    subparsers = parser.add_subparsers(dest="medicao", required=True)
+
+    parser_busca = subparsers.add_parser(
+        "busca_contas", help="busca de contas e usuários: índice x varredura"
+    )
+    parser_busca.add_argument(
+        "--tamanhos",
+        type=int,
+        nargs="+",
+        default=[1_000, 10_000, 100_000, 999_999],
+    )
+    parser_busca.add_argument("--repeticoes", type=int, default=10_000)
+
+    parser_listagem = subparsers.add_parser(
+        "listagem_titulares",
+        help="agrupamento de contas por titular: índice x varredura",
+    )
+    parser_listagem.add_argument(
+        "--tamanhos", type=int, nargs="+", default=[100, 1_000, 10_000]
+    )
+
+    parser_streaming = subparsers.add_parser(
+        "listagem_streaming",
+        help="listagem de usuários: string completa x gerador em lotes",
+    )
+    parser_streaming.add_argument(
+        "--tamanhos", type=int, nargs="+", default=[1_000, 10_000, 100_000]
+    )
+
+    parser_layout = subparsers.add_parser(
+        "layout", help="vazão dos formatadores de relatório: anterior x modelo"
+    )
+    parser_layout.add_argument("--linhas", type=int, default=200_000)
+
+    parser_extrato = subparsers.add_parser(
+        "extrato_ordenado",
+        help="extrato: ordenação a cada consulta x livro cronológico",
+    )
+    parser_extrato.add_argument(
+        "--tamanhos", type=int, nargs="+", default=[1_000, 100_000, 1_000_000]
+    )
+
+    parser_memoria = subparsers.add_parser(
+        "memoria_extrato",
+        help="bytes por transação: livro colunar x dicionários",
+    )
+    parser_memoria.add_argument(
+        "--tamanhos", type=int, nargs="+", default=[100_000, 1_000_000, 10_000_000]
+    )
+
+    parser_dinheiro = subparsers.add_parser(
+        "dinheiro", help="aritmética monetária: centavos inteiros x float"
+    )
+    parser_dinheiro.add_argument("--operacoes", type=int, default=10_000_000)
+
+    parser_motor = subparsers.add_parser(
+        "motor", help="vazão de depositar/sacar chamados diretamente, sem console"
+    )
+    parser_motor.add_argument("--operacoes", type=int, default=1_000_000)
+    parser_motor.add_argument("--contas", type=int, default=10_000)
+
+    parser_lote = subparsers.add_parser(
+        "lote", help="processamento em lote de arquivos CSV sintéticos"
+    )
+    parser_lote.add_argument(
+        "--tamanhos", type=int, nargs="+", default=[10_000, 100_000, 1_000_000]
+    )
+    parser_lote.add_argument("--contas", type=int, default=10_000)
+
+    parser_log = subparsers.add_parser(
+        "log", help="custo do registrar_log por chamada, para cada destino"
+    )
+    parser_log.add_argument("--chamadas", type=int, default=1_000_000)
+
+    parser_alocador = subparsers.add_parser(
+        "alocador", help="alocação de números de conta em faixas quase cheias"
+    )
+    parser_alocador.add_argument(
+        "--ocupacoes", type=float, nargs="+", default=[0.5, 0.9, 0.99, 0.999]
+    )
+
+    parser_persistencia = subparsers.add_parser(
+        "persistencia", help="snapshot, inicialização e diário de operações"
+    )
+    parser_persistencia.add_argument(
+        "--usuarios", type=int, nargs="+", default=[10_000, 100_000]
+    )
+
+    parser_sqlite = subparsers.add_parser(
+        "sqlite", help="caminhos do menu no registro em memória e no SQLite"
+    )
+    parser_sqlite.add_argument(
+        "--usuarios", type=int, nargs="+", default=[10_000, 100_000]
+    )
+
+    parser_livro_binario = subparsers.add_parser(
+        "livro_binario", help="faixas de datas no livro em memória e no binário"
+    )
+    parser_livro_binario.add_argument(
+        "--tamanhos", type=int, nargs="+", default=[10_000, 1_000_000]
+    )
+
+    parser_extrato_paginado = subparsers.add_parser(
+        "extrato_paginado", help="extrato completo, por página e por período"
+    )
+    parser_extrato_paginado.add_argument(
+        "--tamanhos", type=int, nargs="+", default=[10_000, 1_000_000]
+    )
+
+    parser_agregados = subparsers.add_parser(
+        "agregados", help="totais e saldos por varredura e pelos agregados"
+    )
+    parser_agregados.add_argument(
+        "--tamanhos", type=int, nargs="+", default=[10_000, 1_000_000]
+    )
+
+    parser_saques_diarios = subparsers.add_parser(
+        "saques_diarios", help="contadores diários de saques por conta"
+    )
+    parser_saques_diarios.add_argument("--operacoes", type=int, default=300_000)
+    parser_saques_diarios.add_argument("--contas", type=int, default=10_000)
+
+    parser_concorrencia = subparsers.add_parser(
+        "concorrencia", help="teste de carga com threads e conservação dos saldos"
+    )
+    parser_concorrencia.add_argument("--contas", type=int, default=10_000)
+    parser_concorrencia.add_argument("--threads", type=int, default=32)
+    parser_concorrencia.add_argument("--operacoes", type=int, default=320_000)
+
+    parser_transferencias = subparsers.add_parser(
+        "transferencias", help="transferências concorrentes, uma a uma e em lotes"
+    )
+    parser_transferencias.add_argument("--contas", type=int, default=10_000)
+    parser_transferencias.add_argument("--threads", type=int, default=32)
+    parser_transferencias.add_argument("--transferencias", type=int, default=160_000)
+    parser_transferencias.add_argument("--lote", type=int, default=1_000)
+
+    parser_fragmentos = subparsers.add_parser(
+        "fragmentos", help="depósitos e saques divididos entre processos"
+    )
+    parser_fragmentos.add_argument("--operacoes", type=int, default=400_000)
+    parser_fragmentos.add_argument("--contas", type=int, default=10_000)
+    parser_fragmentos.add_argument(
+        "--fragmentos", type=int, nargs="+", default=[1, 2, 4]
+    )
+    parser_fragmentos.add_argument("--transferencias", type=int, default=100_000)
+
+    parser_extratos_mensais = subparsers.add_parser(
+        "extratos_mensais", help="extratos do mês de todas as contas em processos"
+    )
+    parser_extratos_mensais.add_argument("--usuarios", type=int, default=5_000)
+    parser_extratos_mensais.add_argument(
+        "--transacoes-por-conta", type=float, default=60.0
+    )
+    parser_extratos_mensais.add_argument(
+        "--processos", type=int, nargs="+", default=[1, 2, 4]
+    )
+    parser_extratos_mensais.add_argument(
+        "--tamanhos-parte", type=int, nargs="+", default=[50, 500, 5_000]
+    )
+
+    parser_servidor = subparsers.add_parser(
+        "servidor", help="vazão e latência do servidor TCP com muitas conexões"
+    )
+    parser_servidor.add_argument(
+        "--conexoes", type=int, nargs="+", default=[100, 1_000, 5_000]
+    )
+    parser_servidor.add_argument("--requisicoes", type=int, default=50_000)
+    parser_servidor.add_argument("--contas", type=int, default=1_000)
+
+    parser_suite = subparsers.add_parser(
+        "suite", help="caminhos principais sobre dados sintéticos em escala"
+    )
+    parser_suite.add_argument(
+        "--escalas", type=int, nargs="+", default=[1_000, 100_000]
+    )
+    parser_suite.add_argument("--semente", type=int, default=42)
+    parser_suite.add_argument("--transacoes-por-conta", type=float, default=5.0)
+    parser_suite.add_argument("--saida", default="resultados_suite.json")
+    parser_suite.add_argument(
+        "--comparar", metavar="BASE_JSON", help="resultados anteriores a comparar"
+    )
+
+    args = parser.parse_args()
+
+    match args.medicao:
+        case "busca_contas":
+            exibir_tabela(benchmark_busca_contas(args.tamanhos, args.repeticoes))
+        case "listagem_titulares":
+            exibir_tabela(benchmark_listagem_titulares(args.tamanhos))
+        case "listagem_streaming":
+            exibir_tabela(benchmark_listagem_streaming(args.tamanhos))
+        case "layout":
+            exibir_tabela(benchmark_layout(args.linhas))
+        case "extrato_ordenado":
+            exibir_tabela(benchmark_extrato_ordenado(args.tamanhos))
+        case "memoria_extrato":
+            exibir_tabela(benchmark_memoria_extrato(args.tamanhos))
+        case "dinheiro":
+            exibir_tabela(benchmark_dinheiro(args.operacoes))
+        case "motor":
+            exibir_tabela(benchmark_motor(args.operacoes, args.contas))
+        case "lote":
+            exibir_tabela(benchmark_lote(args.tamanhos, args.contas))
+        case "log":
+            exibir_tabela(benchmark_log(args.chamadas))
+        case "alocador":
+            exibir_tabela(benchmark_alocador(args.ocupacoes))
+        case "persistencia":
+            exibir_tabela(benchmark_persistencia(args.usuarios))
+        case "sqlite":
+            exibir_tabela(benchmark_sqlite(args.usuarios))
+        case "livro_binario":
+            exibir_tabela(benchmark_livro_binario(args.tamanhos))
+        case "extrato_paginado":
+            exibir_tabela(benchmark_extrato_paginado(args.tamanhos))
+        case "agregados":
+            exibir_tabela(benchmark_agregados(args.tamanhos))
+        case "saques_diarios":
+            exibir_tabela(benchmark_saques_diarios(args.operacoes, args.contas))
+        case "concorrencia":
+            resultados = benchmark_concorrencia(
+                args.contas, args.threads, args.operacoes
+            )
+            exibir_tabela(resultados)
+            if not resultados[-1]["conservado"]:
+                raise SystemExit("Saldos não conservados com travas!")
+        case "transferencias":
+            resultados = benchmark_transferencias(
+                args.contas, args.threads, args.transferencias, args.lote
+            )
+            exibir_tabela(resultados)
+            if not all(resultado["conservado"] for resultado in resultados):
+                raise SystemExit("Saldos não conservados nas transferências!")
+        case "fragmentos":
+            print(f"Núcleos disponíveis: {os.cpu_count()}")
+            resultados = benchmark_fragmentos(
+                args.operacoes, args.contas, args.fragmentos, args.transferencias
+            )
+            exibir_tabela(resultados)
+            if not all(resultado["conservado"] for resultado in resultados):
+                raise SystemExit("Saldos não conservados nos fragmentos!")
+        case "extratos_mensais":
+            print(f"Núcleos disponíveis: {os.cpu_count()}")
+            resultados = benchmark_extratos_mensais(
+                args.usuarios,
+                args.transacoes_por_conta,
+                args.processos,
+                args.tamanhos_parte,
+            )
+            exibir_tabela(resultados)
+            if not all(resultado["identicos"] for resultado in resultados):
+                raise SystemExit("Extratos diferentes entre as execuções!")
+        case "servidor":
+            exibir_tabela(
+                benchmark_servidor(args.conexoes, args.requisicoes, args.contas)
+            )
+        case "suite":
+            resultados = benchmark_suite(
+                args.escalas, args.semente, args.transacoes_por_conta
+            )
+            salvar_resultados_suite(
+                resultados,
+                args.saida,
+                {
+                    "escalas": args.escalas,
+                    "semente": args.semente,
+                    "transacoes_por_conta": args.transacoes_por_conta,
+                },
+            )
+            if args.comparar:
+                resultados = comparar_resultados_suite(resultados, args.comparar)
+            exibir_tabela(resultados)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+"""Operações concorrentes sobre as contas, com travas por conta (listradas).
+
+O motor de transações (`motor.py`) altera `conta["saldo"]` e o extrato no
+próprio dicionário da conta, sem sincronização: duas threads que movimentam a
+mesma conta ao mesmo tempo podem perder uma das atualizações. `MotorConcorrente`
+envolve as operações do motor em travas por conta, de modo que operações sobre
+contas diferentes seguem em paralelo (por exemplo, a partir de um
+`ThreadPoolExecutor` que atende vários caixas ou canais) e operações sobre a
+mesma conta são atômicas. Transferências adquirem as travas das duas contas,
+sempre na mesma ordem, e por isso não formam ciclos de espera (*deadlocks*).
+
+Em vez de uma trava por conta, que custaria um objeto por conta cadastrada, as
+contas são distribuídas entre um conjunto fixo de travas pelo hash do número
+(*lock striping*). Duas contas que caem na mesma listra apenas se esperam; o
+número de listras limita a memória e o paralelismo possível.
+
+O registro em memória (`RegistroBancario`) é usado sem travas nas consultas;
+cadastros de usuários e aberturas de conta passam por uma trava própria. O
+`RegistroSQLite` não é compartilhável entre threads (cada conexão pertence à
+thread que a criou).
+"""
+
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from typing import Any
+
+from motor import (
+    CONTA_INEXISTENTE,
+    ResultadoOperacao,
+    abrir_conta,
+    criar_usuario,
+    depositar,
+    sacar,
+    transferir,
+)
+from registro import RegistroBancario
+from saques_diarios import ControleSaquesDiarios
+
+# Quantidade padrão de listras: com 32 threads e contas sorteadas, cada
+# operação encontra sua listra ocupada por outra thread em cerca de 3% das vezes.
+LISTRAS_PADRAO = 1024
+
+
+class TravasContas:
+    """Conjunto fixo de travas, distribuídas entre as contas pelo número.
+
+    Attributes:
+        listras (int): Quantidade de travas.
+    """
+
+    __slots__ = ("listras", "_travas")
+
+    def __init__(self, listras: int = LISTRAS_PADRAO) -> None:
+        self.listras = listras
+        self._travas = tuple(threading.Lock() for _ in range(listras))
+
+    def trava(self, numero_conta: str) -> threading.Lock:
+        """Retorna a trava da listra da conta."""
+        return self._travas[hash(numero_conta) % self.listras]
+
+    @contextmanager
+    def travar(self, *numeros_conta: str) -> Iterator[None]:
+        """Adquire as travas de várias contas, sempre na ordem das listras.
+
+        Como todas as threads adquirem as travas na mesma ordem (crescente de
+        listra), duas operações que envolvem as mesmas contas nunca esperam
+        uma pela outra em ciclo. Listras repetidas são adquiridas uma só vez.
+        """
+        travas = [
+            self._travas[listra]
+            for listra in sorted(
+                {hash(numero) % self.listras for numero in numeros_conta}
+            )
+        ]
+        for trava in travas:
+            trava.acquire()
+        try:
+            yield
+        finally:
+            for trava in reversed(travas):
+                trava.release()
+
+
+class MotorConcorrente:
+    """Operações do motor de transações seguras para uso por várias threads.
+
+    Cada operação localiza a conta pelo número e aplica a função do motor com a
+    trava da conta adquirida. Os contadores diários de saques
+    (`ControleSaquesDiarios`) são compartilhados por todas as threads.
+
+    Attributes:
+        registro (RegistroBancario): Registro com as contas movimentadas.
+        travas (TravasContas): Travas por conta.
+        saques_diarios (ControleSaquesDiarios): Contadores diários de saques.
+    """
+
+    def __init__(
+        self,
+        registro: RegistroBancario,
+        *,
+        listras: int = LISTRAS_PADRAO,
+        saques_diarios: ControleSaquesDiarios | None = None,
+    ) -> None:
+        self.registro = registro
+        self.travas = TravasContas(listras)
+        self.saques_diarios = saques_diarios or ControleSaquesDiarios()
+        self._trava_registro = threading.Lock()
+
+    def depositar(
+        self, numero_conta: str, valor: int, *, instante: int | None = None
+    ) -> ResultadoOperacao:
+        """Deposita na conta informada (ver `motor.depositar`)."""
+        conta = self.registro.buscar_conta(numero_conta)
+        if conta is None:
+            return CONTA_INEXISTENTE
+        with self.travas.trava(numero_conta):
+            return depositar(conta, valor, instante=instante)
+
+    def sacar(
+        self,
+        numero_conta: str,
+        valor: int,
+        *,
+        limite: int,
+        limite_saques: int,
+        limite_diario: int | None = None,
+        instante: int | None = None,
+    ) -> ResultadoOperacao:
+        """Saca da conta informada, com os contadores diários compartilhados.
+
+        Ver `motor.sacar`.
+        """
+        conta = self.registro.buscar_conta(numero_conta)
+        if conta is None:
+            return CONTA_INEXISTENTE
+        with self.travas.trava(numero_conta):
+            return sacar(
+                conta,
+                valor,
+                limite=limite,
+                limite_saques=limite_saques,
+                limite_diario=limite_diario,
+                saques_diarios=self.saques_diarios,
+                instante=instante,
+            )
+
+    def transferir(
+        self,
+        numero_origem: str,
+        numero_destino: str,
+        valor: int,
+        *,
+        instante: int | None = None,
+    ) -> ResultadoOperacao:
+        """Transfere entre duas contas com as travas de ambas.
+
+        Ver `motor.transferir`.
+        """
+        origem = self.registro.buscar_conta(numero_origem)
+        destino = self.registro.buscar_conta(numero_destino)
+        if origem is None or destino is None:
+            return CONTA_INEXISTENTE
+        with self.travas.travar(numero_origem, numero_destino):
+            return transferir(origem, destino, valor, instante=instante)
+
+    def transferir_lote(
+        self,
+        transferencias: Iterable[tuple[str, str, int]],
+        *,
+        instante: int | None = None,
+    ) -> list[ResultadoOperacao]:
+        """Aplica várias transferências em uma chamada (ver `motor.transferir_lote`).
+
+        Cada transferência adquire apenas as travas das suas duas contas, de
+        modo que um lote grande não bloqueia as demais threads até terminar.
+        """
+        if instante is None:
+            instante = int(time.time())
+        transferir_contas = self.transferir
+        return [
+            transferir_contas(numero_origem, numero_destino, valor, instante=instante)
+            for numero_origem, numero_destino, valor in transferencias
+        ]
+
+    def saldo(self, numero_conta: str) -> int | None:
+        """Retorna o saldo da conta, lido com a trava da conta, ou None."""
+        conta = self.registro.buscar_conta(numero_conta)
+        if conta is None:
+            return None
+        with self.travas.trava(numero_conta):
+            return conta.get("saldo", 0)
+
+    def criar_usuario(self, **dados: Any) -> ResultadoOperacao:
+        """Cadastra um usuário (ver `motor.criar_usuario`)."""
+        with self._trava_registro:
+            return criar_usuario(self.registro, **dados)
+
+    def abrir_conta(self, *, cpf: str, agencia: str = "0001") -> ResultadoOperacao:
+        """Abre uma conta (ver `motor.abrir_conta`).
+
+        O alocador de números não é compartilhável e usa a trava do registro.
+        """
+        with self._trava_registro:
+            return abrir_conta(self.registro, cpf=cpf, agencia=agencia)
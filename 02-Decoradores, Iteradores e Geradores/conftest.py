@@ -0,0 +1,46 @@
+"""Fixtures compartilhadas pelos testes da atividade."""
+
+from datetime import datetime
+from typing import Any
+
+import pytest
+from livro_extrato import LivroExtrato
+from persistencia import configurar_diario
+from registro import RegistroBancario
+
+# Meio-dia (hora local) de 10/05/2025: instantes dos testes longe da virada do
+# dia, qualquer que seja o fuso da máquina.
+INSTANTE_BASE = int(datetime(2025, 5, 10, 12).timestamp())
+DIA = 86_400
+
+
+def nova_conta(numero: str, saldo: int = 0, agencia: str = "0001") -> dict[str, Any]:
+    """Conta vazia no formato usado pelo registro e pelo motor."""
+    return {
+        "agencia": agencia,
+        "numero_conta_corrente": numero,
+        "cpf_titular": f"{numero.replace('-', ''):0>11}",
+        "extrato": LivroExtrato(),
+        "saldo": saldo,
+    }
+
+
+@pytest.fixture(autouse=True)
+def sem_diario_ativo():
+    """Impede que um teste deixe um diário de operações ativo para o próximo."""
+    anterior = configurar_diario(None)
+    yield
+    configurar_diario(anterior)
+
+
+@pytest.fixture
+def registro() -> RegistroBancario:
+    """Registro com três contas vazias, uma por titular."""
+    registro = RegistroBancario()
+    for numero in ("00001-1", "00002-2", "00003-3"):
+        conta = nova_conta(numero)
+        registro.adicionar_usuario(
+            {"cpf": conta["cpf_titular"], "nome_titular": f"Titular {numero}"}
+        )
+        registro.adicionar_conta(conta)
+    return registro
@@ -0,0 +1,191 @@
+"""Geração de dados sintéticos em escala para medições e testes de carga.
+
+Amplia a ideia de `carregar_dados_mock` para milhares ou milhões de usuários:
+nomes, datas de nascimento e endereços são sorteados de listas fixas, a
+quantidade de contas por usuário segue uma distribuição fixa e cada conta
+recebe um histórico de depósitos e saques aplicado pelo motor de transações.
+Todos os sorteios usam um gerador com semente, de modo que a mesma semente e a
+mesma escala produzem exatamente os mesmos dados.
+"""
+
+import random
+from dataclasses import dataclass
+
+from livro_extrato import LivroExtrato
+from motor import depositar, gerar_conta_unica, sacar
+from registro import RegistroBancario
+
+# fmt: off
+PRIMEIROS_NOMES = (
+    "Ana", "Antônio", "Beatriz", "Carlos", "Fernanda", "Francisco", "Gabriela",
+    "João", "José", "Juliana", "Lucas", "Luiz", "Maria", "Mariana", "Paulo",
+    "Pedro", "Rafael", "Sebastiana", "Tereza", "Vitória",
+)
+SOBRENOMES = (
+    "Almeida", "Alves", "Barbosa", "Carvalho", "Costa", "Ferreira", "Gomes",
+    "Lima", "Martins", "Oliveira", "Pereira", "Ribeiro", "Rodrigues", "Santos",
+    "Silva", "Souza",
+)
+LOGRADOUROS = (
+    "Rua Nova", "Rua Velha", "Avenida Brasil", "Rua da Aurora", "Rua do Sol",
+    "Avenida Boa Viagem", "Rua das Flores", "Travessa São José",
+)
+BAIRROS = ("Centro", "Boa Vista", "Casa Amarela", "Graças", "Madalena", "Várzea")
+CIDADES_UF = (
+    ("Recife", "PE"), ("Olinda", "PE"), ("Caruaru", "PE"), ("Salvador", "BA"),
+    ("Fortaleza", "CE"), ("São Paulo", "SP"), ("Belo Horizonte", "MG"),
+)
+AGENCIAS = ("0001", "0002", "0003", "0004")
+# fmt: on
+
+# Distribuição da quantidade de contas por usuário: (quantidade, peso).
+DISTRIBUICAO_CONTAS = ((0, 10), (1, 60), (2, 25), (3, 5))
+
+# Início dos históricos (2024-01-01 00:00:00 UTC) e intervalo médio entre as
+# transações de uma conta, em segundos.
+INSTANTE_INICIAL = 1_704_067_200
+INTERVALO_MEDIO_TRANSACOES = 86_400
+
+# Multiplicador coprimo com 10^11: gera CPFs distintos e espalhados a partir do
+# índice do usuário, sem precisar guardar os já sorteados.
+_MULTIPLICADOR_CPF = 7_919
+
+
+@dataclass(slots=True)
+class ResumoDadosSinteticos:
+    """Quantidades geradas por `gerar_dados_sinteticos`.
+
+    Attributes:
+        usuarios (int): Usuários cadastrados.
+        contas (int): Contas abertas.
+        transacoes (int): Transações aplicadas com sucesso.
+    """
+
+    usuarios: int = 0
+    contas: int = 0
+    transacoes: int = 0
+
+
+def gerar_cpf(indice: int) -> str:
+    """CPF sintético (11 dígitos) único para cada índice de usuário."""
+    return f"{indice * _MULTIPLICADOR_CPF % 10**11:011d}"
+
+
+def gerar_dados_sinteticos(
+    registro: RegistroBancario,
+    quantidade_usuarios: int,
+    *,
+    transacoes_por_conta: float = 5.0,
+    semente: int = 42,
+) -> ResumoDadosSinteticos:
+    """Popula o registro com usuários, contas e históricos sintéticos.
+
+    Cada conta recebe em média `transacoes_por_conta` operações (distribuição
+    exponencial), 60% delas depósitos, com valores sorteados em escala
+    logarítmica (mediana em torno de R$ 150,00) e instantes crescentes a partir
+    de 2024. Saques acima do saldo ou do limite são recusados pelo motor, como
+    aconteceria no menu, e não entram no histórico.
+
+    As contas são distribuídas entre as `AGENCIAS` e numeradas pelo alocador do
+    registro; para números reproduzíveis, crie o registro com um alocador de
+    semente fixa (`RegistroBancario(alocador_contas=AlocadorContas(semente=...))`).
+
+    Args:
+        registro (RegistroBancario): Registro a popular.
+        quantidade_usuarios (int): Quantidade de usuários a gerar.
+        transacoes_por_conta (float): Média de operações por conta.
+        semente (int): Semente do gerador aleatório.
+
+    Returns:
+        ResumoDadosSinteticos: Quantidades efetivamente geradas.
+    """
+    gerador = random.Random(semente)
+    quantidades_contas, pesos_contas = zip(*DISTRIBUICAO_CONTAS)
+    contas_por_usuario = gerador.choices(
+        quantidades_contas, pesos_contas, k=quantidade_usuarios
+    )
+    resumo = ResumoDadosSinteticos()
+
+    for indice, quantidade_contas in enumerate(contas_por_usuario):
+        cpf = gerar_cpf(indice)
+        cidade, uf = gerador.choice(CIDADES_UF)
+        registro.adicionar_usuario(
+            {
+                "cpf": cpf,
+                "data_nascimento_titular": "%02d-%02d-%04d"
+                % (
+                    gerador.randint(1, 28),
+                    gerador.randint(1, 12),
+                    gerador.randint(1940, 2006),
+                ),
+                "nome_titular": "%s %s %s"
+                % (
+                    gerador.choice(PRIMEIROS_NOMES),
+                    gerador.choice(SOBRENOMES),
+                    gerador.choice(SOBRENOMES),
+                ),
+                "endereco": {
+                    "logradouro": gerador.choice(LOGRADOUROS),
+                    "numero": str(gerador.randint(1, 3_000)),
+                    "bairro": gerador.choice(BAIRROS),
+                    "cidade": cidade,
+                    "uf": uf,
+                },
+            }
+        )
+        resumo.usuarios += 1
+
+        for _ in range(quantidade_contas):
+            agencia = gerador.choice(AGENCIAS)
+            conta = {
+                "agencia": agencia,
+                "numero_conta_corrente": gerar_conta_unica(registro, agencia),
+                "cpf_titular": cpf,
+                "extrato": LivroExtrato(),
+                "saldo": 0,
+            }
+            registro.adicionar_conta(conta)
+            resumo.contas += 1
+            resumo.transacoes += gerar_historico_conta(
+                conta, gerador, transacoes_por_conta
+            )
+
+    return resumo
+
+
+def gerar_historico_conta(
+    conta: dict, gerador: random.Random, transacoes_por_conta: float
+) -> int:
+    """Aplica à conta um histórico sintético de depósitos e saques.
+
+    Args:
+        conta (dict): Conta que recebe as operações.
+        gerador (random.Random): Gerador aleatório compartilhado da geração.
+        transacoes_por_conta (float): Média de operações por conta.
+
+    Returns:
+        int: Quantidade de operações aplicadas com sucesso.
+    """
+    quantidade = int(gerador.expovariate(1 / transacoes_por_conta))
+    instante = INSTANTE_INICIAL + gerador.randrange(INTERVALO_MEDIO_TRANSACOES)
+    aplicadas = 0
+
+    for _ in range(quantidade):
+        instante += int(gerador.expovariate(1 / INTERVALO_MEDIO_TRANSACOES)) + 1
+        valor = max(1, int(gerador.lognormvariate(9.6, 1.2)))
+        if gerador.random() < 0.6:
+            resultado = depositar(conta, valor, instante=instante)
+        else:
+            # O histórico cobre vários dias: a contagem diária de saques não
+            # se acumula entre as operações sorteadas.
+            resultado = sacar(
+                conta,
+                valor,
+                limite=500_00,
+                numero_saques=0,
+                limite_saques=1,
+                instante=instante,
+            )
+        aplicadas += resultado.sucesso
+
+    return aplicadas
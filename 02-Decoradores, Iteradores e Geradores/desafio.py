@@ -1,30 +1,79 @@
+import argparse
 import functools
 import os
-import random
+import sys
 import textwrap
 import time
-from collections.abc import Callable, Iterator
-from datetime import datetime
-from operator import itemgetter
-from typing import Any
+from collections.abc import Callable, Iterable, Iterator
+from datetime import date
+from itertools import islice
+from typing import Any, TextIO
+
+from dinheiro import converter_para_centavos, formatar_centavos
+from layout import (
+    CABECALHO_CONTAS,
+    CABECALHO_EXTRATO,
+    LARGURAS_BLOCO_USUARIO,
+    LAYOUT_CONTAS,
+    MODELO_BLOCO_USUARIO,
+    MODELO_LINHA_CONTA,
+    MODELO_LINHA_EXTRATO,
+    MODELO_PAGINA_EXTRATO,
+    MODELO_RESUMO_EXTRATO,
+    MODELO_SALDO_EXTRATO,
+    PREENCHIMENTO_ENDERECOS_2,
+    SEM_CONTAS,
+)
+from livro_extrato import LivroExtrato, TipoTransacao, Transacao
+from monitoramento import (
+    DESTINO_NULO,
+    EventoLog,
+    ativar_perfil,
+    destino_log,
+    metricas_latencia,
+    perfilador_ativo,
+)
+from motor import (
+    CONTA_INEXISTENTE,
+    USUARIO_EXISTENTE,
+    abrir_conta,
+    converter_data_para_instante,
+    criar_usuario,
+    depositar,
+    sacar,
+    transferir,
+    validar_cpf,
+    validar_data,
+)
+from persistencia import ArmazenamentoBanco
+from registro import RegistroBancario
+from registro_sqlite import RegistroSQLite
+from saques_diarios import ControleSaquesDiarios
 
 
 def registrar_log(
     *, operacao: str
 ) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
-    """Fábrica de decoradores para registrar logs de início e fim de execução.
-
-    O decorador permite registrar no console informações sobre quando determinada
-    operação iniciou e terminou, incluindo data e hora. Ele não altera o retorno
-    da função decorada, apenas adiciona o comportamento de log.
+    """Fábrica de decoradores para registrar a execução de cada operação.
+
+    A cada chamada da função decorada é criado um `EventoLog` estruturado
+    (operação, início, duração e eventual exceção), entregue ao destino de log
+    configurado no módulo `monitoramento` (console, buffer em memória, arquivo
+    em lotes ou nulo). A formatação e a escrita ficam a cargo do destino, fora
+    do caminho da operação. Com a coleta de métricas ativa, a duração (medida
+    com `perf_counter_ns`) também é registrada no histograma de latência da
+    operação, e com o perfilamento ativo a execução é feita sob `cProfile` e
+    `tracemalloc` (ver `monitoramento.Perfilador`). Com o destino nulo, sem
+    métricas e sem perfilamento, a função é chamada diretamente, sem medição.
+    O decorador não altera o retorno da função decorada.
 
     Args:
-        operacao (str): Nome da operação a ser exibida nos logs.
+        operacao (str): Nome da operação a ser registrada nos eventos.
 
     Returns:
         Callable[[Callable[..., Any]], Callable[..., Any]]:
             Uma função decoradora que envolve a função original com um wrapper
-            responsável por imprimir os logs e repassar o retorno original.
+            responsável por medir a execução e repassar o retorno original.
     """
 
     def decorator(function: Callable[..., Any]) -> Callable[..., Any]:
@@ -32,14 +81,28 @@ def registrar_log(
         # Se não utilizar, quando chamar funcao.__name__ vai retornar "wrapper" e não o nome da função
         @functools.wraps(function)
         def wrapper(*args, **kwargs):
-            print(
-                f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] Iniciando operação: {operacao}"
-            )
-            resultado = function(*args, **kwargs)
-            print(
-                f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] Operação concluída: {operacao}"
-            )
-            return resultado
+            destino = destino_log()
+            metricas = metricas_latencia()
+            perfilador = perfilador_ativo()
+            if destino is DESTINO_NULO and metricas is None and perfilador is None:
+                return function(*args, **kwargs)
+
+            inicio_ns = time.time_ns()
+            inicio = time.perf_counter_ns()
+            erro = None
+            try:
+                if perfilador is not None:
+                    return perfilador.executar(operacao, function, *args, **kwargs)
+                return function(*args, **kwargs)
+            except BaseException as excecao:
+                erro = type(excecao).__name__
+                raise
+            finally:
+                duracao_ns = time.perf_counter_ns() - inicio
+                if metricas is not None:
+                    metricas.registrar(operacao, duracao_ns)
+                if destino is not DESTINO_NULO:
+                    destino.emitir(EventoLog(operacao, inicio_ns, duracao_ns, erro))
 
         return wrapper
 
@@ -65,8 +128,8 @@ def exibir_operacao_saque_console(
     """Executa a função de saque, exibe a mensagem de retorno e repassa o resultado.
 
     A função encapsula a chamada da função de saque, imprimindo apenas a
-    mensagem de feedback ao usuário e retornando a tupla completa com o número
-    de saques atualizado, a lista de contas e a mensagem de status.
+    mensagem de feedback ao usuário e retornando a tupla completa com a lista
+    de contas e a mensagem de status.
 
     Args:
         function (Callable[..., Any]): Função responsável por realizar a
@@ -75,12 +138,12 @@ def exibir_operacao_saque_console(
         **kwargs: Argumentos nomeados repassados para a função de saque.
 
     Returns:
-        tuple[Any, ...]: Tupla contendo o número de saques atualizado, a lista
-            de contas modificada (se aplicável) e a mensagem da operação.
+        tuple[Any, ...]: Tupla contendo a lista de contas modificada (se
+            aplicável) e a mensagem da operação.
     """
     resultado: tuple = function(*args, **kwargs)
     if resultado:
-        print(f"\n" + resultado[2])
+        print(f"\n" + resultado[1])
 
     return resultado
 
@@ -112,6 +175,29 @@ def exibir_operacao_deposito_console(
     return resultado
 
 
+@registrar_log(operacao="efetuar_transferencia")
+def exibir_operacao_transferencia_console(
+    function: Callable[..., Any], *args, **kwargs
+) -> tuple[Any, ...]:
+    """Executa a função de transferência, exibe a mensagem e repassa o resultado.
+
+    Args:
+        function (Callable[..., Any]): Função responsável por realizar a
+            transferência.
+        *args: Argumentos posicionais repassados para a função de transferência.
+        **kwargs: Argumentos nomeados repassados para a função de transferência.
+
+    Returns:
+        tuple[Any, ...]: Tupla contendo o registro (com as contas atualizadas,
+            se a transferência for efetuada) e a mensagem da operação.
+    """
+    resultado = function(*args, **kwargs)
+    if resultado:
+        print("\n" + resultado[1])
+
+    return resultado
+
+
 @registrar_log(operacao="listar_usuarios")
 def exibir_lista_usuarios_console(
     function: Callable[..., Any], *args, **kwargs
@@ -120,11 +206,16 @@ def exibir_lista_usuarios_console(
 
     A função é responsável por chamar a função de listagem, obtendo o texto
     formatado com os usuários e contas cadastradas, e imprimir o resultado no
-    console.
+    console. Quando a função de listagem devolve um gerador de blocos, o
+    conteúdo é transmitido ao console à medida que é produzido.
     """
     resultado = function(*args, **kwargs)
     if resultado:
-        print(f"\n" + resultado)
+        if isinstance(resultado, str):
+            resultado = (resultado,)
+        print()
+        escrever_em_blocos(resultado, sys.stdout)
+        print()
 
 
 @registrar_log(operacao="cadastrar_usuario")
@@ -202,8 +293,9 @@ def carregar_menu_principal() -> None:
         3. Listar Usuários Cadastrados
         4. Depositar
         5. Sacar
-        6. Extrato
-        7. Sair
+        6. Transferir
+        7. Extrato
+        8. Sair
 
      """
 
@@ -215,360 +307,417 @@ def exibir_subtitulo(subtitulo: str) -> None:
     print(subtitulo)
 
 
-def atualizar_extrato(
-    *, extrato: dict[str, list[dict[str, Any]]], operacao: str, valor: float
-) -> dict[str, list[dict[str, Any]]]:
-    """
-    Atualiza o extrato de uma conta adicionando um novo registro de operação.
-
-    Acrescenta ao dicionário `extrato` uma entrada na chave da operação
-    (por exemplo: "deposito", "saque"), contendo o valor, a data/hora no
-    formato "YYYY-MM-DD HH:MM:SS" e a descrição da operação.
-
-    Args:
-        extrato (dict[str, list[dict[str, Any]]]): Estrutura de extrato da conta,
-            onde cada chave é o tipo da operação e o valor é a lista de registros.
-        operacao (str): Identificador da operação (ex.: "deposito", "saque").
-        valor (float): Valor monetário movimentado (positivo).
-
-    Returns:
-        dict[str, list[dict[str, Any]]]: O dicionário de extrato atualizado.
-    """
-    extrato.setdefault(operacao, []).append(
-        {
-            "valor": valor,
-            "data": time.strftime("%Y-%m-%d %H:%M:%S"),
-            "tipo": {"deposito": "Depósito", "saque": "Saque"}.get(
-                operacao, operacao.title()
-            ),
-        }
-    )
-    return extrato
-
-
-def recuperar_conta(lista_contas: list[dict[str, Any]]) -> dict[str, Any] | str:
+def recuperar_conta(
+    registro: RegistroBancario,
+    pergunta: str = "Informe o número da conta com o dígito (ex: 12345-6): ",
+) -> dict[str, Any] | str:
     """Recupera uma conta bancária a partir do número informado pelo usuário.
 
     A função solicita ao usuário um número de conta no formato '12345-6', valida a
-    existência dessa conta dentro da lista fornecida e retorna:
+    existência dessa conta no índice do registro e retorna:
 
       • O dicionário completo da conta, caso ela exista.
       • Uma string contendo a mensagem de erro, caso a conta não seja encontrada
         ou caso não existam contas cadastradas.
 
     Args:
-        lista_contas (list[dict[str, Any]]): Lista contendo todas as contas cadastradas.
+        registro (RegistroBancario): Registro contendo todas as contas cadastradas.
+        pergunta (str): Texto exibido ao solicitar o número da conta.
 
     Returns:
         dict[str, Any] | str: O dicionário da conta encontrada ou uma mensagem de erro.
     """
 
-    if not lista_contas:
+    if not registro.lista_contas:
         return "Não existem contas cadastradas!"
 
-    numero_conta_corrente = str(
-        input("Informe o número da conta com o dígito (ex: 12345-6): ")
-    )
-    conta = next(
-        (
-            conta
-            for conta in lista_contas
-            if conta.get("numero_conta_corrente") == numero_conta_corrente
-        ),
-        None,
-    )
-    if not conta:
-        return "Operação falhou! A conta informada não existe!"
+    numero_conta_corrente = str(input(pergunta))
+    conta = registro.buscar_conta(numero_conta_corrente)
+    if conta is None:
+        return CONTA_INEXISTENTE.mensagem
 
     return conta
 
 
-def efetuar_deposito(
-    lista_contas: list[dict[str, Any]], /
-) -> tuple[list[dict[str, Any]], str]:
+def efetuar_deposito(registro: RegistroBancario, /) -> tuple[RegistroBancario, str]:
     """Efetua um depósito em uma conta e atualiza saldo e extrato.
 
-    Solicita ao usuário o número da conta e o valor do depósito, valida a
-    entrada e registra a movimentação no extrato da conta.
+    Solicita ao usuário o número da conta e o valor do depósito e repassa a
+    operação ao motor (`motor.depositar`), que valida o valor e registra a
+    movimentação no extrato da conta.
 
     Args:
-        lista_contas (list[dict[str, Any]]): Lista de contas que será atualizada.
+        registro (RegistroBancario): Registro com as contas que serão atualizadas.
 
     Returns:
-        tuple[list[dict[str, Any]], str]: A lista de contas (com a conta atualizada, se houver)
+        tuple[RegistroBancario, str]: O registro (com a conta atualizada, se houver)
             e uma mensagem indicando o resultado da operação.
     """
 
-    conta = recuperar_conta(lista_contas=lista_contas)
+    conta = recuperar_conta(registro=registro)
     if isinstance(conta, str):
-        return lista_contas, conta
+        return registro, conta
 
     try:
-        valor = float(input("\nInforme o valor do depósito: "))
+        valor = converter_para_centavos(input("\nInforme o valor do depósito: "))
     except ValueError:
         return (
-            lista_contas,
-            "Operação falhou! O valor informado não é numérico.",
+            registro,
+            "Operação falhou! O valor informado não é numérico "
+            "ou tem mais de duas casas decimais.",
         )
 
-    if valor <= 0:
-        return (
-            lista_contas,
-            "Operação falhou! O valor informado é inválido.",
-        )
-    saldo = conta.get("saldo", 0.0)
-    saldo = valor + saldo
-    conta["saldo"] = saldo
-    extrato: dict[str, list[dict[str, Any]]] = {}
-    extrato = conta.get("extrato", extrato)
-    conta["extrato"] = atualizar_extrato(
-        extrato=extrato, operacao="deposito", valor=valor
-    )
-
-    return lista_contas, "Depósito realizado com sucesso!"
+    return registro, depositar(conta, valor).mensagem
 
 
 def efetuar_saque(
     *,
-    limite: float,
-    numero_saques: int,
+    limite: int,
     limite_saques: int,
-    lista_contas: list[dict[str, Any]],
-) -> tuple[int, list[dict[str, Any]], str]:
+    registro: RegistroBancario,
+    saques_diarios: ControleSaquesDiarios,
+    limite_diario: int | None = None,
+) -> tuple[RegistroBancario, str]:
     """Efetua um saque em conta, validando limites e atualizando extrato.
 
-    Solicita o número da conta e o valor do saque e valida: saldo suficiente,
-    limite por operação e quantidade máxima diária de saques. Em caso de sucesso,
-    debita o valor, registra no extrato e incrementa o contador de saques.
+    Solicita o número da conta e o valor do saque e repassa a operação ao motor
+    (`motor.sacar`), que valida saldo suficiente, limite por operação e
+    quantidade máxima diária de saques da conta. Em caso de sucesso, o valor é
+    debitado e registrado no extrato, e o contador diário da conta é
+    atualizado.
 
     Args:
-        limite (float): Valor máximo permitido por operação.
-        numero_saques (int): Quantidade de saques já realizados no dia.
-        limite_saques (int): Limite diário de saques.
-        lista_contas (list[dict[str, Any]]): Lista de contas que será atualizada.
+        limite (int): Valor máximo permitido por operação, em centavos.
+        limite_saques (int): Limite diário de saques por conta.
+        registro (RegistroBancario): Registro com as contas que serão atualizadas.
+        saques_diarios (ControleSaquesDiarios): Contadores diários de saques.
+        limite_diario (int | None): Total máximo sacado por dia e conta, em
+            centavos; se None, apenas a quantidade é limitada.
 
     Returns:
-        tuple[int, list[dict[str, Any]], str]: Número de saques atualizado, lista de contas
-            (com a conta atualizada) e mensagem de resultado.
+        tuple[RegistroBancario, str]: Registro (com a conta atualizada) e
+            mensagem de resultado.
     """
 
-    conta = recuperar_conta(lista_contas=lista_contas)
+    conta = recuperar_conta(registro=registro)
     if isinstance(conta, str):
-        return numero_saques, lista_contas, conta
+        return registro, conta
 
     try:
-        valor = float(input("Informe o valor do saque: "))
+        valor = converter_para_centavos(input("Informe o valor do saque: "))
     except ValueError:
         return (
-            numero_saques,
-            lista_contas,
-            "Operação falhou! O valor informado não é numérico.",
-        )
-
-    saldo = float(conta.get("saldo", 0.0))
-    msg = ""
-
-    if valor <= 0:
-        msg = "Valor inválido!"
-    elif valor > saldo:
-        msg = "Operação falhou! Você não tem saldo suficiente."
-    elif valor > limite:
-        msg = "Operação falhou! O valor do saque excede o limite."
-    elif numero_saques >= limite_saques:
-        msg = "Operação falhou! Número máximo de saques excedido."
-    else:
-        saldo -= valor
-        extrato: dict[str, list[dict[str, Any]]] = {}
-        extrato = conta.get("extrato", extrato)
-        conta["extrato"] = atualizar_extrato(
-            extrato=extrato, operacao="saque", valor=valor
+            registro,
+            "Operação falhou! O valor informado não é numérico "
+            "ou tem mais de duas casas decimais.",
         )
-        conta["saldo"] = saldo
-        numero_saques += 1
-        msg = "Saque realizado com sucesso!"
 
-    return numero_saques, lista_contas, msg
+    resultado = sacar(
+        conta,
+        valor,
+        limite=limite,
+        limite_saques=limite_saques,
+        limite_diario=limite_diario,
+        saques_diarios=saques_diarios,
+    )
+    return registro, resultado.mensagem
 
 
-def iterar_extrato(
-    extrato: dict[str, list[dict[str, Any]]],
-) -> Iterator[list[dict[str, Any]]]:
-    """Itera sobre as listas de transações agrupadas no extrato.
+def efetuar_transferencia(
+    registro: RegistroBancario, /
+) -> tuple[RegistroBancario, str]:
+    """Efetua uma transferência entre duas contas e atualiza saldos e extratos.
 
-    Cada chave do dicionário de extrato representa um tipo de operação
-    (por exemplo, "deposito" ou "saque") e aponta para uma lista de
-    registros. Este gerador devolve cada uma dessas listas para que
-    outro gerador possa tratar os itens individualmente.
+    Solicita as contas de origem e de destino e o valor, e repassa a operação
+    ao motor (`motor.transferir`), que debita a origem e credita o destino de
+    uma só vez, registrando a operação nos dois extratos. A transferência não
+    conta como saque.
 
     Args:
-        extrato (dict[str, list[dict[str, Any]]]): Estrutura de extrato da conta,
-            agrupada por tipo de operação.
+        registro (RegistroBancario): Registro com as contas que serão atualizadas.
 
-    Yields:
-        list[dict[str, Any]]: Lista de registros de transações pertencentes
-            a um tipo específico de operação.
+    Returns:
+        tuple[RegistroBancario, str]: Registro (com as contas atualizadas) e
+            mensagem de resultado.
     """
-    for lista_transacoes in extrato.values():
-        yield lista_transacoes
 
+    origem = recuperar_conta(
+        registro, "Informe o número da conta de origem (ex: 12345-6): "
+    )
+    if isinstance(origem, str):
+        return registro, origem
+    destino = recuperar_conta(
+        registro, "Informe o número da conta de destino (ex: 12345-6): "
+    )
+    if isinstance(destino, str):
+        return registro, destino
+
+    try:
+        valor = converter_para_centavos(input("Informe o valor da transferência: "))
+    except ValueError:
+        return (
+            registro,
+            "Operação falhou! O valor informado não é numérico "
+            "ou tem mais de duas casas decimais.",
+        )
+
+    return registro, transferir(origem, destino, valor).mensagem
 
-def iterar_transacoes(
-    tipo_transacao: str, lista_transacoes: list[dict[str, Any]]
-) -> Iterator[dict[str, Any]]:
-    """Itera sobre uma lista de transações, aplicando um filtro opcional por tipo.
 
-    Se `tipo_transacao` for uma string não vazia, somente os registros cujo
-    campo "tipo" coincida com esse valor serão gerados. Caso contrário, todas
-    as transações da lista são devolvidas.
+def iterar_transacoes(
+    tipo_transacao: str,
+    extrato: LivroExtrato,
+    *,
+    inicio: int | None = None,
+    fim: int | None = None,
+    limite: int | None = None,
+    deslocamento: int = 0,
+) -> Iterator[Transacao]:
+    """Itera sobre as transações do extrato, aplicando filtros opcionais.
+
+    Se `tipo_transacao` for uma string não vazia, somente os registros dessa
+    operação são gerados, lidos diretamente do índice por tipo do livro. Caso
+    contrário, todas as transações são devolvidas. Em ambos os casos a ordem é
+    cronológica, sem necessidade de ordenação. O período e a página são
+    localizados pelo próprio livro, por busca binária na ordem cronológica.
 
     Args:
-        tipo_transacao (str): Descrição do tipo de transação a filtrar
-            (por exemplo, "Depósito" ou "Saque"). Se vazio, nenhuma filtragem
-            é aplicada.
-        lista_transacoes (list[dict[str, Any]]): Lista de transações a ser
-            percorrida.
+        tipo_transacao (str): Operação a filtrar (por exemplo, "deposito" ou
+            "saque"). Se vazio, nenhuma filtragem é aplicada.
+        extrato (LivroExtrato): Livro de transações da conta.
+        inicio (int | None): Instante mínimo (inclusive), em segundos.
+        fim (int | None): Instante máximo (exclusive), em segundos.
+        limite (int | None): Quantidade máxima de transações.
+        deslocamento (int): Transações a pular antes da primeira.
 
     Yields:
-        dict[str, Any]: Registro individual de transação que atende ao filtro.
+        Transacao: Registro individual de transação que atende aos filtros.
     """
-    for transacao in lista_transacoes:
-        if not tipo_transacao or transacao.get("tipo") == tipo_transacao:
-            yield transacao
+    yield from extrato.iterar(
+        TipoTransacao.de_operacao(tipo_transacao) if tipo_transacao else None,
+        inicio=inicio,
+        fim=fim,
+        limite=limite,
+        deslocamento=deslocamento,
+    )
 
 
 def recuperar_tipo_transacao() -> str:
     """Obtém, via input, o tipo de transação desejado para filtragem do extrato.
 
-    O usuário pode escolher visualizar apenas depósitos, apenas saques ou
-    todas as movimentações. O valor retornado é utilizado pelos geradores
-    de transações para aplicar (ou não) o filtro.
+    O usuário pode escolher visualizar apenas depósitos, apenas saques, apenas
+    transferências enviadas ou recebidas, ou todas as movimentações. O valor
+    retornado é utilizado pelos geradores de transações para aplicar (ou não)
+    o filtro.
 
     Returns:
-        str: "Depósito" para a opção 1, "Saque" para a opção 2 ou string
-            vazia quando o relatório completo for solicitado.
+        str: "deposito" para a opção 1, "saque" para a opção 2, string vazia
+            quando o relatório completo for solicitado (opção 3),
+            "transferencia_enviada" para a opção 4 e "transferencia_recebida"
+            para a opção 5.
     """
-    opcoes = {"1": "Depósito", "2": "Saque", "3": ""}
+    opcoes = {
+        "1": "deposito",
+        "2": "saque",
+        "3": "",
+        "4": "transferencia_enviada",
+        "5": "transferencia_recebida",
+    }
 
     while True:
         tipo_transacao = input(
             "Digite 1 para exibir apenas transações de depósito, "
-            "2 para exibir apenas transações de saque e 3 para gerar o relatório completo: "
+            "2 para exibir apenas transações de saque, 3 para gerar o relatório "
+            "completo, 4 para transferências enviadas e 5 para recebidas: "
         )
         if tipo_transacao in opcoes:
             return opcoes[tipo_transacao]
 
 
-def gerar_extrato(*, lista_contas: list[dict[str, Any]]) -> str:
-    """Gera o extrato textual da conta selecionada.
+def formatar_extrato(
+    conta: dict[str, Any],
+    tipo_transacao: str = "",
+    *,
+    inicio: int | None = None,
+    fim: int | None = None,
+    limite: int | None = None,
+    deslocamento: int = 0,
+) -> str:
+    """Monta o texto do extrato de uma conta, sem interação com o console.
 
-    Solicita o número da conta, consolida os registros do extrato por tipo de
-    operação, ordena por data/hora e monta uma string formatada com as
-    movimentações e o saldo atual.
+    Lê os registros do livro de extrato (já em ordem de data/hora),
+    opcionalmente filtrados por tipo de operação e período, e monta uma string
+    formatada com as movimentações e o saldo atual. Com `limite`, apenas uma
+    página é montada; o rodapé indica o deslocamento da página seguinte
+    (cursor), quando houver.
 
     Args:
-        lista_contas (list[dict]): Lista de contas onde o extrato será consultado.
+        conta (dict[str, Any]): Conta cujo extrato será exibido.
+        tipo_transacao (str): Operação a filtrar (ex.: "deposito" ou "saque"); se
+            vazio, todas as movimentações são incluídas.
+        inicio (int | None): Instante mínimo (inclusive), em segundos.
+        fim (int | None): Instante máximo (exclusive), em segundos.
+        limite (int | None): Transações por página; se None, todas.
+        deslocamento (int): Transações do período a pular antes da página.
 
     Returns:
-        str: Texto do extrato ou mensagem de erro quando a conta não existe.
+        str: Texto do extrato.
     """
-
-    conta = recuperar_conta(lista_contas=lista_contas)
-    if isinstance(conta, str):
-        return conta
-
-    tipo_transacao = recuperar_tipo_transacao()
-
-    extrato_completo: list[dict[str, Any]] = []
     extrato = conta.get("extrato")
-    msg = " EXTRATO ".center(70, "=")
+    partes_msg = [CABECALHO_EXTRATO]
+    exibidas = 0
+    ha_mais = False
     if not extrato:
-        msg += "\nSem movimentações.\n"
+        partes_msg.append("\nSem movimentações.\n")
     else:
-        for lista_transacoes in iterar_extrato(extrato):
-            for registro in iterar_transacoes(
-                tipo_transacao=tipo_transacao, lista_transacoes=lista_transacoes
-            ):
-                extrato_completo.append(registro)
-
-        extrato_completo = sorted(extrato_completo, key=itemgetter("data"))
-
-        for registro in extrato_completo:
-            data_registro = f"\n{registro.get('data')}"
-            tipo_operacao_registro = f"{registro.get('tipo')}"
-            valor_operacao = (
-                f"R$ +{registro.get('valor'):.2f}"
-                if tipo_operacao_registro == "Depósito"
-                else f"R$ -{registro.get('valor'):.2f}"
+        # Uma transação além da página indica se há página seguinte.
+        for transacao in iterar_transacoes(
+            tipo_transacao=tipo_transacao,
+            extrato=extrato,
+            inicio=inicio,
+            fim=fim,
+            limite=None if limite is None else limite + 1,
+            deslocamento=deslocamento,
+        ):
+            if exibidas == limite:
+                ha_mais = True
+                break
+            exibidas += 1
+            sinal = "+" if transacao.tipo.sinal > 0 else "-"
+            partes_msg.append(
+                MODELO_LINHA_EXTRATO
+                % (
+                    transacao.data,
+                    transacao.tipo.descricao.upper().center(10),
+                    f"R$ {sinal}{formatar_centavos(transacao.valor)}",
+                )
             )
-            valor_operacao = f"{valor_operacao:>21}"
 
-            msg += "\n"
-            msg += "-" * 70
-            msg += data_registro
-            msg += "|".center(10)
-            msg += tipo_operacao_registro.upper().center(10)
-            msg += "|".center(10)
-            msg += valor_operacao
+    if limite is not None and extrato:
+        if not exibidas:
+            rodape = "Nenhuma movimentação nesta página."
+        else:
+            rodape = f"Transações {deslocamento + 1} a {deslocamento + exibidas}"
+            if ha_mais:
+                rodape += f" (próxima página: {deslocamento + exibidas})"
+        partes_msg.append(MODELO_PAGINA_EXTRATO % rodape)
+
+    if extrato:
+        # Totais dos dias do período, lidos dos agregados do livro.
+        dia_inicial = None if inicio is None else date.fromtimestamp(inicio)
+        dia_final = None if fim is None else date.fromtimestamp(fim - 1)
+        partes_msg.append("\n")
+        for tipo in TipoTransacao:
+            total, quantidade = extrato.agregados.totais(tipo, dia_inicial, dia_final)
+            partes_msg.append(
+                MODELO_RESUMO_EXTRATO % f"{tipo.descricao_plural} ({quantidade}): "
+                f"R$ {formatar_centavos(total)}"
+            )
 
-    saldo = float(conta.get("saldo", 0.0))
-    str_saldo = f"Saldo: R$ {saldo:.2f}"
-    msg += "\n\n\n"
-    msg += f"{str_saldo:>70}"
-    msg += "\n" + "".center(70, "=") + "\n"
+    saldo: int = conta.get("saldo", 0)
+    partes_msg.append(MODELO_SALDO_EXTRATO % f"Saldo: R$ {formatar_centavos(saldo)}")
 
-    return msg
+    return "".join(partes_msg)
 
 
-def validar_cpf(cpf: str) -> bool:
-    """Valida se o CPF informado é composto por 11 dígitos numéricos.
+def recuperar_periodo() -> tuple[int | None, int | None]:
+    """Obtém, via input, o período do extrato.
 
-    A função não realiza validação matemática de CPF (dígitos verificadores),
-    apenas garante que o valor possui o comprimento e formato corretos.
+    As datas seguem o formato 'dd-mm-yyyy'; deixar uma delas em branco abre o
+    período naquela ponta. A data final é incluída no período.
 
-    Args:
-        cpf (str): CPF a ser validado, contendo apenas números.
+    Returns:
+        tuple[int | None, int | None]: Instante inicial (inclusive) e final
+            (exclusive, meia-noite do dia seguinte à data final), em segundos.
+    """
+    limites: list[int | None] = []
+    for rotulo, dias in (("inicial", 0), ("final", 1)):
+        pergunta = f"Informe a data {rotulo} do extrato, no formato dd-mm-yyyy "
+        while True:
+            data = input(pergunta + "(Enter para não limitar): ")
+            if not data:
+                limites.append(None)
+                break
+            try:
+                # Recusa datas inexistentes e as que não cabem em um instante.
+                limites.append(converter_data_para_instante(data, dias))
+                break
+            except ValueError:
+                pergunta = f"Data {rotulo} inválida! Informe no formato dd-mm-yyyy "
+    return limites[0], limites[1]
+
+
+def recuperar_paginacao() -> tuple[int | None, int]:
+    """Obtém, via input, o tamanho da página do extrato e o cursor da página.
 
     Returns:
-        bool: True se o CPF for válido (11 dígitos numéricos), False caso contrário.
+        tuple[int | None, int]: Transações por página (None para todas) e
+            quantidade de transações a pular, informada no rodapé da página
+            anterior.
     """
-    return cpf.isdigit() and len(cpf) == 11
+    while True:
+        tamanho = input(
+            "Informe a quantidade de transações por página (Enter para todas): "
+        )
+        if not tamanho:
+            return None, 0
+        if tamanho.isdigit() and int(tamanho) > 0:
+            break
 
+    while True:
+        cursor = input("Informe o cursor da página (Enter para a primeira): ")
+        if not cursor:
+            return int(tamanho), 0
+        if cursor.isdigit():
+            return int(tamanho), int(cursor)
 
-def validar_data(data_str: str) -> bool:
-    """Valida se uma data está no formato 'dd-mm-yyyy' e representa uma data real.
 
-    A função utiliza o módulo datetime para verificar se a data informada é válida,
-    considerando meses de 30/31 dias e anos bissextos.
+def gerar_extrato(*, registro: RegistroBancario) -> str:
+    """Gera o extrato textual da conta selecionada.
+
+    Solicita o número da conta, o tipo de transação, o período e a página
+    desejados e delega a montagem do texto a `formatar_extrato`.
 
     Args:
-        data_str (str): Data informada pelo usuário no formato 'dd-mm-yyyy'.
+        registro (RegistroBancario): Registro onde o extrato será consultado.
 
     Returns:
-        bool: True se a data for válida e estiver no formato correto, False caso contrário.
+        str: Texto do extrato ou mensagem de erro quando a conta não existe.
     """
-    try:
-        datetime.strptime(data_str, "%d-%m-%Y")
-        return True
-    except ValueError:
-        return False
+
+    conta = recuperar_conta(registro=registro)
+    if isinstance(conta, str):
+        return conta
+
+    tipo_transacao = recuperar_tipo_transacao()
+    inicio, fim = recuperar_periodo()
+    limite, deslocamento = recuperar_paginacao()
+    return formatar_extrato(
+        conta,
+        tipo_transacao,
+        inicio=inicio,
+        fim=fim,
+        limite=limite,
+        deslocamento=deslocamento,
+    )
 
 
 def cadastrar_usuario(
-    lista_usuarios: list[dict[str, Any]],
-) -> tuple[list[dict[str, Any]], str]:
+    registro: RegistroBancario,
+) -> tuple[RegistroBancario, str]:
     """Registra um novo usuário solicitando dados pessoais e endereço.
 
     A função solicita ao usuário informações de CPF, nome, data de nascimento
-    e endereço, validando se o CPF já está cadastrado. Em caso de sucesso,
-    adiciona o novo registro à lista existente.
+    e endereço, validando se o CPF já está cadastrado, e repassa o cadastro ao
+    motor (`motor.criar_usuario`).
 
     Args:
-        lista_usuarios (list[dict[str, Any]]): Lista atual de usuários cadastrados,
-            onde cada item representa um usuário com seus dados pessoais e endereço.
+        registro (RegistroBancario): Registro dos usuários cadastrados, onde cada
+            usuário contém seus dados pessoais e endereço.
 
     Returns:
-        tuple[list[dict[str, Any]], str]:
-            - Lista atualizada de usuários.
+        tuple[RegistroBancario, str]:
+            - Registro com a lista de usuários atualizada.
             - Mensagem indicando o resultado da operação (sucesso ou erro).
     """
 
@@ -580,8 +729,8 @@ def cadastrar_usuario(
             "CPF Inválido! Por favor, informe o CPF do titular da conta, sem pontos e sem traços: "
         )
 
-    if existe_item(lista_usuarios, "cpf", cpf):
-        return lista_usuarios, "Usuário já cadastrado!"
+    if registro.existe_usuario(cpf):
+        return registro, USUARIO_EXISTENTE.mensagem
 
     data_nascimento_titular = input(
         "\nPor favor, informe a data de nascimento do titular da conta, no formato dd-mm-yyyy: "
@@ -602,86 +751,47 @@ def cadastrar_usuario(
     cidade_logradouro = input("\nPor favor, informe a cidade: ")
     uf_logradouro = input("\nPor favor, informe o estado: ")
 
-    lista_usuarios.append(
-        {
-            "cpf": cpf,
-            "data_nascimento_titular": data_nascimento_titular,
-            "nome_titular": nome_titular,
-            "endereco": {
-                "logradouro": endereco_logradouro,
-                "numero": numero_logradouro,
-                "bairro": bairro_logradouro,
-                "cidade": cidade_logradouro,
-                "uf": uf_logradouro,
-            },
-        }
+    resultado = criar_usuario(
+        registro,
+        cpf=cpf,
+        nome_titular=nome_titular,
+        data_nascimento_titular=data_nascimento_titular,
+        endereco={
+            "logradouro": endereco_logradouro,
+            "numero": numero_logradouro,
+            "bairro": bairro_logradouro,
+            "cidade": cidade_logradouro,
+            "uf": uf_logradouro,
+        },
     )
 
-    return lista_usuarios, "\nUsuário cadastrado com sucesso!"
-
-
-def gerar_conta_unica(lista_contas: list[dict[str, Any]]) -> str:
-    """Gera um número de conta corrente único e formatado.
-
-    A função cria um número de conta aleatório com seis dígitos,
-    garantindo que ele não se repita em relação às contas já existentes
-    e que seja formatado com um hífen antes do último dígito.
-    Exemplo de formato: "12345-6".
-
-    Args:
-        lista_contas (list[dict]): Lista de contas já cadastradas, utilizada
-            para verificar duplicidades do número gerado.
-
-    Returns:
-        str: Número de conta corrente único e formatado (ex: "12345-6").
-    """
-    while True:
-        s = f"{random.randint(0, 999_999):06}"  # permite zeros à esquerda
-        if s == "000000":  # opcional: evitar tudo zero
-            continue
-        s = f"{s[:5]}-{s[5:]}"
-        if existe_item(lista_contas, "numero_conta_corrente", s):
-            continue
-        return s
+    return registro, "\n" + resultado.mensagem
 
 
 def cadastrar_conta(
-    lista_usuarios: list[dict[str, Any]], lista_contas: list[dict[str, Any]]
-) -> tuple[list[dict[str, Any]], str]:
+    registro: RegistroBancario,
+) -> tuple[RegistroBancario, str]:
     """
     Cria uma nova conta corrente vinculada a um usuário existente.
 
-    A função verifica se há usuários cadastrados, valida se o CPF informado
-    pertence a um usuário existente e, em caso de sucesso, gera um número
-    de conta único e adiciona o novo registro à lista de contas.
+    A função verifica se há usuários cadastrados, solicita o CPF do titular e
+    repassa a abertura ao motor (`motor.abrir_conta`), que valida o titular,
+    gera um número de conta único e adiciona a conta ao registro.
 
     Args:
-        lista_usuarios (list[dict[str, Any]]): Lista de usuários cadastrados.
-        lista_contas (list[dict[str, Any]]): Lista de contas já cadastradas.
+        registro (RegistroBancario): Registro com os usuários e as contas já
+            cadastradas.
 
     Returns:
-        tuple[list[dict[str, Any]], str]:
-            - Lista de contas atualizada.
+        tuple[RegistroBancario, str]:
+            - Registro com a lista de contas atualizada.
             - Mensagem indicando o resultado da operação.
     """
-    if not lista_usuarios:
-        return lista_contas, "Nenhum usuário cadastrado no sistema!"
+    if not registro.lista_usuarios:
+        return registro, "Nenhum usuário cadastrado no sistema!"
 
     cpf = input("Digite o CPF do usuário para o qual deseja cadastrar a conta: ")
-    if not existe_item(lista_usuarios, "cpf", cpf):
-        return lista_contas, "Usuário não cadastrado!"
-
-    numero_conta = gerar_conta_unica(lista_contas)
-    lista_contas.append(
-        {
-            "agencia": "0001",
-            "numero_conta_corrente": numero_conta,
-            "cpf_titular": cpf,
-            "extrato": {},
-            "saldo": float(0.00),
-        }
-    )
-    return (lista_contas, "Conta cadastrada com sucesso!")
+    return registro, abrir_conta(registro, cpf=cpf).mensagem
 
 
 def valor_default(v: Any, default: str = "-") -> str:
@@ -746,126 +856,135 @@ class IteradorContas:
         return conta
 
 
-def listar_usuarios(
-    lista_usuarios: list[dict[str, Any]], lista_contas: list[dict[str, Any]]
-) -> str:
+def iterar_listagem_usuarios(
+    registro: RegistroBancario, deslocamento: int = 0
+) -> Iterator[str]:
+    """Gera, um bloco por vez, o texto formatado dos usuários e de suas contas.
+
+    Cada bloco produzido corresponde a um usuário: dados pessoais, endereço e,
+    quando existente, as contas bancárias associadas ao CPF, obtidas do índice
+    por titular do registro. Como apenas um bloco é montado de cada vez, o uso
+    de memória não cresce com a quantidade de usuários e o primeiro bloco fica
+    disponível antes de o restante da listagem ser processado. A montagem da
+    tabela é formatada em blocos ASCII para apresentação no console.
+
+    Args:
+        registro (RegistroBancario): Registro com os usuários cadastrados e as
+            contas vinculadas a eles.
+        deslocamento (int): Usuários a pular, sem formatá-los, antes do
+            primeiro bloco (a numeração continua a partir deles).
+
+    Yields:
+        str: Bloco de texto de um usuário; o último bloco contém a mensagem de
+            conclusão da operação.
+    """
+
+    lista_usuarios = registro.lista_usuarios
+
+    if not lista_usuarios:
+        yield "Não existe usuário cadastrado no sistema!"
+        return
+
+    # Cabeçalhos, separadores e modelos das linhas são pré-compilados no módulo
+    # `layout`; a parte fixa de cada bloco é renderizada com uma única
+    # formatação e cada conta com mais uma.
+    for i, usuario in islice(iterar_usuarios(lista_usuarios), deslocamento, None):
+
+        endereco_usuario = usuario.get("endereco") or {}
+        cpf_usuario = str(usuario.get("cpf"))
+        valores_usuario = (
+            str(valor_default(usuario.get("nome_titular"))),
+            cpf_usuario,
+            str(valor_default(usuario.get("data_nascimento_titular"))),
+            valor_default(endereco_usuario.get("logradouro")),
+            valor_default(endereco_usuario.get("numero")),
+            valor_default(endereco_usuario.get("bairro")),
+            valor_default(endereco_usuario.get("cidade")),
+            valor_default(endereco_usuario.get("uf")),
+            PREENCHIMENTO_ENDERECOS_2,
+        )
+
+        partes_bloco = [
+            MODELO_BLOCO_USUARIO
+            % (i, *map(str.center, valores_usuario, LARGURAS_BLOCO_USUARIO))
+        ]
+
+        contas_usuario = registro.contas_do_titular(cpf_usuario)
+        if contas_usuario:
+            partes_bloco.append(CABECALHO_CONTAS)
+
+            for conta in IteradorContas(contas_usuario):
+                partes_bloco.append(
+                    MODELO_LINHA_CONTA
+                    % LAYOUT_CONTAS.centralizar(
+                        str(valor_default(conta.get("agencia"))),
+                        str(valor_default(conta.get("numero_conta_corrente"))),
+                        str(valor_default(conta.get("cpf_titular"))),
+                    )
+                )
+
+        else:
+            partes_bloco.append(SEM_CONTAS)
+
+        yield "".join(partes_bloco)
+
+    yield "\nListagem concluída."
+
+
+def listar_usuarios(registro: RegistroBancario) -> str:
     """Gera e retorna o texto formatado contendo os usuários cadastrados e suas contas.
 
-    A função percorre todos os usuários cadastrados, exibe seus dados pessoais,
-    endereço e, quando existente, lista todas as contas bancárias associadas ao CPF.
-    A montagem da tabela é formatada em blocos ASCII para apresentação no console.
+    Reúne em uma única string os blocos produzidos por `iterar_listagem_usuarios`.
+    Para listagens grandes, prefira consumir o gerador diretamente (por exemplo,
+    com `escrever_em_blocos`), evitando manter o relatório inteiro em memória.
 
     Args:
-        lista_usuarios (list[dict]): Lista de usuários cadastrados.
-        lista_contas (list[dict]): Lista de contas vinculadas aos usuários.
+        registro (RegistroBancario): Registro com os usuários cadastrados e as
+            contas vinculadas a eles.
 
     Returns:
         str: Texto formatado contendo a listagem completa seguida de uma mensagem
              de conclusão da operação.
     """
+    return "".join(iterar_listagem_usuarios(registro))
 
-    if not lista_usuarios:
-        return "Não existe usuário cadastrado no sistema!"
 
-    headers_tabela_informacoes_cadastrais = (
-        f"|{'NOME'.center(41)}|{'CPF'.center(17)}|{'DATA DE NASCIMENTO'.center(22)}|"
-    )
-    headers_tabela_enderecos_1 = (
-        f"|{'LOGRADOURO'.center(40)}|{'NUMERO'.center(18)}|{'BAIRRO'.center(22)}|"
-    )
-    headers_tabela_enderecos_2 = (
-        f"|{'CIDADE'.center(32)}|{'UF'.center(6)}|{''.center(42, '#')}|"
-    )
-    headers_tabela_contas = f"|{'AGÊNCIA'.center(27)}|{'CONTA CORRENTE'.center(27)}|{'TITULAR DA CONTA (CPF)'.center(26)}|"
-    separador_tabela = "-" * 84
-    separador_secao_tabela = f"|{''.center(82)}|"
+def escrever_em_blocos(
+    blocos: Iterable[str], destino: TextIO, tamanho_bloco: int = 64 * 1024
+) -> int:
+    """Escreve os blocos de texto em um destino do tipo arquivo, em lotes limitados.
 
-    lista_usuarios_formatada = ""
+    Os blocos são acumulados até atingir aproximadamente `tamanho_bloco`
+    caracteres e então gravados de uma só vez, reduzindo o número de chamadas de
+    escrita sem reter mais do que um lote em memória.
 
-    if lista_usuarios:
+    Args:
+        blocos (Iterable[str]): Blocos de texto a escrever, na ordem de saída.
+        destino (TextIO): Objeto com método `write` (console, arquivo, socket...).
+        tamanho_bloco (int): Quantidade aproximada de caracteres por escrita.
 
-        for i, usuario in iterar_usuarios(lista_usuarios):
+    Returns:
+        int: Total de caracteres escritos.
+    """
+    pendentes: list[str] = []
+    tamanho_pendente = 0
+    total = 0
 
-            endereco_usuario = usuario.get("endereco") or {}
-            cpf_usuario = str(usuario.get("cpf"))
-            nome_usuario = str(valor_default(usuario.get("nome_titular")))
-            data_nascimento_usuario = str(
-                valor_default(usuario.get("data_nascimento_titular"))
-            )
-            logradouro_usuario = valor_default(endereco_usuario.get("logradouro"))
-            numero_endereco_usuario = valor_default(endereco_usuario.get("numero"))
-            bairro_endereco_usuario = valor_default(endereco_usuario.get("bairro"))
-            cidade_endereco_usuario = valor_default(endereco_usuario.get("cidade"))
-            uf_endereco_usuario = valor_default(endereco_usuario.get("uf"))
-
-            lista_usuarios_formatada += f"\n\nUsuário #{i}"
-            lista_usuarios_formatada += f"\n{separador_tabela}"
-            lista_usuarios_formatada += (
-                f"\n|{'*INFORMAÇÕES CADASTRAIS*'.center(len(separador_tabela) - 2)}|"
-            )
-            lista_usuarios_formatada += f"\n{separador_tabela}"
-            lista_usuarios_formatada += f"\n{headers_tabela_informacoes_cadastrais}"
-            lista_usuarios_formatada += f"\n{separador_tabela}"
-            lista_usuarios_formatada += f"\n|{nome_usuario.center(41)}|{cpf_usuario.center(17)}|{data_nascimento_usuario.center(22)}|"
-            lista_usuarios_formatada += f"\n{separador_tabela}"
-            lista_usuarios_formatada += f"\n{separador_secao_tabela}"
-
-            lista_usuarios_formatada += f"\n{separador_tabela}"
-            lista_usuarios_formatada += (
-                f"\n|{'*ENDEREÇOS CADASTRADOS*'.center(len(separador_tabela) - 2)}|"
-            )
-            lista_usuarios_formatada += f"\n{separador_tabela}"
-            lista_usuarios_formatada += f"\n{headers_tabela_enderecos_1}"
-            lista_usuarios_formatada += f"\n{separador_tabela}"
-            lista_usuarios_formatada += f"\n|{logradouro_usuario.center(40)}|{numero_endereco_usuario.center(18)}|{bairro_endereco_usuario.center(22)}|"
-
-            lista_usuarios_formatada += f"\n{separador_tabela}"
-            lista_usuarios_formatada += f"\n{headers_tabela_enderecos_2}"
-            lista_usuarios_formatada += f"\n{separador_tabela}"
-            lista_usuarios_formatada += f"\n|{cidade_endereco_usuario.center(32)}|{uf_endereco_usuario.center(6)}|{''.center(42, '#')}|"
-            lista_usuarios_formatada += f"\n{separador_tabela}"
-
-            if existe_item(lista_contas, "cpf_titular", cpf_usuario):
-
-                lista_usuarios_formatada += f"\n{separador_secao_tabela}"
-                lista_usuarios_formatada += f"\n{separador_tabela}"
-                lista_usuarios_formatada += (
-                    f"\n|{'*DADOS BANCÁRIOS*'.center(len(separador_tabela) - 2)}|"
-                )
-                lista_usuarios_formatada += f"\n{separador_tabela}"
-                lista_usuarios_formatada += f"\n{headers_tabela_contas}"
-                lista_usuarios_formatada += f"\n{separador_tabela}"
-
-                for conta in IteradorContas(lista_contas):
-                    if conta.get("cpf_titular") == cpf_usuario:
-
-                        agencia_conta_usuario = str(valor_default(conta.get("agencia")))
-                        numero_conta_usuario = str(
-                            valor_default(conta.get("numero_conta_corrente"))
-                        )
-                        cpf_titular = str(valor_default(conta.get("cpf_titular")))
-                        lista_usuarios_formatada += f"\n|{agencia_conta_usuario.center(27)}|{numero_conta_usuario.center(27)}|{cpf_titular.center(26)}|"
-                        lista_usuarios_formatada += f"\n{separador_tabela}"
-
-            else:
-                lista_usuarios_formatada += f"\n{separador_secao_tabela}"
-                # print(separador_secao_tabela)
-                lista_usuarios_formatada += f"\n{separador_tabela}"
-                # print(separador_tabela)
-                lista_usuarios_formatada += (
-                    f"\n|{'*DADOS BANCÁRIOS*'.center(len(separador_tabela) - 2)}|"
-                )
-                # print(f"|{'*DADOS BANCÁRIOS*'.center(len(separador_tabela) - 2)}|")
-                lista_usuarios_formatada += f"\n{separador_tabela}"
-                # print(separador_tabela)
-                lista_usuarios_formatada += (
-                    f"\n|{' Nenhuma conta cadastrada.'.ljust(82)}|"
-                )
-                # print(f"|{' Nenhuma conta cadastrada.'.ljust(82)}|")
-                lista_usuarios_formatada += f"\n{separador_tabela}\n"
-                # print(separador_tabela + "\n")
+    for bloco in blocos:
+        pendentes.append(bloco)
+        tamanho_pendente += len(bloco)
+        if tamanho_pendente >= tamanho_bloco:
+            destino.write("".join(pendentes))
+            total += tamanho_pendente
+            pendentes.clear()
+            tamanho_pendente = 0
+
+    if pendentes:
+        destino.write("".join(pendentes))
+        total += tamanho_pendente
 
-    return f"{lista_usuarios_formatada}\nListagem concluída."
+    destino.flush()
+    return total
 
 
 def limpar_tela() -> None:
@@ -891,105 +1010,118 @@ def carregar_tela_inicial() -> None:
     carregar_menu_principal()
 
 
-def existe_item(lista_items: list[dict], chave: str, valor) -> bool:
-    """
-    Verifica se existe na lista algum item cujo valor para a chave informada
-    seja igual ao valor fornecido.
-
-    Args:
-        lista_items (list[dict]): Lista de dicionários que será pesquisada.
-        chave (str): Nome da chave a ser verificada em cada item.
-        valor: Valor esperado associado à chave.
-
-    Returns:
-        bool: True se algum item corresponder ao critério, False caso contrário.
-    """
-    if not lista_items:
-        return False
-
-    return any(item.get(chave) == valor for item in lista_items)
-
-
-def carregar_dados_mock(
-    lista_usuarios: list[dict[str, Any]], lista_contas: list[dict[str, Any]]
-) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+def carregar_dados_mock(registro: RegistroBancario) -> RegistroBancario:
     """
     Carrega usuários e contas de exemplo para auxiliar em testes locais.
 
-    A função popula as listas de usuários e contas informadas com dados fixos,
+    A função popula o registro informado com usuários e contas fixos,
     simulando um cenário já preenchido para facilitar a validação das
     funcionalidades do sistema bancário.
 
     Args:
-        lista_usuarios (list[dict]): Lista de usuários que será populada com dados de teste.
-        lista_contas (list[dict]): Lista de contas que será populada com dados de teste.
+        registro (RegistroBancario): Registro que será populado com dados de teste.
 
     Returns:
-        tuple[list[dict], list[dict]]: As listas de usuários e contas atualizadas com os dados mock.
+        RegistroBancario: O registro atualizado com os dados mock.
     """
 
-    lista_usuarios.extend(
-        [
-            {
-                "cpf": "01234567890",
-                "data_nascimento_titular": "24-04-1964",
-                "nome_titular": "Sebastiana M. de Carvalho",
-                "endereco": {
-                    "logradouro": "Rua nova",
-                    "numero": "1",
-                    "bairro": "Bairro Teste",
-                    "cidade": "Cidade teste",
-                    "uf": "PE",
-                },
-            },
-            {
-                "cpf": "11111111111",
-                "data_nascimento_titular": "01-01-2001",
-                "nome_titular": "Maria José da Silva",
-                "endereco": {
-                    "logradouro": "Rua velha",
-                    "numero": "2",
-                    "bairro": "Bairro Teste 2",
-                    "cidade": "Cidade Teste 2",
-                    "uf": "PE",
-                },
-            },
-        ]
-    )
-    lista_contas.extend(
-        [
-            {
-                "agencia": "0001",
-                "numero_conta_corrente": "12345-6",
-                "cpf_titular": "01234567890",
+    for usuario in [
+        {
+            "cpf": "01234567890",
+            "data_nascimento_titular": "24-04-1964",
+            "nome_titular": "Sebastiana M. de Carvalho",
+            "endereco": {
+                "logradouro": "Rua nova",
+                "numero": "1",
+                "bairro": "Bairro Teste",
+                "cidade": "Cidade teste",
+                "uf": "PE",
             },
-            {
-                "agencia": "0001",
-                "numero_conta_corrente": "45789-0",
-                "cpf_titular": "01234567890",
+        },
+        {
+            "cpf": "11111111111",
+            "data_nascimento_titular": "01-01-2001",
+            "nome_titular": "Maria José da Silva",
+            "endereco": {
+                "logradouro": "Rua velha",
+                "numero": "2",
+                "bairro": "Bairro Teste 2",
+                "cidade": "Cidade Teste 2",
+                "uf": "PE",
             },
-        ]
-    )
+        },
+    ]:
+        registro.adicionar_usuario(usuario)
+
+    for conta in [
+        {
+            "agencia": "0001",
+            "numero_conta_corrente": "12345-6",
+            "cpf_titular": "01234567890",
+        },
+        {
+            "agencia": "0001",
+            "numero_conta_corrente": "45789-0",
+            "cpf_titular": "01234567890",
+        },
+    ]:
+        registro.adicionar_conta(conta)
 
-    return lista_usuarios, lista_contas
+    return registro
 
 
 def main():
     """
     Função principal que inicializa o estado da aplicação e controla
     o loop do menu interativo do sistema bancário.
+
+    Com a opção `--perfil <diretório>`, cada operação do menu é executada sob
+    `cProfile` e `tracemalloc`, e os perfis são gravados no diretório.
+
+    Com a opção `--dados <diretório>` (ou a variável `BANCO_DADOS`), usuários,
+    contas e extratos são restaurados do diretório na abertura e cada operação
+    é gravada no diário antes de o resultado ser exibido. Com `--sqlite
+    <arquivo>`, os dados ficam em um banco SQLite e são consultados a cada
+    operação, sem serem carregados na memória.
     """
-    carregar_tela_inicial()
+    parser = argparse.ArgumentParser(description="Sistema bancário interativo.")
+    parser.add_argument(
+        "--perfil",
+        metavar="DIRETORIO",
+        help="grava o perfil (.pstats e alocações) de cada operação do menu",
+    )
+    parser.add_argument(
+        "--dados",
+        metavar="DIRETORIO",
+        default=os.environ.get("BANCO_DADOS"),
+        help="diretório onde usuários, contas e extratos são persistidos",
+    )
+    parser.add_argument(
+        "--sqlite",
+        metavar="ARQUIVO",
+        help="usa um banco SQLite como registro de usuários, contas e extratos",
+    )
+    args = parser.parse_args()
+    if args.perfil:
+        ativar_perfil(args.perfil)
+
+    armazenamento = None
+    if args.sqlite:
+        registro = RegistroSQLite(args.sqlite)
+    elif args.dados:
+        armazenamento = ArmazenamentoBanco(args.dados, registros_por_sincronizacao=1)
+        registro = armazenamento.abrir()
+    else:
+        registro = RegistroBancario()
 
-    lista_usuarios: list[dict[str, Any]] = []
-    lista_contas: list[dict[str, Any]] = []
+    carregar_tela_inicial()
 
     # Descomente a linha abaixo apenas para testes locais:
-    # carregar_dados_mock(lista_usuarios, lista_contas)
+    # carregar_dados_mock(registro)
 
-    valor_limite_saque = 500
-    numero_saques = 0
+    valor_limite_saque = 500_00  # em centavos
     QTD_LIMITE_SAQUES = 3
+    saques_diarios = ControleSaquesDiarios()
 
     while True:
         opcao = input("Escolha uma opcão: ")
@@ -997,54 +1129,59 @@ def main():
         match opcao:
             case "1":
                 limpar_tela()
-                lista_usuarios, *_ = exibir_cadastro_usuario_console(
-                    cadastrar_usuario, lista_usuarios
+                registro, *_ = exibir_cadastro_usuario_console(
+                    cadastrar_usuario, registro
                 )
                 input("Pressione qualquer tecla para retornar ao menu principal...")
                 carregar_tela_inicial()
             case "2":
                 limpar_tela()
-                # lista_contas, msg = cadastrar_conta(lista_usuarios, lista_contas)
+                # registro, msg = cadastrar_conta(registro)
                 # print(msg)
-                lista_contas, *_ = exibir_cadastro_conta_console(
-                    cadastrar_conta, lista_usuarios, lista_contas
-                )
+                registro, *_ = exibir_cadastro_conta_console(cadastrar_conta, registro)
                 input("Pressione qualquer tecla para retornar ao menu principal...")
                 carregar_tela_inicial()
             case "3":
                 limpar_tela()
-                # msg = listar_usuarios(lista_usuarios, lista_contas)
+                # msg = listar_usuarios(registro)
                 # print(msg)
-                exibir_lista_usuarios_console(
-                    listar_usuarios, lista_usuarios, lista_contas
-                )
+                exibir_lista_usuarios_console(iterar_listagem_usuarios, registro)
                 input("Pressione qualquer tecla para retornar ao menu principal...")
                 carregar_tela_inicial()
             case "4":
                 limpar_tela()
-                lista_contas, *_ = exibir_operacao_deposito_console(
-                    efetuar_deposito, lista_contas
+                registro, *_ = exibir_operacao_deposito_console(
+                    efetuar_deposito, registro
                 )
                 input("Pressione qualquer tecla para retornar ao menu principal...")
                 carregar_tela_inicial()
             case "5":
                 limpar_tela()
-                numero_saques, *_ = exibir_operacao_saque_console(
+                registro, *_ = exibir_operacao_saque_console(
                     efetuar_saque,
                     limite=valor_limite_saque,
-                    numero_saques=numero_saques,
                     limite_saques=QTD_LIMITE_SAQUES,
-                    lista_contas=lista_contas,
+                    registro=registro,
+                    saques_diarios=saques_diarios,
                 )
                 input("Pressione qualquer tecla para retornar ao menu principal...")
                 carregar_tela_inicial()
             case "6":
                 limpar_tela()
-                exibir_extrato_console(gerar_extrato, lista_contas=lista_contas)
-                # print(f"\n{msg}")
+                registro, *_ = exibir_operacao_transferencia_console(
+                    efetuar_transferencia, registro
+                )
                 input("Pressione qualquer tecla para retornar ao menu principal...")
                 carregar_tela_inicial()
             case "7":
+                limpar_tela()
+                exibir_extrato_console(gerar_extrato, registro=registro)
+                # print(f"\n{msg}")
+                input("Pressione qualquer tecla para retornar ao menu principal...")
+                carregar_tela_inicial()
+            case "8":
+                if armazenamento is not None:
+                    armazenamento.fechar()
                 finalizar_app()
                 break
             case _:
@@ -0,0 +1,64 @@
+"""Representação monetária em ponto fixo: valores inteiros em centavos.
+
+Saldos, valores de transações e limites são guardados como `int` de centavos,
+o que torna somas e comparações exatas (sem o acúmulo de erros do `float`) e
+dispensa arredondamentos na exibição.
+"""
+
+
+def converter_para_centavos(texto: str) -> int:
+    """Converte um valor digitado (ex.: "10", "10.5", "10,50") em centavos.
+
+    Aceita ponto ou vírgula como separador decimal e no máximo duas casas
+    decimais. A conversão é feita apenas com operações de texto e inteiros,
+    sem passar por `float`. Os formatos mais comuns (inteiro sem sinal ou valor
+    com exatamente duas casas) são tratados por um caminho rápido.
+
+    Args:
+        texto (str): Valor monetário em reais, opcionalmente com sinal.
+
+    Returns:
+        int: Valor correspondente em centavos.
+
+    Raises:
+        ValueError: Se o texto não representar um valor com até duas casas
+            decimais.
+    """
+    texto = texto.strip()
+    if texto.isascii():
+        if texto.isdigit():
+            return int(texto) * 100
+        if texto[-3:-2] in (".", ","):
+            reais, centavos = texto[:-3], texto[-2:]
+            if reais.isdigit() and centavos.isdigit():
+                return int(reais) * 100 + int(centavos)
+
+    texto = texto.replace(",", ".", 1)
+    sinal = -1 if texto.startswith("-") else 1
+    if texto[:1] in "+-":
+        texto = texto[1:]
+
+    reais, _, centavos = texto.partition(".")
+    if (
+        not (reais or centavos)
+        or len(centavos) > 2
+        or not (reais + centavos).isascii()
+        or not (reais + centavos).isdigit()
+    ):
+        raise ValueError(f"Valor monetário inválido: {texto!r}")
+
+    return sinal * (int(reais or "0") * 100 + int(centavos.ljust(2, "0")))
+
+
+def formatar_centavos(centavos: int) -> str:
+    """Formata centavos como reais com duas casas decimais (ex.: 12345 -> "123.45").
+
+    Args:
+        centavos (int): Valor em centavos.
+
+    Returns:
+        str: Valor em reais, com o mesmo formato de `f"{valor:.2f}"`.
+    """
+    if centavos >= 0:
+        return "%d.%02d" % divmod(centavos, 100)
+    return "-%d.%02d" % divmod(-centavos, 100)
@@ -0,0 +1,358 @@
+"""Extratos de fim de mês de todas as contas, montados em vários processos.
+
+`gerar_extrato` monta o extrato de uma conta escolhida no menu. No fechamento
+do mês é preciso o extrato de todas as contas, e a montagem do texto (uma
+linha formatada por transação) ocupa um núcleo inteiro por vez. Em
+`gerar_extratos_mensais`, as contas são separadas em partes de
+`TAMANHO_PARTE` contas e cada parte é montada por um processo de um
+`ProcessPoolExecutor`, com o mesmo texto de `formatar_extrato`.
+
+Os extratos são gravados em um arquivo por fragmento (`fragmento_da_conta`,
+a mesma divisão de `RegistroFragmentado`), na ordem de cadastro das contas.
+Cada parte leva aos processos apenas as transações do mês de cada conta, e
+apenas algumas partes por processo ficam em andamento ao mesmo tempo: a
+memória usada além do próprio registro é limitada pelo tamanho das partes,
+não pela quantidade de contas. Execute a partir do diretório da atividade,
+por exemplo:
+
+    python extratos_mensais.py --dados dados/ --mes 05-2025 --saida extratos/
+"""
+
+import argparse
+import os
+import sys
+from array import array
+from collections import deque
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import ExitStack
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+from desafio import carregar_dados_mock, formatar_extrato
+from fragmentos import fragmento_da_conta
+from layout import MODELO_CONTA_EXTRATO
+from livro_extrato import LivroExtrato
+from persistencia import ArmazenamentoBanco
+from registro import RegistroBancario
+
+# Contas por parte enviada a um processo: partes maiores diluem o custo de
+# envio entre os processos, partes menores limitam a memória em andamento.
+TAMANHO_PARTE = 500
+# Partes em andamento por processo: uma em montagem e outra já na fila, para
+# que nenhum processo fique ocioso esperando a gravação da anterior.
+PARTES_POR_PROCESSO = 2
+
+
+def periodo_do_mes(mes: str) -> tuple[int, int]:
+    """Converte um mês 'mm-yyyy' no período do extrato mensal.
+
+    Args:
+        mes (str): Mês no formato 'mm-yyyy'.
+
+    Returns:
+        tuple[int, int]: Instante inicial (inclusive, meia-noite local do dia
+            1º) e final (exclusive, meia-noite do dia 1º do mês seguinte).
+
+    Raises:
+        ValueError: Se o mês não estiver no formato 'mm-yyyy'.
+    """
+    inicio = datetime.strptime(mes, "%m-%Y")
+    fim = (inicio + timedelta(days=31)).replace(day=1)
+    return int(inicio.timestamp()), int(fim.timestamp())
+
+
+def _copiar_coluna(fatia: array | memoryview, codigo: str) -> array:
+    """Retorna a fatia de uma coluna do livro como `array`, copiando só as visões.
+
+    A fatia de um `array` (`LivroExtrato`) já é uma cópia; a de uma visão do
+    arquivo mapeado (`LivroBinario`) precisa ser copiada para ser enviada.
+    """
+    return fatia if isinstance(fatia, array) else array(codigo, fatia)
+
+
+def _saldo_no_fim(extrato: LivroExtrato, saldo_atual: int, fim: int) -> int:
+    """Saldo da conta no instante `fim`, descontado o movimento posterior.
+
+    O movimento dos dias seguintes ao de `fim` vem dos agregados diários
+    (`AgregadosExtrato.saldo_em`); só as transações do próprio dia, entre a
+    meia-noite e `fim`, são percorridas (nenhuma, quando `fim` é uma
+    meia-noite, como em `periodo_do_mes`). Sem transações a partir de `fim`, o
+    saldo é o atual, e os agregados nem são consultados.
+    """
+    if extrato.ultimo_instante < fim:
+        return saldo_atual
+    dia = date.fromtimestamp(fim)
+    saldo = extrato.agregados.saldo_em(saldo_atual, dia - timedelta(days=1))
+    meia_noite = int(datetime.combine(dia, datetime.min.time()).timestamp())
+    if meia_noite < fim:
+        for transacao in extrato.iterar(inicio=meia_noite, fim=fim):
+            saldo += transacao.tipo.sinal * transacao.valor
+    return saldo
+
+
+def _recortar_conta(
+    conta: dict[str, Any],
+    usuario: dict[str, Any] | None,
+    inicio: int,
+    fim: int,
+) -> tuple:
+    """Dados de uma conta necessários ao seu extrato do período.
+
+    Copia do livro apenas as transações do período (localizadas por busca
+    binária), de modo que a parte enviada ao processo não carrega o histórico
+    inteiro. Livros gravados em arquivo (`LivroBinario`) são lidos da mesma
+    forma, pelas colunas.
+
+    Returns:
+        tuple: Agência, número, CPF e nome do titular, saldo ao fim do período
+            e as colunas de valores, instantes e tipos do período.
+    """
+    valores, instantes, tipos = array("q"), array("q"), array("B")
+    saldo = conta.get("saldo", 0)
+    extrato = conta.get("extrato")
+    if extrato:
+        saldo = _saldo_no_fim(extrato, saldo, fim)
+        posicoes = extrato.posicoes(inicio, fim)
+        if posicoes:
+            fatia = slice(posicoes.start, posicoes.stop)
+            valores = _copiar_coluna(extrato.valores[fatia], "q")
+            instantes = _copiar_coluna(extrato.instantes[fatia], "q")
+            tipos = _copiar_coluna(extrato.tipos[fatia], "B")
+    return (
+        conta["agencia"],
+        conta["numero_conta_corrente"],
+        conta["cpf_titular"],
+        usuario.get("nome_titular", "") if usuario else "",
+        saldo,
+        valores,
+        instantes,
+        tipos,
+    )
+
+
+def montar_parte(parte: list[tuple], inicio: int, fim: int) -> bytes:
+    """Monta os extratos de uma parte das contas, já codificados em UTF-8.
+
+    Executada nos processos trabalhadores. Cada extrato é precedido pela
+    identificação da conta e segue o texto de `formatar_extrato` para o
+    período, com o saldo da conta ao fim do período (e não o atual, que inclui
+    as movimentações posteriores); contas sem movimentações no período exibem
+    "Sem movimentações.".
+
+    Args:
+        parte (list[tuple]): Contas recortadas por `_recortar_conta`.
+        inicio (int): Instante inicial do período (inclusive).
+        fim (int): Instante final do período (exclusive).
+
+    Returns:
+        bytes: Texto dos extratos da parte, na ordem recebida.
+    """
+    textos = []
+    for agencia, numero, cpf, nome, saldo, valores, instantes, tipos in parte:
+        conta = {
+            "numero_conta_corrente": numero,
+            "saldo": saldo,
+            "extrato": LivroExtrato.de_colunas(valores, instantes, tipos),
+        }
+        titular = f"{nome} (CPF {cpf})" if nome else f"CPF {cpf}"
+        textos.append(
+            MODELO_CONTA_EXTRATO % (f"Agência {agencia} / Conta {numero}", titular)
+        )
+        textos.append(formatar_extrato(conta, inicio=inicio, fim=fim))
+    return "".join(textos).encode()
+
+
+def _dividir_em_partes(
+    registro: RegistroBancario,
+    fragmentos: int,
+    tamanho_parte: int,
+    inicio: int,
+    fim: int,
+) -> Iterator[tuple[int, list[tuple]]]:
+    """Separa as contas em partes de um mesmo fragmento, na ordem de cadastro.
+
+    Cada fragmento acumula sua parte até `tamanho_parte` contas; no máximo
+    uma parte incompleta por fragmento fica em memória.
+
+    Yields:
+        tuple[int, list[tuple]]: Fragmento e contas recortadas da parte.
+    """
+    partes: list[list[tuple]] = [[] for _ in range(fragmentos)]
+    buscar_usuario = registro.buscar_usuario
+    for conta in registro.lista_contas:
+        fragmento = fragmento_da_conta(conta["numero_conta_corrente"], fragmentos)
+        parte = partes[fragmento]
+        parte.append(
+            _recortar_conta(conta, buscar_usuario(conta["cpf_titular"]), inicio, fim)
+        )
+        if len(parte) == tamanho_parte:
+            yield fragmento, parte
+            partes[fragmento] = []
+    for fragmento, parte in enumerate(partes):
+        if parte:
+            yield fragmento, parte
+
+
+def _gravar_mais_antiga(
+    pendentes: deque[tuple[int, int, Future]], arquivos: list
+) -> int:
+    """Espera a parte pendente mais antiga, grava-a e retorna quantas contas tinha."""
+    fragmento, quantidade, futuro = pendentes.popleft()
+    arquivos[fragmento].write(futuro.result())
+    return quantidade
+
+
+def gerar_extratos_mensais(
+    registro: RegistroBancario,
+    diretorio: str | Path,
+    inicio: int,
+    fim: int,
+    *,
+    processos: int | None = None,
+    fragmentos: int | None = None,
+    tamanho_parte: int = TAMANHO_PARTE,
+    progresso: Callable[[int, int], None] | None = None,
+) -> list[Path]:
+    """Grava os extratos do período de todas as contas, um arquivo por fragmento.
+
+    As partes são montadas pelos processos em paralelo e gravadas na ordem em
+    que foram enviadas: o arquivo de cada fragmento traz suas contas na ordem
+    de cadastro, qualquer que seja a quantidade de processos. No máximo
+    `PARTES_POR_PROCESSO` partes por processo ficam em andamento; com mais,
+    a divisão das contas espera a gravação da parte mais antiga.
+
+    Args:
+        registro (RegistroBancario): Registro com as contas.
+        diretorio (str | Path): Diretório dos arquivos, criado se preciso.
+        inicio (int): Instante inicial do período (inclusive).
+        fim (int): Instante final do período (exclusive).
+        processos (int | None): Processos trabalhadores; None usa um por
+            núcleo, e 0 monta as partes no próprio processo.
+        fragmentos (int | None): Quantidade de arquivos; None usa um por
+            processo.
+        tamanho_parte (int): Contas por parte enviada a um processo.
+        progresso (Callable[[int, int], None] | None): Chamada a cada parte
+            gravada com a quantidade de extratos gravados e o total de contas.
+
+    Returns:
+        list[Path]: Caminhos dos arquivos, na ordem dos fragmentos.
+    """
+    if processos is None:
+        processos = os.cpu_count() or 1
+    fragmentos = fragmentos or max(processos, 1)
+    diretorio = Path(diretorio)
+    diretorio.mkdir(parents=True, exist_ok=True)
+    caminhos = [
+        diretorio / f"extratos-{date.fromtimestamp(inicio):%Y-%m}-{fragmento:03}.txt"
+        for fragmento in range(fragmentos)
+    ]
+    total = len(registro.lista_contas)
+    gravados = 0
+    pendentes: deque[tuple[int, int, Future]] = deque()
+    maximo_pendentes = processos * PARTES_POR_PROCESSO
+
+    with ExitStack() as pilha:
+        arquivos = [pilha.enter_context(open(caminho, "wb")) for caminho in caminhos]
+        executor = (
+            pilha.enter_context(ProcessPoolExecutor(processos)) if processos else None
+        )
+        partes = _dividir_em_partes(registro, fragmentos, tamanho_parte, inicio, fim)
+        for fragmento, parte in partes:
+            if executor is None:
+                arquivos[fragmento].write(montar_parte(parte, inicio, fim))
+                gravados += len(parte)
+                if progresso:
+                    progresso(gravados, total)
+                continue
+            pendentes.append(
+                (
+                    fragmento,
+                    len(parte),
+                    executor.submit(montar_parte, parte, inicio, fim),
+                )
+            )
+            while len(pendentes) >= maximo_pendentes:
+                gravados += _gravar_mais_antiga(pendentes, arquivos)
+                if progresso:
+                    progresso(gravados, total)
+        while pendentes:
+            gravados += _gravar_mais_antiga(pendentes, arquivos)
+            if progresso:
+                progresso(gravados, total)
+    return caminhos
+
+
+def exibir_progresso(gravados: int, total: int) -> None:
+    """Mostra, na mesma linha do terminal de erros, os extratos já gravados."""
+    percentual = 100 * gravados // total if total else 100
+    fim_linha = "\n" if gravados == total else ""
+    print(
+        f"\rExtratos gravados: {gravados} de {total} ({percentual}%)",
+        end=fim_linha,
+        file=sys.stderr,
+        flush=True,
+    )
+
+
+def main() -> None:
+    """Interpreta os argumentos de linha de comando e grava os extratos do mês."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    mes_anterior = date.today().replace(day=1) - timedelta(days=1)
+    parser.add_argument(
+        "--mes",
+        default=f"{mes_anterior:%m-%Y}",
+        help="mês dos extratos, no formato mm-yyyy (padrão: o mês anterior)",
+    )
+    parser.add_argument("--saida", default="extratos", metavar="DIRETORIO")
+    parser.add_argument(
+        "--processos",
+        type=int,
+        help="processos trabalhadores (padrão: um por núcleo; 0 usa só o atual)",
+    )
+    parser.add_argument(
+        "--fragmentos", type=int, help="arquivos de saída (padrão: um por processo)"
+    )
+    parser.add_argument("--tamanho-parte", type=int, default=TAMANHO_PARTE)
+    parser.add_argument(
+        "--dados", metavar="DIRETORIO", help="diretório de dados persistidos"
+    )
+    parser.add_argument(
+        "--mock", action="store_true", help="carrega os usuários e contas de exemplo"
+    )
+    args = parser.parse_args()
+    try:
+        inicio, fim = periodo_do_mes(args.mes)
+    except ValueError:
+        parser.error(f"mês inválido: {args.mes!r} (use mm-yyyy)")
+
+    armazenamento = None
+    if args.dados:
+        armazenamento = ArmazenamentoBanco(args.dados)
+        registro = armazenamento.abrir()
+    else:
+        registro = RegistroBancario()
+    if args.mock:
+        carregar_dados_mock(registro)
+
+    try:
+        caminhos = gerar_extratos_mensais(
+            registro,
+            args.saida,
+            inicio,
+            fim,
+            processos=args.processos,
+            fragmentos=args.fragmentos,
+            tamanho_parte=args.tamanho_parte,
+            progresso=exibir_progresso,
+        )
+    finally:
+        if armazenamento is not None:
+            armazenamento.fechar()
+    for caminho in caminhos:
+        print(caminho)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,570 @@
+"""Registro bancário dividido em fragmentos, cada um atendido por um processo.
+
+Um único processo CPython executa as operações do motor em um núcleo. Em
+`RegistroFragmentado`, as contas são distribuídas entre N processos
+trabalhadores pelo número da conta (`fragmento_da_conta`): cada processo guarda
+apenas as contas do seu fragmento, com saldos, extratos e contadores diários
+de saques, e aplica as operações delas com as funções do motor. O processo
+principal faz o papel de roteador: separa as operações por fragmento, envia a
+cada processo o seu lote por um `Pipe` e junta as respostas na ordem original.
+Os lotes de fragmentos diferentes são processados em paralelo; as operações de
+uma mesma conta chegam ao seu processo na ordem em que foram informadas.
+
+Transferências entre contas do mesmo fragmento são aplicadas pelo próprio
+processo (`motor.transferir`). Entre fragmentos, o roteador confirma que a
+conta de destino existe e aceita o instante, debita a origem e, só com o
+débito aceito, credita o destino: como o roteador é o único a enviar operações
+aos fragmentos, nenhuma outra operação se intercala entre as duas etapas.
+
+O processamento em lote (`lote.py --fragmentos N`) usa este registro.
+"""
+
+import itertools
+import multiprocessing
+import time
+import zlib
+from collections.abc import Iterable
+from multiprocessing.connection import Connection
+from typing import Any
+
+from motor import (
+    CONTA_INEXISTENTE,
+    DEPOSITO_VALOR_INVALIDO,
+    INSTANTE_RETROATIVO,
+    MENSAGEM_DEPOSITO,
+    MENSAGEM_SAQUE,
+    MENSAGEM_TRANSFERENCIA,
+    SAQUE_LIMITE_DIARIO_EXCEDIDO,
+    SAQUE_LIMITE_EXCEDIDO,
+    SAQUE_LIMITE_SAQUES_EXCEDIDO,
+    SAQUE_SALDO_INSUFICIENTE,
+    SAQUE_VALOR_INVALIDO,
+    TRANSFERENCIA_MESMA_CONTA,
+    TRANSFERENCIA_SALDO_INSUFICIENTE,
+    TRANSFERENCIA_VALOR_INVALIDO,
+    ResultadoOperacao,
+    StatusOperacao,
+    atualizar_extrato,
+    depositar,
+    instante_da_operacao,
+    obter_extrato,
+    sacar,
+    transferir,
+    verificar_transferencia,
+)
+from persistencia import configurar_diario
+from registro import RegistroBancario
+from saques_diarios import ControleSaquesDiarios
+
+# Operações enviadas aos fragmentos a cada rodada; limita a memória do
+# roteador e o tamanho das mensagens nos pipes.
+TAMANHO_LOTE = 10_000
+
+OPERACAO_DESCONHECIDA = ResultadoOperacao(
+    StatusOperacao.OPERACAO_INVALIDA, "Operação falhou! Operação desconhecida."
+)
+
+# Os resultados voltam dos fragmentos como inteiros: o saldo, quando a operação
+# foi concluída, ou -1 - posição do status da recusa em `StatusOperacao`.
+# Serializar um inteiro custa uma fração de serializar um `ResultadoOperacao`,
+# e todo status tem código, qualquer que seja a recusa devolvida pelo motor.
+_STATUS = tuple(StatusOperacao)
+_CODIGOS_STATUS = {status: -1 - posicao for posicao, status in enumerate(_STATUS)}
+
+
+def _por_status(*recusas: ResultadoOperacao) -> dict[StatusOperacao, ResultadoOperacao]:
+    """Indexa as recusas pelo status, para a reconstrução no roteador."""
+    return {recusa.status: recusa for recusa in recusas}
+
+
+# Recusas reconstruídas pelo roteador para cada operação, a partir do status.
+_RECUSAS_DEPOSITO = _por_status(
+    CONTA_INEXISTENTE, DEPOSITO_VALOR_INVALIDO, INSTANTE_RETROATIVO
+)
+_RECUSAS_SAQUE = _por_status(
+    CONTA_INEXISTENTE,
+    SAQUE_VALOR_INVALIDO,
+    SAQUE_SALDO_INSUFICIENTE,
+    SAQUE_LIMITE_EXCEDIDO,
+    SAQUE_LIMITE_SAQUES_EXCEDIDO,
+    SAQUE_LIMITE_DIARIO_EXCEDIDO,
+    INSTANTE_RETROATIVO,
+)
+_RECUSAS_TRANSFERENCIA = _por_status(
+    CONTA_INEXISTENTE,
+    TRANSFERENCIA_VALOR_INVALIDO,
+    TRANSFERENCIA_SALDO_INSUFICIENTE,
+    TRANSFERENCIA_MESMA_CONTA,
+    INSTANTE_RETROATIVO,
+)
+_RECUSAS_DESCONHECIDA = _por_status(CONTA_INEXISTENTE, OPERACAO_DESCONHECIDA)
+# Mensagem de sucesso e recusas de cada operação de `executar`.
+_DECODIFICACAO = {
+    "deposito": (MENSAGEM_DEPOSITO, _RECUSAS_DEPOSITO),
+    "saque": (MENSAGEM_SAQUE, _RECUSAS_SAQUE),
+}
+
+
+def fragmento_da_conta(numero_conta_corrente: str, fragmentos: int) -> int:
+    """Fragmento responsável pela conta.
+
+    Usa CRC-32 do número em vez de `hash()`, cujo valor para textos muda a cada
+    processo (`PYTHONHASHSEED`).
+    """
+    return zlib.crc32(numero_conta_corrente.encode()) % fragmentos
+
+
+def aplicar_operacoes(
+    registro: RegistroBancario,
+    operacoes: Iterable[tuple[str, str, int]],
+    *,
+    limite: int,
+    limite_saques: int,
+    limite_diario: int | None,
+    saques_diarios: ControleSaquesDiarios,
+    instante: int,
+) -> list[ResultadoOperacao]:
+    """Aplica depósitos e saques às contas de um registro, na ordem.
+
+    Args:
+        registro (RegistroBancario): Registro com as contas movimentadas.
+        operacoes (Iterable[tuple[str, str, int]]): Operação ("deposito" ou
+            "saque"), número da conta e valor em centavos.
+        limite (int): Valor máximo por saque, em centavos.
+        limite_saques (int): Quantidade máxima de saques por conta e por dia.
+        limite_diario (int | None): Total máximo sacado por conta e por dia.
+        saques_diarios (ControleSaquesDiarios): Contadores diários de saques.
+        instante (int): Momento das operações, em segundos desde a época.
+
+    Returns:
+        list[ResultadoOperacao]: Resultado de cada operação, na mesma ordem.
+    """
+    buscar_conta = registro.buscar_conta
+    resultados = []
+    for operacao, numero, valor in operacoes:
+        conta = buscar_conta(numero)
+        if conta is None:
+            resultado = CONTA_INEXISTENTE
+        elif operacao == "deposito":
+            resultado = depositar(conta, valor, instante=instante)
+        elif operacao == "saque":
+            resultado = sacar(
+                conta,
+                valor,
+                limite=limite,
+                limite_saques=limite_saques,
+                limite_diario=limite_diario,
+                saques_diarios=saques_diarios,
+                instante=instante,
+            )
+        else:
+            resultado = OPERACAO_DESCONHECIDA
+        resultados.append(resultado)
+    return resultados
+
+
+def _codificar(resultados: Iterable[ResultadoOperacao]) -> list[int]:
+    """Converte os resultados do motor nos inteiros enviados ao roteador."""
+    sucesso = StatusOperacao.SUCESSO
+    codigos = _CODIGOS_STATUS
+    return [
+        resultado.saldo if resultado.status is sucesso else codigos[resultado.status]
+        for resultado in resultados
+    ]
+
+
+def _decodificar(
+    codigo: int,
+    mensagem: str,
+    recusas: dict[StatusOperacao, ResultadoOperacao],
+) -> ResultadoOperacao:
+    """Reconstrói o resultado a partir do inteiro recebido de um fragmento.
+
+    Uma recusa volta como a constante do motor com o mesmo status em
+    `recusas`; um status sem constante para a operação ganha um resultado com
+    mensagem genérica.
+    """
+    if codigo < 0:
+        status = _STATUS[-1 - codigo]
+        recusa = recusas.get(status)
+        if recusa is None:
+            recusa = ResultadoOperacao(status, f"Operação falhou! ({status})")
+        return recusa
+    return ResultadoOperacao(StatusOperacao.SUCESSO, mensagem, codigo)
+
+
+def _debitar_transferencia(
+    conta: dict[str, Any], valor: int, instante: int
+) -> ResultadoOperacao:
+    """Primeira etapa de uma transferência entre fragmentos: o débito na origem.
+
+    As verificações são as de `motor.transferir`; o último instante do destino
+    já foi conferido pelo fragmento dele, na rodada anterior.
+    """
+    verificacao = verificar_transferencia(conta, None, valor, instante)
+    if isinstance(verificacao, ResultadoOperacao):
+        return verificacao
+    saldo = conta.get("saldo", 0) - valor
+    conta["saldo"] = saldo
+    atualizar_extrato(
+        extrato=obter_extrato(conta),
+        operacao="transferencia_enviada",
+        valor=valor,
+        instante=instante,
+    )
+    return ResultadoOperacao(StatusOperacao.SUCESSO, MENSAGEM_TRANSFERENCIA, saldo)
+
+
+def _creditar_transferencia(conta: dict[str, Any], valor: int, instante: int) -> None:
+    """Segunda etapa de uma transferência entre fragmentos: o crédito no destino."""
+    conta["saldo"] = conta.get("saldo", 0) + valor
+    atualizar_extrato(
+        extrato=obter_extrato(conta),
+        operacao="transferencia_recebida",
+        valor=valor,
+        instante=instante,
+    )
+
+
+def _atender_fragmento(
+    conexao: Connection,
+    limite: int,
+    limite_saques: int,
+    limite_diario: int | None,
+) -> None:
+    """Laço do processo de um fragmento: recebe comandos e devolve respostas.
+
+    Cada mensagem é uma tupla `(comando, carga)`, e cada comando recebe
+    exatamente uma resposta, na ordem de chegada.
+    """
+    # Um diário herdado do processo principal não é do fragmento: as operações
+    # daqui são persistidas pelo principal, a partir de `exportar_contas`.
+    configurar_diario(None)
+    registro = RegistroBancario()
+    saques_diarios = ControleSaquesDiarios()
+    buscar_conta = registro.buscar_conta
+
+    while True:
+        comando, carga = conexao.recv()
+        match comando:
+            case "contas":
+                for conta in carga:
+                    registro.adicionar_conta(conta)
+                resposta = len(registro.lista_contas)
+            case "operacoes":
+                instante, operacoes = carga
+                resposta = _codificar(
+                    aplicar_operacoes(
+                        registro,
+                        operacoes,
+                        limite=limite,
+                        limite_saques=limite_saques,
+                        limite_diario=limite_diario,
+                        saques_diarios=saques_diarios,
+                        instante=instante,
+                    )
+                )
+            case "destinos":
+                # Zero: a conta existe e aceita um crédito no instante do lote.
+                instante, numeros = carga
+                resposta = []
+                for numero in numeros:
+                    destino = buscar_conta(numero)
+                    if destino is None:
+                        resposta.append(_CODIGOS_STATUS[CONTA_INEXISTENTE.status])
+                    elif instante_da_operacao(instante, obter_extrato(destino)) is None:
+                        resposta.append(_CODIGOS_STATUS[INSTANTE_RETROATIVO.status])
+                    else:
+                        resposta.append(0)
+            case "transferencias":
+                # Destino None: débito de uma transferência entre fragmentos.
+                instante, transferencias = carga
+                resposta = []
+                for numero_origem, numero_destino, valor in transferencias:
+                    origem = buscar_conta(numero_origem)
+                    destino = (
+                        None if numero_destino is None else buscar_conta(numero_destino)
+                    )
+                    if origem is None or (numero_destino and destino is None):
+                        resposta.append(CONTA_INEXISTENTE)
+                    elif destino is None:
+                        resposta.append(_debitar_transferencia(origem, valor, instante))
+                    else:
+                        resposta.append(
+                            transferir(origem, destino, valor, instante=instante)
+                        )
+                resposta = _codificar(resposta)
+            case "creditos":
+                instante, creditos = carga
+                for numero, valor in creditos:
+                    _creditar_transferencia(buscar_conta(numero), valor, instante)
+                resposta = len(creditos)
+            case "exportar":
+                resposta = list(registro.lista_contas)
+            case "conferir":
+                contas = registro.lista_contas
+                resposta = (
+                    len(contas),
+                    sum(conta["saldo"] for conta in contas),
+                    sum(
+                        conta["saldo"] != obter_extrato(conta).agregados.movimento_ate()
+                        for conta in contas
+                    ),
+                )
+            case _:  # "encerrar"
+                conexao.send(None)
+                conexao.close()
+                return
+        conexao.send(resposta)
+
+
+class RegistroFragmentado:
+    """Contas distribuídas entre processos, com um roteador no processo atual.
+
+    Deve ser encerrado com `fechar` (ou usado em um bloco `with`). As contas
+    devem começar com saldo zero ou com o saldo refletido no extrato, para que
+    `conferir` possa comparar saldos e extratos.
+
+    Attributes:
+        fragmentos (int): Quantidade de processos (fragmentos).
+    """
+
+    def __init__(
+        self,
+        fragmentos: int,
+        *,
+        limite: int,
+        limite_saques: int,
+        limite_diario: int | None = None,
+    ) -> None:
+        self.fragmentos = fragmentos
+        self._ultimo_instante = 0
+        self._conexoes: list[Connection] = []
+        self._processos: list[multiprocessing.Process] = []
+        for _ in range(fragmentos):
+            local, remota = multiprocessing.Pipe()
+            processo = multiprocessing.Process(
+                target=_atender_fragmento,
+                args=(remota, limite, limite_saques, limite_diario),
+                daemon=True,
+            )
+            processo.start()
+            remota.close()
+            self._conexoes.append(local)
+            self._processos.append(processo)
+
+    def __enter__(self) -> "RegistroFragmentado":
+        return self
+
+    def __exit__(self, *excecao: object) -> None:
+        self.fechar()
+
+    def _instante(self, instante: int | None) -> int:
+        """Instante de um lote: o informado ou o atual, que nunca recua.
+
+        Os fragmentos recusam instantes anteriores à última transação da conta
+        (`motor.instante_da_operacao`); sem instante informado, o roteador não
+        repete um anterior ao do último lote, mesmo com o relógio ajustado
+        para trás.
+        """
+        if instante is None:
+            instante = max(int(time.time()), self._ultimo_instante)
+        self._ultimo_instante = max(instante, self._ultimo_instante)
+        return instante
+
+    def _fragmento(self, numero_conta_corrente: str) -> int:
+        return fragmento_da_conta(numero_conta_corrente, self.fragmentos)
+
+    def _enviar(
+        self, comando: str, lotes: list[Any], instante: int | None = None
+    ) -> list[Any]:
+        """Envia a cada fragmento o seu lote e reúne as respostas, por fragmento.
+
+        Todos os lotes são enviados antes de a primeira resposta ser lida, de
+        modo que os fragmentos trabalham em paralelo. Fragmentos com lote vazio
+        não recebem mensagem e têm resposta None. Com `instante`, a carga
+        enviada é o par `(instante, lote)`.
+        """
+        for conexao, lote in zip(self._conexoes, lotes):
+            if lote:
+                conexao.send((comando, lote if instante is None else (instante, lote)))
+        return [
+            conexao.recv() if lote else None
+            for conexao, lote in zip(self._conexoes, lotes)
+        ]
+
+    def adicionar_contas(self, contas: Iterable[dict[str, Any]]) -> int:
+        """Envia cada conta ao processo do seu fragmento.
+
+        Returns:
+            int: Quantidade total de contas nos fragmentos.
+        """
+        lotes = [[] for _ in self._conexoes]
+        for conta in contas:
+            lotes[self._fragmento(conta["numero_conta_corrente"])].append(conta)
+        self._enviar("contas", lotes)
+        return sum(quantidade for quantidade, _, _ in self.conferir())
+
+    def executar(
+        self,
+        operacoes: Iterable[tuple[str, str, int]],
+        *,
+        instante: int | None = None,
+    ) -> list[ResultadoOperacao]:
+        """Aplica depósitos e saques nos fragmentos, em lotes de `TAMANHO_LOTE`.
+
+        Args:
+            operacoes (Iterable[tuple[str, str, int]]): Operação ("deposito" ou
+                "saque"), número da conta e valor em centavos.
+            instante (int | None): Momento das operações; se None, o atual.
+
+        Returns:
+            list[ResultadoOperacao]: Resultado de cada operação, na ordem das
+                operações informadas.
+        """
+        instante = self._instante(instante)
+        fragmentos = self.fragmentos
+        resultados: list[ResultadoOperacao] = []
+        operacoes = iter(operacoes)
+        while lote := list(itertools.islice(operacoes, TAMANHO_LOTE)):
+            posicoes = [[] for _ in self._conexoes]
+            lotes = [[] for _ in self._conexoes]
+            for posicao, operacao in enumerate(lote):
+                # Mesmo cálculo de `fragmento_da_conta`, sem a chamada.
+                fragmento = zlib.crc32(operacao[1].encode()) % fragmentos
+                posicoes[fragmento].append(posicao)
+                lotes[fragmento].append(operacao)
+
+            ordenados: list[Any] = [None] * len(lote)
+            for posicoes_fragmento, codigos in zip(
+                posicoes,
+                self._enviar("operacoes", lotes, instante),
+            ):
+                for posicao, codigo in zip(posicoes_fragmento, codigos or ()):
+                    mensagem, recusas = _DECODIFICACAO.get(
+                        lote[posicao][0], ("", _RECUSAS_DESCONHECIDA)
+                    )
+                    ordenados[posicao] = _decodificar(codigo, mensagem, recusas)
+            resultados += ordenados
+        return resultados
+
+    def transferir(
+        self,
+        numero_origem: str,
+        numero_destino: str,
+        valor: int,
+        *,
+        instante: int | None = None,
+    ) -> ResultadoOperacao:
+        """Transfere entre duas contas, do mesmo fragmento ou não."""
+        return self.transferir_lote(
+            [(numero_origem, numero_destino, valor)], instante=instante
+        )[0]
+
+    def transferir_lote(
+        self,
+        transferencias: Iterable[tuple[str, str, int]],
+        *,
+        instante: int | None = None,
+    ) -> list[ResultadoOperacao]:
+        """Aplica um lote de transferências em três rodadas paralelas.
+
+        1. Os fragmentos de destino confirmam que as contas de destino das
+           transferências entre fragmentos existem e aceitam o instante.
+        2. Cada fragmento de origem aplica, na ordem, as transferências
+           internas e os débitos das transferências entre fragmentos.
+        3. Os fragmentos de destino recebem os créditos dos débitos aceitos.
+
+        Dentro de um lote, os créditos entre fragmentos só ficam disponíveis
+        depois de todos os débitos: um débito não conta com um crédito
+        recebido de outro fragmento no mesmo lote.
+
+        Args:
+            transferencias (Iterable[tuple[str, str, int]]): Número da conta de
+                origem, número da conta de destino e valor em centavos.
+            instante (int | None): Momento das operações; se None, o atual.
+
+        Returns:
+            list[ResultadoOperacao]: Resultado de cada transferência, na ordem
+                informada.
+        """
+        instante = self._instante(instante)
+        transferencias = list(transferencias)
+        resultados: list[ResultadoOperacao] = [CONTA_INEXISTENTE] * len(transferencias)
+
+        destinos_por_fragmento = [[] for _ in self._conexoes]
+        entre_fragmentos = []
+        for posicao, (origem, destino, _) in enumerate(transferencias):
+            fragmento_destino = self._fragmento(destino)
+            if self._fragmento(origem) != fragmento_destino:
+                destinos_por_fragmento[fragmento_destino].append(posicao)
+                entre_fragmentos.append(posicao)
+        destino_aceito = [True] * len(transferencias)
+        for posicoes, respostas in zip(
+            destinos_por_fragmento,
+            self._enviar(
+                "destinos",
+                [
+                    [transferencias[posicao][1] for posicao in posicoes]
+                    for posicoes in destinos_por_fragmento
+                ],
+                instante,
+            ),
+        ):
+            for posicao, codigo in zip(posicoes, respostas or ()):
+                if codigo:
+                    destino_aceito[posicao] = False
+                    resultados[posicao] = _decodificar(
+                        codigo, MENSAGEM_TRANSFERENCIA, _RECUSAS_TRANSFERENCIA
+                    )
+
+        posicoes_origem = [[] for _ in self._conexoes]
+        lotes = [[] for _ in self._conexoes]
+        for posicao, (origem, destino, valor) in enumerate(transferencias):
+            if not destino_aceito[posicao]:
+                continue
+            fragmento = self._fragmento(origem)
+            posicoes_origem[fragmento].append(posicao)
+            mesmo_fragmento = fragmento == self._fragmento(destino)
+            lotes[fragmento].append(
+                (origem, destino if mesmo_fragmento else None, valor)
+            )
+        for posicoes, respostas in zip(
+            posicoes_origem,
+            self._enviar("transferencias", lotes, instante),
+        ):
+            for posicao, codigo in zip(posicoes, respostas or ()):
+                resultados[posicao] = _decodificar(
+                    codigo, MENSAGEM_TRANSFERENCIA, _RECUSAS_TRANSFERENCIA
+                )
+
+        creditos = [[] for _ in self._conexoes]
+        for posicao in entre_fragmentos:
+            if resultados[posicao].sucesso:
+                _, destino, valor = transferencias[posicao]
+                creditos[self._fragmento(destino)].append((destino, valor))
+        self._enviar("creditos", creditos, instante)
+        return resultados
+
+    def exportar_contas(self) -> list[dict[str, Any]]:
+        """Cópias das contas de todos os fragmentos, com saldos e extratos atuais."""
+        return [
+            conta
+            for contas in self._enviar("exportar", [True] * self.fragmentos)
+            for conta in contas
+        ]
+
+    def conferir(self) -> list[tuple[int, int, int]]:
+        """Quantidade de contas, soma dos saldos e contas com saldo divergente do
+        extrato (`agregados.movimento_ate()`), por fragmento."""
+        return self._enviar("conferir", [True] * self.fragmentos)
+
+    def fechar(self) -> None:
+        """Encerra os processos dos fragmentos."""
+        for conexao in self._conexoes:
+            if not conexao.closed:
+                conexao.send(("encerrar", None))
+                conexao.recv()
+                conexao.close()
+        for processo in self._processos:
+            processo.join()
@@ -0,0 +1,120 @@
+"""Modelos de layout pré-compilados para os relatórios em tabelas ASCII.
+
+As larguras das colunas são declaradas uma única vez e, na importação do
+módulo, são montados os separadores, cabeçalhos e modelos de formatação de cada
+relatório. Assim, cada linha (ou bloco) de dados é renderizada com uma única
+operação de formatação `%`, sem recalcular as partes fixas da tabela.
+"""
+
+from collections.abc import Sequence
+
+
+def escapar(texto: str) -> str:
+    """Escapa o caractere "%" de um texto fixo para uso dentro de um modelo `%`."""
+    return texto.replace("%", "%%")
+
+
+class LayoutTabela:
+    """Tabela ASCII de colunas com largura fixa, delimitadas por "|".
+
+    Os valores de cada coluna são centralizados com `str.center`, preservando a
+    aparência das tabelas montadas manualmente.
+
+    Attributes:
+        larguras (tuple[int, ...]): Largura interna de cada coluna.
+        largura_total (int): Largura da linha completa, incluindo as bordas.
+        separador (str): Linha horizontal com a largura total da tabela.
+        formato (str): Modelo `%` da linha, com um campo por coluna.
+    """
+
+    def __init__(self, larguras: Sequence[int]) -> None:
+        self.larguras: tuple[int, ...] = tuple(larguras)
+        self.largura_total = sum(self.larguras) + len(self.larguras) + 1
+        self.separador = "-" * self.largura_total
+        self.formato = "|" + "|".join("%s" for _ in self.larguras) + "|"
+
+    def centralizar(self, *valores: str) -> tuple[str, ...]:
+        """Centraliza cada valor na largura da respectiva coluna."""
+        return tuple(map(str.center, valores, self.larguras))
+
+    def linha(self, *valores: str) -> str:
+        """Renderiza uma linha de dados com uma única operação de formatação."""
+        return self.formato % self.centralizar(*valores)
+
+    def titulo(self, texto: str) -> str:
+        """Monta uma linha com o texto centralizado na largura total."""
+        return f"|{texto.center(self.largura_total - 2)}|"
+
+
+# Listagem de usuários (`iterar_listagem_usuarios`).
+LAYOUT_INFORMACOES_CADASTRAIS = LayoutTabela((41, 17, 22))
+LAYOUT_ENDERECOS_1 = LayoutTabela((40, 18, 22))
+LAYOUT_ENDERECOS_2 = LayoutTabela((32, 6, 42))
+LAYOUT_CONTAS = LayoutTabela((27, 27, 26))
+LAYOUT_SECAO = LayoutTabela((82,))
+
+SEPARADOR_TABELA = LAYOUT_SECAO.separador
+SEPARADOR_SECAO_TABELA = LAYOUT_SECAO.linha("")
+PREENCHIMENTO_ENDERECOS_2 = "#" * LAYOUT_ENDERECOS_2.larguras[2]
+
+# Bloco fixo de cada usuário: recebe o número do usuário seguido dos valores
+# das três tabelas de dados, já centralizados nas larguras abaixo.
+LARGURAS_BLOCO_USUARIO = (
+    LAYOUT_INFORMACOES_CADASTRAIS.larguras
+    + LAYOUT_ENDERECOS_1.larguras
+    + LAYOUT_ENDERECOS_2.larguras
+)
+MODELO_BLOCO_USUARIO = "\n".join(
+    [
+        "\n\nUsuário #%s",
+        SEPARADOR_TABELA,
+        escapar(LAYOUT_SECAO.titulo("*INFORMAÇÕES CADASTRAIS*")),
+        SEPARADOR_TABELA,
+        escapar(
+            LAYOUT_INFORMACOES_CADASTRAIS.linha("NOME", "CPF", "DATA DE NASCIMENTO")
+        ),
+        SEPARADOR_TABELA,
+        LAYOUT_INFORMACOES_CADASTRAIS.formato,
+        SEPARADOR_TABELA,
+        SEPARADOR_SECAO_TABELA,
+        SEPARADOR_TABELA,
+        escapar(LAYOUT_SECAO.titulo("*ENDEREÇOS CADASTRADOS*")),
+        SEPARADOR_TABELA,
+        escapar(LAYOUT_ENDERECOS_1.linha("LOGRADOURO", "NUMERO", "BAIRRO")),
+        SEPARADOR_TABELA,
+        LAYOUT_ENDERECOS_1.formato,
+        SEPARADOR_TABELA,
+        escapar(LAYOUT_ENDERECOS_2.linha("CIDADE", "UF", PREENCHIMENTO_ENDERECOS_2)),
+        SEPARADOR_TABELA,
+        LAYOUT_ENDERECOS_2.formato,
+        SEPARADOR_TABELA,
+        SEPARADOR_SECAO_TABELA,
+        SEPARADOR_TABELA,
+        escapar(LAYOUT_SECAO.titulo("*DADOS BANCÁRIOS*")),
+        SEPARADOR_TABELA,
+    ]
+)
+CABECALHO_CONTAS = "\n".join(
+    [
+        "",
+        LAYOUT_CONTAS.linha("AGÊNCIA", "CONTA CORRENTE", "TITULAR DA CONTA (CPF)"),
+        SEPARADOR_TABELA,
+    ]
+)
+MODELO_LINHA_CONTA = f"\n{LAYOUT_CONTAS.formato}\n{SEPARADOR_TABELA}"
+SEM_CONTAS = f"\n|{' Nenhuma conta cadastrada.'.ljust(82)}|\n{SEPARADOR_TABELA}\n"
+
+# Extrato (`gerar_extrato`): data, tipo centralizado em 10 colunas e valor.
+LARGURA_EXTRATO = 70
+CABECALHO_EXTRATO = " EXTRATO ".center(LARGURA_EXTRATO, "=")
+MODELO_LINHA_EXTRATO = (
+    f"\n{'-' * LARGURA_EXTRATO}\n%s{'|'.center(10)}%s{'|'.center(10)}%21s"
+)
+MODELO_SALDO_EXTRATO = f"\n\n\n%{LARGURA_EXTRATO}s\n{'=' * LARGURA_EXTRATO}\n"
+# Rodapé da página do extrato paginado, alinhado à direita como o saldo.
+MODELO_PAGINA_EXTRATO = f"\n\n%{LARGURA_EXTRATO}s"
+# Resumo por tipo de operação, uma linha por tipo, acima do saldo.
+MODELO_RESUMO_EXTRATO = f"\n%{LARGURA_EXTRATO}s"
+# Identificação da conta acima de cada extrato dos extratos mensais
+# (`extratos_mensais.py`): agência e conta à esquerda, titular à direita.
+MODELO_CONTA_EXTRATO = f"\n%-{LARGURA_EXTRATO // 2}s%{LARGURA_EXTRATO // 2}s\n"
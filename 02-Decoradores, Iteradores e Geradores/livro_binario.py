@@ -0,0 +1,422 @@
+"""Livro de extrato em arquivo binário de registros de largura fixa, lido por `mmap`.
+
+Para contas com históricos muito longos, as transações podem ficar em um
+arquivo por conta em vez de na memória. Cada registro ocupa 32 bytes: quatro
+inteiros de 64 bits little-endian com o identificador da conta, o instante
+(segundos desde a época), o código `TipoTransacao` e o valor em centavos.
+
+O arquivo é mapeado em memória e lido por um `memoryview` convertido para
+inteiros de 64 bits, sem cópia: o campo k do registro i é o elemento
+`4 * i + k`, e a coluna de instantes é a visão `campos[1::4]`. Como os registros
+são acrescentados em ordem cronológica, uma faixa de datas é localizada por
+busca binária nessa coluna e apenas os registros da faixa são percorridos: o
+custo de um extrato depende do tamanho da página, não do histórico.
+
+Para que milhares de contas migradas não esgotem os descritores de arquivo do
+processo, no máximo `MAXIMO_ARQUIVOS_ABERTOS` livros ficam com o arquivo
+aberto ao mesmo tempo: ao abrir mais um, o usado há mais tempo é fechado e
+reaberto no próximo acesso.
+"""
+
+import bisect
+import io
+import mmap
+import operator
+import os
+import struct
+from array import array
+from collections import OrderedDict
+from collections.abc import Iterator, Sequence
+from itertools import compress, count, islice
+from typing import Any
+
+from livro_extrato import AgregadosExtrato, LivroExtrato, TipoTransacao, Transacao
+
+# Identificador da conta, instante, tipo e valor (inteiros de 64 bits).
+FORMATO_REGISTRO = struct.Struct("<qqqq")
+TAMANHO_REGISTRO = FORMATO_REGISTRO.size
+CAMPOS_POR_REGISTRO = 4
+
+# Livros com o arquivo aberto ao mesmo tempo. Cada um usa até dois descritores
+# (o arquivo e o mapeamento).
+MAXIMO_ARQUIVOS_ABERTOS = 128
+
+_TIPOS_POR_CODIGO = {tipo.value: tipo for tipo in TipoTransacao}
+
+# Livros com o arquivo aberto, do usado há mais tempo ao mais recente.
+_abertos: "OrderedDict[LivroBinario, None]" = OrderedDict()
+
+
+def identificador_conta(numero_conta_corrente: str) -> int:
+    """Converte o número da conta (ex.: "12345-6") no inteiro gravado nos registros."""
+    return int(numero_conta_corrente.replace("-", ""))
+
+
+class LivroBinario:
+    """Livro de extrato de uma conta gravado em um arquivo de registros fixos.
+
+    Oferece a mesma interface de leitura e gravação de `LivroExtrato`
+    (`registrar`, `iterar`, `transacao`, `len()` e as colunas `valores`,
+    `instantes`, `tipos`, `indices_por_tipo` e `agregados`), de modo que pode
+    ocupar a chave "extrato" de uma conta. As gravações vão direto para o
+    arquivo; o mapeamento em memória é refeito na leitura seguinte, quando o
+    arquivo cresceu. Colunas e geradores de `iterar` obtidos antes de uma
+    gravação continuam lendo o mapeamento anterior, com as transações daquele
+    momento.
+
+    O arquivo é aberto sob demanda e pode ser fechado quando outros livros
+    são abertos (ver `MAXIMO_ARQUIVOS_ABERTOS`); tamanho, último instante e
+    agregados ficam em memória. Como `LivroExtrato`, o livro não é seguro
+    para uso simultâneo por várias threads.
+
+    Attributes:
+        caminho (str): Arquivo do livro.
+        conta_id (int): Identificador da conta, gravado em cada registro.
+    """
+
+    __slots__ = (
+        "caminho",
+        "conta_id",
+        "_arquivo",
+        "_mapa",
+        "_mapas_anteriores",
+        "_campos",
+        "_tamanho",
+        "_ultimo_instante",
+        "_agregados",
+    )
+
+    def __init__(self, caminho: str, conta_id: int) -> None:
+        self.caminho = caminho
+        self.conta_id = conta_id
+        self._arquivo: io.FileIO | None = None
+        self._mapa: mmap.mmap | None = None
+        self._mapas_anteriores: list[mmap.mmap] = []
+        self._campos: memoryview | None = None
+        self._agregados: AgregadosExtrato | None = None
+        descritor = self._obter_arquivo().fileno()
+        tamanho = os.fstat(descritor).st_size
+        if tamanho % TAMANHO_REGISTRO:
+            # Registro incompleto no final (gravação interrompida): descartado.
+            tamanho -= tamanho % TAMANHO_REGISTRO
+            os.truncate(caminho, tamanho)
+        self._tamanho = tamanho
+        self._ultimo_instante: int | None = None
+        if tamanho:
+            _, self._ultimo_instante, _, _ = FORMATO_REGISTRO.unpack(
+                os.pread(descritor, TAMANHO_REGISTRO, tamanho - TAMANHO_REGISTRO)
+            )
+
+    def __len__(self) -> int:
+        return self._tamanho // TAMANHO_REGISTRO
+
+    def registrar(self, tipo: TipoTransacao, valor: int, instante: int) -> None:
+        """Acrescenta uma transação ao final do arquivo.
+
+        Args:
+            tipo (TipoTransacao): Tipo da operação.
+            valor (int): Valor movimentado, em centavos (positivo).
+            instante (int): Momento da transação, em segundos desde a época;
+                deve ser maior ou igual ao da transação anterior.
+
+        Raises:
+            ValueError: Se o instante for anterior ao da última transação.
+        """
+        ultimo = self._ultimo_instante
+        if ultimo is not None and instante < ultimo:
+            raise ValueError(
+                f"Instante {instante} anterior ao da última transação ({ultimo})."
+            )
+        self._obter_arquivo().write(
+            FORMATO_REGISTRO.pack(self.conta_id, instante, tipo, valor)
+        )
+        self._ultimo_instante = instante
+        self._tamanho += TAMANHO_REGISTRO
+        if self._agregados is not None:
+            self._agregados.registrar(tipo, valor, instante)
+
+    def registrar_colunas(
+        self, valores: Sequence[int], instantes: Sequence[int], tipos: Sequence[int]
+    ) -> None:
+        """Acrescenta várias transações ao final do arquivo em uma única escrita.
+
+        Args:
+            valores (Sequence[int]): Valores em centavos.
+            instantes (Sequence[int]): Instantes, em ordem cronológica e a
+                partir do último já registrado.
+            tipos (Sequence[int]): Códigos `TipoTransacao`.
+
+        Raises:
+            ValueError: Se as colunas tiverem tamanhos diferentes ou se os
+                instantes não estiverem em ordem a partir do último registrado.
+        """
+        if not len(valores) == len(instantes) == len(tipos):
+            raise ValueError("As colunas têm quantidades diferentes de transações.")
+        if not instantes:
+            return
+        ultimo = self._ultimo_instante
+        if (ultimo is not None and instantes[0] < ultimo) or not all(
+            map(operator.le, instantes, islice(instantes, 1, None))
+        ):
+            raise ValueError(
+                "Os instantes devem estar em ordem cronológica, a partir do "
+                f"último já registrado ({ultimo})."
+            )
+        quantidade = len(instantes)
+        registros = array("q", bytes(TAMANHO_REGISTRO * quantidade))
+        registros[0::CAMPOS_POR_REGISTRO] = array("q", [self.conta_id]) * quantidade
+        registros[1::CAMPOS_POR_REGISTRO] = array("q", instantes)
+        registros[2::CAMPOS_POR_REGISTRO] = array("q", tipos)
+        registros[3::CAMPOS_POR_REGISTRO] = array("q", valores)
+        self._obter_arquivo().write(registros.tobytes())
+        self._ultimo_instante = instantes[-1]
+        self._tamanho += TAMANHO_REGISTRO * quantidade
+        # Recalculados no próximo acesso, já com as novas transações.
+        self._agregados = None
+
+    @property
+    def ultimo_instante(self) -> int | None:
+        """Instante do registro mais recente, ou None se o arquivo estiver vazio."""
+        return self._ultimo_instante
+
+    def sincronizar(self) -> None:
+        """Força a gravação do arquivo em disco (`fsync`)."""
+        os.fsync(self._obter_arquivo().fileno())
+
+    def fechar(self) -> None:
+        """Libera os mapeamentos e fecha o arquivo.
+
+        Mapeamentos ainda lidos por colunas ou geradores em uso são fechados
+        pelo próprio Python quando a última visão for descartada. Se o livro
+        voltar a ser usado, o arquivo é reaberto.
+        """
+        _abertos.pop(self, None)
+        self._liberar_mapa()
+        self._mapas_anteriores = []
+        if self._arquivo is not None:
+            self._arquivo.close()
+            self._arquivo = None
+
+    def _obter_arquivo(self) -> io.FileIO:
+        """Retorna o arquivo do livro, abrindo-o se necessário.
+
+        Ao passar de `MAXIMO_ARQUIVOS_ABERTOS`, fecha o livro usado há mais
+        tempo.
+        """
+        arquivo = self._arquivo
+        if arquivo is not None:
+            _abertos.move_to_end(self)
+            return arquivo
+        arquivo = self._arquivo = open(self.caminho, "a+b", buffering=0)
+        _abertos[self] = None
+        while len(_abertos) > MAXIMO_ARQUIVOS_ABERTOS:
+            antigo, _ = _abertos.popitem(last=False)
+            antigo.fechar()
+        return arquivo
+
+    def _liberar_mapa(self) -> None:
+        """Descarta o mapeamento atual e fecha os que não têm mais visões.
+
+        Fechar um mapeamento com visões em uso (uma coluna ou um gerador de
+        `iterar` suspenso) levantaria `BufferError`; esses mapeamentos ficam
+        guardados e são fechados em uma troca seguinte, depois de liberados.
+        """
+        if self._campos is not None:
+            self._campos.release()
+            self._campos = None
+        if self._mapa is not None:
+            self._mapas_anteriores.append(self._mapa)
+            self._mapa = None
+        em_uso = []
+        for mapa in self._mapas_anteriores:
+            try:
+                mapa.close()
+            except BufferError:
+                em_uso.append(mapa)
+        self._mapas_anteriores = em_uso
+
+    def _obter_campos(self) -> memoryview:
+        """Retorna os campos do arquivo como inteiros de 64 bits, sem cópia.
+
+        O mapeamento é refeito quando o arquivo cresceu desde o último acesso.
+        """
+        campos = self._campos
+        if campos is None or len(campos) * 8 != self._tamanho:
+            self._liberar_mapa()
+            if not self._tamanho:
+                return memoryview(b"").cast("q")
+            self._mapa = mmap.mmap(
+                self._obter_arquivo().fileno(),
+                self._tamanho,
+                access=mmap.ACCESS_READ,
+            )
+            campos = self._campos = memoryview(self._mapa).cast("q")
+        return campos
+
+    @property
+    def instantes(self) -> memoryview:
+        """Coluna de instantes, como visão do arquivo mapeado (sem cópia)."""
+        return self._obter_campos()[1::CAMPOS_POR_REGISTRO]
+
+    @property
+    def tipos(self) -> memoryview:
+        """Coluna de códigos `TipoTransacao`, como visão do arquivo mapeado."""
+        return self._obter_campos()[2::CAMPOS_POR_REGISTRO]
+
+    @property
+    def valores(self) -> memoryview:
+        """Coluna de valores em centavos, como visão do arquivo mapeado."""
+        return self._obter_campos()[3::CAMPOS_POR_REGISTRO]
+
+    @property
+    def indices_por_tipo(self) -> dict[TipoTransacao, array]:
+        """Posições de cada tipo de operação, calculadas a cada acesso."""
+        tipos = self.tipos
+        return {
+            _TIPOS_POR_CODIGO[codigo]: array(
+                "I", compress(count(), map(codigo.__eq__, tipos))
+            )
+            for codigo in set(tipos)
+        }
+
+    @property
+    def agregados(self) -> AgregadosExtrato:
+        """Totais por tipo e por dia, calculados no primeiro acesso."""
+        if self._agregados is None:
+            self._agregados = AgregadosExtrato.de_transacoes(
+                self.instantes, self.tipos, self.valores
+            )
+        return self._agregados
+
+    def transacao(self, posicao: int) -> Transacao:
+        """Monta a visão da transação armazenada na posição informada."""
+        _, instante, codigo, valor = FORMATO_REGISTRO.unpack_from(
+            self._obter_campos(), posicao * TAMANHO_REGISTRO
+        )
+        return Transacao(instante, _TIPOS_POR_CODIGO[codigo], valor)
+
+    def posicoes(self, inicio: int | None = None, fim: int | None = None) -> range:
+        """Localiza, por busca binária, as posições dos registros de uma faixa de datas.
+
+        Args:
+            inicio (int | None): Instante mínimo (inclusive); None para o início.
+            fim (int | None): Instante máximo (exclusive); None para o final.
+
+        Returns:
+            range: Posições dos registros com `inicio <= instante < fim`.
+        """
+        instantes = self.instantes
+        primeira = 0 if inicio is None else bisect.bisect_left(instantes, inicio)
+        ultima = len(instantes) if fim is None else bisect.bisect_left(instantes, fim)
+        return range(primeira, max(primeira, ultima))
+
+    def iterar(
+        self,
+        tipo: TipoTransacao | None = None,
+        *,
+        inicio: int | None = None,
+        fim: int | None = None,
+        limite: int | None = None,
+        deslocamento: int = 0,
+    ) -> Iterator[Transacao]:
+        """Percorre as transações em ordem cronológica, com filtros opcionais.
+
+        A faixa de datas é localizada por busca binária; sem filtro de tipo, a
+        página (`deslocamento` e `limite`) também é calculada por posição, e
+        apenas os registros devolvidos são lidos.
+
+        Args:
+            tipo (TipoTransacao | None): Tipo de operação a filtrar.
+            inicio (int | None): Instante mínimo (inclusive), em segundos.
+            fim (int | None): Instante máximo (exclusive), em segundos.
+            limite (int | None): Quantidade máxima de transações.
+            deslocamento (int): Transações a pular antes da primeira.
+
+        Yields:
+            Transacao: Transações que atendem aos filtros.
+        """
+        faixa = self.posicoes(inicio, fim)
+        if tipo is None:
+            faixa = faixa[deslocamento:]
+            if limite is not None:
+                faixa = faixa[:limite]
+
+        campos = self._obter_campos()[
+            faixa.start * CAMPOS_POR_REGISTRO : faixa.stop * CAMPOS_POR_REGISTRO
+        ]
+        transacoes = (
+            Transacao(instante, _TIPOS_POR_CODIGO[codigo], valor)
+            for instante, codigo, valor in zip(
+                campos[1::CAMPOS_POR_REGISTRO],
+                campos[2::CAMPOS_POR_REGISTRO],
+                campos[3::CAMPOS_POR_REGISTRO],
+            )
+            if tipo is None or codigo == tipo
+        )
+        if tipo is not None:
+            transacoes = islice(
+                transacoes,
+                deslocamento,
+                None if limite is None else deslocamento + limite,
+            )
+        yield from transacoes
+
+
+def caminho_livro(diretorio: str, numero_conta_corrente: str) -> str:
+    """Arquivo do livro binário da conta no diretório de extratos."""
+    return os.path.join(diretorio, f"{numero_conta_corrente}.extrato")
+
+
+def _chave(transacao: Transacao) -> tuple[int, TipoTransacao, int]:
+    """Campos que identificam uma transação, para comparar os dois livros."""
+    return transacao.instante, transacao.tipo, transacao.valor
+
+
+def migrar_para_livro_binario(conta: dict[str, Any], diretorio: str) -> LivroBinario:
+    """Passa o extrato da conta para um arquivo binário no diretório informado.
+
+    As transações já registradas no livro em memória são gravadas no arquivo
+    (em uma única escrita) e o livro binário passa a ocupar a chave "extrato"
+    da conta; as próximas operações do motor são gravadas direto no arquivo.
+    Um arquivo já existente para a conta (de uma migração anterior) é
+    reaproveitado: se o seu último registro coincide com a transação de mesma
+    posição no livro em memória, apenas as transações seguintes são
+    acrescentadas.
+
+    Args:
+        conta (dict[str, Any]): Conta cujo extrato será migrado.
+        diretorio (str): Diretório dos arquivos de extrato.
+
+    Returns:
+        LivroBinario: O novo livro da conta.
+
+    Raises:
+        ValueError: Se o arquivo existente tiver mais registros que o livro em
+            memória ou não coincidir com ele; a conta continua com o livro
+            anterior.
+    """
+    numero = conta["numero_conta_corrente"]
+    caminho = caminho_livro(diretorio, numero)
+    livro = LivroBinario(caminho, identificador_conta(numero))
+
+    anterior = conta.get("extrato")
+    if isinstance(anterior, LivroExtrato):
+        gravados = len(livro)
+        if gravados and (
+            gravados > len(anterior)
+            or _chave(livro.transacao(gravados - 1))
+            != _chave(anterior.transacao(gravados - 1))
+        ):
+            livro.fechar()
+            raise ValueError(
+                f"O arquivo {caminho} ({gravados} registros) não corresponde "
+                f"ao extrato em memória da conta ({len(anterior)} transações)."
+            )
+        livro.registrar_colunas(
+            anterior.valores[gravados:],
+            anterior.instantes[gravados:],
+            anterior.tipos[gravados:],
+        )
+
+    conta["extrato"] = livro
+    return livro
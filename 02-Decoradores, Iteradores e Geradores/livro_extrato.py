@@ -0,0 +1,477 @@
+"""Livro de transações de uma conta, mantido em ordem cronológica."""
+
+import bisect
+import time
+from array import array
+from collections.abc import Iterable, Iterator
+from datetime import date, datetime, timedelta
+from enum import IntEnum
+from functools import lru_cache
+from itertools import compress, count
+
+
+class TipoTransacao(IntEnum):
+    """Código compacto (um byte) de cada tipo de operação registrada no extrato."""
+
+    DEPOSITO = 1
+    SAQUE = 2
+    # As duas pontas de uma transferência (`motor.transferir`), registradas
+    # com o mesmo instante e valor nos extratos de origem e de destino.
+    TRANSFERENCIA_ENVIADA = 3
+    TRANSFERENCIA_RECEBIDA = 4
+
+    @property
+    def operacao(self) -> str:
+        """Identificador textual da operação (ex.: "deposito", "saque")."""
+        return self.name.lower()
+
+    @property
+    def sinal(self) -> int:
+        """Efeito da operação no saldo: 1 para entradas e -1 para saídas."""
+        return 1 if self in _ENTRADAS else -1
+
+    @property
+    def descricao(self) -> str:
+        """Descrição curta da operação para exibição (ex.: "Depósito", "Saque")."""
+        return _DESCRICOES[self]
+
+    @property
+    def descricao_plural(self) -> str:
+        """Descrição no plural, para os totais (ex.: "Depósitos")."""
+        return _DESCRICOES_PLURAL[self]
+
+    @classmethod
+    def de_operacao(cls, operacao: str) -> "TipoTransacao":
+        """Converte o identificador textual da operação no código correspondente.
+
+        Raises:
+            KeyError: Se a operação não corresponder a nenhum tipo conhecido.
+        """
+        return cls[operacao.upper()]
+
+
+_ENTRADAS = frozenset({TipoTransacao.DEPOSITO, TipoTransacao.TRANSFERENCIA_RECEBIDA})
+# Descrições curtas: cabem na coluna de tipo do extrato (10 caracteres).
+_DESCRICOES = {
+    TipoTransacao.DEPOSITO: "Depósito",
+    TipoTransacao.SAQUE: "Saque",
+    TipoTransacao.TRANSFERENCIA_ENVIADA: "Enviada",
+    TipoTransacao.TRANSFERENCIA_RECEBIDA: "Recebida",
+}
+_DESCRICOES_PLURAL = {
+    TipoTransacao.DEPOSITO: "Depósitos",
+    TipoTransacao.SAQUE: "Saques",
+    TipoTransacao.TRANSFERENCIA_ENVIADA: "Transferências enviadas",
+    TipoTransacao.TRANSFERENCIA_RECEBIDA: "Transferências recebidas",
+}
+# Conversão de código para membro, mais barata que chamar `TipoTransacao(codigo)`.
+_TIPOS_POR_CODIGO = {tipo.value: tipo for tipo in TipoTransacao}
+
+
+@lru_cache(maxsize=4096)
+def formatar_instante(instante: int) -> str:
+    """Formata um instante (segundos desde a época) como "YYYY-MM-DD HH:MM:SS".
+
+    Transações consecutivas costumam compartilhar o mesmo segundo, por isso os
+    textos formatados mais recentes são mantidos em cache.
+    """
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(instante))
+
+
+class Transacao:
+    """Visão de uma transação do livro, criada apenas durante a leitura.
+
+    Attributes:
+        instante (int): Momento da transação, em segundos desde a época.
+        tipo (TipoTransacao): Tipo da operação.
+        valor (int): Valor movimentado, em centavos (positivo).
+    """
+
+    __slots__ = ("instante", "tipo", "valor")
+
+    def __init__(self, instante: int, tipo: TipoTransacao, valor: int) -> None:
+        self.instante = instante
+        self.tipo = tipo
+        self.valor = valor
+
+    @property
+    def data(self) -> str:
+        """Data e hora da transação no formato "YYYY-MM-DD HH:MM:SS"."""
+        return formatar_instante(self.instante)
+
+    def __repr__(self) -> str:
+        return f"Transacao({self.data!r}, {self.tipo.descricao!r}, {self.valor!r})"
+
+
+# Colunas de cada dia em `AgregadosExtrato.acumulados`: total e quantidade de
+# cada tipo de operação.
+_COLUNAS_AGREGADOS = {tipo: 2 * posicao for posicao, tipo in enumerate(TipoTransacao)}
+_LARGURA_AGREGADOS = 2 * len(TipoTransacao)
+
+
+class AgregadosExtrato:
+    """Totais e quantidades acumulados por tipo de operação e por dia.
+
+    Para cada dia com movimentação é guardada uma linha com o total e a
+    quantidade acumulados, desde o início do livro, de cada tipo de operação.
+    A última linha dá os totais gerais; a diferença entre duas linhas dá os
+    totais de um período; e a soma dos totais com o sinal de cada tipo dá o
+    movimento líquido até o fim de um dia, de onde sai o saldo daquele dia.
+    Cada transação atualiza a última linha em tempo constante; as consultas
+    por data são buscas binárias nos dias.
+
+    Attributes:
+        dias (array): Dias com movimentação (`date.toordinal()`), em ordem.
+        acumulados (array): Linhas de `2 * len(TipoTransacao)` inteiros, uma por
+            dia, com total (centavos) e quantidade acumulados de cada tipo.
+    """
+
+    __slots__ = ("dias", "acumulados", "_fim_dia")
+
+    def __init__(self) -> None:
+        self.dias = array("q")
+        self.acumulados = array("q")
+        self._fim_dia = float("-inf")
+
+    @classmethod
+    def de_transacoes(
+        cls, instantes: Iterable[int], tipos: Iterable[int], valores: Iterable[int]
+    ) -> "AgregadosExtrato":
+        """Calcula os agregados a partir das colunas de um livro, em ordem cronológica."""
+        agregados = cls()
+        registrar = agregados.registrar
+        for instante, codigo, valor in zip(instantes, tipos, valores):
+            registrar(_TIPOS_POR_CODIGO[codigo], valor, instante)
+        return agregados
+
+    @classmethod
+    def de_totais_diarios(
+        cls, linhas: Iterable[tuple[int, int, int, int]]
+    ) -> "AgregadosExtrato":
+        """Monta os agregados a partir de totais por dia e tipo já consolidados.
+
+        Args:
+            linhas (Iterable[tuple[int, int, int, int]]): Dia
+                (`date.toordinal()`), código `TipoTransacao`, total em centavos
+                e quantidade de operações, em ordem de dia.
+
+        Returns:
+            AgregadosExtrato: Agregados acumulados dia a dia.
+        """
+        agregados = cls()
+        dias, acumulados = agregados.dias, agregados.acumulados
+        for ordinal, codigo, total, quantidade in linhas:
+            if not dias or dias[-1] != ordinal:
+                dias.append(ordinal)
+                acumulados.extend(
+                    acumulados[-_LARGURA_AGREGADOS:]
+                    or array("q", bytes(8 * _LARGURA_AGREGADOS))
+                )
+            coluna = (
+                len(acumulados)
+                - _LARGURA_AGREGADOS
+                + _COLUNAS_AGREGADOS[_TIPOS_POR_CODIGO[codigo]]
+            )
+            acumulados[coluna] += total
+            acumulados[coluna + 1] += quantidade
+        if dias:
+            agregados._fim_dia = datetime.combine(
+                date.fromordinal(dias[-1] + 1), datetime.min.time()
+            ).timestamp()
+        return agregados
+
+    def registrar(self, tipo: TipoTransacao, valor: int, instante: int) -> None:
+        """Soma uma transação aos acumulados do seu dia.
+
+        Args:
+            tipo (TipoTransacao): Tipo da operação.
+            valor (int): Valor movimentado, em centavos (positivo).
+            instante (int): Momento da transação, em segundos desde a época.
+        """
+        if instante >= self._fim_dia:
+            self._abrir_dia(instante)
+        coluna = len(self.acumulados) - _LARGURA_AGREGADOS + _COLUNAS_AGREGADOS[tipo]
+        self.acumulados[coluna] += valor
+        self.acumulados[coluna + 1] += 1
+
+    def _abrir_dia(self, instante: int) -> None:
+        """Inicia a linha do dia do instante, copiando os acumulados anteriores.
+
+        O fim do dia (meia-noite local seguinte) fica guardado, de modo que a
+        conversão de datas só acontece na primeira transação de cada dia.
+        """
+        dia = date.fromtimestamp(instante)
+        self.dias.append(dia.toordinal())
+        self.acumulados.extend(
+            self.acumulados[-_LARGURA_AGREGADOS:]
+            or array("q", bytes(8 * _LARGURA_AGREGADOS))
+        )
+        self._fim_dia = datetime.combine(
+            dia + timedelta(days=1), datetime.min.time()
+        ).timestamp()
+
+    def _linha_ate(self, dia: date | None) -> int:
+        """Índice da última linha até o dia informado (inclusive), ou -1."""
+        if dia is None:
+            return len(self.dias) - 1
+        return bisect.bisect_right(self.dias, dia.toordinal()) - 1
+
+    def _valor(self, linha: int, coluna: int) -> int:
+        return self.acumulados[linha * _LARGURA_AGREGADOS + coluna] if linha >= 0 else 0
+
+    def totais(
+        self,
+        tipo: TipoTransacao,
+        inicio: date | None = None,
+        fim: date | None = None,
+    ) -> tuple[int, int]:
+        """Retorna o total e a quantidade de operações de um tipo em um período.
+
+        Args:
+            tipo (TipoTransacao): Tipo de operação.
+            inicio (date | None): Primeiro dia do período; None para o início.
+            fim (date | None): Último dia do período (inclusive); None para hoje.
+
+        Returns:
+            tuple[int, int]: Total em centavos e quantidade de operações.
+        """
+        coluna = _COLUNAS_AGREGADOS[tipo]
+        ultima = self._linha_ate(fim)
+        anterior = -1 if inicio is None else self._linha_ate(inicio - timedelta(days=1))
+        return (
+            self._valor(ultima, coluna) - self._valor(anterior, coluna),
+            self._valor(ultima, coluna + 1) - self._valor(anterior, coluna + 1),
+        )
+
+    def movimento_ate(self, dia: date | None = None) -> int:
+        """Movimento líquido (entradas menos saídas) até o fim do dia, em centavos."""
+        linha = self._linha_ate(dia)
+        return sum(
+            tipo.sinal * self._valor(linha, coluna)
+            for tipo, coluna in _COLUNAS_AGREGADOS.items()
+        )
+
+    def saldo_em(self, saldo_atual: int, dia: date) -> int:
+        """Saldo ao fim do dia, obtido do saldo atual e do movimento posterior.
+
+        Args:
+            saldo_atual (int): Saldo atual da conta, em centavos.
+            dia (date): Dia consultado.
+
+        Returns:
+            int: Saldo ao fim do dia, em centavos.
+        """
+        return saldo_atual - (self.movimento_ate() - self.movimento_ate(dia))
+
+    def saldos_diarios(self, saldo_atual: int) -> Iterator[tuple[date, int]]:
+        """Percorre o saldo ao fim de cada dia com movimentação.
+
+        Args:
+            saldo_atual (int): Saldo atual da conta, em centavos.
+
+        Yields:
+            tuple[date, int]: Dia e saldo ao fim do dia, em centavos.
+        """
+        saldo_inicial = saldo_atual - self.movimento_ate()
+        for linha, ordinal in enumerate(self.dias):
+            movimento = sum(
+                tipo.sinal * self._valor(linha, coluna)
+                for tipo, coluna in _COLUNAS_AGREGADOS.items()
+            )
+            yield date.fromordinal(ordinal), saldo_inicial + movimento
+
+
+class LivroExtrato:
+    """Registro somente de inclusão (append-only) das transações de uma conta.
+
+    As transações são guardadas na ordem em que acontecem, que é também a ordem
+    cronológica, de modo que o extrato completo é uma leitura sequencial sem
+    necessidade de ordenação. Para cada tipo de operação é mantido um índice
+    lateral com as posições das respectivas transações, permitindo o extrato
+    filtrado sem percorrer as transações dos demais tipos.
+
+    O armazenamento é colunar: cada campo fica em um `array` de tipo primitivo,
+    ocupando cerca de 21 bytes por transação (8 do valor, 8 do instante, 1 do
+    tipo e 4 do índice por tipo), contra centenas de bytes de um dicionário.
+
+    Os agregados por tipo e por dia (`AgregadosExtrato`) são calculados no
+    primeiro acesso a `agregados` e, a partir daí, atualizados a cada
+    transação registrada.
+
+    Attributes:
+        valores (array): Valores movimentados, em centavos.
+        instantes (array): Instantes das transações, em segundos desde a época.
+        tipos (array): Código `TipoTransacao` de cada transação.
+        indices_por_tipo (dict[TipoTransacao, array]): Posições de cada tipo de
+            operação nas colunas acima, também em ordem.
+    """
+
+    __slots__ = ("valores", "instantes", "tipos", "indices_por_tipo", "_agregados")
+
+    def __init__(self) -> None:
+        self.valores = array("q")
+        self.instantes = array("q")
+        self.tipos = array("B")
+        self.indices_por_tipo: dict[TipoTransacao, array] = {}
+        self._agregados: AgregadosExtrato | None = None
+
+    def __len__(self) -> int:
+        return len(self.tipos)
+
+    @classmethod
+    def de_colunas(
+        cls,
+        valores: array,
+        instantes: array,
+        tipos: array,
+        indices_por_tipo: dict[TipoTransacao, array] | None = None,
+    ) -> "LivroExtrato":
+        """Monta um livro a partir de colunas já em ordem cronológica.
+
+        Usado na recuperação de dados persistidos: as colunas são adotadas sem
+        cópia.
+
+        Args:
+            valores (array): Coluna de valores (`array("q")`), em centavos.
+            instantes (array): Coluna de instantes (`array("q")`).
+            tipos (array): Coluna de códigos `TipoTransacao` (`array("B")`).
+            indices_por_tipo (dict[TipoTransacao, array] | None): Posições de
+                cada tipo (`array("I")`); se None, são recalculadas a partir de
+                `tipos`.
+
+        Returns:
+            LivroExtrato: Livro com as transações informadas.
+        """
+        livro = cls.__new__(cls)
+        livro.valores = valores
+        livro.instantes = instantes
+        livro.tipos = tipos
+        if indices_por_tipo is None:
+            indices_por_tipo = {
+                _TIPOS_POR_CODIGO[codigo]: array(
+                    "I", compress(count(), map(codigo.__eq__, tipos))
+                )
+                for codigo in set(tipos)
+            }
+        livro.indices_por_tipo = indices_por_tipo
+        livro._agregados = None
+        return livro
+
+    @property
+    def agregados(self) -> AgregadosExtrato:
+        """Totais por tipo e por dia, calculados no primeiro acesso."""
+        if self._agregados is None:
+            self._agregados = AgregadosExtrato.de_transacoes(
+                self.instantes, self.tipos, self.valores
+            )
+        return self._agregados
+
+    @property
+    def ultimo_instante(self) -> int | None:
+        """Instante da transação mais recente, ou None se o livro estiver vazio."""
+        return self.instantes[-1] if self.instantes else None
+
+    def registrar(self, tipo: TipoTransacao, valor: int, instante: int) -> None:
+        """Acrescenta uma transação ao final do livro e ao índice do seu tipo.
+
+        Args:
+            tipo (TipoTransacao): Tipo da operação.
+            valor (int): Valor movimentado, em centavos (positivo).
+            instante (int): Momento da transação, em segundos desde a época;
+                deve ser maior ou igual ao da transação anterior.
+
+        Raises:
+            ValueError: Se o instante for anterior ao da última transação: as
+                buscas por período e os agregados dependem da ordem cronológica.
+        """
+        instantes = self.instantes
+        if instantes and instante < instantes[-1]:
+            raise ValueError(
+                f"Instante {instante} anterior ao da última transação "
+                f"({instantes[-1]})."
+            )
+        indices = self.indices_por_tipo.get(tipo)
+        if indices is None:
+            indices = self.indices_por_tipo[tipo] = array("I")
+        indices.append(len(self.tipos))
+        self.valores.append(valor)
+        instantes.append(instante)
+        self.tipos.append(tipo)
+        if self._agregados is not None:
+            self._agregados.registrar(tipo, valor, instante)
+
+    def transacao(self, posicao: int) -> Transacao:
+        """Monta a visão da transação armazenada na posição informada."""
+        return Transacao(
+            self.instantes[posicao],
+            _TIPOS_POR_CODIGO[self.tipos[posicao]],
+            self.valores[posicao],
+        )
+
+    def posicoes(self, inicio: int | None = None, fim: int | None = None) -> range:
+        """Localiza, por busca binária, as posições das transações de uma faixa de datas.
+
+        Args:
+            inicio (int | None): Instante mínimo (inclusive); None para o início.
+            fim (int | None): Instante máximo (exclusive); None para o final.
+
+        Returns:
+            range: Posições das transações com `inicio <= instante < fim`.
+        """
+        instantes = self.instantes
+        primeira = 0 if inicio is None else bisect.bisect_left(instantes, inicio)
+        ultima = len(instantes) if fim is None else bisect.bisect_left(instantes, fim)
+        return range(primeira, max(primeira, ultima))
+
+    def iterar(
+        self,
+        tipo: TipoTransacao | None = None,
+        *,
+        inicio: int | None = None,
+        fim: int | None = None,
+        limite: int | None = None,
+        deslocamento: int = 0,
+    ) -> Iterator[Transacao]:
+        """Percorre as transações em ordem cronológica, com filtros opcionais.
+
+        A faixa de datas é localizada por busca binária nos instantes (ou, com
+        filtro de tipo, nas posições do índice do tipo, também ordenadas), e a
+        página é recortada por posição: o custo é proporcional às transações
+        devolvidas, não ao histórico.
+
+        Args:
+            tipo (TipoTransacao | None): Tipo de operação a filtrar; se None,
+                todas as transações são devolvidas.
+            inicio (int | None): Instante mínimo (inclusive), em segundos.
+            fim (int | None): Instante máximo (exclusive), em segundos.
+            limite (int | None): Quantidade máxima de transações.
+            deslocamento (int): Transações a pular antes da primeira.
+
+        Yields:
+            Transacao: Transações na ordem em que foram registradas.
+        """
+        faixa = self.posicoes(inicio, fim)
+        if tipo is not None:
+            indices = self.indices_por_tipo.get(tipo, ())
+            faixa = range(
+                bisect.bisect_left(indices, faixa.start),
+                bisect.bisect_left(indices, faixa.stop),
+            )
+        faixa = faixa[deslocamento:]
+        if limite is not None:
+            faixa = faixa[:limite]
+
+        if tipo is None:
+            instantes, tipos, valores = self.instantes, self.tipos, self.valores
+            if len(faixa) != len(instantes):
+                instantes = instantes[faixa.start : faixa.stop]
+                tipos = tipos[faixa.start : faixa.stop]
+                valores = valores[faixa.start : faixa.stop]
+            for instante, codigo, valor in zip(instantes, tipos, valores):
+                yield Transacao(instante, _TIPOS_POR_CODIGO[codigo], valor)
+            return
+
+        instantes = self.instantes
+        valores = self.valores
+        for posicao in indices[faixa.start : faixa.stop]:
+            yield Transacao(instantes[posicao], tipo, valores[posicao])
@@ -0,0 +1,536 @@
+"""Processamento em lote de arquivos de operações (CSV ou JSONL).
+
+Cada linha do arquivo de entrada descreve um depósito ou saque e é aplicada
+pelo motor de transações com as mesmas regras do menu interativo. As operações
+aceitas são gravadas no arquivo de resultados e as recusadas, com o motivo, no
+arquivo de rejeições. Execute a partir do diretório da atividade, por exemplo:
+
+    python lote.py operacoes.csv --resultados resultados.csv --rejeicoes rejeicoes.csv
+"""
+
+import argparse
+import csv
+import json
+import os
+import time
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from typing import TextIO
+
+from desafio import carregar_dados_mock
+from dinheiro import converter_para_centavos, formatar_centavos
+from fragmentos import TAMANHO_LOTE, RegistroFragmentado
+from livro_binario import caminho_livro, migrar_para_livro_binario
+from motor import (
+    CONTA_INEXISTENTE,
+    OPERACAO_INVALIDA,
+    VALOR_NAO_NUMERICO,
+    ResultadoOperacao,
+    StatusOperacao,
+    depositar,
+    sacar,
+)
+from persistencia import ArmazenamentoBanco
+from registro import RegistroBancario
+from saques_diarios import ControleSaquesDiarios
+
+CAMPOS_OBRIGATORIOS = ("operacao", "conta", "valor")
+CAMPOS_RESULTADO = ("linha", "operacao", "conta", "valor", "saldo")
+CAMPOS_REJEICAO = ("linha", "operacao", "conta", "valor", "status", "mensagem")
+
+# Tamanho do buffer dos arquivos de saída: as linhas são acumuladas em memória
+# e gravadas em blocos, sem uma chamada de sistema por operação.
+TAMANHO_BUFFER = 1024 * 1024
+
+# Com `--extratos-binarios`, só os extratos com pelo menos esta quantidade de
+# transações (ou que já têm arquivo) vão para disco; os demais ficam em memória.
+MINIMO_TRANSACOES_BINARIO = 10_000
+
+
+@dataclass(slots=True)
+class OperacaoLote:
+    """Operação lida de uma linha do arquivo de entrada, ainda sem validação.
+
+    Attributes:
+        linha (int): Número da linha no arquivo de entrada.
+        operacao (str): "deposito" ou "saque".
+        conta (str): Número da conta corrente (ex.: "12345-6").
+        valor (str): Valor em reais, como escrito no arquivo (ex.: "10.50").
+        instante (str): Momento da operação em segundos desde a época; se
+            vazio, é usado o instante do processamento. Não pode ser anterior
+            à última movimentação da conta (`motor.INSTANTE_RETROATIVO`).
+    """
+
+    linha: int
+    operacao: str
+    conta: str
+    valor: str
+    instante: str = ""
+
+
+@dataclass(slots=True)
+class ResumoLote:
+    """Totais de um processamento em lote.
+
+    Attributes:
+        total (int): Quantidade de operações lidas.
+        aceitas (int): Operações aplicadas com sucesso.
+        rejeitadas (int): Operações recusadas.
+        segundos (float): Duração do processamento.
+    """
+
+    total: int = 0
+    aceitas: int = 0
+    rejeitadas: int = 0
+    segundos: float = 0.0
+
+    @property
+    def operacoes_por_segundo(self) -> float:
+        """Vazão do processamento, em operações por segundo."""
+        return self.total / self.segundos if self.segundos else 0.0
+
+
+def ler_operacoes_csv(arquivo: TextIO) -> Iterator[OperacaoLote]:
+    """Lê as operações de um CSV com cabeçalho, uma linha por vez.
+
+    O cabeçalho deve conter as colunas "operacao", "conta" e "valor" e pode
+    conter "instante"; a ordem das colunas é livre.
+
+    Args:
+        arquivo (TextIO): Arquivo aberto em modo texto (com `newline=""`).
+
+    Yields:
+        OperacaoLote: Operação de cada linha não vazia; linhas com colunas
+            faltando geram campos vazios, recusados no processamento.
+
+    Raises:
+        ValueError: Se o cabeçalho não tiver as colunas obrigatórias.
+    """
+    leitor = csv.reader(arquivo)
+    cabecalho = next(leitor, None)
+    if cabecalho is None:
+        return
+
+    posicoes = {campo.strip(): i for i, campo in enumerate(cabecalho)}
+    faltando = [campo for campo in CAMPOS_OBRIGATORIOS if campo not in posicoes]
+    if faltando:
+        raise ValueError(f"Cabeçalho sem as colunas: {', '.join(faltando)}")
+
+    indices = [posicoes[campo] for campo in CAMPOS_OBRIGATORIOS]
+    if "instante" in posicoes:
+        indices.append(posicoes["instante"])
+    quantidade_colunas = len(cabecalho)
+
+    for linha, campos in enumerate(leitor, start=2):
+        if not campos:
+            continue
+        if len(campos) < quantidade_colunas:
+            campos += [""] * (quantidade_colunas - len(campos))
+        yield OperacaoLote(linha, *[campos[i] for i in indices])
+
+
+def ler_operacoes_jsonl(arquivo: TextIO) -> Iterator[OperacaoLote]:
+    """Lê as operações de um arquivo JSONL (um objeto JSON por linha).
+
+    Args:
+        arquivo (TextIO): Arquivo aberto em modo texto.
+
+    Yields:
+        OperacaoLote: Operação de cada linha não vazia; linhas que não são um
+            objeto JSON geram uma operação vazia, recusada no processamento.
+    """
+    for linha, texto in enumerate(arquivo, start=1):
+        if not texto.strip():
+            continue
+        try:
+            dados = json.loads(texto)
+        except json.JSONDecodeError:
+            dados = None
+        if not isinstance(dados, dict):
+            yield OperacaoLote(linha, "", "", "")
+            continue
+
+        instante = dados.get("instante")
+        yield OperacaoLote(
+            linha,
+            str(dados.get("operacao", "")),
+            str(dados.get("conta", "")),
+            str(dados.get("valor", "")),
+            "" if instante is None else str(instante),
+        )
+
+
+def _converter_valor_e_instante(
+    operacao: OperacaoLote,
+) -> tuple[int, int | None] | ResultadoOperacao:
+    """Valor em centavos e instante da linha, ou o motivo da rejeição."""
+    try:
+        valor = converter_para_centavos(operacao.valor)
+    except ValueError:
+        return VALOR_NAO_NUMERICO
+    try:
+        return valor, int(operacao.instante) if operacao.instante else None
+    except ValueError:
+        return OPERACAO_INVALIDA
+
+
+def processar_operacoes(
+    registro: RegistroBancario,
+    operacoes: Iterable[OperacaoLote],
+    *,
+    limite: int,
+    limite_saques: int,
+    limite_diario: int | None = None,
+) -> Iterator[tuple[OperacaoLote, ResultadoOperacao]]:
+    """Aplica as operações pelo motor de transações, uma por vez.
+
+    As regras são as do menu interativo (`motor.depositar` e `motor.sacar`):
+    valor positivo com até duas casas, saldo suficiente, limite por saque e
+    quantidade máxima de saques, contada por conta e por dia da operação
+    (`ControleSaquesDiarios`). Linhas fora de ordem, com instante anterior à
+    última movimentação da conta, são recusadas sem alterar a conta.
+
+    Args:
+        registro (RegistroBancario): Registro com as contas movimentadas.
+        operacoes (Iterable[OperacaoLote]): Operações na ordem de aplicação.
+        limite (int): Valor máximo por saque, em centavos.
+        limite_saques (int): Quantidade máxima de saques por conta e por dia.
+        limite_diario (int | None): Total máximo sacado por conta e por dia,
+            em centavos; se None, apenas a quantidade é limitada.
+
+    Yields:
+        tuple[OperacaoLote, ResultadoOperacao]: Cada operação com o seu
+            resultado, na mesma ordem da entrada.
+    """
+    saques_diarios = ControleSaquesDiarios()
+
+    for operacao in operacoes:
+        tipo = operacao.operacao.strip().lower()
+        if tipo not in ("deposito", "saque"):
+            yield operacao, OPERACAO_INVALIDA
+            continue
+
+        conta = registro.buscar_conta(operacao.conta)
+        if conta is None:
+            yield operacao, CONTA_INEXISTENTE
+            continue
+
+        convertidos = _converter_valor_e_instante(operacao)
+        if isinstance(convertidos, ResultadoOperacao):
+            yield operacao, convertidos
+            continue
+        valor, instante = convertidos
+
+        if tipo == "deposito":
+            yield operacao, depositar(conta, valor, instante=instante)
+            continue
+
+        yield operacao, sacar(
+            conta,
+            valor,
+            limite=limite,
+            limite_saques=limite_saques,
+            limite_diario=limite_diario,
+            saques_diarios=saques_diarios,
+            instante=instante,
+        )
+
+
+def processar_operacoes_fragmentadas(
+    fragmentado: RegistroFragmentado,
+    operacoes: Iterable[OperacaoLote],
+) -> Iterator[tuple[OperacaoLote, ResultadoOperacao]]:
+    """Aplica as operações pelos processos de um `RegistroFragmentado`.
+
+    As linhas são validadas aqui, como em `processar_operacoes`, e enviadas ao
+    roteador em lotes de até `TAMANHO_LOTE` operações seguidas com o mesmo
+    instante (`RegistroFragmentado.executar` aplica cada lote em um único
+    instante). Os limites de saque são os informados na criação do registro
+    fragmentado.
+
+    Args:
+        fragmentado (RegistroFragmentado): Registro com as contas movimentadas.
+        operacoes (Iterable[OperacaoLote]): Operações na ordem de aplicação.
+
+    Yields:
+        tuple[OperacaoLote, ResultadoOperacao]: Cada operação com o seu
+            resultado, na mesma ordem da entrada.
+    """
+    # Operações aguardando o envio: a tupla do roteador ou a recusa já conhecida.
+    pendentes: list[tuple[OperacaoLote, tuple[str, str, int] | ResultadoOperacao]] = []
+    enviadas = 0
+    instante_pendente = None
+
+    for operacao in operacoes:
+        tipo = operacao.operacao.strip().lower()
+        if tipo not in ("deposito", "saque"):
+            recusa = OPERACAO_INVALIDA
+        else:
+            recusa = _converter_valor_e_instante(operacao)
+        if isinstance(recusa, ResultadoOperacao):
+            if pendentes:
+                pendentes.append((operacao, recusa))
+            else:
+                yield operacao, recusa
+            continue
+
+        valor, instante = recusa
+        if enviadas and (instante != instante_pendente or enviadas == TAMANHO_LOTE):
+            yield from _aplicar_pendentes(fragmentado, pendentes, instante_pendente)
+            pendentes, enviadas = [], 0
+        pendentes.append((operacao, (tipo, operacao.conta, valor)))
+        enviadas += 1
+        instante_pendente = instante
+
+    if pendentes:
+        yield from _aplicar_pendentes(fragmentado, pendentes, instante_pendente)
+
+
+def _aplicar_pendentes(
+    fragmentado: RegistroFragmentado,
+    pendentes: list[tuple[OperacaoLote, tuple[str, str, int] | ResultadoOperacao]],
+    instante: int | None,
+) -> Iterator[tuple[OperacaoLote, ResultadoOperacao]]:
+    """Envia as operações pendentes ao roteador e as devolve com os resultados."""
+    resultados = iter(
+        fragmentado.executar(
+            [item for _, item in pendentes if not isinstance(item, ResultadoOperacao)],
+            instante=instante,
+        )
+    )
+    for operacao, item in pendentes:
+        if not isinstance(item, ResultadoOperacao):
+            item = next(resultados)
+        yield operacao, item
+
+
+def executar_lote(
+    registro: RegistroBancario | RegistroFragmentado,
+    operacoes: Iterable[OperacaoLote],
+    resultados: TextIO,
+    rejeicoes: TextIO,
+    *,
+    limite: int,
+    limite_saques: int,
+    limite_diario: int | None = None,
+) -> ResumoLote:
+    """Processa as operações e grava os arquivos de resultados e de rejeições.
+
+    A entrada é consumida como fluxo: apenas a operação corrente fica em
+    memória, e as saídas são gravadas à medida que as operações são aplicadas.
+    O consumo de memória do processamento não depende do tamanho do arquivo;
+    cresce apenas o estado das contas (saldo e livro de extrato).
+
+    Args:
+        registro (RegistroBancario | RegistroFragmentado): Registro com as
+            contas movimentadas. Com um `RegistroFragmentado`, as operações são
+            aplicadas pelos fragmentos (`processar_operacoes_fragmentadas`), e
+            os limites de saque são os da criação dele.
+        operacoes (Iterable[OperacaoLote]): Operações na ordem de aplicação.
+        resultados (TextIO): Destino CSV das operações aceitas.
+        rejeicoes (TextIO): Destino CSV das operações recusadas.
+        limite (int): Valor máximo por saque, em centavos.
+        limite_saques (int): Quantidade máxima de saques por conta e por dia.
+        limite_diario (int | None): Total máximo sacado por conta e por dia,
+            em centavos; se None, apenas a quantidade é limitada.
+
+    Returns:
+        ResumoLote: Totais e duração do processamento.
+    """
+    escritor_resultados = csv.writer(resultados)
+    escritor_rejeicoes = csv.writer(rejeicoes)
+    escritor_resultados.writerow(CAMPOS_RESULTADO)
+    escritor_rejeicoes.writerow(CAMPOS_REJEICAO)
+
+    resumo = ResumoLote()
+    inicio = time.perf_counter()
+
+    if isinstance(registro, RegistroFragmentado):
+        processadas = processar_operacoes_fragmentadas(registro, operacoes)
+    else:
+        processadas = processar_operacoes(
+            registro,
+            operacoes,
+            limite=limite,
+            limite_saques=limite_saques,
+            limite_diario=limite_diario,
+        )
+    for operacao, resultado in processadas:
+        if resultado.sucesso:
+            resumo.aceitas += 1
+            escritor_resultados.writerow(
+                (
+                    operacao.linha,
+                    operacao.operacao,
+                    operacao.conta,
+                    operacao.valor,
+                    formatar_centavos(resultado.saldo),
+                )
+            )
+        else:
+            resumo.rejeitadas += 1
+            escritor_rejeicoes.writerow(
+                (
+                    operacao.linha,
+                    operacao.operacao,
+                    operacao.conta,
+                    operacao.valor,
+                    resultado.status,
+                    resultado.mensagem,
+                )
+            )
+
+    resultados.flush()
+    rejeicoes.flush()
+    resumo.total = resumo.aceitas + resumo.rejeitadas
+    resumo.segundos = time.perf_counter() - inicio
+    return resumo
+
+
+def main() -> None:
+    """Interpreta os argumentos de linha de comando e processa o arquivo."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("entrada", help="arquivo de operações (.csv ou .jsonl)")
+    parser.add_argument(
+        "--formato",
+        choices=("csv", "jsonl"),
+        help="formato da entrada; por padrão, deduzido da extensão do arquivo",
+    )
+    parser.add_argument("--resultados", default="resultados.csv")
+    parser.add_argument("--rejeicoes", default="rejeicoes.csv")
+    parser.add_argument(
+        "--limite", default="500.00", help="valor máximo por saque, em reais"
+    )
+    parser.add_argument("--limite-saques", type=int, default=3)
+    parser.add_argument(
+        "--limite-diario", help="total máximo sacado por conta e por dia, em reais"
+    )
+    parser.add_argument(
+        "--dados",
+        metavar="DIRETORIO",
+        help="diretório de dados persistidos: as contas são lidas dele e as "
+        "operações aceitas são gravadas no seu diário",
+    )
+    parser.add_argument(
+        "--mock",
+        action="store_true",
+        help="carrega os usuários e contas de exemplo antes do processamento",
+    )
+    parser.add_argument(
+        "--extratos-binarios",
+        metavar="DIRETORIO",
+        help="grava os extratos longos em arquivos binários no diretório, um "
+        "por conta, acrescentando a cada arquivo as transações que ainda não "
+        "estão nele",
+    )
+    parser.add_argument(
+        "--minimo-binario",
+        type=int,
+        default=MINIMO_TRANSACOES_BINARIO,
+        metavar="N",
+        help="quantidade mínima de transações para o extrato ir para arquivo "
+        f"com --extratos-binarios (padrão: {MINIMO_TRANSACOES_BINARIO}); "
+        "contas que já têm arquivo são sempre migradas",
+    )
+    parser.add_argument(
+        "--fragmentos",
+        type=int,
+        metavar="N",
+        help="divide as contas entre N processos (`RegistroFragmentado`); os "
+        "saldos e extratos voltam ao registro ao final do processamento",
+    )
+    args = parser.parse_args()
+    if args.fragmentos and args.extratos_binarios:
+        parser.error("--fragmentos não pode ser combinado com --extratos-binarios")
+
+    formato = args.formato or (
+        "jsonl" if args.entrada.endswith((".jsonl", ".ndjson")) else "csv"
+    )
+    ler_operacoes = ler_operacoes_jsonl if formato == "jsonl" else ler_operacoes_csv
+
+    armazenamento = None
+    if args.dados:
+        armazenamento = ArmazenamentoBanco(args.dados)
+        registro = armazenamento.abrir()
+    else:
+        registro = RegistroBancario()
+    if args.mock:
+        carregar_dados_mock(registro)
+    livros = []
+    if args.extratos_binarios:
+        os.makedirs(args.extratos_binarios, exist_ok=True)
+        livros = [
+            migrar_para_livro_binario(conta, args.extratos_binarios)
+            for conta in registro.lista_contas
+            if len(conta["extrato"]) >= args.minimo_binario
+            or os.path.exists(
+                caminho_livro(args.extratos_binarios, conta["numero_conta_corrente"])
+            )
+        ]
+
+    limite = converter_para_centavos(args.limite)
+    limite_diario = (
+        converter_para_centavos(args.limite_diario) if args.limite_diario else None
+    )
+    fragmentado = None
+    if args.fragmentos:
+        fragmentado = RegistroFragmentado(
+            args.fragmentos,
+            limite=limite,
+            limite_saques=args.limite_saques,
+            limite_diario=limite_diario,
+        )
+        fragmentado.adicionar_contas(registro.lista_contas)
+
+    with (
+        open(args.entrada, encoding="utf-8", newline="") as entrada,
+        open(
+            args.resultados,
+            "w",
+            encoding="utf-8",
+            newline="",
+            buffering=TAMANHO_BUFFER,
+        ) as resultados,
+        open(
+            args.rejeicoes,
+            "w",
+            encoding="utf-8",
+            newline="",
+            buffering=TAMANHO_BUFFER,
+        ) as rejeicoes,
+    ):
+        resumo = executar_lote(
+            fragmentado or registro,
+            ler_operacoes(entrada),
+            resultados,
+            rejeicoes,
+            limite=limite,
+            limite_saques=args.limite_saques,
+            limite_diario=limite_diario,
+        )
+
+    if fragmentado is not None:
+        # As operações não passaram pelo diário: o estado final volta ao
+        # registro e, com `--dados`, é gravado em um snapshot.
+        for exportada in fragmentado.exportar_contas():
+            conta = registro.buscar_conta(exportada["numero_conta_corrente"])
+            conta["saldo"] = exportada["saldo"]
+            conta["extrato"] = exportada["extrato"]
+        fragmentado.fechar()
+        if armazenamento is not None:
+            armazenamento.gravar_snapshot()
+    if armazenamento is not None:
+        armazenamento.fechar()
+    for livro in livros:
+        livro.sincronizar()
+        livro.fechar()
+
+    print(
+        f"{resumo.total} operações processadas em {resumo.segundos:.2f} s "
+        f"({resumo.operacoes_por_segundo:,.0f} ops/s): "
+        f"{resumo.aceitas} aceitas, {resumo.rejeitadas} rejeitadas."
+    )
+
+
+if __name__ == "__main__":
+    main()
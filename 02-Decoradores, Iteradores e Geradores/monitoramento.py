@@ -0,0 +1,623 @@
+"""Eventos estruturados das operações e destinos (sinks) plugáveis para o log.
+
+O decorador `registrar_log` (em `desafio.py`) mede cada operação e entrega um
+`EventoLog` ao destino configurado, sem formatar texto nem escrever no console
+no caminho da operação. Os destinos disponíveis são:
+
+- `DestinoConsole`: imprime uma linha por operação concluída;
+- `DestinoMemoria`: mantém os eventos mais recentes em um buffer circular;
+- `DestinoArquivoLote`: grava os eventos em JSON Lines, em lotes de N eventos
+  ou a cada T milissegundos (mesmo com o programa ocioso);
+- `DestinoNulo`: descarta os eventos; com ele ativo, o decorador não mede nada.
+
+O destino inicial é escolhido pela variável de ambiente `BANCO_LOG`
+("console", "memoria", "nulo" ou "arquivo:<caminho>") e pode ser trocado em
+tempo de execução com `configurar_log`.
+
+Independentemente do destino, o decorador pode registrar as durações em
+histogramas de latência por operação (`MetricasLatencia`), ativados com
+`ativar_metricas` ou pela variável `BANCO_METRICAS=<arquivo>` (".json" ou
+".prom"), que também define o arquivo de exportação.
+
+Para investigar operações lentas, `ativar_perfil` (ou `BANCO_PERFIL=<diretório>`)
+executa cada operação decorada sob `cProfile` e `tracemalloc`, gravando um
+arquivo `.pstats` e os principais locais de alocação de cada execução.
+"""
+
+import atexit
+import cProfile
+import json
+import os
+import signal
+import threading
+import time
+import tracemalloc
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any
+
+
+@dataclass(slots=True)
+class EventoLog:
+    """Execução de uma operação decorada por `registrar_log`.
+
+    Attributes:
+        operacao (str): Nome da operação.
+        inicio_ns (int): Início, em nanossegundos desde a época (`time_ns`).
+        duracao_ns (int): Duração medida com `perf_counter_ns`.
+        erro (str | None): Nome da exceção lançada pela operação, se houver.
+    """
+
+    operacao: str
+    inicio_ns: int
+    duracao_ns: int
+    erro: str | None = None
+
+    @property
+    def fim_ns(self) -> int:
+        """Fim da operação, em nanossegundos desde a época."""
+        return self.inicio_ns + self.duracao_ns
+
+    @property
+    def resultado(self) -> str:
+        """Situação da operação: "sucesso", ou "erro" se lançou exceção."""
+        return "sucesso" if self.erro is None else "erro"
+
+    def como_dicionario(self) -> dict[str, str | int | None]:
+        """Representação serializável do evento (ex.: para JSON)."""
+        return {
+            "operacao": self.operacao,
+            "inicio_ns": self.inicio_ns,
+            "fim_ns": self.fim_ns,
+            "duracao_ns": self.duracao_ns,
+            "resultado": self.resultado,
+            "erro": self.erro,
+        }
+
+
+MODELO_LINHA_JSON = (
+    '{"operacao": %s, "inicio_ns": %d, "fim_ns": %d, "duracao_ns": %d, '
+    '"resultado": "%s", "erro": %s}\n'
+)
+
+
+@lru_cache(maxsize=256)
+def _json_texto(texto: str | None) -> str:
+    return json.dumps(texto)
+
+
+def linha_json(evento: EventoLog) -> str:
+    """Serializa o evento como uma linha JSON, no formato de `como_dicionario`.
+
+    As linhas são montadas com um modelo `%` pré-definido; apenas os textos
+    (nome da operação e da exceção, que se repetem) passam por `json.dumps`,
+    com cache.
+    """
+    return MODELO_LINHA_JSON % (
+        _json_texto(evento.operacao),
+        evento.inicio_ns,
+        evento.fim_ns,
+        evento.duracao_ns,
+        evento.resultado,
+        _json_texto(evento.erro),
+    )
+
+
+class DestinoLog:
+    """Interface dos destinos de eventos de log.
+
+    Subclasses implementam `emitir`; `descarregar` e `fechar` só precisam ser
+    sobrescritos por destinos que acumulam eventos antes de gravá-los.
+    """
+
+    def emitir(self, evento: EventoLog) -> None:
+        """Recebe o evento de uma operação concluída."""
+        raise NotImplementedError
+
+    def descarregar(self) -> None:
+        """Grava os eventos pendentes, se houver."""
+
+    def fechar(self) -> None:
+        """Grava os eventos pendentes e libera os recursos do destino."""
+        self.descarregar()
+
+
+class DestinoNulo(DestinoLog):
+    """Descarta todos os eventos.
+
+    O decorador reconhece este destino e chama a operação diretamente, sem
+    medir tempos nem criar eventos.
+    """
+
+    def emitir(self, evento: EventoLog) -> None:
+        pass
+
+
+class DestinoConsole(DestinoLog):
+    """Imprime no console uma linha por operação concluída."""
+
+    def emitir(self, evento: EventoLog) -> None:
+        instante = time.strftime(
+            "%Y-%m-%d %H:%M:%S", time.localtime(evento.fim_ns // 1_000_000_000)
+        )
+        situacao = "concluída" if evento.erro is None else f"falhou ({evento.erro})"
+        print(
+            f"[{instante}] Operação {situacao}: {evento.operacao} "
+            f"({evento.duracao_ns / 1e6:.3f} ms)"
+        )
+
+
+class DestinoMemoria(DestinoLog):
+    """Buffer circular com os eventos mais recentes.
+
+    Attributes:
+        eventos (deque[EventoLog]): Eventos retidos, do mais antigo ao mais
+            recente; ao atingir a capacidade, os mais antigos são descartados.
+    """
+
+    def __init__(self, capacidade: int = 10_000) -> None:
+        self.eventos: deque[EventoLog] = deque(maxlen=capacidade)
+
+    def emitir(self, evento: EventoLog) -> None:
+        self.eventos.append(evento)
+
+
+class DestinoArquivoLote(DestinoLog):
+    """Grava os eventos em um arquivo JSON Lines, em lotes.
+
+    Os eventos são acumulados em memória e serializados apenas na gravação, que
+    acontece quando o lote atinge `eventos_por_lote` eventos ou, a cada
+    `intervalo_ms` milissegundos, por uma thread em segundo plano: um processo
+    que fica ocioso (como o servidor entre pedidos) não retém o último lote até
+    o próximo evento. Os pendentes também são gravados em `fechar`, chamado
+    automaticamente no encerramento do programa.
+
+    Attributes:
+        caminho (str): Arquivo de destino (aberto em modo de acréscimo).
+        eventos_por_lote (int): Quantidade de eventos que dispara a gravação.
+        intervalo_ms (float): Tempo máximo entre gravações, em milissegundos.
+
+    Raises:
+        ValueError: Se `intervalo_ms` não for positivo.
+    """
+
+    def __init__(
+        self, caminho: str, eventos_por_lote: int = 1_000, intervalo_ms: float = 1_000
+    ) -> None:
+        if not intervalo_ms > 0:
+            raise ValueError("O intervalo entre gravações deve ser positivo.")
+        self.caminho = caminho
+        self.eventos_por_lote = eventos_por_lote
+        self.intervalo_ms = intervalo_ms
+        self._pendentes: list[EventoLog] = []
+        self._arquivo = open(caminho, "a", encoding="utf-8")
+        # Protege os pendentes e o arquivo, usados também pela thread.
+        self._trava = threading.Lock()
+        self._parar = threading.Event()
+        self._descarregador = threading.Thread(
+            target=self._descarregar_periodicamente,
+            name=f"descarregar-log-{caminho}",
+            daemon=True,
+        )
+        self._descarregador.start()
+        atexit.register(self.fechar)
+
+    def emitir(self, evento: EventoLog) -> None:
+        with self._trava:
+            pendentes = self._pendentes
+            pendentes.append(evento)
+            if len(pendentes) >= self.eventos_por_lote:
+                self._gravar()
+
+    def descarregar(self) -> None:
+        with self._trava:
+            self._gravar()
+
+    def _gravar(self) -> None:
+        """Grava os pendentes; deve ser chamado com a trava adquirida."""
+        if self._pendentes and not self._arquivo.closed:
+            self._arquivo.write("".join(map(linha_json, self._pendentes)))
+            self._arquivo.flush()
+            self._pendentes.clear()
+
+    def _descarregar_periodicamente(self) -> None:
+        while not self._parar.wait(self.intervalo_ms / 1000):
+            self.descarregar()
+
+    def fechar(self) -> None:
+        self._parar.set()
+        if self._descarregador is not threading.current_thread():
+            self._descarregador.join()
+        with self._trava:
+            self._gravar()
+            self._arquivo.close()
+        atexit.unregister(self.fechar)
+
+
+def destino_pelo_ambiente(valor: str | None = None) -> DestinoLog:
+    """Cria o destino descrito por `valor` ou pela variável `BANCO_LOG`.
+
+    Args:
+        valor (str | None): "console" (padrão), "memoria", "nulo" ou
+            "arquivo:<caminho>"; se None, é lido de `BANCO_LOG`.
+
+    Returns:
+        DestinoLog: Destino correspondente.
+
+    Raises:
+        ValueError: Se o valor não corresponder a nenhum destino.
+    """
+    if valor is None:
+        valor = os.environ.get("BANCO_LOG", "console")
+
+    tipo, _, caminho = valor.partition(":")
+    match tipo:
+        case "console":
+            return DestinoConsole()
+        case "memoria":
+            return DestinoMemoria()
+        case "nulo":
+            return DESTINO_NULO
+        case "arquivo" if caminho:
+            return DestinoArquivoLote(caminho)
+    raise ValueError(f"Destino de log inválido: {valor!r}")
+
+
+DESTINO_NULO = DestinoNulo()
+_destino_atual: DestinoLog = destino_pelo_ambiente()
+
+
+def configurar_log(destino: DestinoLog) -> DestinoLog:
+    """Define o destino dos eventos de log e devolve o destino anterior.
+
+    O destino anterior é descarregado antes da troca, mas não é fechado.
+    Qualquer `DestinoNulo` é substituído pela instância única `DESTINO_NULO`,
+    reconhecida pelo decorador.
+    """
+    global _destino_atual
+    anterior = _destino_atual
+    anterior.descarregar()
+    _destino_atual = DESTINO_NULO if isinstance(destino, DestinoNulo) else destino
+    return anterior
+
+
+def destino_log() -> DestinoLog:
+    """Retorna o destino de eventos de log em uso."""
+    return _destino_atual
+
+
+class HistogramaLatencia:
+    """Histograma de latências com faixas log-lineares (no estilo HDR).
+
+    Cada potência de 2 é dividida em `SUBDIVISOES` faixas de mesma largura, de
+    modo que o erro relativo dos percentis fica abaixo de 1/`SUBDIVISOES`
+    (cerca de 6%) em qualquer ordem de grandeza, com memória proporcional ao
+    logaritmo do maior valor. Valores menores que `SUBDIVISOES` são exatos.
+
+    Attributes:
+        contagens (list[int]): Quantidade de valores em cada faixa.
+        quantidade (int): Total de valores registrados.
+        soma (int): Soma dos valores registrados.
+        minimo (int): Menor valor registrado (0 se o histograma estiver vazio).
+        maximo (int): Maior valor registrado.
+    """
+
+    SUBDIVISOES = 16
+    _BITS_SUBDIVISAO = SUBDIVISOES.bit_length() - 1
+
+    __slots__ = ("contagens", "quantidade", "soma", "minimo", "maximo")
+
+    def __init__(self) -> None:
+        self.contagens: list[int] = []
+        self.quantidade = 0
+        self.soma = 0
+        self.minimo = 0
+        self.maximo = 0
+
+    @classmethod
+    def faixa(cls, valor: int) -> int:
+        """Índice da faixa que contém o valor (não negativo)."""
+        deslocamento = valor.bit_length() - cls._BITS_SUBDIVISAO - 1
+        if deslocamento <= 0:
+            return valor
+        return deslocamento * cls.SUBDIVISOES + (valor >> deslocamento)
+
+    @classmethod
+    def limite_superior(cls, faixa: int) -> int:
+        """Maior valor contido na faixa informada."""
+        if faixa < 2 * cls.SUBDIVISOES:
+            return faixa
+        deslocamento = faixa // cls.SUBDIVISOES - 1
+        mantissa = faixa % cls.SUBDIVISOES + cls.SUBDIVISOES
+        return ((mantissa + 1) << deslocamento) - 1
+
+    def registrar(self, valor: int) -> None:
+        """Acrescenta um valor (ex.: duração em nanossegundos) ao histograma."""
+        # Mesmo cálculo de `faixa`, repetido aqui por ser o caminho mais
+        # frequente (uma vez por operação decorada).
+        deslocamento = valor.bit_length() - self._BITS_SUBDIVISAO - 1
+        faixa = (
+            valor
+            if deslocamento <= 0
+            else deslocamento * self.SUBDIVISOES + (valor >> deslocamento)
+        )
+        contagens = self.contagens
+        try:
+            contagens[faixa] += 1
+        except IndexError:
+            contagens.extend([0] * (faixa + 1 - len(contagens)))
+            contagens[faixa] += 1
+        self.quantidade += 1
+        self.soma += valor
+        if valor > self.maximo:
+            self.maximo = valor
+        if valor < self.minimo or self.quantidade == 1:
+            self.minimo = valor
+
+    def percentil(self, percentual: float) -> int:
+        """Valor abaixo do qual está `percentual`% dos registros.
+
+        Retorna o limite superior da faixa correspondente, limitado ao maior
+        valor registrado, ou 0 se o histograma estiver vazio.
+        """
+        if not self.quantidade:
+            return 0
+        posicao = max(1, -(-self.quantidade * percentual // 100))
+        acumulado = 0
+        for faixa, contagem in enumerate(self.contagens):
+            acumulado += contagem
+            if acumulado >= posicao:
+                return min(self.limite_superior(faixa), self.maximo)
+        return self.maximo
+
+    def resumo(self) -> dict[str, int | float]:
+        """Quantidade, média, mínimo, p50, p95, p99 e máximo, em nanossegundos."""
+        return {
+            "quantidade": self.quantidade,
+            "media_ns": self.soma / self.quantidade if self.quantidade else 0.0,
+            "minimo_ns": self.minimo,
+            "p50_ns": self.percentil(50),
+            "p95_ns": self.percentil(95),
+            "p99_ns": self.percentil(99),
+            "maximo_ns": self.maximo,
+        }
+
+
+class MetricasLatencia:
+    """Histogramas de latência por operação, preenchidos por `registrar_log`.
+
+    Attributes:
+        histogramas (dict[str, HistogramaLatencia]): Histograma de cada
+            operação, criado na primeira execução.
+    """
+
+    def __init__(self) -> None:
+        self.histogramas: dict[str, HistogramaLatencia] = {}
+
+    def registrar(self, operacao: str, duracao_ns: int) -> None:
+        """Registra a duração de uma execução da operação."""
+        histograma = self.histogramas.get(operacao)
+        if histograma is None:
+            histograma = self.histogramas[operacao] = HistogramaLatencia()
+        histograma.registrar(duracao_ns)
+
+    def resumo(self) -> dict[str, dict[str, int | float]]:
+        """Resumo (quantidade, percentis e máximo) de cada operação."""
+        return {
+            operacao: histograma.resumo()
+            for operacao, histograma in sorted(self.histogramas.items())
+        }
+
+    def como_json(self) -> str:
+        """Resumo das operações em JSON."""
+        return json.dumps(self.resumo(), indent=2, ensure_ascii=False)
+
+    def como_prometheus(self) -> str:
+        """Resumo das operações no formato texto de exposição do Prometheus.
+
+        As durações são exportadas em segundos, como métrica do tipo `summary`
+        (percentis 0,5, 0,95 e 0,99, soma e contagem) acompanhada do máximo.
+        """
+        nome = "banco_operacao_duracao_segundos"
+        linhas = [
+            f"# HELP {nome} Duração das operações decoradas por registrar_log.",
+            f"# TYPE {nome} summary",
+        ]
+        maximos = [
+            f"# HELP {nome}_max Maior duração registrada de cada operação.",
+            f"# TYPE {nome}_max gauge",
+        ]
+        for operacao, histograma in sorted(self.histogramas.items()):
+            rotulo = f'operacao="{operacao}"'
+            for quantil, percentual in (("0.5", 50), ("0.95", 95), ("0.99", 99)):
+                linhas.append(
+                    f'{nome}{{{rotulo},quantile="{quantil}"}} '
+                    f"{histograma.percentil(percentual) / 1e9:.9f}"
+                )
+            linhas.append(f"{nome}_sum{{{rotulo}}} {histograma.soma / 1e9:.9f}")
+            linhas.append(f"{nome}_count{{{rotulo}}} {histograma.quantidade}")
+            maximos.append(f"{nome}_max{{{rotulo}}} {histograma.maximo / 1e9:.9f}")
+        return "\n".join(linhas + maximos) + "\n"
+
+    def exportar(self, caminho: str) -> None:
+        """Grava o resumo em arquivo, no formato indicado pela extensão.
+
+        Arquivos ".prom" recebem o formato do Prometheus; os demais, JSON.
+        """
+        conteudo = (
+            self.como_prometheus() if caminho.endswith(".prom") else self.como_json()
+        )
+        with open(caminho, "w", encoding="utf-8") as arquivo:
+            arquivo.write(conteudo)
+
+
+_metricas_atuais: MetricasLatencia | None = None
+# Histogramas e arquivo da exportação automática (a última pedida), e se o
+# encerramento e o SIGUSR1 já chamam `_exportar_metricas`.
+_exportacao: tuple[MetricasLatencia, str] | None = None
+_exportacao_no_encerramento = False
+_exportacao_no_sinal = False
+
+
+def _exportar_metricas(*_: Any) -> None:
+    """Grava o resumo pedido em `ativar_metricas` (no encerramento ou no sinal)."""
+    if _exportacao is not None:
+        metricas, caminho = _exportacao
+        metricas.exportar(caminho)
+
+
+def ativar_metricas(
+    caminho_exportacao: str | None = None, metricas: MetricasLatencia | None = None
+) -> MetricasLatencia:
+    """Passa a coletar os histogramas de latência em `registrar_log`.
+
+    Args:
+        caminho_exportacao (str | None): Se informado, o resumo é gravado nesse
+            arquivo no encerramento do programa e, em sistemas com o sinal
+            SIGUSR1, também a cada recebimento do sinal (`kill -USR1 <pid>`).
+            Chamadas seguintes trocam o arquivo e os histogramas exportados,
+            sem repetir a gravação. O tratador do sinal só pode ser instalado
+            pela thread principal; chamada de outra thread, a exportação fica
+            apenas para o encerramento.
+        metricas (MetricasLatencia | None): Histogramas a retomar (por exemplo,
+            os devolvidos por `desativar_metricas`); se None, são mantidos os
+            atuais ou criados novos.
+
+    Returns:
+        MetricasLatencia: Coleção de histogramas em uso.
+    """
+    global _metricas_atuais, _exportacao
+    global _exportacao_no_encerramento, _exportacao_no_sinal
+    if metricas is not None:
+        _metricas_atuais = metricas
+    elif _metricas_atuais is None:
+        _metricas_atuais = MetricasLatencia()
+
+    if caminho_exportacao:
+        _exportacao = (_metricas_atuais, caminho_exportacao)
+        if not _exportacao_no_encerramento:
+            atexit.register(_exportar_metricas)
+            _exportacao_no_encerramento = True
+        if (
+            not _exportacao_no_sinal
+            and hasattr(signal, "SIGUSR1")
+            and threading.current_thread() is threading.main_thread()
+        ):
+            signal.signal(signal.SIGUSR1, _exportar_metricas)
+            _exportacao_no_sinal = True
+    return _metricas_atuais
+
+
+def desativar_metricas() -> MetricasLatencia | None:
+    """Interrompe a coleta dos histogramas e devolve os coletados até então."""
+    global _metricas_atuais
+    metricas, _metricas_atuais = _metricas_atuais, None
+    return metricas
+
+
+def metricas_latencia() -> MetricasLatencia | None:
+    """Retorna os histogramas em coleta, ou None se a coleta estiver desativada."""
+    return _metricas_atuais
+
+
+class Perfilador:
+    """Executa as operações decoradas sob `cProfile` e `tracemalloc`.
+
+    Cada execução gera, no diretório informado, o arquivo
+    `<operacao>-<n>.pstats` (abrir com `python -m pstats` ou `snakeviz`) e o
+    arquivo `<operacao>-<n>-alocacoes.txt`, com os locais que mais alocaram
+    memória durante a execução e o pico de memória rastreada.
+
+    Attributes:
+        diretorio (str): Diretório onde os arquivos são gravados.
+        quantidade_alocacoes (int): Quantidade de locais de alocação listados.
+        execucoes (dict[str, int]): Quantidade de execuções de cada operação.
+    """
+
+    def __init__(self, diretorio: str, quantidade_alocacoes: int = 25) -> None:
+        self.diretorio = diretorio
+        self.quantidade_alocacoes = quantidade_alocacoes
+        self.execucoes: dict[str, int] = {}
+        self._em_execucao = False
+        os.makedirs(diretorio, exist_ok=True)
+
+    def executar(
+        self, operacao: str, function: Callable[..., Any], *args, **kwargs
+    ) -> Any:
+        """Chama `function` com os argumentos, gravando o perfil da execução.
+
+        Operações decoradas chamadas dentro de outra já perfilada são apenas
+        executadas, ficando incluídas no perfil da operação externa.
+        """
+        if self._em_execucao:
+            return function(*args, **kwargs)
+
+        numero = self.execucoes[operacao] = self.execucoes.get(operacao, 0) + 1
+        prefixo = os.path.join(self.diretorio, f"{operacao}-{numero:04d}")
+        rastreando = tracemalloc.is_tracing()
+        if not rastreando:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        antes = tracemalloc.take_snapshot()
+        perfil = cProfile.Profile()
+
+        self._em_execucao = True
+        try:
+            return perfil.runcall(function, *args, **kwargs)
+        finally:
+            self._em_execucao = False
+            depois = tracemalloc.take_snapshot()
+            _, pico = tracemalloc.get_traced_memory()
+            if not rastreando:
+                tracemalloc.stop()
+            perfil.dump_stats(prefixo + ".pstats")
+            self._gravar_alocacoes(prefixo + "-alocacoes.txt", antes, depois, pico)
+
+    def _gravar_alocacoes(
+        self,
+        caminho: str,
+        antes: tracemalloc.Snapshot,
+        depois: tracemalloc.Snapshot,
+        pico: int,
+    ) -> None:
+        filtros = [tracemalloc.Filter(False, tracemalloc.__file__)]
+        diferencas = depois.filter_traces(filtros).compare_to(
+            antes.filter_traces(filtros), "lineno"
+        )
+        linhas = [
+            f"Pico de memória rastreada: {pico / 1024:.1f} KiB",
+            f"Locais com maior alocação (top {self.quantidade_alocacoes}):",
+            *map(str, diferencas[: self.quantidade_alocacoes]),
+        ]
+        with open(caminho, "w", encoding="utf-8") as arquivo:
+            arquivo.write("\n".join(linhas) + "\n")
+
+
+_perfilador_atual: Perfilador | None = None
+
+
+def ativar_perfil(diretorio: str) -> Perfilador:
+    """Passa a perfilar as operações decoradas, gravando em `diretorio`."""
+    global _perfilador_atual
+    _perfilador_atual = Perfilador(diretorio)
+    return _perfilador_atual
+
+
+def desativar_perfil() -> Perfilador | None:
+    """Interrompe o perfilamento e devolve o perfilador usado até então."""
+    global _perfilador_atual
+    perfilador, _perfilador_atual = _perfilador_atual, None
+    return perfilador
+
+
+def perfilador_ativo() -> Perfilador | None:
+    """Retorna o perfilador em uso, ou None se o perfilamento estiver desativado."""
+    return _perfilador_atual
+
+
+if os.environ.get("BANCO_METRICAS"):
+    ativar_metricas(os.environ["BANCO_METRICAS"])
+if os.environ.get("BANCO_PERFIL"):
+    ativar_perfil(os.environ["BANCO_PERFIL"])
@@ -0,0 +1,627 @@
+"""Motor de transações: operações bancárias sem interação com o console.
+
+As funções deste módulo recebem todos os dados por argumento e devolvem um
+`ResultadoOperacao`, sem chamar `input()` nem imprimir nada. Assim podem ser
+usadas tanto pelo menu interativo (`desafio.py`, que apenas lê os dados e exibe
+a mensagem do resultado) quanto por processamentos em lote e medições de
+desempenho.
+"""
+
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from enum import StrEnum
+from typing import Any
+
+from livro_extrato import LivroExtrato, TipoTransacao
+from persistencia import diario_ativo
+from registro import RegistroBancario
+from saques_diarios import ControleSaquesDiarios
+
+
+class StatusOperacao(StrEnum):
+    """Código do resultado de uma operação, estável para registro e análise."""
+
+    SUCESSO = "sucesso"
+    OPERACAO_INVALIDA = "operacao_invalida"
+    VALOR_INVALIDO = "valor_invalido"
+    SALDO_INSUFICIENTE = "saldo_insuficiente"
+    LIMITE_EXCEDIDO = "limite_excedido"
+    LIMITE_SAQUES_EXCEDIDO = "limite_saques_excedido"
+    LIMITE_DIARIO_EXCEDIDO = "limite_diario_excedido"
+    CONTA_INEXISTENTE = "conta_inexistente"
+    MESMA_CONTA = "mesma_conta"
+    INSTANTE_INVALIDO = "instante_invalido"
+    CPF_INVALIDO = "cpf_invalido"
+    DATA_INVALIDA = "data_invalida"
+    USUARIO_EXISTENTE = "usuario_existente"
+    USUARIO_INEXISTENTE = "usuario_inexistente"
+
+
+@dataclass(slots=True)
+class ResultadoOperacao:
+    """Resultado estruturado de uma operação do motor.
+
+    A classe não é congelada (`frozen`) porque a criação de instâncias
+    congeladas custa várias vezes mais, e um resultado é criado a cada operação
+    bem-sucedida; os resultados devem ser tratados como somente leitura.
+
+    Attributes:
+        status (StatusOperacao): Código do resultado.
+        mensagem (str): Mensagem para exibição ao usuário.
+        saldo (int | None): Saldo da conta após a operação, em centavos, quando
+            a operação envolve uma conta.
+        dados (dict[str, Any] | None): Usuário ou conta criados pela operação.
+    """
+
+    status: StatusOperacao
+    mensagem: str
+    saldo: int | None = None
+    dados: dict[str, Any] | None = None
+
+    @property
+    def sucesso(self) -> bool:
+        """Indica se a operação foi concluída."""
+        return self.status is StatusOperacao.SUCESSO
+
+
+# Mensagens das operações concluídas.
+MENSAGEM_DEPOSITO = "Depósito realizado com sucesso!"
+MENSAGEM_SAQUE = "Saque realizado com sucesso!"
+MENSAGEM_TRANSFERENCIA = "Transferência realizada com sucesso!"
+
+# Resultados de recusa não dependem da conta, por isso são instâncias únicas
+# reaproveitadas a cada chamada (e, portanto, nunca devem ser alteradas).
+DEPOSITO_VALOR_INVALIDO = ResultadoOperacao(
+    StatusOperacao.VALOR_INVALIDO, "Operação falhou! O valor informado é inválido."
+)
+SAQUE_VALOR_INVALIDO = ResultadoOperacao(
+    StatusOperacao.VALOR_INVALIDO, "Valor inválido!"
+)
+SAQUE_SALDO_INSUFICIENTE = ResultadoOperacao(
+    StatusOperacao.SALDO_INSUFICIENTE,
+    "Operação falhou! Você não tem saldo suficiente.",
+)
+SAQUE_LIMITE_EXCEDIDO = ResultadoOperacao(
+    StatusOperacao.LIMITE_EXCEDIDO,
+    "Operação falhou! O valor do saque excede o limite.",
+)
+SAQUE_LIMITE_SAQUES_EXCEDIDO = ResultadoOperacao(
+    StatusOperacao.LIMITE_SAQUES_EXCEDIDO,
+    "Operação falhou! Número máximo de saques excedido.",
+)
+SAQUE_LIMITE_DIARIO_EXCEDIDO = ResultadoOperacao(
+    StatusOperacao.LIMITE_DIARIO_EXCEDIDO,
+    "Operação falhou! O valor excede o limite diário de saques.",
+)
+TRANSFERENCIA_VALOR_INVALIDO = ResultadoOperacao(
+    StatusOperacao.VALOR_INVALIDO, "Operação falhou! O valor informado é inválido."
+)
+TRANSFERENCIA_SALDO_INSUFICIENTE = ResultadoOperacao(
+    StatusOperacao.SALDO_INSUFICIENTE,
+    "Operação falhou! Você não tem saldo suficiente.",
+)
+TRANSFERENCIA_MESMA_CONTA = ResultadoOperacao(
+    StatusOperacao.MESMA_CONTA,
+    "Operação falhou! As contas de origem e destino são a mesma.",
+)
+CONTA_INEXISTENTE = ResultadoOperacao(
+    StatusOperacao.CONTA_INEXISTENTE, "Operação falhou! A conta informada não existe!"
+)
+INSTANTE_RETROATIVO = ResultadoOperacao(
+    StatusOperacao.INSTANTE_INVALIDO,
+    "Operação falhou! O instante informado é anterior à última movimentação "
+    "da conta.",
+)
+CPF_INVALIDO = ResultadoOperacao(StatusOperacao.CPF_INVALIDO, "CPF inválido!")
+DATA_INVALIDA = ResultadoOperacao(
+    StatusOperacao.DATA_INVALIDA, "Data de nascimento inválida!"
+)
+USUARIO_EXISTENTE = ResultadoOperacao(
+    StatusOperacao.USUARIO_EXISTENTE, "Usuário já cadastrado!"
+)
+USUARIO_INEXISTENTE = ResultadoOperacao(
+    StatusOperacao.USUARIO_INEXISTENTE, "Usuário não cadastrado!"
+)
+OPERACAO_INVALIDA = ResultadoOperacao(
+    StatusOperacao.OPERACAO_INVALIDA,
+    "Operação falhou! Operação desconhecida ou linha mal formada.",
+)
+VALOR_NAO_NUMERICO = ResultadoOperacao(
+    StatusOperacao.VALOR_INVALIDO,
+    "Operação falhou! O valor informado não é numérico "
+    "ou tem mais de duas casas decimais.",
+)
+
+
+def validar_cpf(cpf: str) -> bool:
+    """Valida se o CPF informado é composto por 11 dígitos numéricos.
+
+    A função não realiza validação matemática de CPF (dígitos verificadores),
+    apenas garante que o valor possui o comprimento e formato corretos.
+
+    Args:
+        cpf (str): CPF a ser validado, contendo apenas números.
+
+    Returns:
+        bool: True se o CPF for válido (11 dígitos numéricos), False caso contrário.
+    """
+    return cpf.isdigit() and len(cpf) == 11
+
+
+def validar_data(data_str: str) -> bool:
+    """Valida se uma data está no formato 'dd-mm-yyyy' e representa uma data real.
+
+    A função utiliza o módulo datetime para verificar se a data informada é válida,
+    considerando meses de 30/31 dias e anos bissextos.
+
+    Args:
+        data_str (str): Data informada pelo usuário no formato 'dd-mm-yyyy'.
+
+    Returns:
+        bool: True se a data for válida e estiver no formato correto, False caso contrário.
+    """
+    try:
+        datetime.strptime(data_str, "%d-%m-%Y")
+        return True
+    except ValueError:
+        return False
+
+
+def converter_data_para_instante(data_str: str, dias: int = 0) -> int:
+    """Converte uma data 'dd-mm-yyyy' no instante da meia-noite local desse dia.
+
+    Args:
+        data_str (str): Data no formato validado por `validar_data`.
+        dias (int): Dias a somar à data antes da conversão (ex.: 1 para o fim
+            do dia informado, isto é, a meia-noite do dia seguinte).
+
+    Returns:
+        int: Instante correspondente, em segundos desde a época.
+
+    Raises:
+        ValueError: Se a data não for válida ou estiver fora da faixa de
+            instantes representáveis (ex.: "31-12-9999", cujo dia seguinte
+            não existe, ou "01-01-0001").
+    """
+    try:
+        data = datetime.strptime(data_str, "%d-%m-%Y") + timedelta(days=dias)
+        return int(data.timestamp())
+    except (OverflowError, OSError) as erro:
+        raise ValueError(f"Data fora da faixa aceita: {data_str!r}.") from erro
+
+
+def obter_extrato(conta: dict[str, Any]) -> LivroExtrato:
+    """Retorna o livro de extrato da conta, criando-o no primeiro uso."""
+    extrato = conta.get("extrato")
+    if extrato is None:
+        extrato = conta["extrato"] = LivroExtrato()
+    return extrato
+
+
+def consultar_totais(
+    conta: dict[str, Any],
+    tipo: TipoTransacao,
+    inicio: date | None = None,
+    fim: date | None = None,
+) -> tuple[int, int]:
+    """Retorna o total e a quantidade de operações de um tipo em um período.
+
+    A consulta usa os agregados do livro (`AgregadosExtrato`), mantidos a cada
+    transação, sem percorrer o extrato.
+
+    Args:
+        conta (dict[str, Any]): Conta consultada.
+        tipo (TipoTransacao): Tipo de operação.
+        inicio (date | None): Primeiro dia do período; None para o início.
+        fim (date | None): Último dia do período (inclusive); None para hoje.
+
+    Returns:
+        tuple[int, int]: Total em centavos e quantidade de operações.
+    """
+    return obter_extrato(conta).agregados.totais(tipo, inicio, fim)
+
+
+def consultar_saldo_no_dia(conta: dict[str, Any], dia: date) -> int:
+    """Retorna o saldo da conta ao fim do dia informado, em centavos.
+
+    O saldo é obtido do saldo atual e do movimento posterior ao dia, lido dos
+    agregados diários do livro.
+    """
+    return obter_extrato(conta).agregados.saldo_em(conta.get("saldo", 0), dia)
+
+
+def instante_da_operacao(instante: int | None, *extratos: LivroExtrato) -> int | None:
+    """Instante a registrar nos extratos, ou None se ele for retroativo.
+
+    Os extratos guardam as transações em ordem de instante; é dessa ordem que
+    dependem as buscas por período, os agregados diários e os contadores de
+    saques. Um instante informado anterior à última transação de algum dos
+    extratos é recusado. Sem instante informado, usa o atual, mas nunca um
+    anterior ao da última transação (ex.: relógio ajustado para trás).
+
+    Args:
+        instante (int | None): Instante informado; se None, o atual.
+        *extratos (LivroExtrato): Extratos que receberão a transação.
+
+    Returns:
+        int | None: Instante da operação, ou None se o informado for retroativo.
+    """
+    ultimo = max(
+        (
+            ultimo_instante
+            for extrato in extratos
+            if (ultimo_instante := extrato.ultimo_instante) is not None
+        ),
+        default=None,
+    )
+    if instante is None:
+        instante = int(time.time())
+        return instante if ultimo is None or instante >= ultimo else ultimo
+    return None if ultimo is not None and instante < ultimo else instante
+
+
+def atualizar_extrato(
+    *, extrato: LivroExtrato, operacao: str, valor: int, instante: int | None = None
+) -> LivroExtrato:
+    """
+    Atualiza o extrato de uma conta adicionando um novo registro de operação.
+
+    Acrescenta ao final do livro `extrato` uma entrada compacta contendo o
+    valor, o instante da operação (em segundos desde a época) e o código do
+    tipo da operação. Como as entradas são sempre acrescentadas no momento em
+    que a operação ocorre, o livro permanece em ordem cronológica.
+
+    Args:
+        extrato (LivroExtrato): Livro de transações da conta.
+        operacao (str): Identificador da operação (ex.: "deposito", "saque").
+        valor (int): Valor monetário movimentado, em centavos (positivo).
+        instante (int | None): Momento da operação; se None, o instante atual.
+
+    Returns:
+        LivroExtrato: O livro de extrato atualizado.
+    """
+    extrato.registrar(
+        TipoTransacao.de_operacao(operacao),
+        valor,
+        int(time.time()) if instante is None else instante,
+    )
+    return extrato
+
+
+def depositar(
+    conta: dict[str, Any], valor: int, *, instante: int | None = None
+) -> ResultadoOperacao:
+    """Credita um valor na conta e registra a transação no extrato.
+
+    Args:
+        conta (dict[str, Any]): Conta que receberá o depósito.
+        valor (int): Valor do depósito, em centavos.
+        instante (int | None): Momento da operação, em segundos desde a época;
+            se None, o instante atual.
+
+    Returns:
+        ResultadoOperacao: Sucesso com o novo saldo, `VALOR_INVALIDO` quando o
+            valor não é positivo ou `INSTANTE_RETROATIVO` quando o instante é
+            anterior à última transação da conta.
+    """
+    if valor <= 0:
+        return DEPOSITO_VALOR_INVALIDO
+
+    extrato = obter_extrato(conta)
+    instante = instante_da_operacao(instante, extrato)
+    if instante is None:
+        return INSTANTE_RETROATIVO
+    saldo = conta.get("saldo", 0) + valor
+    conta["saldo"] = saldo
+    extrato.registrar(TipoTransacao.DEPOSITO, valor, instante)
+    diario = diario_ativo()
+    if diario is not None:
+        diario.registrar_transacao(
+            TipoTransacao.DEPOSITO, conta["numero_conta_corrente"], valor, instante
+        )
+    return ResultadoOperacao(StatusOperacao.SUCESSO, MENSAGEM_DEPOSITO, saldo)
+
+
+def sacar(
+    conta: dict[str, Any],
+    valor: int,
+    *,
+    limite: int,
+    numero_saques: int = 0,
+    limite_saques: int,
+    limite_diario: int | None = None,
+    saques_diarios: ControleSaquesDiarios | None = None,
+    instante: int | None = None,
+) -> ResultadoOperacao:
+    """Debita um valor da conta, validando saldo e limites, e registra no extrato.
+
+    As validações seguem a ordem do menu interativo: valor positivo, saldo
+    suficiente, limite por operação, instante não anterior à última transação
+    da conta, quantidade de saques já realizados e, quando informado, total
+    diário. Com `saques_diarios`, a quantidade e o
+    total sacados vêm do contador da conta no dia da operação, atualizado aqui
+    em caso de sucesso; sem ele, a contagem fica a cargo de quem chama
+    (`numero_saques`), que deve incrementá-la quando o resultado for de sucesso.
+
+    Args:
+        conta (dict[str, Any]): Conta de onde o valor será sacado.
+        valor (int): Valor do saque, em centavos.
+        limite (int): Valor máximo permitido por operação, em centavos.
+        numero_saques (int): Quantidade de saques já realizados no período;
+            ignorado quando `saques_diarios` é informado.
+        limite_saques (int): Quantidade máxima de saques no período.
+        limite_diario (int | None): Total máximo sacado por dia, em centavos;
+            verificado apenas com `saques_diarios`.
+        saques_diarios (ControleSaquesDiarios | None): Contadores diários de
+            saques por conta.
+        instante (int | None): Momento da operação, em segundos desde a época;
+            se None, o instante atual.
+
+    Returns:
+        ResultadoOperacao: Sucesso com o novo saldo ou o motivo da recusa.
+    """
+    saldo = conta.get("saldo", 0)
+
+    if valor <= 0:
+        return SAQUE_VALOR_INVALIDO
+    if valor > saldo:
+        return SAQUE_SALDO_INSUFICIENTE
+    if valor > limite:
+        return SAQUE_LIMITE_EXCEDIDO
+
+    extrato = obter_extrato(conta)
+    instante = instante_da_operacao(instante, extrato)
+    if instante is None:
+        return INSTANTE_RETROATIVO
+    total_sacado = 0
+    if saques_diarios is not None:
+        numero_saques, total_sacado = saques_diarios.consultar(conta, instante)
+    if numero_saques >= limite_saques:
+        return SAQUE_LIMITE_SAQUES_EXCEDIDO
+    if limite_diario is not None and total_sacado + valor > limite_diario:
+        return SAQUE_LIMITE_DIARIO_EXCEDIDO
+
+    saldo -= valor
+    conta["saldo"] = saldo
+    extrato.registrar(TipoTransacao.SAQUE, valor, instante)
+    if saques_diarios is not None:
+        saques_diarios.registrar(conta, valor, instante)
+    diario = diario_ativo()
+    if diario is not None:
+        diario.registrar_transacao(
+            TipoTransacao.SAQUE, conta["numero_conta_corrente"], valor, instante
+        )
+    return ResultadoOperacao(StatusOperacao.SUCESSO, MENSAGEM_SAQUE, saldo)
+
+
+def verificar_transferencia(
+    origem: dict[str, Any],
+    numero_destino: str | None,
+    valor: int,
+    instante: int | None,
+    *extratos_destino: LivroExtrato,
+) -> ResultadoOperacao | int:
+    """Faz as verificações de uma transferência, sem alterar nenhuma conta.
+
+    Usada por `transferir` e pelo débito das transferências entre fragmentos
+    (`fragmentos.py`), em que a conta de destino está em outro processo.
+
+    Args:
+        origem (dict[str, Any]): Conta a debitar.
+        numero_destino (str | None): Número da conta de destino; None quando
+            ela não está disponível (e, portanto, não é a mesma conta).
+        valor (int): Valor da transferência, em centavos.
+        instante (int | None): Momento da operação; se None, o atual.
+        *extratos_destino (LivroExtrato): Extratos do destino disponíveis,
+            cujo último instante também é verificado.
+
+    Returns:
+        ResultadoOperacao | int: O motivo da recusa (valor inválido, mesma
+            conta, saldo insuficiente, instante retroativo) ou, se a
+            transferência pode ser feita, o instante a registrar.
+    """
+    if valor <= 0:
+        return TRANSFERENCIA_VALOR_INVALIDO
+    if numero_destino == origem["numero_conta_corrente"]:
+        return TRANSFERENCIA_MESMA_CONTA
+    if valor > origem.get("saldo", 0):
+        return TRANSFERENCIA_SALDO_INSUFICIENTE
+    instante = instante_da_operacao(instante, obter_extrato(origem), *extratos_destino)
+    if instante is None:
+        return INSTANTE_RETROATIVO
+    return instante
+
+
+def transferir(
+    origem: dict[str, Any],
+    destino: dict[str, Any],
+    valor: int,
+    *,
+    instante: int | None = None,
+) -> ResultadoOperacao:
+    """Transfere um valor entre duas contas e registra as duas pontas nos extratos.
+
+    Todas as validações são feitas antes de qualquer alteração
+    (`verificar_transferencia`): ou as duas contas são atualizadas, ou
+    nenhuma. A saída (`TRANSFERENCIA_ENVIADA`) e a entrada
+    (`TRANSFERENCIA_RECEBIDA`) são registradas com o mesmo instante e valor
+    pelo `atualizar_extrato`, e a transferência ocupa um único registro no
+    diário de operações, reaplicado por inteiro ou descartado. A
+    transferência não conta como saque nem consome os limites de saque.
+
+    Para uso por várias threads, ver `concorrencia.MotorConcorrente.transferir`,
+    que adquire as travas das duas contas em ordem fixa.
+
+    Args:
+        origem (dict[str, Any]): Conta debitada.
+        destino (dict[str, Any]): Conta creditada.
+        valor (int): Valor da transferência, em centavos.
+        instante (int | None): Momento da operação, em segundos desde a época;
+            se None, o instante atual.
+
+    Returns:
+        ResultadoOperacao: Sucesso com o novo saldo da conta de origem, ou o
+            motivo da recusa (valor inválido, mesma conta, saldo insuficiente,
+            instante anterior à última transação de uma das contas).
+    """
+    numero_destino = destino["numero_conta_corrente"]
+    extrato_destino = obter_extrato(destino)
+    instante = verificar_transferencia(
+        origem, numero_destino, valor, instante, extrato_destino
+    )
+    if isinstance(instante, ResultadoOperacao):
+        return instante
+
+    saldo = origem.get("saldo", 0) - valor
+    origem["saldo"] = saldo
+    destino["saldo"] = destino.get("saldo", 0) + valor
+    atualizar_extrato(
+        extrato=obter_extrato(origem),
+        operacao="transferencia_enviada",
+        valor=valor,
+        instante=instante,
+    )
+    atualizar_extrato(
+        extrato=extrato_destino,
+        operacao="transferencia_recebida",
+        valor=valor,
+        instante=instante,
+    )
+    diario = diario_ativo()
+    if diario is not None:
+        diario.registrar_transferencia(
+            origem["numero_conta_corrente"], numero_destino, valor, instante
+        )
+    return ResultadoOperacao(StatusOperacao.SUCESSO, MENSAGEM_TRANSFERENCIA, saldo)
+
+
+def transferir_lote(
+    registro: RegistroBancario,
+    transferencias: Iterable[tuple[str, str, int]],
+    *,
+    instante: int | None = None,
+) -> list[ResultadoOperacao]:
+    """Aplica várias transferências em uma chamada, na ordem informada.
+
+    Cada transferência é validada e aplicada por `transferir`; uma recusa não
+    interrompe as seguintes. Todas recebem o mesmo instante.
+
+    Args:
+        registro (RegistroBancario): Registro com as contas movimentadas.
+        transferencias (Iterable[tuple[str, str, int]]): Número da conta de
+            origem, número da conta de destino e valor em centavos.
+        instante (int | None): Momento das operações; se None, o instante atual.
+
+    Returns:
+        list[ResultadoOperacao]: Resultado de cada transferência, na mesma ordem.
+    """
+    if instante is None:
+        instante = int(time.time())
+    buscar_conta = registro.buscar_conta
+    resultados = []
+    for numero_origem, numero_destino, valor in transferencias:
+        origem = buscar_conta(numero_origem)
+        destino = buscar_conta(numero_destino)
+        if origem is None or destino is None:
+            resultados.append(CONTA_INEXISTENTE)
+        else:
+            resultados.append(transferir(origem, destino, valor, instante=instante))
+    return resultados
+
+
+def criar_usuario(
+    registro: RegistroBancario,
+    *,
+    cpf: str,
+    nome_titular: str,
+    data_nascimento_titular: str,
+    endereco: dict[str, str],
+) -> ResultadoOperacao:
+    """Cadastra um usuário a partir dos dados já informados.
+
+    Args:
+        registro (RegistroBancario): Registro onde o usuário será incluído.
+        cpf (str): CPF do titular, com 11 dígitos e sem pontuação.
+        nome_titular (str): Nome do titular.
+        data_nascimento_titular (str): Data de nascimento no formato dd-mm-yyyy.
+        endereco (dict[str, str]): Logradouro, número, bairro, cidade e UF.
+
+    Returns:
+        ResultadoOperacao: Sucesso com o usuário criado em `dados`, ou o motivo
+            da recusa (CPF ou data inválidos, CPF já cadastrado).
+    """
+    if not validar_cpf(cpf):
+        return CPF_INVALIDO
+    if registro.existe_usuario(cpf):
+        return USUARIO_EXISTENTE
+    if not validar_data(data_nascimento_titular):
+        return DATA_INVALIDA
+
+    usuario = {
+        "cpf": cpf,
+        "data_nascimento_titular": data_nascimento_titular,
+        "nome_titular": nome_titular,
+        "endereco": endereco,
+    }
+    registro.adicionar_usuario(usuario)
+    diario = diario_ativo()
+    if diario is not None:
+        diario.registrar_usuario(usuario)
+    return ResultadoOperacao(
+        StatusOperacao.SUCESSO, "Usuário cadastrado com sucesso!", dados=usuario
+    )
+
+
+def gerar_conta_unica(registro: RegistroBancario, agencia: str = "0001") -> str:
+    """Gera um número de conta corrente único e formatado.
+
+    O número vem do alocador do registro (`alocador.AlocadorContas`), em tempo
+    constante por mais contas que existam, e termina com um dígito verificador
+    calculado sobre a agência e o corpo do número. Exemplo de formato:
+    "12345-6".
+
+    Args:
+        registro (RegistroBancario): Registro das contas já cadastradas, cujo
+            alocador fornece o número; contas inseridas por outro caminho (como
+            as de exemplo) são evitadas.
+        agencia (str): Agência da nova conta.
+
+    Returns:
+        str: Número de conta corrente único e formatado (ex: "12345-6").
+    """
+    return registro.alocador_contas.alocar(agencia, registro.existe_conta)
+
+
+def abrir_conta(
+    registro: RegistroBancario, *, cpf: str, agencia: str = "0001"
+) -> ResultadoOperacao:
+    """Abre uma conta corrente para um usuário já cadastrado.
+
+    Args:
+        registro (RegistroBancario): Registro com os usuários e as contas.
+        cpf (str): CPF do titular da nova conta.
+        agencia (str): Agência da conta.
+
+    Returns:
+        ResultadoOperacao: Sucesso com a conta criada em `dados` e saldo zero,
+            ou `USUARIO_INEXISTENTE` quando o CPF não está cadastrado.
+    """
+    if not registro.existe_usuario(cpf):
+        return USUARIO_INEXISTENTE
+
+    conta = {
+        "agencia": agencia,
+        "numero_conta_corrente": gerar_conta_unica(registro, agencia),
+        "cpf_titular": cpf,
+        "extrato": LivroExtrato(),
+        "saldo": 0,
+    }
+    registro.adicionar_conta(conta)
+    diario = diario_ativo()
+    if diario is not None:
+        diario.registrar_conta(conta, registro.alocador_contas)
+    return ResultadoOperacao(
+        StatusOperacao.SUCESSO, "Conta cadastrada com sucesso!", 0, conta
+    )
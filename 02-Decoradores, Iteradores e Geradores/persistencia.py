@@ -0,0 +1,501 @@
+"""Persistência do registro bancário: snapshot mais diário de operações (WAL).
+
+O estado completo (usuários, contas, saldos, extratos e a posição do alocador
+de números de conta) é gravado periodicamente em um snapshot. Entre um snapshot
+e o seguinte, cada operação bem-sucedida do motor (cadastro de usuário,
+abertura de conta, depósito, saque ou transferência) é acrescentada a um diário somente de
+inclusão (*write-ahead log*) antes de o resultado ser devolvido a quem chamou.
+Na inicialização, o snapshot é carregado e o diário é reaplicado sobre ele.
+
+Arquivos do diretório de dados:
+
+    snapshot.pkl           estado completo, gravado de forma atômica
+    diario-000001.log      operações posteriores ao snapshot da geração 1
+
+Cada linha do diário é "<crc32>\\t<tipo>\\t<campos...>". Uma linha incompleta
+ou com CRC divergente (gravação interrompida por uma queda) encerra a
+reaplicação, e o diário é truncado nesse ponto.
+"""
+
+import atexit
+import gc
+import json
+import os
+import pickle
+import threading
+import time
+import zlib
+from array import array
+from typing import Any
+
+from alocador import AlocadorContas
+from livro_extrato import LivroExtrato, TipoTransacao
+from registro import RegistroBancario
+
+VERSAO_SNAPSHOT = 2
+ARQUIVO_SNAPSHOT = "snapshot.pkl"
+MODELO_ARQUIVO_DIARIO = "diario-%06d.log"
+
+# Tipos de registro do diário.
+REGISTRO_USUARIO = "U"
+REGISTRO_CONTA = "C"
+REGISTRO_DEPOSITO = "D"
+REGISTRO_SAQUE = "S"
+REGISTRO_TRANSFERENCIA = "T"
+
+_REGISTROS_TRANSACAO = {
+    TipoTransacao.DEPOSITO: REGISTRO_DEPOSITO,
+    TipoTransacao.SAQUE: REGISTRO_SAQUE,
+}
+
+
+class DiarioOperacoes:
+    """Diário somente de inclusão das operações, sincronizado em lotes.
+
+    Os registros são acumulados em memória e gravados com `fsync` quando o lote
+    atinge `registros_por_sincronizacao` registros ou quando, ao registrar uma
+    operação, já se passaram `intervalo_ms` milissegundos desde a última
+    sincronização. Com `registros_por_sincronizacao=1`, cada operação só é
+    concluída depois de chegar ao disco; com lotes maiores, uma queda pode
+    perder as operações do último lote ainda não sincronizado, em troca de uma
+    vazão muito maior. Os pendentes também são gravados em `fechar`, chamado
+    automaticamente no encerramento do programa. O registro e a gravação são
+    protegidos por uma trava, e o diário pode ser usado por várias threads.
+
+    Attributes:
+        caminho (str): Arquivo do diário (aberto em modo de acréscimo).
+        registros_por_sincronizacao (int): Registros que disparam a gravação.
+        intervalo_ms (float): Tempo máximo entre gravações, em milissegundos.
+        quantidade (int): Registros existentes no arquivo, incluindo pendentes.
+    """
+
+    def __init__(
+        self,
+        caminho: str,
+        registros_por_sincronizacao: int = 1_000,
+        intervalo_ms: float = 1_000,
+        quantidade: int = 0,
+    ) -> None:
+        self.caminho = caminho
+        self.registros_por_sincronizacao = registros_por_sincronizacao
+        self.intervalo_ms = intervalo_ms
+        self.quantidade = quantidade
+        self._pendentes: list[str] = []
+        self._intervalo_ns = int(intervalo_ms * 1_000_000)
+        self._ultima_sincronizacao_ns = time.monotonic_ns()
+        self._arquivo = open(caminho, "a", encoding="utf-8")
+        self._trava = threading.Lock()
+        atexit.register(self.fechar)
+
+    def _registrar(self, corpo: str) -> None:
+        """Acrescenta um registro, sincronizando o lote quando necessário."""
+        linha = "%08x\t%s\n" % (zlib.crc32(corpo.encode()), corpo)
+        with self._trava:
+            pendentes = self._pendentes
+            pendentes.append(linha)
+            self.quantidade += 1
+            if (
+                len(pendentes) >= self.registros_por_sincronizacao
+                or time.monotonic_ns() - self._ultima_sincronizacao_ns
+                >= self._intervalo_ns
+            ):
+                self._gravar_pendentes()
+
+    def registrar_usuario(self, usuario: dict[str, Any]) -> None:
+        """Registra o cadastro de um usuário."""
+        self._registrar(
+            f"{REGISTRO_USUARIO}\t{json.dumps(usuario, ensure_ascii=False)}"
+        )
+
+    def registrar_conta(self, conta: dict[str, Any], alocador: AlocadorContas) -> None:
+        """Registra a abertura de uma conta e a posição do alocador após ela."""
+        self._registrar(
+            "%s\t%s\t%s\t%s\t%d\t%d"
+            % (
+                REGISTRO_CONTA,
+                conta["agencia"],
+                conta["numero_conta_corrente"],
+                conta["cpf_titular"],
+                alocador.digitos,
+                alocador.alocados,
+            )
+        )
+
+    def registrar_transacao(
+        self, tipo: TipoTransacao, numero_conta: str, valor: int, instante: int
+    ) -> None:
+        """Registra um depósito ou saque já aplicado à conta."""
+        self._registrar(
+            "%s\t%s\t%d\t%d"
+            % (_REGISTROS_TRANSACAO[tipo], numero_conta, valor, instante)
+        )
+
+    def registrar_transferencia(
+        self, numero_origem: str, numero_destino: str, valor: int, instante: int
+    ) -> None:
+        """Registra uma transferência já aplicada às duas contas, em uma só linha."""
+        self._registrar(
+            "%s\t%s\t%s\t%d\t%d"
+            % (REGISTRO_TRANSFERENCIA, numero_origem, numero_destino, valor, instante)
+        )
+
+    def sincronizar(self) -> None:
+        """Grava os registros pendentes e força a gravação em disco (`fsync`)."""
+        with self._trava:
+            self._gravar_pendentes()
+
+    def _gravar_pendentes(self) -> None:
+        """Grava os pendentes com `fsync`; deve ser chamado com a trava adquirida."""
+        if self._pendentes and not self._arquivo.closed:
+            self._arquivo.write("".join(self._pendentes))
+            self._arquivo.flush()
+            os.fsync(self._arquivo.fileno())
+            self._pendentes.clear()
+        self._ultima_sincronizacao_ns = time.monotonic_ns()
+
+    def fechar(self) -> None:
+        """Sincroniza os pendentes e fecha o arquivo."""
+        self.sincronizar()
+        self._arquivo.close()
+        atexit.unregister(self.fechar)
+
+
+def reaplicar_diario(registro: RegistroBancario, caminho: str) -> int:
+    """Reaplica ao registro as operações gravadas em um diário.
+
+    As operações são aplicadas diretamente ao estado, sem as validações do
+    motor, que já foram feitas quando elas aconteceram. A leitura para na
+    primeira linha incompleta ou corrompida, e o arquivo é truncado nesse ponto
+    para que as próximas operações sejam acrescentadas após a última válida.
+
+    Args:
+        registro (RegistroBancario): Registro restaurado do snapshot.
+        caminho (str): Arquivo do diário; se não existir, nada é feito.
+
+    Returns:
+        int: Quantidade de operações reaplicadas.
+    """
+    if not os.path.exists(caminho):
+        return 0
+
+    buscar_conta = registro.buscar_conta
+    deposito = TipoTransacao.DEPOSITO
+    saque = TipoTransacao.SAQUE
+    enviada = TipoTransacao.TRANSFERENCIA_ENVIADA
+    recebida = TipoTransacao.TRANSFERENCIA_RECEBIDA
+    aplicadas = 0
+    posicao_valida = 0
+
+    with open(caminho, "rb") as arquivo:
+        for linha in arquivo:
+            if not linha.endswith(b"\n"):
+                break
+            crc, _, corpo = linha[:-1].partition(b"\t")
+            if crc != b"%08x" % zlib.crc32(corpo):
+                break
+            posicao_valida += len(linha)
+
+            tipo, *campos = corpo.decode().split("\t")
+            match tipo:  # valores de REGISTRO_*
+                case "D" | "S":
+                    conta = buscar_conta(campos[0])
+                    if conta is None:
+                        # Conta que não foi persistida (ex.: dados de exemplo).
+                        continue
+                    valor = int(campos[1])
+                    if tipo == "D":
+                        conta["saldo"] += valor
+                        conta["extrato"].registrar(deposito, valor, int(campos[2]))
+                    else:
+                        conta["saldo"] -= valor
+                        conta["extrato"].registrar(saque, valor, int(campos[2]))
+                case "T":
+                    origem = buscar_conta(campos[0])
+                    destino = buscar_conta(campos[1])
+                    valor, instante = int(campos[2]), int(campos[3])
+                    if origem is not None:
+                        origem["saldo"] -= valor
+                        origem["extrato"].registrar(enviada, valor, instante)
+                    if destino is not None:
+                        destino["saldo"] += valor
+                        destino["extrato"].registrar(recebida, valor, instante)
+                case "C":
+                    agencia, numero, cpf, digitos, alocados = campos
+                    registro.adicionar_conta(
+                        {
+                            "agencia": agencia,
+                            "numero_conta_corrente": numero,
+                            "cpf_titular": cpf,
+                            "extrato": LivroExtrato(),
+                            "saldo": 0,
+                        }
+                    )
+                    registro.alocador_contas.posicionar(int(digitos), int(alocados))
+                case "U":
+                    registro.adicionar_usuario(json.loads(campos[0]))
+
+            aplicadas += 1
+
+    if posicao_valida < os.path.getsize(caminho):
+        os.truncate(caminho, posicao_valida)
+    return aplicadas
+
+
+def gravar_snapshot(registro: RegistroBancario, caminho: str, geracao: int) -> None:
+    """Grava o estado completo do registro, substituindo o snapshot de forma atômica.
+
+    Os extratos de todas as contas são concatenados em colunas únicas (valores,
+    instantes, tipos e as posições de cada tipo), com a posição final de cada
+    conta, em vez de um objeto por conta: o snapshot fica menor e a carga
+    recria os extratos apenas fatiando as colunas, sem recalcular nada.
+    O arquivo é gravado ao lado do definitivo, sincronizado e só então
+    renomeado, de modo que uma queda durante a gravação preserva o anterior.
+
+    Args:
+        registro (RegistroBancario): Registro a gravar.
+        caminho (str): Arquivo do snapshot.
+        geracao (int): Geração do snapshot; o diário que o complementa é o da
+            mesma geração.
+    """
+    valores = array("q")
+    instantes = array("q")
+    tipos = array("B")
+    fins = array("q")
+    indices = {tipo.value: (array("I"), array("q")) for tipo in TipoTransacao}
+    contas = []
+    for conta in registro.lista_contas:
+        livro = conta.get("extrato")
+        if livro is not None:
+            valores.extend(livro.valores)
+            instantes.extend(livro.instantes)
+            tipos.extend(livro.tipos)
+            for tipo, posicoes in livro.indices_por_tipo.items():
+                indices[tipo][0].extend(posicoes)
+        fins.append(len(tipos))
+        for posicoes, fins_tipo in indices.values():
+            fins_tipo.append(len(posicoes))
+        contas.append({chave: v for chave, v in conta.items() if chave != "extrato"})
+
+    alocador = registro.alocador_contas
+    dados = {
+        "versao": VERSAO_SNAPSHOT,
+        "geracao": geracao,
+        "alocador": (alocador.semente, alocador.digitos, alocador.alocados),
+        "usuarios": registro.lista_usuarios,
+        "contas": contas,
+        "fins": fins,
+        "valores": valores,
+        "instantes": instantes,
+        "tipos": tipos,
+        "indices": indices,
+    }
+
+    temporario = caminho + ".tmp"
+    with open(temporario, "wb") as arquivo:
+        pickle.dump(dados, arquivo, protocol=pickle.HIGHEST_PROTOCOL)
+        arquivo.flush()
+        os.fsync(arquivo.fileno())
+    os.replace(temporario, caminho)
+    _sincronizar_diretorio(os.path.dirname(caminho))
+
+
+def carregar_snapshot(caminho: str) -> tuple[RegistroBancario, int]:
+    """Carrega um snapshot gravado por `gravar_snapshot`.
+
+    O arquivo usa `pickle`: carregue apenas snapshots gravados pelo próprio
+    sistema, nunca arquivos de origem desconhecida.
+
+    A coleta de lixo fica suspensa durante a carga: a criação de milhões de
+    objetos que permanecem vivos dispararia coletas sucessivas, cada uma
+    percorrendo todo o estado já carregado, sem nada a liberar. Ao final, o
+    estado carregado é movido para a geração permanente do coletor
+    (`gc.freeze`), para que as coletas seguintes não o percorram de novo; os
+    objetos continuam sendo liberados normalmente pela contagem de referências.
+
+    Args:
+        caminho (str): Arquivo do snapshot.
+
+    Returns:
+        tuple[RegistroBancario, int]: Registro restaurado e geração do snapshot.
+
+    Raises:
+        ValueError: Se o snapshot for de uma versão desconhecida.
+    """
+    coleta_ativa = gc.isenabled()
+    gc.disable()
+    try:
+        resultado = _restaurar_snapshot(caminho)
+        gc.freeze()
+        return resultado
+    finally:
+        if coleta_ativa:
+            gc.enable()
+
+
+def _restaurar_snapshot(caminho: str) -> tuple[RegistroBancario, int]:
+    """Lê o snapshot e recria o registro; ver `carregar_snapshot`."""
+    with open(caminho, "rb") as arquivo:
+        dados = pickle.load(arquivo)
+    if dados.get("versao") != VERSAO_SNAPSHOT:
+        raise ValueError(f"Versão de snapshot desconhecida: {dados.get('versao')}")
+
+    valores = dados["valores"]
+    instantes = dados["instantes"]
+    tipos = dados["tipos"]
+    indices = [
+        (TipoTransacao(codigo), posicoes, fins_tipo)
+        for codigo, (posicoes, fins_tipo) in dados["indices"].items()
+    ]
+    inicios_tipo = [0] * len(indices)
+    de_colunas = LivroExtrato.de_colunas
+    contas = dados["contas"]
+    inicio = 0
+    for i, (conta, fim) in enumerate(zip(contas, dados["fins"])):
+        indices_por_tipo = {}
+        if fim > inicio:
+            for j, (tipo, posicoes, fins_tipo) in enumerate(indices):
+                fim_tipo = fins_tipo[i]
+                if fim_tipo > inicios_tipo[j]:
+                    indices_por_tipo[tipo] = posicoes[inicios_tipo[j] : fim_tipo]
+                    inicios_tipo[j] = fim_tipo
+        conta["extrato"] = de_colunas(
+            valores[inicio:fim],
+            instantes[inicio:fim],
+            tipos[inicio:fim],
+            indices_por_tipo,
+        )
+        inicio = fim
+
+    semente, digitos, alocados = dados["alocador"]
+    alocador = AlocadorContas(digitos, semente)
+    alocador.posicionar(digitos, alocados)
+    registro = RegistroBancario.restaurar(dados["usuarios"], contas, alocador)
+    return registro, dados["geracao"]
+
+
+def _sincronizar_diretorio(diretorio: str) -> None:
+    """Força a gravação das entradas do diretório (renomeações e remoções)."""
+    if os.name != "posix":
+        return
+    descritor = os.open(diretorio or ".", os.O_RDONLY)
+    try:
+        os.fsync(descritor)
+    finally:
+        os.close(descritor)
+
+
+class ArmazenamentoBanco:
+    """Diretório de dados com o snapshot e o diário de operações do banco.
+
+    `abrir` restaura o registro e passa a registrar no diário as operações do
+    motor; `gravar_snapshot` compacta o estado em um novo snapshot e inicia um
+    diário vazio (uma nova geração), descartando o anterior.
+
+    Attributes:
+        diretorio (str): Diretório dos arquivos de dados.
+        registros_por_sincronizacao (int): Tamanho dos lotes do diário.
+        registros_por_snapshot (int): Tamanho do diário a partir do qual a
+            abertura e o fechamento gravam um novo snapshot.
+        geracao (int): Geração atual do snapshot e do diário.
+        diario (DiarioOperacoes | None): Diário aberto, após `abrir`.
+    """
+
+    def __init__(
+        self,
+        diretorio: str,
+        *,
+        registros_por_sincronizacao: int = 1_000,
+        registros_por_snapshot: int = 100_000,
+    ) -> None:
+        self.diretorio = diretorio
+        self.registros_por_sincronizacao = registros_por_sincronizacao
+        self.registros_por_snapshot = registros_por_snapshot
+        self.geracao = 0
+        self.diario: DiarioOperacoes | None = None
+        self._registro: RegistroBancario | None = None
+
+    @property
+    def caminho_snapshot(self) -> str:
+        """Arquivo do snapshot."""
+        return os.path.join(self.diretorio, ARQUIVO_SNAPSHOT)
+
+    def caminho_diario(self, geracao: int) -> str:
+        """Arquivo do diário da geração informada."""
+        return os.path.join(self.diretorio, MODELO_ARQUIVO_DIARIO % geracao)
+
+    def abrir(self) -> RegistroBancario:
+        """Restaura o registro (snapshot mais diário) e ativa o diário.
+
+        Num diretório sem dados, um snapshot vazio é gravado de imediato, para
+        que a semente do alocador de números de conta fique persistida desde a
+        primeira conta aberta.
+
+        Returns:
+            RegistroBancario: Registro com o estado da última operação gravada;
+                vazio se o diretório ainda não tiver dados.
+        """
+        os.makedirs(self.diretorio, exist_ok=True)
+        if os.path.exists(self.caminho_snapshot):
+            registro, self.geracao = carregar_snapshot(self.caminho_snapshot)
+        else:
+            registro, self.geracao = RegistroBancario(), 0
+
+        reaplicadas = reaplicar_diario(registro, self.caminho_diario(self.geracao))
+        self._registro = registro
+        if self.geracao == 0 or reaplicadas >= self.registros_por_snapshot:
+            self.gravar_snapshot()
+        else:
+            self._abrir_diario(reaplicadas)
+        return registro
+
+    def _abrir_diario(self, quantidade: int = 0) -> None:
+        """Abre o diário da geração atual e o torna o diário ativo do motor."""
+        self.diario = DiarioOperacoes(
+            self.caminho_diario(self.geracao),
+            self.registros_por_sincronizacao,
+            quantidade=quantidade,
+        )
+        configurar_diario(self.diario)
+
+    def gravar_snapshot(self) -> None:
+        """Grava o estado atual em um snapshot e inicia um diário vazio.
+
+        O snapshot da nova geração é gravado antes de o diário anterior ser
+        removido: uma queda entre os dois passos deixa o snapshot novo com um
+        diário inexistente (vazio), nunca operações aplicadas duas vezes.
+        """
+        anterior = self.geracao
+        if self.diario is not None:
+            self.diario.fechar()
+        self.geracao += 1
+        gravar_snapshot(self._registro, self.caminho_snapshot, self.geracao)
+        caminho_anterior = self.caminho_diario(anterior)
+        if os.path.exists(caminho_anterior):
+            os.remove(caminho_anterior)
+        self._abrir_diario()
+
+    def fechar(self) -> None:
+        """Grava um snapshot se o diário estiver grande e fecha o diário."""
+        if self.diario is None:
+            return
+        if self.diario.quantidade >= self.registros_por_snapshot:
+            self.gravar_snapshot()
+        if diario_ativo() is self.diario:
+            configurar_diario(None)
+        self.diario.fechar()
+        self.diario = None
+
+
+_diario_atual: DiarioOperacoes | None = None
+
+
+def configurar_diario(diario: DiarioOperacoes | None) -> DiarioOperacoes | None:
+    """Define o diário das operações do motor e devolve o anterior."""
+    global _diario_atual
+    anterior, _diario_atual = _diario_atual, diario
+    return anterior
+
+
+def diario_ativo() -> DiarioOperacoes | None:
+    """Retorna o diário em uso, ou None se as operações não são persistidas."""
+    return _diario_atual
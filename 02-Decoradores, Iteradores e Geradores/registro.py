@@ -0,0 +1,138 @@
+"""Registro em memória de usuários e contas com índices de acesso direto."""
+
+from typing import Any
+
+from alocador import AlocadorContas
+
+
+class RegistroBancario:
+    """Mantém as listas de usuários e contas acompanhadas de índices em dicionário.
+
+    As listas preservam a ordem de cadastro (utilizada nas listagens), enquanto os
+    índices permitem localizar um usuário pelo CPF ou uma conta pelo número em
+    tempo constante, sem percorrer toda a coleção. Os índices são atualizados a
+    cada inserção, por isso os cadastros devem ser feitos pelos métodos
+    `adicionar_usuario` e `adicionar_conta`, nunca diretamente nas listas.
+
+    Attributes:
+        lista_usuarios (list[dict[str, Any]]): Usuários na ordem de cadastro.
+        lista_contas (list[dict[str, Any]]): Contas na ordem de cadastro.
+        indice_usuarios (dict[str, dict[str, Any]]): Usuários indexados pelo CPF.
+        indice_contas (dict[str, dict[str, Any]]): Contas indexadas pelo número
+            da conta corrente.
+        indice_titulares (dict[str, list[dict[str, Any]]]): Contas de cada
+            titular, agrupadas pelo CPF e mantidas na ordem de cadastro.
+        alocador_contas (AlocadorContas): Fonte dos números das novas contas.
+    """
+
+    def __init__(
+        self,
+        lista_usuarios: list[dict[str, Any]] | None = None,
+        lista_contas: list[dict[str, Any]] | None = None,
+        alocador_contas: AlocadorContas | None = None,
+    ) -> None:
+        self.lista_usuarios: list[dict[str, Any]] = []
+        self.lista_contas: list[dict[str, Any]] = []
+        self.indice_usuarios: dict[str, dict[str, Any]] = {}
+        self.indice_contas: dict[str, dict[str, Any]] = {}
+        self.indice_titulares: dict[str, list[dict[str, Any]]] = {}
+        self.alocador_contas = alocador_contas or AlocadorContas()
+
+        for usuario in lista_usuarios or []:
+            self.adicionar_usuario(usuario)
+        for conta in lista_contas or []:
+            self.adicionar_conta(conta)
+
+    @classmethod
+    def restaurar(
+        cls,
+        lista_usuarios: list[dict[str, Any]],
+        lista_contas: list[dict[str, Any]],
+        alocador_contas: AlocadorContas,
+    ) -> "RegistroBancario":
+        """Recria o registro a partir de listas já validadas, como as de um snapshot.
+
+        As listas são adotadas sem cópia e os índices são montados de uma só
+        vez, sem a verificação de duplicidade feita a cada cadastro.
+        """
+        registro = cls(alocador_contas=alocador_contas)
+        registro.lista_usuarios = lista_usuarios
+        registro.lista_contas = lista_contas
+        registro.indice_usuarios = {
+            usuario["cpf"]: usuario for usuario in lista_usuarios
+        }
+        registro.indice_contas = {
+            conta["numero_conta_corrente"]: conta for conta in lista_contas
+        }
+        indice_titulares = registro.indice_titulares
+        for conta in lista_contas:
+            contas_titular = indice_titulares.get(conta["cpf_titular"])
+            if contas_titular is None:
+                indice_titulares[conta["cpf_titular"]] = [conta]
+            else:
+                contas_titular.append(conta)
+        return registro
+
+    def adicionar_usuario(self, usuario: dict[str, Any]) -> bool:
+        """Cadastra um usuário, recusando CPFs já existentes.
+
+        Args:
+            usuario (dict[str, Any]): Dados do usuário, contendo a chave "cpf".
+
+        Returns:
+            bool: True se o usuário foi inserido, False se o CPF já existia.
+        """
+        cpf = usuario.get("cpf")
+        if cpf in self.indice_usuarios:
+            return False
+
+        self.indice_usuarios[cpf] = usuario
+        self.lista_usuarios.append(usuario)
+        return True
+
+    def adicionar_conta(self, conta: dict[str, Any]) -> bool:
+        """Cadastra uma conta, recusando números de conta já existentes.
+
+        Args:
+            conta (dict[str, Any]): Dados da conta, contendo as chaves
+                "numero_conta_corrente" e "cpf_titular".
+
+        Returns:
+            bool: True se a conta foi inserida, False se o número já existia.
+        """
+        numero_conta = conta.get("numero_conta_corrente")
+        if numero_conta in self.indice_contas:
+            return False
+
+        self.indice_contas[numero_conta] = conta
+        self.indice_titulares.setdefault(conta.get("cpf_titular"), []).append(conta)
+        self.lista_contas.append(conta)
+        return True
+
+    def buscar_usuario(self, cpf: str) -> dict[str, Any] | None:
+        """Retorna o usuário com o CPF informado ou None, em tempo constante."""
+        return self.indice_usuarios.get(cpf)
+
+    def buscar_conta(self, numero_conta_corrente: str) -> dict[str, Any] | None:
+        """Retorna a conta com o número informado ou None, em tempo constante."""
+        return self.indice_contas.get(numero_conta_corrente)
+
+    def existe_usuario(self, cpf: str) -> bool:
+        """Indica se existe usuário cadastrado com o CPF informado."""
+        return cpf in self.indice_usuarios
+
+    def existe_conta(self, numero_conta_corrente: str) -> bool:
+        """Indica se existe conta cadastrada com o número informado."""
+        return numero_conta_corrente in self.indice_contas
+
+    def possui_contas(self, cpf_titular: str) -> bool:
+        """Indica se o CPF informado é titular de ao menos uma conta."""
+        return cpf_titular in self.indice_titulares
+
+    def contas_do_titular(self, cpf_titular: str) -> list[dict[str, Any]]:
+        """Retorna as contas do titular informado, na ordem de cadastro.
+
+        A lista devolvida é a própria lista do índice e não deve ser alterada
+        diretamente; quando o CPF não possui contas, uma lista vazia é retornada.
+        """
+        return self.indice_titulares.get(cpf_titular, [])
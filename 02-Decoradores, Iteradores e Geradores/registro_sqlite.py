@@ -0,0 +1,519 @@
+"""Registro bancário armazenado em SQLite, com a mesma interface do registro em memória.
+
+`RegistroSQLite` oferece os métodos de `RegistroBancario` usados pelo menu e
+pelo motor de transações (`buscar_conta`, `existe_usuario`, `contas_do_titular`,
+`adicionar_conta`...), mas consulta o banco a cada chamada em vez de manter os
+dados em listas. `lista_usuarios` e `lista_contas` são visões preguiçosas que
+percorrem a tabela com um cursor, e o extrato de cada conta é lido por faixas
+do índice `(conta, instante)`, com `LIMIT`/`OFFSET` para paginação. Assim
+`recuperar_conta`, `cadastrar_conta`, `listar_usuarios` e `gerar_extrato`
+funcionam sobre o banco sem carregar a base inteira na memória.
+
+O banco usa o modo WAL (leitores não bloqueiam a gravação) com
+`synchronous=NORMAL`, e as instruções SQL são constantes do módulo, reutilizadas
+pelo cache de instruções preparadas da conexão.
+"""
+
+import sqlite3
+from collections.abc import Callable, Iterator, MutableMapping
+from datetime import date
+from typing import Any
+
+from alocador import AlocadorContas
+from livro_extrato import AgregadosExtrato, TipoTransacao, Transacao
+from registro import RegistroBancario
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS usuarios (
+    id INTEGER PRIMARY KEY,
+    cpf TEXT NOT NULL UNIQUE,
+    nome_titular TEXT,
+    data_nascimento_titular TEXT,
+    logradouro TEXT,
+    numero TEXT,
+    bairro TEXT,
+    cidade TEXT,
+    uf TEXT
+);
+CREATE TABLE IF NOT EXISTS contas (
+    id INTEGER PRIMARY KEY,
+    numero_conta_corrente TEXT NOT NULL UNIQUE,
+    agencia TEXT NOT NULL,
+    cpf_titular TEXT NOT NULL,
+    saldo INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS contas_por_titular ON contas (cpf_titular, id);
+CREATE TABLE IF NOT EXISTS transacoes (
+    id INTEGER PRIMARY KEY,
+    conta_id INTEGER NOT NULL REFERENCES contas (id),
+    instante INTEGER NOT NULL,
+    tipo INTEGER NOT NULL,
+    valor INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS transacoes_por_conta_instante
+    ON transacoes (conta_id, instante);
+CREATE TABLE IF NOT EXISTS agregados_diarios (
+    conta_id INTEGER NOT NULL REFERENCES contas (id),
+    dia INTEGER NOT NULL,
+    tipo INTEGER NOT NULL,
+    total INTEGER NOT NULL,
+    quantidade INTEGER NOT NULL,
+    PRIMARY KEY (conta_id, dia, tipo)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS metadados (
+    chave TEXT PRIMARY KEY,
+    valor TEXT NOT NULL
+);
+"""
+
+CAMPOS_ENDERECO = ("logradouro", "numero", "bairro", "cidade", "uf")
+
+SQL_INSERIR_USUARIO = (
+    "INSERT OR IGNORE INTO usuarios (cpf, nome_titular, data_nascimento_titular, "
+    "logradouro, numero, bairro, cidade, uf) VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+)
+SQL_INSERIR_CONTA = (
+    "INSERT OR IGNORE INTO contas "
+    "(numero_conta_corrente, agencia, cpf_titular, saldo) VALUES (?, ?, ?, ?)"
+)
+SQL_INSERIR_TRANSACAO = (
+    "INSERT INTO transacoes (conta_id, instante, tipo, valor) VALUES (?, ?, ?, ?)"
+)
+SQL_SOMAR_AGREGADO = (
+    "INSERT INTO agregados_diarios (conta_id, dia, tipo, total, quantidade) "
+    "VALUES (?, ?, ?, ?, 1) ON CONFLICT DO UPDATE SET "
+    "total = total + excluded.total, quantidade = quantidade + 1"
+)
+# Consolida as transações com `id` maior que o parâmetro nos agregados diários.
+# O dia é o ordinal de `date` (1 = 01/01/0001) da data local da transação.
+SQL_CONSOLIDAR_AGREGADOS = (
+    "INSERT INTO agregados_diarios (conta_id, dia, tipo, total, quantidade) "
+    "SELECT conta_id, CAST(julianday(date(instante, 'unixepoch', 'localtime')) "
+    "- 1721424.5 AS INTEGER) AS dia, tipo, sum(valor), count(*) "
+    "FROM transacoes WHERE id > ? GROUP BY conta_id, dia, tipo "
+    "ON CONFLICT DO UPDATE SET total = total + excluded.total, "
+    "quantidade = quantidade + excluded.quantidade"
+)
+SQL_ATUALIZAR_SALDO = "UPDATE contas SET saldo = ? WHERE id = ?"
+SQL_GRAVAR_METADADO = "INSERT OR REPLACE INTO metadados (chave, valor) VALUES (?, ?)"
+
+SQL_COLUNAS_USUARIO = (
+    "SELECT cpf, nome_titular, data_nascimento_titular, "
+    "logradouro, numero, bairro, cidade, uf FROM usuarios"
+)
+SQL_COLUNAS_CONTA = (
+    "SELECT id, agencia, numero_conta_corrente, cpf_titular, saldo FROM contas"
+)
+SQL_BUSCAR_USUARIO = SQL_COLUNAS_USUARIO + " WHERE cpf = ?"
+SQL_BUSCAR_CONTA = SQL_COLUNAS_CONTA + " WHERE numero_conta_corrente = ?"
+SQL_CONTAS_DO_TITULAR = SQL_COLUNAS_CONTA + " WHERE cpf_titular = ? ORDER BY id"
+SQL_EXISTE_USUARIO = "SELECT 1 FROM usuarios WHERE cpf = ?"
+SQL_EXISTE_CONTA = "SELECT 1 FROM contas WHERE numero_conta_corrente = ?"
+SQL_POSSUI_CONTAS = "SELECT 1 FROM contas WHERE cpf_titular = ? LIMIT 1"
+SQL_EXISTE_TRANSACAO = "SELECT 1 FROM transacoes WHERE conta_id = ? LIMIT 1"
+SQL_QUANTIDADE_TRANSACOES = "SELECT count(*) FROM transacoes WHERE conta_id = ?"
+SQL_ULTIMO_INSTANTE = "SELECT max(instante) FROM transacoes WHERE conta_id = ?"
+SQL_AGREGADOS_DA_CONTA = (
+    "SELECT dia, tipo, total, quantidade FROM agregados_diarios "
+    "WHERE conta_id = ? ORDER BY dia"
+)
+
+_TIPOS_POR_CODIGO = {tipo.value: tipo for tipo in TipoTransacao}
+
+
+def _usuario_da_linha(linha: tuple) -> dict[str, Any]:
+    """Converte uma linha de `usuarios` no dicionário usado pelo sistema."""
+    cpf, nome, nascimento, *endereco = linha
+    return {
+        "cpf": cpf,
+        "data_nascimento_titular": nascimento,
+        "nome_titular": nome,
+        "endereco": dict(zip(CAMPOS_ENDERECO, endereco)),
+    }
+
+
+def _linha_do_usuario(usuario: dict[str, Any]) -> tuple:
+    """Converte o dicionário de um usuário nos parâmetros de `SQL_INSERIR_USUARIO`."""
+    endereco = usuario.get("endereco") or {}
+    return (
+        usuario.get("cpf"),
+        usuario.get("nome_titular"),
+        usuario.get("data_nascimento_titular"),
+        *(endereco.get(campo) for campo in CAMPOS_ENDERECO),
+    )
+
+
+class ExtratoSQLite:
+    """Extrato de uma conta lido da tabela `transacoes`, com a interface do livro.
+
+    Oferece `registrar`, `iterar`, `agregados` e `len()` como `LivroExtrato`.
+    As leituras percorrem o índice `(conta_id, instante)` e devolvem as
+    transações em ordem cronológica, uma por vez, sem materializar o histórico.
+    Os agregados vêm da tabela `agregados_diarios` (uma linha por dia e tipo
+    de operação), atualizada junto com cada transação gravada.
+    """
+
+    __slots__ = ("_conexao", "conta_id", "_agregados")
+
+    def __init__(self, conexao: sqlite3.Connection, conta_id: int) -> None:
+        self._conexao = conexao
+        self.conta_id = conta_id
+        self._agregados: AgregadosExtrato | None = None
+
+    def __len__(self) -> int:
+        return self._conexao.execute(
+            SQL_QUANTIDADE_TRANSACOES, (self.conta_id,)
+        ).fetchone()[0]
+
+    def __bool__(self) -> bool:
+        return (
+            self._conexao.execute(SQL_EXISTE_TRANSACAO, (self.conta_id,)).fetchone()
+            is not None
+        )
+
+    @property
+    def ultimo_instante(self) -> int | None:
+        """Instante da transação mais recente (pelo índice), ou None se não houver."""
+        cursor = self._conexao.execute(SQL_ULTIMO_INSTANTE, (self.conta_id,))
+        return cursor.fetchone()[0]
+
+    def registrar(self, tipo: TipoTransacao, valor: int, instante: int) -> None:
+        """Grava a transação e confirma a operação em andamento.
+
+        O motor atualiza o saldo da conta antes de registrar a transação; as
+        duas alterações são confirmadas juntas, em uma única transação do banco.
+        A saída de uma transferência fica pendente: `motor.transferir` registra
+        em seguida a entrada no destino, e os dois saldos e as duas pontas são
+        confirmados (ou, em caso de erro, desfeitos) juntos.
+        """
+        conexao = self._conexao
+        try:
+            conexao.execute(
+                SQL_INSERIR_TRANSACAO, (self.conta_id, instante, int(tipo), valor)
+            )
+            conexao.execute(
+                SQL_SOMAR_AGREGADO,
+                (
+                    self.conta_id,
+                    date.fromtimestamp(instante).toordinal(),
+                    int(tipo),
+                    valor,
+                ),
+            )
+        except BaseException:
+            conexao.rollback()
+            self._agregados = None  # pode conter a saída desfeita
+            raise
+        if tipo is not TipoTransacao.TRANSFERENCIA_ENVIADA:
+            conexao.commit()
+        if self._agregados is not None:
+            self._agregados.registrar(tipo, valor, instante)
+
+    @property
+    def agregados(self) -> AgregadosExtrato:
+        """Totais por tipo e por dia, lidos de `agregados_diarios` no primeiro acesso."""
+        if self._agregados is None:
+            self._agregados = AgregadosExtrato.de_totais_diarios(
+                self._conexao.execute(SQL_AGREGADOS_DA_CONTA, (self.conta_id,))
+            )
+        return self._agregados
+
+    def iterar(
+        self,
+        tipo: TipoTransacao | None = None,
+        *,
+        inicio: int | None = None,
+        fim: int | None = None,
+        limite: int | None = None,
+        deslocamento: int = 0,
+    ) -> Iterator[Transacao]:
+        """Percorre as transações em ordem cronológica, com filtros opcionais.
+
+        Args:
+            tipo (TipoTransacao | None): Tipo de operação a filtrar.
+            inicio (int | None): Instante mínimo (inclusive), em segundos.
+            fim (int | None): Instante máximo (exclusive), em segundos.
+            limite (int | None): Quantidade máxima de transações (`LIMIT`).
+            deslocamento (int): Transações a pular antes da primeira (`OFFSET`).
+
+        Yields:
+            Transacao: Transações que atendem aos filtros.
+        """
+        condicoes = ["conta_id = ?"]
+        parametros: list[int] = [self.conta_id]
+        if inicio is not None:
+            condicoes.append("instante >= ?")
+            parametros.append(inicio)
+        if fim is not None:
+            condicoes.append("instante < ?")
+            parametros.append(fim)
+        if tipo is not None:
+            condicoes.append("tipo = ?")
+            parametros.append(int(tipo))
+        parametros += (-1 if limite is None else limite, deslocamento)
+
+        cursor = self._conexao.execute(
+            "SELECT instante, tipo, valor FROM transacoes WHERE "
+            + " AND ".join(condicoes)
+            + " ORDER BY instante, id LIMIT ? OFFSET ?",
+            parametros,
+        )
+        for instante, codigo, valor in cursor:
+            yield Transacao(instante, _TIPOS_POR_CODIGO[codigo], valor)
+
+
+class ContaSQLite(MutableMapping):
+    """Conta lida do banco, com a interface de dicionário das contas em memória.
+
+    As chaves são as mesmas das contas de `RegistroBancario`. Apenas "saldo"
+    pode ser alterado: a atribuição atualiza a linha da conta e é confirmada
+    junto com a transação registrada no extrato logo em seguida.
+    """
+
+    __slots__ = ("_conexao", "id", "_dados", "_extrato")
+
+    def __init__(self, conexao: sqlite3.Connection, linha: tuple) -> None:
+        self._conexao = conexao
+        self.id, agencia, numero, cpf, saldo = linha
+        self._dados = {
+            "agencia": agencia,
+            "numero_conta_corrente": numero,
+            "cpf_titular": cpf,
+            "saldo": saldo,
+        }
+        self._extrato: ExtratoSQLite | None = None
+
+    def __getitem__(self, chave: str) -> Any:
+        if chave == "extrato":
+            if self._extrato is None:
+                self._extrato = ExtratoSQLite(self._conexao, self.id)
+            return self._extrato
+        return self._dados[chave]
+
+    def __setitem__(self, chave: str, valor: Any) -> None:
+        if chave != "saldo":
+            raise KeyError(f"Campo somente leitura: {chave!r}")
+        self._conexao.execute(SQL_ATUALIZAR_SALDO, (valor, self.id))
+        self._dados["saldo"] = valor
+
+    def __delitem__(self, chave: str) -> None:
+        raise KeyError(f"Campo somente leitura: {chave!r}")
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self._dados
+        yield "extrato"
+
+    def __len__(self) -> int:
+        return len(self._dados) + 1
+
+
+class VisaoTabela:
+    """Visão preguiçosa de uma tabela, no lugar das listas do registro em memória.
+
+    `bool()` e `len()` consultam o banco; a iteração percorre a tabela na ordem
+    de cadastro com um cursor, convertendo uma linha por vez.
+    """
+
+    def __init__(
+        self,
+        conexao: sqlite3.Connection,
+        tabela: str,
+        consulta: str,
+        converter: Callable[[tuple], Any],
+    ) -> None:
+        self._conexao = conexao
+        self._sql_existe = f"SELECT 1 FROM {tabela} LIMIT 1"
+        self._sql_quantidade = f"SELECT count(*) FROM {tabela}"
+        self._sql_iterar = consulta + " ORDER BY id"
+        self._converter = converter
+
+    def __bool__(self) -> bool:
+        return self._conexao.execute(self._sql_existe).fetchone() is not None
+
+    def __len__(self) -> int:
+        return self._conexao.execute(self._sql_quantidade).fetchone()[0]
+
+    def __iter__(self) -> Iterator[Any]:
+        return map(self._converter, self._conexao.execute(self._sql_iterar))
+
+
+class RegistroSQLite:
+    """Registro de usuários e contas armazenado em um arquivo SQLite.
+
+    Attributes:
+        caminho (str): Arquivo do banco (ou ":memory:").
+        conexao (sqlite3.Connection): Conexão em uso.
+        lista_usuarios (VisaoTabela): Usuários na ordem de cadastro.
+        lista_contas (VisaoTabela): Contas na ordem de cadastro.
+        alocador_contas (AlocadorContas): Fonte dos números das novas contas,
+            cuja semente e posição ficam gravadas no próprio banco.
+    """
+
+    def __init__(self, caminho: str, alocador_contas: AlocadorContas | None = None):
+        self.caminho = caminho
+        self.conexao = sqlite3.connect(caminho, cached_statements=256)
+        self.conexao.execute("PRAGMA journal_mode = WAL")
+        self.conexao.execute("PRAGMA synchronous = NORMAL")
+        self.conexao.executescript(ESQUEMA)
+        if (
+            self.conexao.execute("SELECT 1 FROM agregados_diarios LIMIT 1").fetchone()
+            is None
+        ):
+            # Banco criado antes dos agregados: consolida o histórico existente.
+            self.conexao.execute(SQL_CONSOLIDAR_AGREGADOS, (0,))
+
+        self.lista_usuarios = VisaoTabela(
+            self.conexao, "usuarios", SQL_COLUNAS_USUARIO, _usuario_da_linha
+        )
+        self.lista_contas = VisaoTabela(
+            self.conexao, "contas", SQL_COLUNAS_CONTA, self._conta_da_linha
+        )
+
+        metadados = {
+            chave: int(valor)
+            for chave, valor in self.conexao.execute(
+                "SELECT chave, valor FROM metadados"
+            )
+        }
+        if "alocador_semente" in metadados:
+            alocador_contas = AlocadorContas(
+                metadados["alocador_digitos"], metadados["alocador_semente"]
+            )
+            alocador_contas.posicionar(
+                metadados["alocador_digitos"], metadados["alocador_alocados"]
+            )
+        self.alocador_contas = alocador_contas or AlocadorContas()
+        self._gravar_alocador()
+        self.conexao.commit()
+
+    def _conta_da_linha(self, linha: tuple) -> ContaSQLite:
+        """Converte uma linha de `contas` na conta correspondente."""
+        return ContaSQLite(self.conexao, linha)
+
+    def _gravar_alocador(self) -> None:
+        """Grava a semente e a posição do alocador (sem confirmar)."""
+        alocador = self.alocador_contas
+        self.conexao.executemany(
+            SQL_GRAVAR_METADADO,
+            (
+                ("alocador_semente", str(alocador.semente)),
+                ("alocador_digitos", str(alocador.digitos)),
+                ("alocador_alocados", str(alocador.alocados)),
+            ),
+        )
+
+    def fechar(self) -> None:
+        """Fecha a conexão com o banco."""
+        self.conexao.close()
+
+    def adicionar_usuario(self, usuario: dict[str, Any]) -> bool:
+        """Cadastra um usuário, recusando CPFs já existentes.
+
+        Returns:
+            bool: True se o usuário foi inserido, False se o CPF já existia.
+        """
+        cursor = self.conexao.execute(SQL_INSERIR_USUARIO, _linha_do_usuario(usuario))
+        self.conexao.commit()
+        return cursor.rowcount == 1
+
+    def adicionar_conta(self, conta: dict[str, Any]) -> bool:
+        """Cadastra uma conta, recusando números de conta já existentes.
+
+        A posição do alocador é gravada na mesma transação, para que o próximo
+        número entregue após reabrir o banco continue a sequência.
+
+        Returns:
+            bool: True se a conta foi inserida, False se o número já existia.
+        """
+        cursor = self.conexao.execute(
+            SQL_INSERIR_CONTA,
+            (
+                conta.get("numero_conta_corrente"),
+                conta.get("agencia"),
+                conta.get("cpf_titular"),
+                conta.get("saldo", 0),
+            ),
+        )
+        self._gravar_alocador()
+        self.conexao.commit()
+        return cursor.rowcount == 1
+
+    def importar(self, registro: RegistroBancario) -> None:
+        """Copia usuários, contas e extratos de um registro em memória.
+
+        Tudo é gravado em uma única transação, com `executemany` por tabela.
+        """
+        with self.conexao:
+            self.conexao.executemany(
+                SQL_INSERIR_USUARIO, map(_linha_do_usuario, registro.lista_usuarios)
+            )
+            self.conexao.executemany(
+                SQL_INSERIR_CONTA,
+                (
+                    (
+                        conta["numero_conta_corrente"],
+                        conta["agencia"],
+                        conta["cpf_titular"],
+                        conta.get("saldo", 0),
+                    )
+                    for conta in registro.lista_contas
+                ),
+            )
+            ids = dict(
+                self.conexao.execute("SELECT numero_conta_corrente, id FROM contas")
+            )
+            (ultima_transacao,) = self.conexao.execute(
+                "SELECT coalesce(max(id), 0) FROM transacoes"
+            ).fetchone()
+            self.conexao.executemany(
+                SQL_INSERIR_TRANSACAO,
+                (
+                    (ids[conta["numero_conta_corrente"]], instante, tipo, valor)
+                    for conta in registro.lista_contas
+                    if conta.get("extrato")
+                    for instante, tipo, valor in zip(
+                        conta["extrato"].instantes,
+                        conta["extrato"].tipos,
+                        conta["extrato"].valores,
+                    )
+                ),
+            )
+            self.conexao.execute(SQL_CONSOLIDAR_AGREGADOS, (ultima_transacao,))
+            self._gravar_alocador()
+
+    def buscar_usuario(self, cpf: str) -> dict[str, Any] | None:
+        """Retorna o usuário com o CPF informado ou None."""
+        linha = self.conexao.execute(SQL_BUSCAR_USUARIO, (cpf,)).fetchone()
+        return None if linha is None else _usuario_da_linha(linha)
+
+    def buscar_conta(self, numero_conta_corrente: str) -> ContaSQLite | None:
+        """Retorna a conta com o número informado ou None."""
+        linha = self.conexao.execute(
+            SQL_BUSCAR_CONTA, (numero_conta_corrente,)
+        ).fetchone()
+        return None if linha is None else ContaSQLite(self.conexao, linha)
+
+    def existe_usuario(self, cpf: str) -> bool:
+        """Indica se existe usuário cadastrado com o CPF informado."""
+        return self.conexao.execute(SQL_EXISTE_USUARIO, (cpf,)).fetchone() is not None
+
+    def existe_conta(self, numero_conta_corrente: str) -> bool:
+        """Indica se existe conta cadastrada com o número informado."""
+        return (
+            self.conexao.execute(SQL_EXISTE_CONTA, (numero_conta_corrente,)).fetchone()
+            is not None
+        )
+
+    def possui_contas(self, cpf_titular: str) -> bool:
+        """Indica se o CPF informado é titular de ao menos uma conta."""
+        return (
+            self.conexao.execute(SQL_POSSUI_CONTAS, (cpf_titular,)).fetchone()
+            is not None
+        )
+
+    def contas_do_titular(self, cpf_titular: str) -> list[ContaSQLite]:
+        """Retorna as contas do titular informado, na ordem de cadastro."""
+        return [
+            ContaSQLite(self.conexao, linha)
+            for linha in self.conexao.execute(SQL_CONTAS_DO_TITULAR, (cpf_titular,))
+        ]
@@ -0,0 +1,134 @@
+"""Contagem diária de saques por conta, com virada de dia preguiçosa.
+
+`ControleSaquesDiarios` guarda, para cada conta que sacou no dia corrente, a
+quantidade e o total sacados, e responde às verificações de limite do motor
+(`motor.sacar`) em tempo constante. Só os contadores do dia corrente ficam em
+memória: quando chega a primeira operação de um novo dia, os contadores do dia
+anterior são descartados de uma vez, e a memória fica limitada às contas
+movimentadas no dia.
+
+O contador de uma conta é iniciado a partir do próprio extrato, lendo apenas
+os saques do dia (busca binária pelo período). Por isso os limites continuam
+corretos depois de reiniciar o sistema ou de descartar os contadores.
+"""
+
+from datetime import date, datetime, timedelta
+from typing import Any
+
+from livro_extrato import TipoTransacao
+
+
+def limites_do_dia(instante: int) -> tuple[float, float]:
+    """Retorna o início (inclusive) e o fim (exclusive) do dia local do instante."""
+    dia = date.fromtimestamp(instante)
+    meia_noite = datetime.min.time()
+    return (
+        datetime.combine(dia, meia_noite).timestamp(),
+        datetime.combine(dia + timedelta(days=1), meia_noite).timestamp(),
+    )
+
+
+def contar_saques_no_extrato(
+    conta: dict[str, Any], inicio: float, fim: float
+) -> list[int]:
+    """Conta os saques registrados no extrato da conta em um período.
+
+    Args:
+        conta (dict[str, Any]): Conta consultada.
+        inicio (float): Instante inicial (inclusive), em segundos.
+        fim (float): Instante final (exclusive), em segundos.
+
+    Returns:
+        list[int]: Quantidade de saques e total sacado, em centavos.
+    """
+    quantidade = total = 0
+    extrato = conta.get("extrato")
+    if extrato:
+        for transacao in extrato.iterar(TipoTransacao.SAQUE, inicio=inicio, fim=fim):
+            quantidade += 1
+            total += transacao.valor
+    return [quantidade, total]
+
+
+class ControleSaquesDiarios:
+    """Quantidade e total sacados por conta no dia corrente.
+
+    Operações com instante de um dia já encerrado (por exemplo, em um lote
+    retroativo) são verificadas pelo extrato daquele dia, sem guardar contador.
+
+    Pode ser compartilhado entre threads, desde que as operações de uma mesma
+    conta não sejam simultâneas (ver `concorrencia.MotorConcorrente`): cada
+    contador guarda o início do seu dia e é lido de novo do extrato se não for
+    do dia da operação, de modo que viradas de dia simultâneas apenas fazem
+    contadores serem relidos.
+    """
+
+    __slots__ = ("_contadores", "_dia")
+
+    def __init__(self) -> None:
+        # Contadores `[início do dia, quantidade, total]` por número de conta.
+        self._contadores: dict[str, list] = {}
+        self._dia = (float("-inf"), float("-inf"))
+
+    def __len__(self) -> int:
+        """Quantidade de contas com contador no dia corrente."""
+        return len(self._contadores)
+
+    def _contador(self, conta: dict[str, Any], instante: int) -> tuple[list, bool]:
+        """Retorna o contador da conta no dia do instante.
+
+        Returns:
+            tuple[list, bool]: Contador `[início do dia, quantidade, total]` e
+                se ele acabou de ser lido do extrato.
+        """
+        inicio, fim = self._dia
+        if instante >= fim:
+            # Novo dia: os contadores guardados são todos de dias anteriores.
+            inicio, fim = self._dia = limites_do_dia(instante)
+            self._contadores = {}
+        elif instante < inicio:
+            inicio, fim = limites_do_dia(instante)
+            return [inicio, *contar_saques_no_extrato(conta, inicio, fim)], True
+
+        contadores = self._contadores
+        numero = conta["numero_conta_corrente"]
+        contador = contadores.get(numero)
+        if contador is None or contador[0] != inicio:
+            contador = contadores[numero] = [
+                inicio,
+                *contar_saques_no_extrato(conta, inicio, fim),
+            ]
+            return contador, True
+        return contador, False
+
+    def consultar(self, conta: dict[str, Any], instante: int) -> tuple[int, int]:
+        """Retorna a quantidade e o total sacados pela conta no dia do instante.
+
+        Deve ser chamado antes de o saque ser registrado no extrato; o
+        contador iniciado aqui é o que `registrar` atualiza em seguida.
+
+        Args:
+            conta (dict[str, Any]): Conta consultada.
+            instante (int): Momento da operação, em segundos desde a época.
+
+        Returns:
+            tuple[int, int]: Quantidade de saques e total sacado, em centavos.
+        """
+        (_, quantidade, total), _ = self._contador(conta, instante)
+        return quantidade, total
+
+    def registrar(self, conta: dict[str, Any], valor: int, instante: int) -> None:
+        """Soma um saque concluído ao contador da conta no dia do instante.
+
+        Deve ser chamado depois de o saque ser registrado no extrato: se o
+        contador precisar ser lido do extrato, o saque já está incluído nele.
+
+        Args:
+            conta (dict[str, Any]): Conta movimentada.
+            valor (int): Valor sacado, em centavos.
+            instante (int): Momento da operação, em segundos desde a época.
+        """
+        contador, lido_do_extrato = self._contador(conta, instante)
+        if not lido_do_extrato:
+            contador[1] += 1
+            contador[2] += valor
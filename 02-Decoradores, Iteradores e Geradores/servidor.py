@@ -0,0 +1,400 @@
+"""Servidor TCP (asyncio) com as operações do menu em JSON, uma linha por pedido.
+
+Cada linha recebida é um objeto JSON com a chave "operacao" e os dados da
+operação; cada resposta é um objeto JSON em uma linha, na ordem dos pedidos da
+conexão, com o código do resultado ("status"), a mensagem e, conforme a
+operação, o saldo, o número da conta aberta ou o texto do extrato. A chave
+opcional "id" do pedido é devolvida na resposta. Exemplos:
+
+    {"operacao": "cadastrar_usuario", "cpf": "12345678901", "nome_titular": "Ana",
+     "data_nascimento_titular": "01-01-1990", "endereco": {"cidade": "Recife"}}
+    {"operacao": "cadastrar_conta", "cpf": "12345678901"}
+    {"operacao": "depositar", "conta": "12345-6", "valor": "100.00"}
+    {"operacao": "sacar", "conta": "12345-6", "valor": "20.50"}
+    {"operacao": "transferir", "origem": "12345-6", "destino": "65432-1",
+     "valor": "10"}
+    {"operacao": "extrato", "conta": "12345-6", "tipo": "saque",
+     "inicio": "01-05-2025", "fim": "31-05-2025", "limite": 20}
+    {"operacao": "listar", "limite": 100, "deslocamento": 200}
+
+As validações são as do motor de transações (`motor.py`), as mesmas do menu
+interativo, e o extrato e a listagem usam os mesmos textos de `desafio.py`,
+em páginas de no máximo `LIMITE_MAXIMO_PAGINA` itens.
+Todas as conexões são atendidas por um único laço de eventos: cada operação é
+executada do início ao fim sem ceder o laço, de modo que as operações sobre uma
+conta nunca se intercalam e nenhuma trava é necessária. Execute a partir do
+diretório da atividade, por exemplo:
+
+    python servidor.py --porta 8765 --dados dados/
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import signal
+import sys
+from collections.abc import Callable
+from itertools import islice
+from typing import Any
+
+from desafio import carregar_dados_mock, formatar_extrato, iterar_listagem_usuarios
+from dinheiro import converter_para_centavos, formatar_centavos
+from livro_extrato import TipoTransacao
+from motor import (
+    CONTA_INEXISTENTE,
+    OPERACAO_INVALIDA,
+    VALOR_NAO_NUMERICO,
+    ResultadoOperacao,
+    StatusOperacao,
+    abrir_conta,
+    converter_data_para_instante,
+    criar_usuario,
+    depositar,
+    sacar,
+    transferir,
+)
+from persistencia import ArmazenamentoBanco
+from registro import RegistroBancario
+from saques_diarios import ControleSaquesDiarios
+
+PORTA_PADRAO = 8765
+# Conexões pendentes aceitas pelo sistema antes de o servidor atendê-las.
+FILA_CONEXOES = 4096
+# Tamanho máximo de uma linha de pedido; linhas maiores encerram a conexão.
+TAMANHO_MAXIMO_PEDIDO = 64 * 1024
+# Itens por página do extrato e da listagem: padrão, quando o pedido não informa
+# "limite", e máximo aceito. Cada pedido roda sem ceder o laço de eventos, então
+# uma página sem limite atrasaria todas as outras conexões.
+LIMITE_PADRAO_PAGINA = 100
+LIMITE_MAXIMO_PAGINA = 1_000
+
+PEDIDO_INVALIDO = ResultadoOperacao(
+    StatusOperacao.OPERACAO_INVALIDA,
+    "Operação falhou! O pedido não é um objeto JSON ou está incompleto.",
+)
+PERIODO_INVALIDO = ResultadoOperacao(
+    StatusOperacao.DATA_INVALIDA, "Período inválido! Use datas no formato dd-mm-yyyy."
+)
+PAGINA_INVALIDA = ResultadoOperacao(
+    StatusOperacao.OPERACAO_INVALIDA,
+    f"Página inválida! O limite deve ser um inteiro de 1 a {LIMITE_MAXIMO_PAGINA} "
+    "e o deslocamento, um inteiro não negativo.",
+)
+
+
+class ServidorBancario:
+    """Atende os pedidos JSON das conexões, aplicando-os ao registro bancário.
+
+    Attributes:
+        registro (RegistroBancario): Registro com os usuários e as contas.
+        limite (int): Valor máximo por saque, em centavos.
+        limite_saques (int): Quantidade máxima de saques por conta e por dia.
+        limite_diario (int | None): Total máximo sacado por conta e por dia, em
+            centavos; se None, apenas a quantidade é limitada.
+        saques_diarios (ControleSaquesDiarios): Contadores diários de saques.
+        conexoes (int): Conexões abertas no momento.
+    """
+
+    def __init__(
+        self,
+        registro: RegistroBancario,
+        *,
+        limite: int,
+        limite_saques: int,
+        limite_diario: int | None = None,
+    ) -> None:
+        self.registro = registro
+        self.limite = limite
+        self.limite_saques = limite_saques
+        self.limite_diario = limite_diario
+        self.saques_diarios = ControleSaquesDiarios()
+        self.conexoes = 0
+        self._operacoes: dict[str, Callable[[dict[str, Any]], dict[str, Any]]] = {
+            "cadastrar_usuario": self._cadastrar_usuario,
+            "cadastrar_conta": self._cadastrar_conta,
+            "depositar": self._depositar,
+            "sacar": self._sacar,
+            "transferir": self._transferir,
+            "extrato": self._extrato,
+            "listar": self._listar,
+        }
+
+    def executar(self, pedido: dict[str, Any]) -> dict[str, Any]:
+        """Executa um pedido já decodificado e monta a resposta.
+
+        Args:
+            pedido (dict[str, Any]): Objeto do pedido, com a chave "operacao".
+
+        Returns:
+            dict[str, Any]: Resposta com "status", "mensagem" e os campos da
+                operação.
+        """
+        try:
+            operacao = self._operacoes[pedido["operacao"]]
+        except (KeyError, TypeError):
+            return _resposta(OPERACAO_INVALIDA)
+        try:
+            return operacao(pedido)
+        except (KeyError, TypeError, ValueError, ArithmeticError):
+            # ArithmeticError: números fora da faixa (ex.: 1e400 vira infinito).
+            return _resposta(PEDIDO_INVALIDO)
+
+    def responder(self, linha: bytes) -> bytes:
+        """Decodifica uma linha de pedido e devolve a linha de resposta."""
+        try:
+            pedido = json.loads(linha)
+        except ValueError:
+            pedido = None
+        if not isinstance(pedido, dict):
+            resposta = _resposta(PEDIDO_INVALIDO)
+        else:
+            resposta = self.executar(pedido)
+            if "id" in pedido:
+                resposta["id"] = pedido["id"]
+        return (json.dumps(resposta, ensure_ascii=False) + "\n").encode()
+
+    async def atender(
+        self, leitor: asyncio.StreamReader, escritor: asyncio.StreamWriter
+    ) -> None:
+        """Atende uma conexão até o cliente fechá-la."""
+        self.conexoes += 1
+        try:
+            while linha := await leitor.readline():
+                escritor.write(self.responder(linha))
+                await escritor.drain()
+        except (ConnectionError, ValueError):
+            # Conexão interrompida ou linha maior que TAMANHO_MAXIMO_PEDIDO.
+            pass
+        finally:
+            self.conexoes -= 1
+            escritor.close()
+
+    async def servir(
+        self, host: str, porta: int, parar: asyncio.Event | None = None
+    ) -> None:
+        """Aceita conexões até `parar` ser sinalizado (ou indefinidamente).
+
+        Ao começar, informa no console o endereço em que o servidor escuta (com
+        a porta efetiva, se `porta` for 0).
+        """
+        servidor = await asyncio.start_server(
+            self.atender,
+            host,
+            porta,
+            backlog=FILA_CONEXOES,
+            limit=TAMANHO_MAXIMO_PEDIDO,
+        )
+        async with servidor:
+            endereco = servidor.sockets[0].getsockname()
+            print(f"Servidor ouvindo em {endereco[0]}:{endereco[1]}", flush=True)
+            await (parar or asyncio.Event()).wait()
+
+    def _cadastrar_usuario(self, pedido: dict[str, Any]) -> dict[str, Any]:
+        return _resposta(
+            criar_usuario(
+                self.registro,
+                cpf=str(pedido["cpf"]),
+                nome_titular=str(pedido["nome_titular"]),
+                data_nascimento_titular=str(pedido["data_nascimento_titular"]),
+                endereco=dict(pedido.get("endereco") or {}),
+            )
+        )
+
+    def _cadastrar_conta(self, pedido: dict[str, Any]) -> dict[str, Any]:
+        resultado = abrir_conta(self.registro, cpf=str(pedido["cpf"]))
+        resposta = _resposta(resultado)
+        if resultado.sucesso:
+            resposta["agencia"] = resultado.dados["agencia"]
+            resposta["conta"] = resultado.dados["numero_conta_corrente"]
+        return resposta
+
+    def _depositar(self, pedido: dict[str, Any]) -> dict[str, Any]:
+        conta = self.registro.buscar_conta(str(pedido["conta"]))
+        if conta is None:
+            return _resposta(CONTA_INEXISTENTE)
+        valor = _valor(pedido)
+        if valor is None:
+            return _resposta(VALOR_NAO_NUMERICO)
+        return _resposta(depositar(conta, valor))
+
+    def _sacar(self, pedido: dict[str, Any]) -> dict[str, Any]:
+        conta = self.registro.buscar_conta(str(pedido["conta"]))
+        if conta is None:
+            return _resposta(CONTA_INEXISTENTE)
+        valor = _valor(pedido)
+        if valor is None:
+            return _resposta(VALOR_NAO_NUMERICO)
+        return _resposta(
+            sacar(
+                conta,
+                valor,
+                limite=self.limite,
+                limite_saques=self.limite_saques,
+                limite_diario=self.limite_diario,
+                saques_diarios=self.saques_diarios,
+            )
+        )
+
+    def _transferir(self, pedido: dict[str, Any]) -> dict[str, Any]:
+        origem = self.registro.buscar_conta(str(pedido["origem"]))
+        destino = self.registro.buscar_conta(str(pedido["destino"]))
+        if origem is None or destino is None:
+            return _resposta(CONTA_INEXISTENTE)
+        valor = _valor(pedido)
+        if valor is None:
+            return _resposta(VALOR_NAO_NUMERICO)
+        return _resposta(transferir(origem, destino, valor))
+
+    def _extrato(self, pedido: dict[str, Any]) -> dict[str, Any]:
+        conta = self.registro.buscar_conta(str(pedido["conta"]))
+        if conta is None:
+            return _resposta(CONTA_INEXISTENTE)
+
+        tipo = str(pedido.get("tipo") or "")
+        if tipo:
+            TipoTransacao.de_operacao(tipo)  # KeyError: pedido inválido
+        inicio, fim = pedido.get("inicio"), pedido.get("fim")
+        try:
+            inicio = None if inicio is None else converter_data_para_instante(inicio)
+            fim = None if fim is None else converter_data_para_instante(fim, 1)
+        except (TypeError, ValueError):
+            return _resposta(PERIODO_INVALIDO)
+        pagina = _pagina(pedido)
+        if pagina is None:
+            return _resposta(PAGINA_INVALIDA)
+        limite, deslocamento = pagina
+
+        texto = formatar_extrato(
+            conta,
+            tipo,
+            inicio=inicio,
+            fim=fim,
+            limite=limite,
+            deslocamento=deslocamento,
+        )
+        resposta = _resposta(
+            ResultadoOperacao(StatusOperacao.SUCESSO, "Extrato gerado.")
+        )
+        resposta["saldo"] = formatar_centavos(conta.get("saldo", 0))
+        resposta["extrato"] = texto
+        return resposta
+
+    def _listar(self, pedido: dict[str, Any]) -> dict[str, Any]:
+        # Um bloco por usuário: a página é recortada sem montar a listagem toda,
+        # e os usuários anteriores a ela nem chegam a ser formatados.
+        pagina = _pagina(pedido)
+        if pagina is None:
+            return _resposta(PAGINA_INVALIDA)
+        limite, deslocamento = pagina
+        blocos = islice(iterar_listagem_usuarios(self.registro, deslocamento), limite)
+        resposta = _resposta(
+            ResultadoOperacao(StatusOperacao.SUCESSO, "Listagem gerada.")
+        )
+        resposta["listagem"] = "".join(blocos)
+        return resposta
+
+
+def _resposta(resultado: ResultadoOperacao) -> dict[str, Any]:
+    """Converte o resultado do motor no objeto de resposta do protocolo."""
+    resposta = {"status": resultado.status.value, "mensagem": resultado.mensagem}
+    if resultado.saldo is not None:
+        resposta["saldo"] = formatar_centavos(resultado.saldo)
+    return resposta
+
+
+def _valor(pedido: dict[str, Any]) -> int | None:
+    """Lê o valor em reais do pedido (texto ou número JSON), em centavos."""
+    try:
+        return converter_para_centavos(str(pedido["valor"]))
+    except ValueError:
+        return None
+
+
+def _pagina(pedido: dict[str, Any]) -> tuple[int, int] | None:
+    """Lê o limite e o deslocamento da página pedida.
+
+    Returns:
+        tuple[int, int] | None: Limite (`LIMITE_PADRAO_PAGINA` se omitido) e
+            deslocamento, ou None se algum não for um inteiro JSON na faixa
+            aceita.
+    """
+    limite = pedido.get("limite", LIMITE_PADRAO_PAGINA)
+    deslocamento = pedido.get("deslocamento", 0)
+    # `type(...) is int` recusa também booleanos e números com casas decimais.
+    if (
+        type(limite) is not int
+        or type(deslocamento) is not int
+        or not 1 <= limite <= LIMITE_MAXIMO_PAGINA
+        or not 0 <= deslocamento <= sys.maxsize
+    ):
+        return None
+    return limite, deslocamento
+
+
+async def executar_servidor(servidor: ServidorBancario, host: str, porta: int) -> None:
+    """Executa o servidor até receber SIGINT ou SIGTERM."""
+    parar = asyncio.Event()
+    laco = asyncio.get_running_loop()
+    for sinal in (signal.SIGINT, signal.SIGTERM):
+        # Sem suporte a tratadores de sinal no laço (Windows): Ctrl+C encerra.
+        with contextlib.suppress(NotImplementedError):
+            laco.add_signal_handler(sinal, parar.set)
+    await servidor.servir(host, porta, parar)
+
+
+def main() -> None:
+    """Interpreta os argumentos de linha de comando e inicia o servidor."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument(
+        "--porta", type=int, default=PORTA_PADRAO, help="0 escolhe uma porta livre"
+    )
+    parser.add_argument(
+        "--limite", default="500.00", help="valor máximo por saque, em reais"
+    )
+    parser.add_argument("--limite-saques", type=int, default=3)
+    parser.add_argument(
+        "--limite-diario", help="total máximo sacado por conta e por dia, em reais"
+    )
+    parser.add_argument(
+        "--dados",
+        metavar="DIRETORIO",
+        help="diretório de dados persistidos: as contas são lidas dele e as "
+        "operações aceitas são gravadas no seu diário",
+    )
+    parser.add_argument(
+        "--mock",
+        action="store_true",
+        help="carrega os usuários e contas de exemplo ao iniciar",
+    )
+    args = parser.parse_args()
+
+    armazenamento = None
+    if args.dados:
+        armazenamento = ArmazenamentoBanco(args.dados)
+        registro = armazenamento.abrir()
+    else:
+        registro = RegistroBancario()
+    if args.mock:
+        carregar_dados_mock(registro)
+
+    servidor = ServidorBancario(
+        registro,
+        limite=converter_para_centavos(args.limite),
+        limite_saques=args.limite_saques,
+        limite_diario=(
+            converter_para_centavos(args.limite_diario) if args.limite_diario else None
+        ),
+    )
+    try:
+        asyncio.run(executar_servidor(servidor, args.host, args.porta))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if armazenamento is not None:
+            armazenamento.fechar()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Testes do alocador de números de conta (`alocador.py`)."""
+
+import pytest
+from alocador import AlocadorContas, PermutacaoFeistel, validar_numero_conta
+
+
+@pytest.mark.parametrize("tamanho", [1, 7, 100, 1_000, 4_097])
+def test_permutacao_percorre_cada_valor_uma_vez(tamanho):
+    permutacao = PermutacaoFeistel(tamanho, "semente")
+
+    assert sorted(map(permutacao, range(tamanho))) == list(range(tamanho))
+
+
+def test_numeros_unicos_e_validos_ao_esgotar_a_largura():
+    alocador = AlocadorContas(digitos=2, semente=7)
+
+    numeros = [alocador.alocar("0001") for _ in range(150)]
+
+    assert len(set(numeros)) == len(numeros)
+    assert all(validar_numero_conta("0001", numero) for numero in numeros)
+    # Os 99 corpos de dois dígitos (sem o zero) vêm antes dos de três.
+    assert {len(numero) for numero in numeros[:99]} == {4}
+    assert {len(numero) for numero in numeros[99:]} == {5}
+    assert alocador.digitos == 3
+
+
+def test_mesma_semente_reproduz_a_sequencia_e_posicionar_retoma():
+    original = AlocadorContas(semente=42)
+    numeros = [original.alocar() for _ in range(20)]
+
+    retomado = AlocadorContas(semente=42)
+    retomado.posicionar(original.digitos, 10)
+    assert [retomado.alocar() for _ in range(10)] == numeros[10:]
+
+
+def test_numeros_em_uso_sao_pulados():
+    em_uso = set()
+    referencia = AlocadorContas(semente=3)
+    em_uso.update(referencia.alocar() for _ in range(5))
+
+    alocador = AlocadorContas(semente=3)
+    numero = alocador.alocar(em_uso=em_uso.__contains__)
+
+    assert numero not in em_uso
+    assert numero == referencia.alocar()
+
+
+def test_numeros_mal_formados_e_agencia_invalida():
+    numero = AlocadorContas(semente=1).alocar("0001")
+
+    assert validar_numero_conta("0001", numero)
+    assert not validar_numero_conta(
+        "0001", numero[:-1] + str((int(numero[-1]) + 1) % 10)
+    )
+    assert not validar_numero_conta("0001", numero.replace("-", ""))
+    with pytest.raises(ValueError):
+        AlocadorContas().alocar("A01")
@@ -0,0 +1,104 @@
+"""Testes das operações concorrentes com travas por conta (`concorrencia.py`)."""
+
+import sys
+import threading
+import time
+
+import pytest
+from concorrencia import MotorConcorrente, TravasContas
+from conftest import INSTANTE_BASE
+from motor import CONTA_INEXISTENTE
+
+
+@pytest.fixture(autouse=True)
+def trocas_frequentes():
+    """Força trocas de thread frequentes para expor atualizações perdidas."""
+    anterior = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(anterior)
+
+
+def executar_em_threads(alvos: list) -> None:
+    threads = [threading.Thread(target=alvo, daemon=True) for alvo in alvos]
+    for thread in threads:
+        thread.start()
+    prazo = time.monotonic() + 10
+    for thread in threads:
+        thread.join(timeout=max(prazo - time.monotonic(), 0))
+    assert not any(thread.is_alive() for thread in threads), "threads travadas"
+
+
+def test_travar_adquire_listras_repetidas_uma_vez():
+    travas = TravasContas(listras=1)
+
+    with travas.travar("00001-1", "00002-2", "00001-1"):
+        assert travas.trava("00001-1").locked()
+    assert not travas.trava("00002-2").locked()
+
+
+@pytest.mark.parametrize("listras", [1, 1024])
+def test_depositos_simultaneos_na_mesma_conta_nao_se_perdem(registro, listras):
+    motor = MotorConcorrente(registro, listras=listras)
+
+    def depositar() -> None:
+        for _ in range(2_000):
+            motor.depositar("00001-1", 1_00, instante=INSTANTE_BASE)
+
+    executar_em_threads([depositar] * 8)
+
+    assert motor.saldo("00001-1") == 8 * 2_000 * 1_00
+    assert len(registro.buscar_conta("00001-1")["extrato"]) == 8 * 2_000
+
+
+@pytest.mark.parametrize("listras", [2, 1024])
+def test_transferencias_cruzadas_conservam_o_total(registro, listras):
+    motor = MotorConcorrente(registro, listras=listras)
+    numeros = ("00001-1", "00002-2", "00003-3")
+    for numero in numeros:
+        motor.depositar(numero, 1_000_00, instante=INSTANTE_BASE)
+    enviadas = []
+
+    def transferir(origem: str, destino: str) -> None:
+        for i in range(1_000):
+            resultado = motor.transferir(
+                origem, destino, 1_00 + i % 7, instante=INSTANTE_BASE
+            )
+            enviadas.append(resultado.sucesso)
+
+    # Cada par de contas é movimentado nos dois sentidos ao mesmo tempo: com as
+    # travas adquiridas fora de ordem, as threads esperariam uma pela outra.
+    executar_em_threads(
+        [
+            lambda origem=origem, destino=destino: transferir(origem, destino)
+            for origem in numeros
+            for destino in numeros
+            if origem != destino
+        ]
+    )
+
+    assert sum(map(motor.saldo, numeros)) == 3 * 1_000_00
+    assert all(motor.saldo(numero) >= 0 for numero in numeros)
+    # Depósito inicial mais as duas pontas de cada transferência aceita.
+    movimentos = sum(len(registro.buscar_conta(n)["extrato"]) for n in numeros)
+    assert movimentos == 3 + 2 * sum(enviadas)
+
+
+def test_transferir_lote_com_conta_inexistente(registro):
+    motor = MotorConcorrente(registro)
+    motor.depositar("00001-1", 10_00, instante=INSTANTE_BASE)
+
+    resultados = motor.transferir_lote(
+        [("00001-1", "00002-2", 4_00), ("00001-1", "99999-9", 1_00)],
+        instante=INSTANTE_BASE,
+    )
+
+    assert resultados[0].sucesso and resultados[1] is CONTA_INEXISTENTE
+    assert (motor.saldo("00001-1"), motor.saldo("00002-2")) == (6_00, 4_00)
+
+
+def test_conta_inexistente(registro):
+    motor = MotorConcorrente(registro)
+
+    assert motor.depositar("99999-9", 1_00) is CONTA_INEXISTENTE
+    assert motor.saldo("99999-9") is None
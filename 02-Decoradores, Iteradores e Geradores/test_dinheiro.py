@@ -0,0 +1,45 @@
+"""Testes da representação monetária em centavos (`dinheiro.py`)."""
+
+import pytest
+from dinheiro import converter_para_centavos, formatar_centavos
+
+
+@pytest.mark.parametrize(
+    "texto, centavos",
+    [
+        ("10", 1_000),
+        ("10.50", 1_050),
+        ("10,50", 1_050),
+        ("10.5", 1_050),
+        (".5", 50),
+        ("7.", 700),
+        (" 0.01 ", 1),
+        ("+3,07", 307),
+        ("-3,07", -307),
+        ("0.29", 29),
+        ("1" + "0" * 20, 10**22),
+    ],
+)
+def test_converter_para_centavos(texto, centavos):
+    assert converter_para_centavos(texto) == centavos
+
+
+@pytest.mark.parametrize(
+    "texto",
+    ["", ".", "-", "abc", "1.234", "1,2,3", "1.2.3", "1e3", "--1", "١٢", "½"],
+)
+def test_texto_invalido_e_recusado(texto):
+    with pytest.raises(ValueError):
+        converter_para_centavos(texto)
+
+
+@pytest.mark.parametrize("centavos", [0, 1, 9, 10, 99, 100, 12_345, -1, -12_345])
+def test_formatar_centavos_equivale_ao_formato_do_float(centavos):
+    assert formatar_centavos(centavos) == f"{centavos / 100:.2f}"
+
+
+def test_soma_de_centavos_e_exata():
+    total = sum(converter_para_centavos("0.10") for _ in range(10))
+
+    assert formatar_centavos(total) == "1.00"
+    assert converter_para_centavos(formatar_centavos(-10_05)) == -10_05
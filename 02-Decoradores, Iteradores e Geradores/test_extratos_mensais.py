@@ -0,0 +1,36 @@
+"""Testes dos extratos de fim de mês (`extratos_mensais.py`)."""
+
+from conftest import DIA, INSTANTE_BASE
+from extratos_mensais import gerar_extratos_mensais, periodo_do_mes
+from motor import depositar, sacar
+
+
+def test_saldo_do_extrato_e_o_do_fim_do_mes(registro, tmp_path):
+    maio, junho = periodo_do_mes("05-2025"), periodo_do_mes("06-2025")
+    conta = registro.buscar_conta("00001-1")
+    depositar(conta, 100_00, instante=INSTANTE_BASE)  # 10/05
+    sacar(conta, 30_00, limite=500_00, limite_saques=3, instante=maio[1] - 60)
+    depositar(conta, 900_00, instante=maio[1])  # meia-noite de 01/06
+    depositar(conta, 5_00, instante=INSTANTE_BASE + 40 * DIA)
+
+    [maio_arquivo] = gerar_extratos_mensais(registro, tmp_path, *maio, processos=0)
+    [junho_arquivo] = gerar_extratos_mensais(registro, tmp_path, *junho, processos=0)
+
+    texto_maio = maio_arquivo.read_text(encoding="utf-8")
+    assert "Saldo: R$ 70.00" in texto_maio
+    assert "Saldo: R$ 975.00" in junho_arquivo.read_text(encoding="utf-8")
+    # Contas sem movimentação mantêm o saldo (zero) e o aviso de sempre.
+    assert texto_maio.count("Sem movimentações.") == 2
+
+
+def test_periodo_que_termina_no_meio_do_dia(registro, tmp_path):
+    conta = registro.buscar_conta("00001-1")
+    depositar(conta, 100_00, instante=INSTANTE_BASE)
+    depositar(conta, 20_00, instante=INSTANTE_BASE + 60)
+    depositar(conta, 300_00, instante=INSTANTE_BASE + DIA)
+
+    [arquivo] = gerar_extratos_mensais(
+        registro, tmp_path, INSTANTE_BASE, INSTANTE_BASE + 30, processos=0
+    )
+
+    assert "Saldo: R$ 100.00" in arquivo.read_text(encoding="utf-8")
@@ -0,0 +1,78 @@
+"""Testes do registro dividido entre processos (`fragmentos.py`)."""
+
+import pytest
+from conftest import INSTANTE_BASE, nova_conta
+from fragmentos import (
+    _RECUSAS_SAQUE,
+    _RECUSAS_TRANSFERENCIA,
+    RegistroFragmentado,
+    _codificar,
+    _decodificar,
+    fragmento_da_conta,
+)
+from motor import (
+    INSTANTE_RETROATIVO,
+    SAQUE_LIMITE_DIARIO_EXCEDIDO,
+    USUARIO_INEXISTENTE,
+    StatusOperacao,
+)
+
+NUMEROS = [f"{i:05d}-{i % 10}" for i in range(1, 13)]
+
+
+@pytest.fixture
+def fragmentado():
+    with RegistroFragmentado(2, limite=500_00, limite_saques=3) as fragmentado:
+        fragmentado.adicionar_contas(nova_conta(numero) for numero in NUMEROS)
+        yield fragmentado
+
+
+def test_recusas_viajam_pelo_status():
+    codigos = _codificar([SAQUE_LIMITE_DIARIO_EXCEDIDO, USUARIO_INEXISTENTE])
+
+    assert _decodificar(codigos[0], "", _RECUSAS_SAQUE) is (
+        SAQUE_LIMITE_DIARIO_EXCEDIDO
+    )
+    # Uma recusa sem constante para a operação não derruba o fragmento.
+    desconhecida = _decodificar(codigos[1], "", _RECUSAS_SAQUE)
+    assert desconhecida.status is StatusOperacao.USUARIO_INEXISTENTE
+
+
+def test_transferencias_entre_fragmentos_conservam_o_total(fragmentado):
+    fragmentado.executar(
+        [("deposito", numero, 100_00) for numero in NUMEROS], instante=INSTANTE_BASE
+    )
+    transferencias = [
+        (NUMEROS[i % 12], NUMEROS[(i * 5 + 1) % 12], (i * 1_237) % 150_00)
+        for i in range(200)
+    ]
+
+    resultados = fragmentado.transferir_lote(
+        transferencias, instante=INSTANTE_BASE + 60
+    )
+
+    assert any(r.sucesso for r in resultados)
+    assert any(r.status is StatusOperacao.SALDO_INSUFICIENTE for r in resultados)
+    conferencia = fragmentado.conferir()
+    assert sum(quantidade for quantidade, _, _ in conferencia) == 12
+    assert sum(soma for _, soma, _ in conferencia) == 12 * 100_00
+    assert not any(divergentes for _, _, divergentes in conferencia)
+
+
+def test_instante_retroativo_no_destino_e_recusado_antes_do_debito(fragmentado):
+    origem = NUMEROS[0]
+    destino = next(
+        numero
+        for numero in NUMEROS
+        if fragmento_da_conta(numero, 2) != fragmento_da_conta(origem, 2)
+    )
+    fragmentado.executar([("deposito", origem, 100_00)], instante=INSTANTE_BASE)
+    fragmentado.executar([("deposito", destino, 1_00)], instante=INSTANTE_BASE + 60)
+
+    resultado = fragmentado.transferir(origem, destino, 10_00, instante=INSTANTE_BASE)
+
+    assert resultado is _RECUSAS_TRANSFERENCIA[INSTANTE_RETROATIVO.status]
+    contas = {
+        conta["numero_conta_corrente"]: conta for conta in fragmentado.exportar_contas()
+    }
+    assert (contas[origem]["saldo"], contas[destino]["saldo"]) == (100_00, 1_00)
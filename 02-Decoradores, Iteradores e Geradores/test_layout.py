@@ -0,0 +1,124 @@
+"""Testes dos modelos de layout pré-compilados (`layout.py`)."""
+
+from conftest import nova_conta
+from desafio import iterar_listagem_usuarios
+from layout import (
+    CABECALHO_EXTRATO,
+    LARGURA_EXTRATO,
+    LAYOUT_SECAO,
+    MODELO_LINHA_EXTRATO,
+    LayoutTabela,
+    escapar,
+)
+from registro import RegistroBancario
+
+SEPARADOR = "-" * 84
+SECAO = f"|{''.center(82)}|"
+
+
+def bloco_montado_a_mao(i: int, usuario: dict, contas: list[dict]) -> str:
+    """Bloco de um usuário montado célula a célula, como antes dos modelos."""
+    endereco = usuario["endereco"]
+    linhas = [
+        f"\nUsuário #{i}",
+        SEPARADOR,
+        f"|{'*INFORMAÇÕES CADASTRAIS*'.center(82)}|",
+        SEPARADOR,
+        f"|{'NOME'.center(41)}|{'CPF'.center(17)}|"
+        f"{'DATA DE NASCIMENTO'.center(22)}|",
+        SEPARADOR,
+        f"|{usuario['nome_titular'].center(41)}|{usuario['cpf'].center(17)}|"
+        f"{usuario['data_nascimento_titular'].center(22)}|",
+        SEPARADOR,
+        SECAO,
+        SEPARADOR,
+        f"|{'*ENDEREÇOS CADASTRADOS*'.center(82)}|",
+        SEPARADOR,
+        f"|{'LOGRADOURO'.center(40)}|{'NUMERO'.center(18)}|{'BAIRRO'.center(22)}|",
+        SEPARADOR,
+        f"|{endereco['logradouro'].center(40)}|{endereco['numero'].center(18)}|"
+        f"{endereco['bairro'].center(22)}|",
+        SEPARADOR,
+        f"|{'CIDADE'.center(32)}|{'UF'.center(6)}|{''.center(42, '#')}|",
+        SEPARADOR,
+        f"|{endereco['cidade'].center(32)}|{endereco['uf'].center(6)}|"
+        f"{''.center(42, '#')}|",
+        SEPARADOR,
+        SECAO,
+        SEPARADOR,
+        f"|{'*DADOS BANCÁRIOS*'.center(82)}|",
+        SEPARADOR,
+    ]
+    if contas:
+        linhas.append(
+            f"|{'AGÊNCIA'.center(27)}|{'CONTA CORRENTE'.center(27)}|"
+            f"{'TITULAR DA CONTA (CPF)'.center(26)}|"
+        )
+        linhas.append(SEPARADOR)
+        for conta in contas:
+            linhas.append(
+                f"|{conta['agencia'].center(27)}|"
+                f"{conta['numero_conta_corrente'].center(27)}|"
+                f"{conta['cpf_titular'].center(26)}|"
+            )
+            linhas.append(SEPARADOR)
+    else:
+        linhas.append(f"|{' Nenhuma conta cadastrada.'.ljust(82)}|")
+        linhas.append(f"{SEPARADOR}\n")
+    return "\n" + "\n".join(linhas)
+
+
+def test_layout_tabela_monta_separador_e_linhas_na_largura_total():
+    tabela = LayoutTabela((5, 3))
+
+    assert tabela.largura_total == 11
+    assert tabela.separador == "-" * 11
+    assert tabela.linha("ab", "c") == f"|{'ab'.center(5)}|{'c'.center(3)}|"
+    assert tabela.titulo("x") == "|    x    |"
+
+
+def test_escapar_permite_texto_com_percentual_no_modelo():
+    modelo = escapar(LAYOUT_SECAO.titulo("100% ATIVO")) + "%s"
+
+    assert modelo % "!" == LAYOUT_SECAO.titulo("100% ATIVO") + "!"
+
+
+def test_listagem_igual_ao_bloco_montado_a_mao():
+    registro = RegistroBancario()
+    usuarios = [
+        {
+            "cpf": f"{i:011d}",
+            "nome_titular": f"Titular 50% {i}",
+            "data_nascimento_titular": "01-02-1990",
+            "endereco": {
+                "logradouro": "Rua das Flores",
+                "numero": str(i),
+                "bairro": "Centro",
+                "cidade": "São Paulo",
+                "uf": "SP",
+            },
+        }
+        for i in (1, 2)
+    ]
+    for usuario in usuarios:
+        registro.adicionar_usuario(usuario)
+    contas = [nova_conta("00001-1"), nova_conta("00011-9", agencia="0002")]
+    for conta in contas:
+        conta["cpf_titular"] = usuarios[0]["cpf"]
+        registro.adicionar_conta(conta)
+
+    blocos = list(iterar_listagem_usuarios(registro))
+
+    assert blocos == [
+        bloco_montado_a_mao(1, usuarios[0], contas),
+        bloco_montado_a_mao(2, usuarios[1], []),
+        "\nListagem concluída.",
+    ]
+
+
+def test_linha_do_extrato_tem_a_largura_do_cabecalho():
+    linha = MODELO_LINHA_EXTRATO % ("10/05/2025", "SAQUE".center(10), "R$ -1.00")
+
+    separador, conteudo = linha.lstrip("\n").split("\n")
+    assert len(CABECALHO_EXTRATO) == len(separador) == LARGURA_EXTRATO
+    assert conteudo.endswith(f"{'R$ -1.00':>21}")
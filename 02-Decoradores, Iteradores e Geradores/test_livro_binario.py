@@ -0,0 +1,141 @@
+"""Testes do livro de extrato em arquivo binário (`livro_binario.py`)."""
+
+import livro_binario
+import pytest
+from conftest import INSTANTE_BASE, nova_conta
+from livro_binario import LivroBinario, migrar_para_livro_binario
+from livro_extrato import LivroExtrato, TipoTransacao
+from motor import depositar, sacar
+
+
+def movimentar(conta, quantidade: int, inicio: int = 0) -> None:
+    """Alterna depósitos e saques, um por minuto a partir de `INSTANTE_BASE`."""
+    for i in range(inicio, inicio + quantidade):
+        instante = INSTANTE_BASE + 60 * i
+        if i % 2:
+            sacar(conta, 1_00, limite=500_00, limite_saques=10**6, instante=instante)
+        else:
+            depositar(conta, 10_00 + i, instante=instante)
+
+
+def colunas(livro) -> tuple[list[int], ...]:
+    return list(livro.instantes), list(livro.tipos), list(livro.valores)
+
+
+def test_migracao_grava_o_historico_e_recebe_as_novas_operacoes(tmp_path):
+    conta = nova_conta("00001-1")
+    movimentar(conta, 10)
+    esperado = colunas(conta["extrato"])
+
+    livro = migrar_para_livro_binario(conta, str(tmp_path))
+    movimentar(conta, 2, inicio=10)
+
+    assert conta["extrato"] is livro and len(livro) == 12
+    assert colunas(livro)[0][:10] == esperado[0]
+    assert livro.agregados.movimento_ate() == conta["saldo"]
+    livro.fechar()
+
+
+def test_arquivo_existente_recebe_apenas_as_transacoes_que_faltam(tmp_path):
+    conta = nova_conta("00001-1")
+    movimentar(conta, 10)
+    em_memoria = conta["extrato"]
+    migrar_para_livro_binario(conta, str(tmp_path)).fechar()
+    # O livro em memória (ex.: restaurado do diário) tem transações posteriores.
+    conta["extrato"] = em_memoria
+    movimentar(conta, 5, inicio=10)
+
+    livro = migrar_para_livro_binario(conta, str(tmp_path))
+
+    assert colunas(livro) == colunas(em_memoria)
+    assert livro.ultimo_instante == em_memoria.ultimo_instante
+    livro.fechar()
+
+
+@pytest.mark.parametrize("quantidade", [3, 12])
+def test_arquivo_que_nao_corresponde_ao_livro_e_recusado(tmp_path, quantidade):
+    conta = nova_conta("00001-1")
+    movimentar(conta, 10)
+    em_memoria = conta["extrato"]
+    migrar_para_livro_binario(conta, str(tmp_path)).fechar()
+    # Mais curto ou diferente do arquivo: a migração não pode encurtar o extrato.
+    conta["extrato"] = LivroExtrato()
+    movimentar(conta, quantidade, inicio=100)
+
+    with pytest.raises(ValueError, match="não corresponde"):
+        migrar_para_livro_binario(conta, str(tmp_path))
+    assert conta["extrato"] is not em_memoria and len(conta["extrato"]) == quantidade
+
+
+def test_registrar_recusa_instante_anterior_ao_do_arquivo(tmp_path):
+    caminho = str(tmp_path / "conta.extrato")
+    livro = LivroBinario(caminho, 11)
+    livro.registrar(TipoTransacao.DEPOSITO, 1_00, INSTANTE_BASE)
+    livro.fechar()
+
+    reaberto = LivroBinario(caminho, 11)
+    assert reaberto.ultimo_instante == INSTANTE_BASE
+    with pytest.raises(ValueError, match="anterior"):
+        reaberto.registrar(TipoTransacao.DEPOSITO, 1_00, INSTANTE_BASE - 1)
+    reaberto.fechar()
+
+
+def test_leituras_em_andamento_sobrevivem_a_novas_gravacoes(tmp_path):
+    livro = LivroBinario(str(tmp_path / "conta.extrato"), 11)
+    livro.registrar(TipoTransacao.DEPOSITO, 1_00, INSTANTE_BASE)
+    livro.registrar(TipoTransacao.DEPOSITO, 2_00, INSTANTE_BASE + 1)
+    leitura = livro.iterar()
+    primeira = next(leitura)
+    valores = livro.valores
+
+    # A gravação faz a leitura seguinte remapear o arquivo, que cresceu.
+    livro.registrar(TipoTransacao.SAQUE, 50, INSTANTE_BASE + 2)
+    assert [t.valor for t in livro.iterar()] == [1_00, 2_00, 50]
+    livro.registrar(TipoTransacao.SAQUE, 25, INSTANTE_BASE + 3)
+    assert list(livro.valores) == [1_00, 2_00, 50, 25]
+
+    # As leituras anteriores continuam com as transações do seu momento.
+    assert [primeira.valor] + [t.valor for t in leitura] == [1_00, 2_00]
+    assert list(valores) == [1_00, 2_00]
+    livro.fechar()
+    assert list(valores) == [1_00, 2_00]
+
+
+def test_livros_alem_do_maximo_de_arquivos_abertos_sao_reabertos(tmp_path, monkeypatch):
+    monkeypatch.setattr(livro_binario, "MAXIMO_ARQUIVOS_ABERTOS", 2)
+    livros = [LivroBinario(str(tmp_path / f"{i}.extrato"), i) for i in range(5)]
+    for rodada in range(3):
+        for i, livro in enumerate(livros):
+            livro.registrar(TipoTransacao.DEPOSITO, 100 * i + rodada, INSTANTE_BASE)
+            assert len(livro_binario._abertos) <= 2
+
+    assert [list(livro.valores) for livro in livros] == [
+        [100 * i, 100 * i + 1, 100 * i + 2] for i in range(5)
+    ]
+    for livro in livros:
+        livro.fechar()
+    assert not any(livro in livro_binario._abertos for livro in livros)
+
+
+def test_registrar_colunas_grava_em_uma_escrita_e_confere_a_ordem(tmp_path):
+    livro = LivroBinario(str(tmp_path / "conta.extrato"), 11)
+    livro.registrar(TipoTransacao.DEPOSITO, 5_00, INSTANTE_BASE)
+    saldo = livro.agregados.movimento_ate()
+
+    livro.registrar_colunas(
+        [1_00, 2_00], [INSTANTE_BASE, INSTANTE_BASE + 1], [TipoTransacao.SAQUE] * 2
+    )
+    for instantes in ([INSTANTE_BASE - 1], [INSTANTE_BASE + 5, INSTANTE_BASE + 4]):
+        with pytest.raises(ValueError, match="ordem"):
+            livro.registrar_colunas(
+                [1] * len(instantes), instantes, [1] * len(instantes)
+            )
+
+    assert colunas(livro) == (
+        [INSTANTE_BASE, INSTANTE_BASE, INSTANTE_BASE + 1],
+        [TipoTransacao.DEPOSITO, TipoTransacao.SAQUE, TipoTransacao.SAQUE],
+        [5_00, 1_00, 2_00],
+    )
+    assert livro.ultimo_instante == INSTANTE_BASE + 1
+    assert livro.agregados.movimento_ate() == saldo - 3_00
+    livro.fechar()
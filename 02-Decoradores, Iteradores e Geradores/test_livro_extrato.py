@@ -0,0 +1,130 @@
+"""Testes do livro de extrato e dos seus agregados (`livro_extrato.py`)."""
+
+from datetime import date
+
+import pytest
+from conftest import DIA, INSTANTE_BASE
+from livro_extrato import AgregadosExtrato, LivroExtrato, TipoTransacao
+
+DEPOSITO = TipoTransacao.DEPOSITO
+SAQUE = TipoTransacao.SAQUE
+
+
+@pytest.fixture
+def livro() -> LivroExtrato:
+    """Dez transações, uma por dia, alternando depósitos (pares) e saques."""
+    livro = LivroExtrato()
+    for i in range(10):
+        livro.registrar(DEPOSITO if i % 2 == 0 else SAQUE, (i + 1) * 100, instante(i))
+    return livro
+
+
+def instante(dia: int) -> int:
+    """Instante do meio-dia do dia informado, contado a partir de `INSTANTE_BASE`."""
+    return INSTANTE_BASE + dia * DIA
+
+
+def dia(numero: int) -> date:
+    return date.fromtimestamp(instante(numero))
+
+
+def valores(transacoes) -> list[int]:
+    return [transacao.valor for transacao in transacoes]
+
+
+def test_posicoes_por_faixa_de_instantes(livro):
+    assert livro.posicoes() == range(10)
+    assert livro.posicoes(instante(2), instante(5)) == range(2, 5)
+    assert livro.posicoes(instante(2) + 1, instante(5) + 1) == range(3, 6)
+    assert livro.posicoes(instante(20)) == range(10, 10)
+    assert livro.posicoes(instante(5), instante(2)) == range(5, 5)
+
+
+def test_iterar_com_periodo_tipo_e_pagina(livro):
+    assert valores(livro.iterar()) == [100 * (i + 1) for i in range(10)]
+    assert valores(livro.iterar(inicio=instante(3), fim=instante(6))) == [
+        400,
+        500,
+        600,
+    ]
+    assert valores(livro.iterar(SAQUE)) == [200, 400, 600, 800, 1000]
+    assert valores(livro.iterar(SAQUE, inicio=instante(2), fim=instante(7))) == [
+        400,
+        600,
+    ]
+    assert valores(livro.iterar(limite=3, deslocamento=4)) == [500, 600, 700]
+    assert valores(livro.iterar(DEPOSITO, limite=2, deslocamento=1)) == [300, 500]
+    assert valores(livro.iterar(DEPOSITO, deslocamento=9)) == []
+    assert valores(livro.iterar(TipoTransacao.TRANSFERENCIA_ENVIADA)) == []
+
+
+def test_paginas_cobrem_o_periodo_sem_repetir(livro):
+    paginas = [
+        valores(livro.iterar(inicio=instante(1), limite=4, deslocamento=pagina * 4))
+        for pagina in range(3)
+    ]
+
+    assert paginas == [[200, 300, 400, 500], [600, 700, 800, 900], [1000]]
+
+
+def test_de_colunas_recalcula_indices_por_tipo(livro):
+    copia = LivroExtrato.de_colunas(livro.valores, livro.instantes, livro.tipos)
+
+    assert list(copia.indices_por_tipo[SAQUE]) == [1, 3, 5, 7, 9]
+    assert valores(copia.iterar(DEPOSITO)) == valores(livro.iterar(DEPOSITO))
+
+
+def test_totais_por_periodo(livro):
+    agregados = livro.agregados
+
+    assert agregados.totais(DEPOSITO) == (100 + 300 + 500 + 700 + 900, 5)
+    assert agregados.totais(SAQUE, dia(2), dia(5)) == (400 + 600, 2)
+    assert agregados.totais(DEPOSITO, dia(4), dia(4)) == (500, 1)
+    assert agregados.totais(DEPOSITO, dia(20), dia(30)) == (0, 0)
+    assert agregados.totais(SAQUE, fim=dia(-1)) == (0, 0)
+
+
+def test_agregados_acompanham_novas_transacoes(livro):
+    livro.agregados  # calculados agora; passam a ser atualizados a cada registro
+    livro.registrar(DEPOSITO, 5_000, instante(9) + 60)
+    livro.registrar(SAQUE, 50, instante(11))
+
+    recalculados = AgregadosExtrato.de_transacoes(
+        livro.instantes, livro.tipos, livro.valores
+    )
+    assert livro.agregados.dias == recalculados.dias
+    assert livro.agregados.acumulados == recalculados.acumulados
+    assert livro.agregados.totais(DEPOSITO, dia(9), dia(9)) == (5_000, 1)
+
+
+def test_saldo_ao_fim_de_cada_dia(livro):
+    saldo_atual = livro.agregados.movimento_ate()
+    esperado, saldo = [], 0
+    for transacao in livro.iterar():
+        saldo += transacao.tipo.sinal * transacao.valor
+        esperado.append(saldo)
+
+    assert [s for _, s in livro.agregados.saldos_diarios(saldo_atual)] == esperado
+    assert livro.agregados.saldo_em(saldo_atual, dia(3)) == esperado[3]
+    assert livro.agregados.saldo_em(saldo_atual, dia(-1)) == 0
+    assert livro.agregados.saldo_em(saldo_atual, dia(30)) == saldo_atual
+
+
+def test_agregados_de_totais_diarios_equivalem_aos_das_transacoes(livro):
+    linhas = [
+        (dia(i).toordinal(), transacao.tipo, transacao.valor, 1)
+        for i, transacao in enumerate(livro.iterar())
+    ]
+
+    consolidados = AgregadosExtrato.de_totais_diarios(linhas)
+
+    assert consolidados.dias == livro.agregados.dias
+    assert consolidados.acumulados == livro.agregados.acumulados
+
+
+def test_registrar_recusa_instante_anterior_ao_ultimo(livro):
+    with pytest.raises(ValueError, match="anterior"):
+        livro.registrar(DEPOSITO, 1, instante(9) - 1)
+
+    livro.registrar(DEPOSITO, 1, instante(9))  # o mesmo instante é aceito
+    assert len(livro) == 11 and livro.ultimo_instante == instante(9)
@@ -0,0 +1,240 @@
+"""Testes da leitura e do processamento em lote (`lote.py`)."""
+
+import io
+import os
+import sys
+
+import pytest
+from conftest import INSTANTE_BASE
+from fragmentos import RegistroFragmentado
+from lote import (
+    OperacaoLote,
+    executar_lote,
+    ler_operacoes_csv,
+    ler_operacoes_jsonl,
+    main,
+    processar_operacoes,
+    processar_operacoes_fragmentadas,
+)
+from motor import (
+    CONTA_INEXISTENTE,
+    INSTANTE_RETROATIVO,
+    OPERACAO_INVALIDA,
+    SAQUE_LIMITE_SAQUES_EXCEDIDO,
+    VALOR_NAO_NUMERICO,
+    abrir_conta,
+    criar_usuario,
+    depositar,
+)
+from persistencia import ArmazenamentoBanco
+
+
+def test_csv_aceita_colunas_em_qualquer_ordem():
+    arquivo = io.StringIO(
+        "valor,instante,conta,operacao\n"
+        "10.50,1700000000,00001-1,deposito\n"
+        "\n"
+        "3,,00002-2,saque\n"
+        "7\n"
+    )
+
+    assert list(ler_operacoes_csv(arquivo)) == [
+        OperacaoLote(2, "deposito", "00001-1", "10.50", "1700000000"),
+        OperacaoLote(4, "saque", "00002-2", "3", ""),
+        OperacaoLote(5, "", "", "7", ""),
+    ]
+
+
+def test_csv_sem_colunas_obrigatorias():
+    with pytest.raises(ValueError, match="conta, valor"):
+        list(ler_operacoes_csv(io.StringIO("operacao,instante\n")))
+    assert list(ler_operacoes_csv(io.StringIO(""))) == []
+
+
+def test_jsonl_linhas_mal_formadas_viram_operacoes_vazias():
+    arquivo = io.StringIO(
+        '{"operacao": "saque", "conta": "00001-1", "valor": 5, "instante": 17}\n'
+        "não é json\n"
+        "[1, 2]\n"
+        "\n"
+        '{"operacao": "deposito"}\n'
+    )
+
+    assert list(ler_operacoes_jsonl(arquivo)) == [
+        OperacaoLote(1, "saque", "00001-1", "5", "17"),
+        OperacaoLote(2, "", "", ""),
+        OperacaoLote(3, "", "", ""),
+        OperacaoLote(5, "deposito", "", "", ""),
+    ]
+
+
+def test_processamento_recusa_cada_tipo_de_linha_invalida(registro):
+    operacoes = [
+        OperacaoLote(1, "transferencia", "00001-1", "10"),
+        OperacaoLote(2, "deposito", "99999-9", "10"),
+        OperacaoLote(3, "deposito", "00001-1", "10.001"),
+        OperacaoLote(4, "deposito", "00001-1", "10", "ontem"),
+        OperacaoLote(5, " Deposito ", "00001-1", "10,50", str(INSTANTE_BASE)),
+    ]
+
+    resultados = [
+        resultado
+        for _, resultado in processar_operacoes(
+            registro, operacoes, limite=500_00, limite_saques=3
+        )
+    ]
+
+    assert resultados[:4] == [
+        OPERACAO_INVALIDA,
+        CONTA_INEXISTENTE,
+        VALOR_NAO_NUMERICO,
+        OPERACAO_INVALIDA,
+    ]
+    assert resultados[4].sucesso and resultados[4].saldo == 10_50
+
+
+def test_limite_de_saques_e_contado_por_dia(registro):
+    operacoes = [OperacaoLote(1, "deposito", "00001-1", "100", str(INSTANTE_BASE))]
+    operacoes += [
+        OperacaoLote(2 + i, "saque", "00001-1", "1", str(INSTANTE_BASE + i))
+        for i in range(4)
+    ]
+
+    resultados = [
+        resultado
+        for _, resultado in processar_operacoes(
+            registro, operacoes, limite=500_00, limite_saques=3
+        )
+    ]
+
+    assert [r.sucesso for r in resultados] == [True, True, True, True, False]
+    assert resultados[-1] is SAQUE_LIMITE_SAQUES_EXCEDIDO
+
+
+def test_executar_lote_separa_resultados_e_rejeicoes(registro):
+    entrada = io.StringIO(
+        "operacao,conta,valor\n"
+        "deposito,00001-1,100\n"
+        "saque,00001-1,250\n"
+        "saque,00001-1,40.5\n"
+    )
+    resultados, rejeicoes = io.StringIO(), io.StringIO()
+
+    resumo = executar_lote(
+        registro,
+        ler_operacoes_csv(entrada),
+        resultados,
+        rejeicoes,
+        limite=500_00,
+        limite_saques=3,
+    )
+
+    assert (resumo.total, resumo.aceitas, resumo.rejeitadas) == (3, 2, 1)
+    assert resultados.getvalue().splitlines() == [
+        "linha,operacao,conta,valor,saldo",
+        "2,deposito,00001-1,100,100.00",
+        "4,saque,00001-1,40.5,59.50",
+    ]
+    assert (
+        rejeicoes.getvalue()
+        .splitlines()[1]
+        .startswith("3,saque,00001-1,250,saldo_insuficiente,")
+    )
+
+
+def test_instantes_anteriores_ao_ultimo_da_conta_sao_rejeitados(registro):
+    entrada = io.StringIO(
+        "operacao,conta,valor,instante\n"
+        "deposito,00001-1,100,1700200000\n"
+        "deposito,00001-1,50,1700000000\n"
+        "saque,00001-1,10,1700100000\n"
+        "saque,00001-1,10,1700200000\n"
+    )
+
+    resultados = [
+        resultado
+        for _, resultado in processar_operacoes(
+            registro, ler_operacoes_csv(entrada), limite=500_00, limite_saques=3
+        )
+    ]
+
+    assert resultados[1] is resultados[2] is INSTANTE_RETROATIVO
+    assert resultados[3].sucesso and resultados[3].saldo == 90_00
+    extrato = registro.buscar_conta("00001-1")["extrato"]
+    assert list(extrato.instantes) == [1700200000, 1700200000]
+
+
+def test_processamento_fragmentado_equivale_ao_do_registro(registro):
+    operacoes = [
+        OperacaoLote(1, "deposito", "00001-1", "100", str(INSTANTE_BASE)),
+        OperacaoLote(2, "deposito", "00002-2", "50", str(INSTANTE_BASE)),
+        OperacaoLote(3, "bônus", "00001-1", "1"),
+        OperacaoLote(4, "saque", "00001-1", "30", str(INSTANTE_BASE + 60)),
+        OperacaoLote(5, "saque", "00002-2", "80", str(INSTANTE_BASE + 60)),
+        OperacaoLote(6, "deposito", "99999-9", "1", str(INSTANTE_BASE + 60)),
+        OperacaoLote(7, "saque", "00001-1", "1", str(INSTANTE_BASE)),
+        OperacaoLote(8, "deposito", "00003-3", "dez"),
+    ]
+    with RegistroFragmentado(2, limite=500_00, limite_saques=3) as fragmentado:
+        fragmentado.adicionar_contas(registro.lista_contas)
+        fragmentados = list(processar_operacoes_fragmentadas(fragmentado, operacoes))
+        contas = fragmentado.exportar_contas()
+
+    sequenciais = list(
+        processar_operacoes(registro, operacoes, limite=500_00, limite_saques=3)
+    )
+
+    assert [operacao for operacao, _ in fragmentados] == operacoes
+    assert [(r.status, r.saldo) for _, r in fragmentados] == [
+        (r.status, r.saldo) for _, r in sequenciais
+    ]
+    assert sorted((c["numero_conta_corrente"], c["saldo"]) for c in contas) == [
+        ("00001-1", 70_00),
+        ("00002-2", 50_00),
+        ("00003-3", 0),
+    ]
+
+
+def test_extratos_binarios_apenas_para_historicos_longos(tmp_path, monkeypatch):
+    dados, extratos = tmp_path / "dados", tmp_path / "extratos"
+    armazenamento = ArmazenamentoBanco(str(dados))
+    registro = armazenamento.abrir()
+    numeros = []
+    for cpf, depositos in (("11111111111", 3), ("22222222222", 1)):
+        criar_usuario(
+            registro,
+            cpf=cpf,
+            nome_titular="Titular",
+            data_nascimento_titular="01-01-1990",
+            endereco={},
+        )
+        conta = abrir_conta(registro, cpf=cpf).dados
+        for i in range(depositos):
+            depositar(conta, 1_00, instante=INSTANTE_BASE + i)
+        numeros.append(conta["numero_conta_corrente"])
+    armazenamento.fechar()
+    entrada = tmp_path / "operacoes.csv"
+    entrada.write_text(f"operacao,conta,valor\ndeposito,{numeros[1]},1\n")
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        [
+            "lote.py",
+            str(entrada),
+            "--dados",
+            str(dados),
+            "--extratos-binarios",
+            str(extratos),
+            "--minimo-binario",
+            "3",
+            "--resultados",
+            str(tmp_path / "resultados.csv"),
+            "--rejeicoes",
+            str(tmp_path / "rejeicoes.csv"),
+        ],
+    )
+
+    main()
+
+    assert os.listdir(extratos) == [f"{numeros[0]}.extrato"]
+    assert os.path.getsize(extratos / f"{numeros[0]}.extrato") == 3 * 32
@@ -0,0 +1,241 @@
+"""Testes dos eventos, destinos de log e métricas (`monitoramento.py`)."""
+
+import atexit
+import json
+import os
+import pstats
+import signal
+import threading
+import time
+import tracemalloc
+
+import monitoramento
+import pytest
+from desafio import registrar_log
+from monitoramento import (
+    DESTINO_NULO,
+    DestinoArquivoLote,
+    DestinoConsole,
+    DestinoMemoria,
+    EventoLog,
+    HistogramaLatencia,
+    MetricasLatencia,
+    Perfilador,
+    ativar_metricas,
+    ativar_perfil,
+    configurar_log,
+    desativar_metricas,
+    desativar_perfil,
+    destino_pelo_ambiente,
+    linha_json,
+)
+
+
+def evento(numero: int, erro: str | None = None) -> EventoLog:
+    return EventoLog(f"operacao_{numero}", 1_000 * numero, 10 + numero, erro)
+
+
+def linhas(caminho) -> list[dict]:
+    with open(caminho, encoding="utf-8") as arquivo:
+        return [json.loads(linha) for linha in arquivo]
+
+
+def test_linha_json_equivale_ao_dicionario_do_evento():
+    for atual in (evento(1), evento(2, 'ValueError "x"')):
+        assert json.loads(linha_json(atual)) == atual.como_dicionario()
+
+
+def test_memoria_retem_os_eventos_mais_recentes():
+    destino = DestinoMemoria(capacidade=3)
+    for i in range(5):
+        destino.emitir(evento(i))
+
+    assert [e.operacao for e in destino.eventos] == [
+        "operacao_2",
+        "operacao_3",
+        "operacao_4",
+    ]
+
+
+def test_arquivo_grava_ao_completar_o_lote_e_ao_fechar(tmp_path):
+    caminho = tmp_path / "eventos.jsonl"
+    destino = DestinoArquivoLote(str(caminho), eventos_por_lote=3, intervalo_ms=60_000)
+
+    for i in range(4):
+        destino.emitir(evento(i))
+    assert [linha["operacao"] for linha in linhas(caminho)] == [
+        "operacao_0",
+        "operacao_1",
+        "operacao_2",
+    ]
+
+    destino.fechar()
+    assert len(linhas(caminho)) == 4
+
+
+def test_arquivo_grava_pelo_intervalo_mesmo_sem_novos_eventos(tmp_path):
+    caminho = tmp_path / "eventos.jsonl"
+    destino = DestinoArquivoLote(str(caminho), eventos_por_lote=1_000, intervalo_ms=20)
+
+    destino.emitir(evento(1))
+    # Nenhum outro evento chega: a gravação vem da thread em segundo plano.
+    prazo = time.monotonic() + 5
+    while not caminho.stat().st_size and time.monotonic() < prazo:
+        time.sleep(0.01)
+
+    assert [linha["operacao"] for linha in linhas(caminho)] == ["operacao_1"]
+    destino.fechar()
+    assert not destino._descarregador.is_alive()
+
+
+def test_intervalo_precisa_ser_positivo(tmp_path):
+    with pytest.raises(ValueError, match="positivo"):
+        DestinoArquivoLote(str(tmp_path / "eventos.jsonl"), intervalo_ms=0)
+
+
+def test_destino_pelo_ambiente(tmp_path):
+    assert isinstance(destino_pelo_ambiente("console"), DestinoConsole)
+    assert isinstance(destino_pelo_ambiente("memoria"), DestinoMemoria)
+    assert destino_pelo_ambiente("nulo") is DESTINO_NULO
+    arquivo = destino_pelo_ambiente(f"arquivo:{tmp_path / 'log.jsonl'}")
+    assert isinstance(arquivo, DestinoArquivoLote)
+    arquivo.fechar()
+    for invalido in ("arquivo:", "syslog"):
+        with pytest.raises(ValueError, match="inválido"):
+            destino_pelo_ambiente(invalido)
+
+
+def test_faixas_do_histograma_cobrem_os_valores_sem_lacunas():
+    for valor in [*range(200), *(2**k + d for k in range(5, 40) for d in (-1, 0, 1))]:
+        faixa = HistogramaLatencia.faixa(valor)
+        assert HistogramaLatencia.limite_superior(faixa) >= valor
+        if faixa:
+            assert HistogramaLatencia.limite_superior(faixa - 1) < valor
+
+
+def test_percentis_com_erro_relativo_limitado():
+    histograma = HistogramaLatencia()
+    assert histograma.percentil(99) == 0
+    valores = [1_000 + 37 * i for i in range(10_000)]
+    for valor in reversed(valores):
+        histograma.registrar(valor)
+
+    for percentual in (1, 50, 95, 99, 100):
+        exato = valores[-(-len(valores) * percentual // 100) - 1]
+        estimado = histograma.percentil(percentual)
+        assert exato <= estimado <= exato * (1 + 1 / HistogramaLatencia.SUBDIVISOES)
+    assert histograma.percentil(100) == histograma.maximo == valores[-1]
+    assert histograma.resumo()["minimo_ns"] == valores[0]
+    assert histograma.resumo()["quantidade"] == len(valores)
+
+
+def test_exportacao_em_json_e_prometheus(tmp_path):
+    metricas = MetricasLatencia()
+    for duracao in (1_000, 2_000, 3_000):
+        metricas.registrar("depositar", duracao)
+
+    metricas.exportar(str(tmp_path / "metricas.json"))
+    metricas.exportar(str(tmp_path / "metricas.prom"))
+
+    resumo = json.loads((tmp_path / "metricas.json").read_text(encoding="utf-8"))
+    assert resumo["depositar"]["quantidade"] == 3
+    prometheus = (tmp_path / "metricas.prom").read_text(encoding="utf-8")
+    assert 'banco_operacao_duracao_segundos_count{operacao="depositar"} 3' in (
+        prometheus
+    )
+    assert "banco_operacao_duracao_segundos_sum" in prometheus
+
+
+@pytest.fixture
+def exportacao_limpa(monkeypatch):
+    """Isola do processo o registro no encerramento e o tratador de SIGUSR1."""
+    registrados = []
+    monkeypatch.setattr(atexit, "register", registrados.append)
+    monkeypatch.setattr(monitoramento, "_exportacao", None)
+    monkeypatch.setattr(monitoramento, "_exportacao_no_encerramento", False)
+    monkeypatch.setattr(monitoramento, "_exportacao_no_sinal", False)
+    anterior = desativar_metricas()
+    if hasattr(signal, "SIGUSR1"):
+        tratador = signal.getsignal(signal.SIGUSR1)
+    yield registrados
+    if hasattr(signal, "SIGUSR1"):
+        signal.signal(signal.SIGUSR1, tratador)
+    desativar_metricas()
+    if anterior is not None:
+        ativar_metricas(metricas=anterior)
+
+
+def test_ativar_metricas_registra_a_exportacao_uma_vez(exportacao_limpa, tmp_path):
+    ativar_metricas(str(tmp_path / "primeira.json"))
+    metricas = ativar_metricas(str(tmp_path / "metricas.json"))
+    metricas.registrar("sacar", 5_000)
+
+    assert len(exportacao_limpa) == 1
+    exportacao_limpa[0]()
+    assert not (tmp_path / "primeira.json").exists()
+    resumo = json.loads((tmp_path / "metricas.json").read_text(encoding="utf-8"))
+    assert resumo["sacar"]["quantidade"] == 1
+
+
+def test_ativar_metricas_fora_da_thread_principal(exportacao_limpa, tmp_path):
+    erros = []
+
+    def ativar() -> None:
+        try:
+            ativar_metricas(str(tmp_path / "metricas.json"))
+        except ValueError as erro:  # `signal.signal` fora da thread principal
+            erros.append(erro)
+
+    thread = threading.Thread(target=ativar)
+    thread.start()
+    thread.join()
+
+    assert erros == [] and len(exportacao_limpa) == 1
+    assert not monitoramento._exportacao_no_sinal
+
+
+def test_perfilador_grava_um_perfil_por_execucao_externa(tmp_path):
+    perfilador = Perfilador(str(tmp_path))
+
+    def interna() -> int:
+        return sum(range(1_000))
+
+    def externa() -> int:
+        # Chamada aninhada: fica incluída no perfil da operação externa.
+        return perfilador.executar("interna", interna) + 1
+
+    assert perfilador.executar("externa", externa) == sum(range(1_000)) + 1
+    assert perfilador.executar("externa", externa) == sum(range(1_000)) + 1
+
+    assert perfilador.execucoes == {"externa": 2}
+    assert sorted(os.listdir(tmp_path)) == [
+        "externa-0001-alocacoes.txt",
+        "externa-0001.pstats",
+        "externa-0002-alocacoes.txt",
+        "externa-0002.pstats",
+    ]
+    funcoes = pstats.Stats(str(tmp_path / "externa-0001.pstats")).stats
+    assert any(nome == "interna" for _, _, nome in funcoes)
+    alocacoes = (tmp_path / "externa-0001-alocacoes.txt").read_text(encoding="utf-8")
+    assert alocacoes.startswith("Pico de memória rastreada:")
+    assert not tracemalloc.is_tracing()
+
+
+def test_registrar_log_perfila_e_registra_operacoes_com_erro(tmp_path):
+    @registrar_log(operacao="falhar")
+    def falhar() -> None:
+        raise KeyError("conta")
+
+    memoria = DestinoMemoria()
+    anterior = configurar_log(memoria)
+    ativar_perfil(str(tmp_path))
+    try:
+        with pytest.raises(KeyError):
+            falhar()
+    finally:
+        desativar_perfil()
+        configurar_log(anterior)
+
+    [registrado] = memoria.eventos
+    assert (registrado.operacao, registrado.erro) == ("falhar", "KeyError")
+    assert (tmp_path / "falhar-0001.pstats").exists()
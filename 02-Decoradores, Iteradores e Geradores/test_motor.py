@@ -0,0 +1,229 @@
+"""Testes do motor de transações (`motor.py`)."""
+
+import pytest
+from conftest import DIA, INSTANTE_BASE, nova_conta
+from livro_extrato import TipoTransacao
+from motor import (
+    CONTA_INEXISTENTE,
+    CPF_INVALIDO,
+    DATA_INVALIDA,
+    DEPOSITO_VALOR_INVALIDO,
+    INSTANTE_RETROATIVO,
+    SAQUE_LIMITE_DIARIO_EXCEDIDO,
+    SAQUE_LIMITE_EXCEDIDO,
+    SAQUE_LIMITE_SAQUES_EXCEDIDO,
+    SAQUE_SALDO_INSUFICIENTE,
+    SAQUE_VALOR_INVALIDO,
+    TRANSFERENCIA_MESMA_CONTA,
+    TRANSFERENCIA_SALDO_INSUFICIENTE,
+    TRANSFERENCIA_VALOR_INVALIDO,
+    USUARIO_EXISTENTE,
+    USUARIO_INEXISTENTE,
+    StatusOperacao,
+    abrir_conta,
+    converter_data_para_instante,
+    criar_usuario,
+    depositar,
+    sacar,
+    transferir,
+    transferir_lote,
+    validar_data,
+)
+from registro import RegistroBancario
+from saques_diarios import ControleSaquesDiarios
+
+
+def sacar_padrao(conta, valor, **argumentos):
+    """Saque com limites folgados, sobrescritos pelos argumentos informados."""
+    argumentos = {"limite": 500_00, "limite_saques": 3, **argumentos}
+    return sacar(conta, valor, instante=INSTANTE_BASE, **argumentos)
+
+
+def test_deposito_soma_ao_saldo_e_registra_no_extrato():
+    conta = nova_conta("00001-1")
+
+    resultado = depositar(conta, 150_00, instante=INSTANTE_BASE)
+
+    assert resultado.sucesso
+    assert resultado.saldo == conta["saldo"] == 150_00
+    transacoes = list(conta["extrato"].iterar())
+    assert [(t.tipo, t.valor, t.instante) for t in transacoes] == [
+        (TipoTransacao.DEPOSITO, 150_00, INSTANTE_BASE)
+    ]
+
+
+@pytest.mark.parametrize("valor", [0, -1])
+def test_deposito_recusa_valor_nao_positivo(valor):
+    conta = nova_conta("00001-1")
+
+    assert depositar(conta, valor) is DEPOSITO_VALOR_INVALIDO
+    assert conta["saldo"] == 0
+    assert len(conta["extrato"]) == 0
+
+
+@pytest.mark.parametrize(
+    "valor, argumentos, recusa",
+    [
+        # Valor inválido vem antes de qualquer outra verificação.
+        (0, {"limite": 0, "numero_saques": 9}, SAQUE_VALOR_INVALIDO),
+        # Saldo vem antes do limite por operação e da quantidade de saques.
+        (200_00, {"limite": 10_00, "numero_saques": 9}, SAQUE_SALDO_INSUFICIENTE),
+        # Limite por operação vem antes da quantidade de saques.
+        (60_00, {"limite": 50_00, "numero_saques": 9}, SAQUE_LIMITE_EXCEDIDO),
+        (10_00, {"numero_saques": 3}, SAQUE_LIMITE_SAQUES_EXCEDIDO),
+    ],
+)
+def test_saque_verifica_na_ordem_do_menu(valor, argumentos, recusa):
+    conta = nova_conta("00001-1", saldo=100_00)
+
+    assert sacar_padrao(conta, valor, **argumentos) is recusa
+    assert conta["saldo"] == 100_00
+    assert len(conta["extrato"]) == 0
+
+
+def test_saque_conta_limites_pelo_controle_diario():
+    conta = nova_conta("00001-1", saldo=1_000_00)
+    controle = ControleSaquesDiarios()
+    argumentos = {"limite_saques": 2, "limite_diario": 150_00}
+
+    assert sacar_padrao(conta, 100_00, saques_diarios=controle, **argumentos).sucesso
+    assert (
+        sacar_padrao(conta, 60_00, saques_diarios=controle, **argumentos)
+        is SAQUE_LIMITE_DIARIO_EXCEDIDO
+    )
+    assert sacar_padrao(conta, 50_00, saques_diarios=controle, **argumentos).sucesso
+    assert (
+        sacar_padrao(conta, 1_00, saques_diarios=controle, **argumentos)
+        is SAQUE_LIMITE_SAQUES_EXCEDIDO
+    )
+    # No dia seguinte, os contadores recomeçam.
+    assert sacar(
+        conta,
+        100_00,
+        limite=500_00,
+        saques_diarios=controle,
+        instante=INSTANTE_BASE + DIA,
+        **argumentos,
+    ).sucesso
+    assert conta["saldo"] == 750_00
+
+
+def test_controle_diario_le_saques_do_extrato():
+    conta = nova_conta("00001-1", saldo=1_000_00)
+    sacar_padrao(conta, 100_00)
+    sacar_padrao(conta, 100_00)
+
+    # Um controle novo (ex.: depois de reiniciar) conta os saques já registrados.
+    controle = ControleSaquesDiarios()
+    assert controle.consultar(conta, INSTANTE_BASE + 60) == (2, 200_00)
+
+
+@pytest.mark.parametrize(
+    "valor, destino, recusa",
+    [
+        (0, "00001-1", TRANSFERENCIA_VALOR_INVALIDO),
+        (10_00, "00001-1", TRANSFERENCIA_MESMA_CONTA),
+        (200_00, "00002-2", TRANSFERENCIA_SALDO_INSUFICIENTE),
+    ],
+)
+def test_transferencia_recusada_nao_altera_contas(valor, destino, recusa):
+    origem = nova_conta("00001-1", saldo=100_00)
+    contas = {"00001-1": origem, "00002-2": nova_conta("00002-2")}
+
+    assert transferir(origem, contas[destino], valor) is recusa
+    assert [conta["saldo"] for conta in contas.values()] == [100_00, 0]
+    assert not any(len(conta["extrato"]) for conta in contas.values())
+
+
+def test_transferencia_registra_as_duas_pontas():
+    origem, destino = nova_conta("00001-1", saldo=100_00), nova_conta("00002-2")
+
+    resultado = transferir(origem, destino, 40_00, instante=INSTANTE_BASE)
+
+    assert resultado.sucesso and resultado.saldo == 60_00
+    assert destino["saldo"] == 40_00
+    [enviada] = origem["extrato"].iterar()
+    [recebida] = destino["extrato"].iterar()
+    assert (enviada.tipo, enviada.valor) == (TipoTransacao.TRANSFERENCIA_ENVIADA, 40_00)
+    assert (recebida.tipo, recebida.valor) == (
+        TipoTransacao.TRANSFERENCIA_RECEBIDA,
+        40_00,
+    )
+    assert enviada.instante == recebida.instante == INSTANTE_BASE
+
+
+def test_instante_anterior_ao_ultimo_de_qualquer_ponta_e_recusado():
+    origem = nova_conta("00001-1", saldo=100_00)
+    destino = nova_conta("00002-2")
+    depositar(destino, 10_00, instante=INSTANTE_BASE + 60)
+
+    assert depositar(origem, 1_00, instante=INSTANTE_BASE).sucesso
+    assert sacar_padrao(destino, 1_00) is INSTANTE_RETROATIVO
+    assert transferir(origem, destino, 5_00, instante=INSTANTE_BASE) is (
+        INSTANTE_RETROATIVO
+    )
+    assert (origem["saldo"], destino["saldo"]) == (101_00, 10_00)
+    # Sem instante informado, a operação nunca fica antes da última transação.
+    destino["extrato"].registrar(TipoTransacao.DEPOSITO, 0, 2**40)
+    assert depositar(destino, 1_00).sucesso
+    assert destino["extrato"].ultimo_instante == 2**40
+
+
+def test_transferencias_em_lote_conservam_o_total(registro):
+    for conta in registro.lista_contas:
+        depositar(conta, 100_00, instante=INSTANTE_BASE)
+    numeros = [conta["numero_conta_corrente"] for conta in registro.lista_contas]
+    transferencias = [
+        (numeros[i % 3], numeros[(i * 7 + 1) % 3], (i * 1_237) % 150_00)
+        for i in range(300)
+    ] + [(numeros[0], "99999-9", 1_00)]
+
+    resultados = transferir_lote(registro, transferencias, instante=INSTANTE_BASE + 60)
+
+    assert resultados[-1] is CONTA_INEXISTENTE
+    assert any(r.status is StatusOperacao.SALDO_INSUFICIENTE for r in resultados)
+    assert sum(conta["saldo"] for conta in registro.lista_contas) == 300_00
+    for conta in registro.lista_contas:
+        extrato = conta["extrato"]
+        assert extrato.agregados.movimento_ate() == conta["saldo"] >= 0
+
+
+def test_cadastro_de_usuario_e_conta():
+    registro = RegistroBancario()
+    dados = {
+        "cpf": "12345678901",
+        "nome_titular": "Ana",
+        "data_nascimento_titular": "01-01-1990",
+        "endereco": {},
+    }
+
+    assert criar_usuario(registro, **{**dados, "cpf": "123"}) is CPF_INVALIDO
+    assert (
+        criar_usuario(registro, **{**dados, "data_nascimento_titular": "31-02-1990"})
+        is DATA_INVALIDA
+    )
+    assert criar_usuario(registro, **dados).sucesso
+    assert criar_usuario(registro, **dados) is USUARIO_EXISTENTE
+
+    assert abrir_conta(registro, cpf="98765432100") is USUARIO_INEXISTENTE
+    resultado = abrir_conta(registro, cpf="12345678901")
+    assert resultado.sucesso and resultado.saldo == 0
+    assert registro.buscar_conta(resultado.dados["numero_conta_corrente"]) is (
+        resultado.dados
+    )
+
+
+@pytest.mark.parametrize(
+    "data, dias", [("31-12-9999", 1), ("01-01-0001", 0), ("31-02-2025", 0)]
+)
+def test_data_fora_da_faixa_de_instantes_e_recusada_com_value_error(data, dias):
+    with pytest.raises(ValueError):
+        converter_data_para_instante(data, dias)
+
+
+def test_data_convertida_para_a_meia_noite_local():
+    assert validar_data("31-12-9999") and not validar_data("31-02-2025")
+    inicio = converter_data_para_instante("10-05-2025")
+
+    assert converter_data_para_instante("10-05-2025", 1) == inicio + DIA
+    assert inicio <= INSTANTE_BASE < inicio + DIA
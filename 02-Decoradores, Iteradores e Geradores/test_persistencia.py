@@ -0,0 +1,118 @@
+"""Testes da persistência por snapshot e diário de operações (`persistencia.py`)."""
+
+import os
+
+from conftest import INSTANTE_BASE
+from motor import abrir_conta, criar_usuario, depositar, sacar, transferir
+from persistencia import ArmazenamentoBanco
+
+
+def popular(registro) -> list[str]:
+    """Cadastra dois titulares com uma conta cada e movimenta as contas pelo motor."""
+    numeros = []
+    for cpf, nome in (("11111111111", "Ana"), ("22222222222", "Bruno")):
+        criar_usuario(
+            registro,
+            cpf=cpf,
+            nome_titular=nome,
+            data_nascimento_titular="01-01-1990",
+            endereco={"cidade": "Recife"},
+        )
+        numeros.append(abrir_conta(registro, cpf=cpf).dados["numero_conta_corrente"])
+    origem, destino = map(registro.buscar_conta, numeros)
+    depositar(origem, 500_00, instante=INSTANTE_BASE)
+    sacar(origem, 120_00, limite=500_00, limite_saques=3, instante=INSTANTE_BASE + 1)
+    transferir(origem, destino, 80_00, instante=INSTANTE_BASE + 2)
+    return numeros
+
+
+def estado(registro) -> list[tuple]:
+    """Usuários, saldos, extratos e posição do alocador, para comparação."""
+    return [
+        [usuario["cpf"] for usuario in registro.lista_usuarios],
+        [
+            (
+                conta["numero_conta_corrente"],
+                conta["saldo"],
+                list(conta["extrato"].instantes),
+                list(conta["extrato"].tipos),
+                list(conta["extrato"].valores),
+            )
+            for conta in registro.lista_contas
+        ],
+        (registro.alocador_contas.digitos, registro.alocador_contas.alocados),
+    ]
+
+
+def test_reabre_pelo_diario_e_pelo_snapshot(tmp_path):
+    armazenamento = ArmazenamentoBanco(str(tmp_path))
+    registro = armazenamento.abrir()
+    popular(registro)
+    esperado = estado(registro)
+    armazenamento.fechar()
+
+    # Só o diário traz as operações: o snapshot inicial está vazio.
+    reaberto = ArmazenamentoBanco(str(tmp_path))
+    assert estado(reaberto.abrir()) == esperado
+    reaberto.gravar_snapshot()
+    reaberto.fechar()
+    assert os.path.getsize(reaberto.caminho_diario(reaberto.geracao)) == 0
+
+    # Agora tudo vem do snapshot, e a próxima conta não repete números.
+    armazenamento = ArmazenamentoBanco(str(tmp_path))
+    registro = armazenamento.abrir()
+    assert estado(registro) == esperado
+    criar_usuario(
+        registro,
+        cpf="33333333333",
+        nome_titular="Caio",
+        data_nascimento_titular="01-01-1990",
+        endereco={},
+    )
+    numero = abrir_conta(registro, cpf="33333333333").dados["numero_conta_corrente"]
+    armazenamento.fechar()
+    assert numero not in {conta for conta, *_ in esperado[1]}
+
+
+def test_linha_incompleta_no_fim_do_diario_e_descartada(tmp_path):
+    armazenamento = ArmazenamentoBanco(str(tmp_path), registros_por_sincronizacao=1)
+    registro = armazenamento.abrir()
+    numeros = popular(registro)
+    esperado = estado(registro)
+    caminho = armazenamento.caminho_diario(armazenamento.geracao)
+    armazenamento.fechar()
+    tamanho = os.path.getsize(caminho)
+    with open(caminho, "a", encoding="utf-8") as arquivo:
+        arquivo.write(f"00000000\tD\t{numeros[0]}\t999")  # queda no meio da linha
+
+    reaberto = ArmazenamentoBanco(str(tmp_path))
+    registro = reaberto.abrir()
+    assert estado(registro) == esperado
+    assert os.path.getsize(caminho) == tamanho
+
+    # As próximas operações são acrescentadas depois da última linha válida.
+    depositar(registro.buscar_conta(numeros[1]), 1_00, instante=INSTANTE_BASE + 3)
+    esperado = estado(registro)
+    reaberto.fechar()
+    reaberto = ArmazenamentoBanco(str(tmp_path))
+    assert estado(reaberto.abrir()) == esperado
+    reaberto.fechar()
+
+
+def test_transferencias_do_diario_conservam_o_total(tmp_path):
+    armazenamento = ArmazenamentoBanco(str(tmp_path))
+    registro = armazenamento.abrir()
+    origem, destino = map(registro.buscar_conta, popular(registro))
+    for i in range(50):
+        transferir(origem, destino, 1_00 + i, instante=INSTANTE_BASE + 10 + i)
+        transferir(destino, origem, 2_00, instante=INSTANTE_BASE + 10 + i)
+    armazenamento.fechar()
+
+    reaberto = ArmazenamentoBanco(str(tmp_path))
+    registro = reaberto.abrir()
+    reaberto.fechar()
+    saldos = [conta["saldo"] for conta in registro.lista_contas]
+    assert sum(saldos) == 500_00 - 120_00
+    assert saldos == [
+        conta["extrato"].agregados.movimento_ate() for conta in registro.lista_contas
+    ]
@@ -0,0 +1,57 @@
+"""Testes do registro em SQLite (`registro_sqlite.py`)."""
+
+import sqlite3
+
+import pytest
+from conftest import INSTANTE_BASE
+from livro_extrato import TipoTransacao
+from motor import abrir_conta, criar_usuario, depositar, transferir
+from registro_sqlite import RegistroSQLite
+
+SQL_SALDOS = "SELECT saldo FROM contas ORDER BY id"
+SQL_QUANTIDADE = "SELECT count(*) FROM transacoes"
+
+
+@pytest.fixture
+def banco(tmp_path):
+    """Banco com duas contas, a primeira com R$ 100,00 depositados."""
+    caminho = str(tmp_path / "banco.db")
+    registro = RegistroSQLite(caminho)
+    for cpf in ("11111111111", "22222222222"):
+        criar_usuario(
+            registro,
+            cpf=cpf,
+            nome_titular=f"Titular {cpf[0]}",
+            data_nascimento_titular="01-01-1990",
+            endereco={},
+        )
+        abrir_conta(registro, cpf=cpf)
+    depositar(next(iter(registro.lista_contas)), 100_00, instante=INSTANTE_BASE)
+    yield caminho, registro
+    registro.fechar()
+
+
+def test_transferencia_confirma_as_duas_pontas_juntas(banco):
+    caminho, registro = banco
+    origem, destino = registro.lista_contas
+    leitor = sqlite3.connect(caminho)
+
+    assert transferir(origem, destino, 40_00, instante=INSTANTE_BASE + 1).sucesso
+    assert [saldo for saldo, in leitor.execute(SQL_SALDOS)] == [60_00, 40_00]
+    assert leitor.execute(SQL_QUANTIDADE).fetchone() == (3,)
+
+    # Saída registrada, entrada ainda não: nada visível para outra conexão.
+    origem["saldo"] = 50_00
+    origem["extrato"].registrar(
+        TipoTransacao.TRANSFERENCIA_ENVIADA, 10_00, INSTANTE_BASE + 2
+    )
+    assert leitor.execute(SQL_QUANTIDADE).fetchone() == (3,)
+    # Falha ao gravar a entrada: a saída e o saldo da origem são desfeitos.
+    with pytest.raises(OverflowError):
+        destino["extrato"].registrar(TipoTransacao.TRANSFERENCIA_RECEBIDA, 10_00, 2**70)
+    assert registro.conexao.execute(SQL_QUANTIDADE).fetchone() == (3,)
+    assert [saldo for saldo, in registro.conexao.execute(SQL_SALDOS)] == [
+        60_00,
+        40_00,
+    ]
+    leitor.close()
@@ -0,0 +1,130 @@
+"""Testes do servidor TCP de pedidos JSON (`servidor.py`)."""
+
+import asyncio
+import json
+
+import pytest
+from conftest import INSTANTE_BASE
+from motor import depositar
+from servidor import LIMITE_MAXIMO_PAGINA, ServidorBancario
+
+
+@pytest.fixture
+def servidor(registro) -> ServidorBancario:
+    return ServidorBancario(registro, limite=500_00, limite_saques=3)
+
+
+def responder(servidor: ServidorBancario, pedido: dict | bytes) -> dict:
+    linha = pedido if isinstance(pedido, bytes) else json.dumps(pedido).encode()
+    return json.loads(servidor.responder(linha))
+
+
+@pytest.mark.parametrize(
+    "linha",
+    [
+        b"nao e json\n",
+        b"[1, 2]\n",
+        b'{"operacao": "depositar", "conta": "00001-1"}\n',
+        b'{"operacao": "transferir", "origem": "00001-1"}\n',
+        b'{"operacao": "extrato", "conta": "00001-1", "tipo": "bonus"}\n',
+    ],
+)
+def test_pedido_mal_formado_recebe_resposta_de_erro(servidor, linha):
+    assert responder(servidor, linha)["status"] == "operacao_invalida"
+
+
+@pytest.mark.parametrize(
+    "periodo",
+    [
+        {"fim": "31-12-9999"},
+        {"inicio": "01-01-0001"},
+        {"inicio": "31-02-2025"},
+        {"fim": 20250531},
+    ],
+)
+def test_periodo_invalido_ou_fora_da_faixa_e_recusado(servidor, periodo):
+    resposta = responder(
+        servidor, {"operacao": "extrato", "conta": "00001-1", **periodo}
+    )
+
+    assert resposta["status"] == "data_invalida"
+
+
+@pytest.mark.parametrize(
+    "pagina",
+    [
+        {"limite": 1e400},
+        {"limite": 0},
+        {"limite": LIMITE_MAXIMO_PAGINA + 1},
+        {"limite": "10"},
+        {"limite": True},
+        {"limite": 2.5},
+        {"deslocamento": -1},
+        {"deslocamento": 10**30},
+    ],
+)
+@pytest.mark.parametrize("operacao", ["listar", "extrato"])
+def test_pagina_fora_da_faixa_e_recusada(servidor, operacao, pagina):
+    resposta = responder(servidor, {"operacao": operacao, "conta": "00001-1", **pagina})
+
+    assert resposta["status"] == "operacao_invalida"
+    assert resposta["mensagem"].startswith("Página inválida!")
+
+
+def test_operacao_desconhecida_devolve_o_id(servidor):
+    resposta = responder(servidor, {"operacao": "bonus", "id": 7})
+
+    assert (resposta["status"], resposta["id"]) == ("operacao_invalida", 7)
+
+
+def test_listagem_paginada_continua_a_numeracao(servidor):
+    primeira = responder(servidor, {"operacao": "listar", "limite": 2})
+    resto = responder(servidor, {"operacao": "listar", "deslocamento": 2})
+
+    assert "Titular 00002-2" in primeira["listagem"]
+    assert "Titular 00003-3" not in primeira["listagem"]
+    assert "Titular 00003-3" in resto["listagem"]
+    assert resto["listagem"].endswith("Listagem concluída.")
+
+
+def test_extrato_sem_limite_usa_a_pagina_padrao(servidor, registro):
+    conta = registro.buscar_conta("00001-1")
+    for i in range(150):
+        depositar(conta, 1_00, instante=INSTANTE_BASE + i)
+
+    resposta = responder(servidor, {"operacao": "extrato", "conta": "00001-1"})
+
+    assert resposta["saldo"] == "150.00"
+    assert "Transações 1 a 100 (próxima página: 100)" in resposta["extrato"]
+
+
+def test_conexao_recebe_as_respostas_na_ordem_dos_pedidos(servidor):
+    async def conversar() -> list[dict]:
+        escuta = await asyncio.start_server(servidor.atender, "127.0.0.1", 0)
+        porta = escuta.sockets[0].getsockname()[1]
+        async with escuta:
+            leitor, escritor = await asyncio.open_connection("127.0.0.1", porta)
+            for i, pedido in enumerate(
+                [
+                    {"operacao": "depositar", "conta": "00001-1", "valor": "10"},
+                    {"operacao": "sacar", "conta": "00001-1", "valor": "99"},
+                    {"operacao": "listar", "limite": 1e400},
+                ]
+            ):
+                escritor.write(json.dumps({**pedido, "id": i}).encode() + b"\n")
+            escritor.write(b"{}\n")
+            await escritor.drain()
+            respostas = [json.loads(await leitor.readline()) for _ in range(4)]
+            escritor.close()
+            await escritor.wait_closed()
+        return respostas
+
+    respostas = asyncio.run(conversar())
+
+    assert [r.get("id") for r in respostas] == [0, 1, 2, None]
+    assert [r["status"] for r in respostas] == [
+        "sucesso",
+        "saldo_insuficiente",
+        "operacao_invalida",
+        "operacao_invalida",
+    ]